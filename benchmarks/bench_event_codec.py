@@ -0,0 +1,90 @@
+"""Micro-benchmark for event serialization.
+
+Compares the event codec in `omnicoreagent.core.events.codec` against the
+previous `event.json()` / `Event.parse_raw` path for a mix of event types.
+
+Usage:
+    python benchmarks/bench_event_codec.py [--number 5000]
+"""
+
+import argparse
+import json
+import timeit
+import warnings
+
+from omnicoreagent.core.events.base import (
+    AgentThoughtPayload,
+    Event,
+    EventType,
+    FinalAnswerPayload,
+    ToolCallResultPayload,
+    ToolCallStartedPayload,
+)
+from omnicoreagent.core.events.codec import decode_event, encode_event
+
+LARGE_RESULT = json.dumps(
+    [{"id": i, "title": f"Item {i}", "body": "lorem ipsum " * 20} for i in range(200)]
+)
+
+SAMPLE_EVENTS = {
+    "agent_thought": Event(
+        type=EventType.AGENT_THOUGHT,
+        payload=AgentThoughtPayload(message="I should look up the weather first."),
+        agent_name="bench",
+    ),
+    "tool_call_started": Event(
+        type=EventType.TOOL_CALL_STARTED,
+        payload=ToolCallStartedPayload(
+            tool_name="get_weather", tool_args={"city": "Lagos", "units": "metric"}
+        ),
+        agent_name="bench",
+    ),
+    "large_tool_result": Event(
+        type=EventType.TOOL_CALL_RESULT,
+        payload=ToolCallResultPayload(
+            tool_name="search", tool_args={"q": "items"}, result=LARGE_RESULT
+        ),
+        agent_name="bench",
+    ),
+    "final_answer": Event(
+        type=EventType.FINAL_ANSWER,
+        payload=FinalAnswerPayload(message="It is 31°C and sunny in Lagos."),
+        agent_name="bench",
+    ),
+}
+
+
+def legacy_round_trip(event: Event) -> Event:
+    return Event.parse_raw(event.json())
+
+
+def codec_round_trip(event: Event) -> Event:
+    body, blobs = encode_event(event)
+    return decode_event(body, blobs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=5000)
+    options = parser.parse_args()
+    warnings.simplefilter("ignore", DeprecationWarning)
+
+    print(
+        f"{'event':<22}{'legacy us':>12}{'codec us':>12}{'speedup':>10}"
+        f"{'legacy bytes':>14}{'codec bytes':>13}"
+    )
+    for name, event in SAMPLE_EVENTS.items():
+        legacy = timeit.timeit(lambda: legacy_round_trip(event), number=options.number)
+        current = timeit.timeit(lambda: codec_round_trip(event), number=options.number)
+        legacy_us = legacy / options.number * 1e6
+        current_us = current / options.number * 1e6
+        legacy_bytes = len(event.json().encode())
+        codec_bytes = len(encode_event(event)[0])
+        print(
+            f"{name:<22}{legacy_us:>12.1f}{current_us:>12.1f}"
+            f"{legacy_us / current_us:>9.2f}x{legacy_bytes:>14}{codec_bytes:>13}"
+        )
+
+
+if __name__ == "__main__":
+    main()
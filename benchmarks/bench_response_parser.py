@@ -0,0 +1,118 @@
+"""Micro-benchmark for agent response parsing.
+
+Compares the single-pass parser in `omnicoreagent.core.agents.response_parser`
+against the previous regex cascade over a set of recorded LLM responses.
+
+Usage:
+    python benchmarks/bench_response_parser.py [--number 2000]
+"""
+
+import argparse
+import json
+import re
+import timeit
+
+from omnicoreagent.core.agents.response_parser import (
+    parse_agent_response,
+    to_tool_parsed_response,
+)
+
+LARGE_OBSERVATION = json.dumps(
+    [{"id": i, "title": f"Item {i}", "body": "lorem ipsum " * 20} for i in range(50)]
+)
+
+RECORDED_RESPONSES = {
+    "final_answer": (
+        "<thought>The user asked for a greeting, no tools are needed.</thought>\n"
+        "<final_answer>Hello! How can I help you today?</final_answer>"
+    ),
+    "single_tool_call": (
+        "<thought>I need to read the file first.</thought>\n"
+        "<tool_call>\n  <tool_name>read_file</tool_name>\n"
+        '  <parameters>{"path": "/home/user/notes.txt"}</parameters>\n</tool_call>'
+    ),
+    "multi_tool_calls_xml_args": (
+        "<thought>Fetch weather for three cities in parallel.</thought>\n<tool_calls>\n"
+        + "".join(
+            f"  <tool_call>\n    <tool_name>get_weather</tool_name>\n"
+            f"    <parameters><city>{city}</city><units>metric</units>"
+            f'<fields>["temp", "humidity"]</fields></parameters>\n  </tool_call>\n'
+            for city in ("Lagos", "London", "Tokyo")
+        )
+        + "</tool_calls>"
+    ),
+    "long_final_answer": (
+        "<thought>" + "Reasoning about the data. " * 50 + "</thought>\n"
+        "<final_answer>" + LARGE_OBSERVATION + "</final_answer>"
+    ),
+}
+
+
+def legacy_extract(response: str) -> dict:
+    """The regex cascade previously used by BaseReactAgent.extract_action_or_answer."""
+    re.search(r"<thought>(.*?)</thought>", response, re.DOTALL)
+    tool_calls = []
+    tool_call_blocks = []
+    if "<tool_calls>" in response and "</tool_calls>" in response:
+        block_match = re.search(r"<tool_calls>(.*?)</tool_calls>", response, re.DOTALL)
+        if block_match:
+            tool_call_blocks = re.findall(
+                r"<tool_call>(.*?)</tool_call>", block_match.group(1), re.DOTALL
+            )
+    elif "<tool_call>" in response and "</tool_call>" in response:
+        single_match = re.search(r"<tool_call>(.*?)</tool_call>", response, re.DOTALL)
+        tool_call_blocks = [single_match.group(1)] if single_match else []
+    for block in tool_call_blocks:
+        name_match = re.search(r"<tool_name>(.*?)</tool_name>", block, re.DOTALL) or (
+            re.search(r"<name>(.*?)</name>", block, re.DOTALL)
+        )
+        args_match = re.search(
+            r"<parameters>(.*?)</parameters>", block, re.DOTALL
+        ) or re.search(r"<args>(.*?)</args>", block, re.DOTALL)
+        args_str = args_match.group(1).strip()
+        args = {}
+        if args_str.startswith("{") and args_str.endswith("}"):
+            args = json.loads(args_str)
+        else:
+            for key, value in re.findall(r"<(\w+)>(.*?)</\1>", args_str, re.DOTALL):
+                value = value.strip()
+                if value.startswith(("[", "{")):
+                    try:
+                        args[key] = json.loads(value)
+                    except json.JSONDecodeError:
+                        args[key] = value
+                else:
+                    args[key] = value
+        tool_calls.append({"tool": name_match.group(1).strip(), "parameters": args})
+    if tool_calls:
+        return {"action": True, "data": json.dumps(tool_calls)}
+    if "<final_answer>" in response and "</final_answer>" in response:
+        match = re.search(r"<final_answer>(.*?)</final_answer>", response, re.DOTALL)
+        return {"answer": match.group(1).strip()}
+    return {"error": "no match"}
+
+
+def single_pass_extract(response: str):
+    return to_tool_parsed_response(parse_agent_response(response))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2000)
+    options = parser.parse_args()
+
+    print(f"{'response':<28}{'legacy us':>12}{'single-pass us':>16}{'speedup':>10}")
+    for name, response in RECORDED_RESPONSES.items():
+        legacy = timeit.timeit(lambda: legacy_extract(response), number=options.number)
+        current = timeit.timeit(
+            lambda: single_pass_extract(response), number=options.number
+        )
+        legacy_us = legacy / options.number * 1e6
+        current_us = current / options.number * 1e6
+        print(
+            f"{name:<28}{legacy_us:>12.1f}{current_us:>16.1f}{legacy_us / current_us:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -19,7 +19,17 @@ from .omni_agent.background_agent import (
     BackgroundAgentManager,
     TaskRegistry,
     APSchedulerBackend,
+    AsyncIOSchedulerBackend,
     BackgroundTaskScheduler,
+    RedisLeaseCoordinator,
+    RedisTaskRegistry,
+    WorkerPool,
+    BaseTrigger,
+    FileWatchTrigger,
+    MCPResourceTrigger,
+    QueueTrigger,
+    RedisPubSubTrigger,
+    RedisStreamTrigger,
 )
 
 # MCP Client (for advanced users)
@@ -29,6 +39,7 @@ from .mcp_omni_connect import MCPClient, Configuration, main
 from .omni_agent.workflow.parallel_agent import ParallelAgent
 from .omni_agent.workflow.sequential_agent import SequentialAgent
 from .omni_agent.workflow.router_agent import RouterAgent
+from .omni_agent.workflow.graph_agent import GraphAgent, GraphNode
 
 __all__ = [
     # Core Agents
@@ -47,10 +58,22 @@ __all__ = [
     "BackgroundAgentManager",
     "TaskRegistry",
     "APSchedulerBackend",
+    "AsyncIOSchedulerBackend",
     "BackgroundTaskScheduler",
+    "RedisLeaseCoordinator",
+    "RedisTaskRegistry",
+    "WorkerPool",
+    "BaseTrigger",
+    "FileWatchTrigger",
+    "MCPResourceTrigger",
+    "QueueTrigger",
+    "RedisPubSubTrigger",
+    "RedisStreamTrigger",
     "ParallelAgent",
     "SequentialAgent",
     "RouterAgent",
+    "GraphAgent",
+    "GraphNode",
     # MCP Client
     "MCPClient",
     "Configuration",
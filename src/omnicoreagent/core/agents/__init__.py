@@ -14,7 +14,14 @@ from .react_agent import ReactAgent
 from .orchestrator import OrchestratorAgent
 from .tool_calling_agent import ToolCallingAgent
 from .types import AgentConfig, ParsedResponse, ToolCall
-from .token_usage import UsageLimits, Usage, UsageLimitExceeded
+from .token_usage import (
+    UsageLimits,
+    Usage,
+    UsageLimitExceeded,
+    UsageLedger,
+    UsageScope,
+    usage_ledger,
+)
 
 __all__ = [
     "BaseReactAgent",
@@ -27,4 +34,7 @@ __all__ = [
     "UsageLimits",
     "Usage",
     "UsageLimitExceeded",
+    "UsageLedger",
+    "UsageScope",
+    "usage_ledger",
 ]
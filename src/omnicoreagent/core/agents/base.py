@@ -1,6 +1,6 @@
 import asyncio
 import json
-import re
+import logging
 import uuid
 from collections.abc import Callable
 from collections import defaultdict
@@ -14,14 +14,25 @@ from omnicoreagent.core.agents.token_usage import (
     Usage,
     UsageLimitExceeded,
     UsageLimits,
-    session_stats,
-    usage,
+    UsageScope,
+    record_request_usage,
+    usage_ledger,
 )
 from omnicoreagent.core.tools.tools_handler import (
     LocalToolHandler,
     MCPToolHandler,
     ToolExecutor,
 )
+from omnicoreagent.core.agents.context_compaction import (
+    CompactionConfig,
+    ObservationStore,
+    ObservationToolRegistry,
+    WorkingMemoryCompactor,
+)
+from omnicoreagent.core.agents.response_parser import (
+    parse_agent_response,
+    to_tool_parsed_response,
+)
 from omnicoreagent.core.agents.types import (
     AgentState,
     Message,
@@ -42,6 +53,9 @@ from omnicoreagent.core.utils import (
     is_vector_db_enabled,
     normalize_tool_args,
     build_xml_observations_block,
+    LazyLogPayload,
+    LOG_HISTORY_DUMPS,
+    format_messages_for_log,
 )
 from omnicoreagent.core.events.base import (
     Event,
@@ -53,6 +67,7 @@ from omnicoreagent.core.events.base import (
     AgentMessagePayload,
     UserMessagePayload,
     AgentThoughtPayload,
+    ContextCompactedPayload,
 )
 import traceback
 from omnicoreagent.core.tools.tool_knowledge_base import (
@@ -61,7 +76,9 @@ from omnicoreagent.core.tools.tool_knowledge_base import (
 from omnicoreagent.core.tools.memory_tool.memory_tool import (
     build_tool_registry_memory_tool,
 )
+from omnicoreagent.core.tools.local_tools_registry import ToolRegistry
 from omnicoreagent.core.constants import date_time_func
+from omnicoreagent.core.run_timing import timed
 
 # Import memory system first to ensure initialization
 if is_vector_db_enabled():
@@ -97,6 +114,7 @@ class BaseReactAgent:
         tools_results_limit: int = 10,
         tools_similarity_threshold: float = 0.5,
         memory_tool_backend: str = None,
+        context_compaction: dict | None = None,
     ):
         self.agent_name = agent_name
         # Enforce minimum 5 steps to allow proper tool usage and reasoning
@@ -132,6 +150,11 @@ class BaseReactAgent:
             request_limit=self.request_limit, total_tokens_limit=self.total_tokens_limit
         )
 
+        # Working-memory compaction keeps each step's prompt inside the context window
+        self.compactor = WorkingMemoryCompactor(
+            CompactionConfig(**(context_compaction or {}))
+        )
+
         self._session_states: dict[Tuple[str, str], SessionState] = {}
 
     def _get_session_state(self, session_id: str) -> SessionState:
@@ -143,6 +166,7 @@ class BaseReactAgent:
                 loop_detector=RobustLoopDetector(),
                 assistant_with_tool_calls=None,
                 pending_tool_responses=[],
+                observations=ObservationStore(),
             )
         return self._session_states[key]
 
@@ -171,7 +195,7 @@ class BaseReactAgent:
             limit = self.memory_results_limit
             threshold = self.memory_similarity_threshold
 
-            logger.debug(f"Memory retrieval: limit={limit}, threshold={threshold}")
+            logger.debug("Memory retrieval: limit=%s, threshold=%s", limit, threshold)
 
             try:
                 # Vector DB is enabled - load memory functions and use them
@@ -234,113 +258,26 @@ class BaseReactAgent:
     ) -> ParsedResponse:
         """Parse LLM response to extract a final answer or a tool action using XML format only."""
         try:
+            parsed = parse_agent_response(response)
             # emit the agent thoughts each time
-            agent_thoughts = re.search(r"<thought>(.*?)</thought>", response, re.DOTALL)
-            if agent_thoughts:
+            if parsed.thought is not None:
                 event = Event(
                     type=EventType.AGENT_THOUGHT,
                     payload=AgentThoughtPayload(
-                        message=str(agent_thoughts.group(1).strip()),
+                        message=parsed.thought,
                     ),
                     agent_name=self.agent_name,
                 )
                 if event_router:
                     await event_router(session_id=session_id, event=event)
-            tool_calls = []
-            tool_call_blocks = []
-            # Check for XML-style tool call format first
-            if "<tool_calls>" in response and "</tool_calls>" in response:
-                if debug:
-                    logger.info("Multiple tool calls detected.")
-                block_match = re.search(
-                    r"<tool_calls>(.*?)</tool_calls>", response, re.DOTALL
-                )
-                if block_match:
-                    tool_call_blocks = re.findall(
-                        r"<tool_call>(.*?)</tool_call>", block_match.group(1), re.DOTALL
-                    )
-
-            elif "<tool_call>" in response and "</tool_call>" in response:
-                if debug:
-                    logger.info("Single tool call detected.")
-                single_match = re.search(
-                    r"<tool_call>(.*?)</tool_call>", response, re.DOTALL
-                )
-                tool_call_blocks = [single_match.group(1)] if single_match else []
-            else:
-                tool_call_blocks = []
-
-            # Parse each <tool_call> block
-            for block in tool_call_blocks:
-                name_match = re.search(
-                    r"<tool_name>(.*?)</tool_name>", block, re.DOTALL
-                ) or re.search(r"<name>(.*?)</name>", block, re.DOTALL)
-                args_match = re.search(
-                    r"<parameters>(.*?)</parameters>", block, re.DOTALL
-                ) or re.search(r"<args>(.*?)</args>", block, re.DOTALL)
-
-                if not (name_match and args_match):
-                    return ParsedResponse(
-                        error="Invalid tool call format - missing name or parameters"
-                    )
-
-                tool_name = name_match.group(1).strip()
-                args_str = args_match.group(1).strip()
-                # Parse parameters (JSON or XML)
-                args = {}
-                if args_str.startswith("{") and args_str.endswith("}"):
-                    try:
-                        args = json.loads(args_str)
-                    except json.JSONDecodeError as e:
-                        return ParsedResponse(error=f"Invalid JSON in args: {str(e)}")
-                else:
-                    for key, value in re.findall(
-                        r"<(\w+)>(.*?)</\1>", args_str, re.DOTALL
-                    ):
-                        value = value.strip()
-                        # Try parsing as JSON if it looks like JSON
-                        if (value.startswith("[") and value.endswith("]")) or (
-                            value.startswith("{") and value.endswith("}")
-                        ):
-                            try:
-                                args[key] = json.loads(value)
-                            except json.JSONDecodeError:
-                                args[key] = value
-                        else:
-                            args[key] = value
-
-                tool_calls.append({"tool": tool_name, "parameters": args})
-
-            # Return parsed tool calls if any
-            if tool_calls:
-                return ParsedResponse(action=True, data=json.dumps(tool_calls))
-
-            # Check for XML final answer format
-            if "<final_answer>" in response and "</final_answer>" in response:
-                if debug:
+            if debug:
+                if parsed.tool_calls:
+                    logger.info("%d tool call(s) detected.", len(parsed.tool_calls))
+                elif parsed.final_answer is not None:
                     logger.info(
                         "XML final answer format detected in response: %s", response
                     )
-                final_answer_match = re.search(
-                    r"<final_answer>(.*?)</final_answer>", response, re.DOTALL
-                )
-                if final_answer_match:
-                    answer = final_answer_match.group(1).strip()
-                    return ParsedResponse(answer=answer)
-                else:
-                    return ParsedResponse(error="Invalid XML final answer format")
-
-            # Check if response contains any XML tags at all
-            if "<" in response and ">" in response:
-                # Has some XML but not the required format - return error
-                return ParsedResponse(
-                    error="Response contains XML tags but not in the required format. You MUST use <thought> and <final_answer> tags for all responses."
-                )
-
-            # No XML at all - return error
-            return ParsedResponse(
-                error="Response must use XML format. You MUST wrap your response in <thought> and <final_answer> tags. Example: <thought>Your reasoning here</thought><final_answer>Your answer here</final_answer>"
-            )
+            return to_tool_parsed_response(parsed)
 
         except Exception as e:
             logger.error("Error parsing model response: %s", str(e))
@@ -470,7 +407,9 @@ class BaseReactAgent:
         try:
             if self.enable_tools_knowledge_base:
                 mcp_tools = None
-                local_tools = tools_retriever_local_tool
+                # keep this run's copy that adds expand_observation, if any
+                if not isinstance(local_tools, ObservationToolRegistry):
+                    local_tools = tools_retriever_local_tool
                 if self.memory_tool_backend:
                     build_tool_registry_memory_tool(
                         memory_tool_backend=self.memory_tool_backend,
@@ -759,8 +698,10 @@ class BaseReactAgent:
             combined_tool_args = [getattr(t, "tool_args", {}) for t in tool_errors]
 
             logger.error(
-                f"Tool call validation failed for: {combined_tool_name} "
-                f"args={combined_tool_args} -> {obs_text}"
+                "Tool call validation failed for: %s args=%s -> %s",
+                combined_tool_name,
+                LazyLogPayload(combined_tool_args),
+                LazyLogPayload(obs_text),
             )
         else:
             tool_call_id = str(uuid.uuid4())
@@ -981,7 +922,9 @@ class BaseReactAgent:
 
         if debug:
             logger.info(
-                f"Agent state changed from {session_state.state} to {AgentState.OBSERVING}"
+                "Agent state changed from %s to %s",
+                session_state.state,
+                AgentState.OBSERVING,
             )
         session_state.state = AgentState.OBSERVING
 
@@ -1004,7 +947,7 @@ class BaseReactAgent:
             if session_state.loop_detector.is_looping(tool_name):
                 loop_type = session_state.loop_detector.get_loop_type(tool_name)
                 logger.warning(
-                    f"Tool call loop detected for '{tool_name}': {loop_type}"
+                    "Tool call loop detected for '%s': %s", tool_name, loop_type
                 )
 
                 new_system_prompt = handle_stuck_state(system_prompt)
@@ -1044,7 +987,9 @@ class BaseReactAgent:
 
                 if debug:
                     logger.info(
-                        f"Agent state changed from {session_state.state} to {AgentState.STUCK}"
+                        "Agent state changed from %s to %s",
+                        session_state.state,
+                        AgentState.STUCK,
                     )
 
                 session_state.state = AgentState.STUCK
@@ -1076,6 +1021,43 @@ class BaseReactAgent:
         finally:
             session_state.state = previous_state
 
+    async def compact_working_memory(
+        self,
+        session_state: SessionState,
+        llm_connection: Callable,
+        session_id: str = None,
+        event_router: Callable[[str, Event], Any] = None,
+    ):
+        """Compact older observations once the working set nears the context window."""
+        session_state.messages, result = self.compactor.compact(
+            session_state.messages,
+            llm_connection=llm_connection,
+            store=session_state.observations,
+        )
+        if result is None:
+            return None
+        logger.info(
+            "Compacted %d observations: ~%d -> ~%d tokens (context window %d)",
+            result.compacted_messages,
+            result.tokens_before,
+            result.tokens_after,
+            result.context_window,
+        )
+        if event_router:
+            event = Event(
+                type=EventType.CONTEXT_COMPACTED,
+                payload=ContextCompactedPayload(
+                    tokens_before=result.tokens_before,
+                    tokens_after=result.tokens_after,
+                    context_window=result.context_window,
+                    compacted_messages=result.compacted_messages,
+                    references=result.references,
+                ),
+                agent_name=self.agent_name,
+            )
+            await event_router(session_id=session_id, event=event)
+        return result
+
     async def get_tools_registry(
         self, mcp_tools: dict = None, local_tools: Any = None
     ) -> str:
@@ -1083,7 +1065,9 @@ class BaseReactAgent:
         try:
             # Process local tools
             if self.enable_tools_knowledge_base:
-                local_tools = tools_retriever_local_tool
+                # keep this run's copy that adds expand_observation, if any
+                if not isinstance(local_tools, ObservationToolRegistry):
+                    local_tools = tools_retriever_local_tool
                 if self.memory_tool_backend:
                     build_tool_registry_memory_tool(
                         memory_tool_backend=self.memory_tool_backend,
@@ -1204,9 +1188,12 @@ class BaseReactAgent:
 
             @track("memory_retrieval_step")
             async def get_memory():
-                return await self.get_long_episodic_memory(
-                    query=query, session_id=session_id, llm_connection=llm_connection
-                )
+                with timed("memory"):
+                    return await self.get_long_episodic_memory(
+                        query=query,
+                        session_id=session_id,
+                        llm_connection=llm_connection,
+                    )
 
             long_term_memory, episodic_memory = await get_memory()
 
@@ -1220,6 +1207,18 @@ class BaseReactAgent:
             system_updated_prompt = system_prompt
             long_term_memory, episodic_memory = [], []
 
+        # compacted observations are read back through `expand_observation`;
+        # add it to a copy of this run's tools before they are listed
+        if self.compactor.enabled:
+            if self.enable_tools_knowledge_base:
+                local_tools = ObservationToolRegistry(
+                    tools_retriever_local_tool, store=session_state.observations
+                )
+            elif local_tools is None or isinstance(local_tools, ToolRegistry):
+                local_tools = ObservationToolRegistry(
+                    local_tools, store=session_state.observations
+                )
+
         tools_section = await self.get_tools_registry(
             mcp_tools=mcp_tools, local_tools=local_tools
         )
@@ -1280,6 +1279,14 @@ class BaseReactAgent:
             )
 
         # set the agent state to running
+        # usage is accounted per run; limits apply to this agent's session
+        usage_scope = UsageScope(
+            agent_name=self.agent_name,
+            session_id=session_id,
+            run_id=uuid.uuid4().hex,
+        )
+        limit_scope = UsageScope(agent_name=self.agent_name, session_id=session_id)
+
         async with self.agent_session_state_context(
             new_state=AgentState.RUNNING, session_id=session_id
         ):
@@ -1289,16 +1296,31 @@ class BaseReactAgent:
                 session_state.state not in [AgentState.FINISHED]
                 and current_steps < self.max_steps
             ):
-                logger.info(f"history: {(session_state.messages[1:])}")
+                if LOG_HISTORY_DUMPS and logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "history: %s",
+                        LazyLogPayload(
+                            lambda: format_messages_for_log(session_state.messages[1:])
+                        ),
+                    )
                 if debug:
                     logger.info(
-                        f"Sending {len(session_state.messages)} messages to LLM"
+                        "Sending %d messages to LLM", len(session_state.messages)
                     )
                 current_steps += 1
                 if self._limits_enabled:
-                    self.usage_limits.check_before_request(usage=usage)
+                    self.usage_limits.check_before_request(
+                        usage=usage_ledger.usage_for(**limit_scope.as_dict())
+                    )
 
                 try:
+                    if self.compactor.enabled:
+                        await self.compact_working_memory(
+                            session_state=session_state,
+                            llm_connection=llm_connection,
+                            session_id=session_id,
+                            event_router=event_router,
+                        )
 
                     @track("llm_call")
                     async def make_llm_call():
@@ -1321,54 +1343,36 @@ class BaseReactAgent:
                         # check if it has usage - always record, but only enforce limits when enabled
                         if hasattr(response, "usage"):
                             request_usage = Usage(
-                                requests=current_steps,
+                                requests=1,
                                 request_tokens=response.usage.prompt_tokens,
                                 response_tokens=response.usage.completion_tokens,
                                 total_tokens=response.usage.total_tokens,
                             )
-                            usage.incr(request_usage)
-
-                            # Only enforce limits if they're enabled
-                            if self._limits_enabled:
-                                # Check if we've exceeded token limits
-                                self.usage_limits.check_tokens(usage)
-                                # Show remaining resources
-                                remaining_tokens = self.usage_limits.remaining_tokens(
-                                    usage
-                                )
-                                used_tokens = usage.total_tokens
-                                used_requests = usage.requests
-                                remaining_requests = self.request_limit - used_requests
-                                session_stats.update(
-                                    {
-                                        "used_requests": used_requests,
-                                        "used_tokens": used_tokens,
-                                        "remaining_requests": remaining_requests,
-                                        "remaining_tokens": remaining_tokens,
-                                        "request_tokens": request_usage.request_tokens,
-                                        "response_tokens": request_usage.response_tokens,
-                                        "total_tokens": request_usage.total_tokens,
-                                    }
+                            stats = record_request_usage(
+                                ledger=usage_ledger,
+                                scope=usage_scope,
+                                usage_limits=self.usage_limits
+                                if self._limits_enabled
+                                else None,
+                                incr_usage=request_usage,
+                                limit_scope=limit_scope,
+                            )
+                            if debug:
+                                logger.info(
+                                    "API Call Stats - Requests: %s/%s, Tokens: %s/%s, "
+                                    "Request Tokens: %s, Response Tokens: %s, "
+                                    "Total Tokens: %s, Remaining Requests: %s, "
+                                    "Remaining Tokens: %s",
+                                    stats["used_requests"],
+                                    self.request_limit,
+                                    stats["used_tokens"],
+                                    self.total_tokens_limit,
+                                    stats["request_tokens"],
+                                    stats["response_tokens"],
+                                    stats["total_tokens"],
+                                    stats["remaining_requests"],
+                                    stats["remaining_tokens"],
                                 )
-                                if debug:
-                                    logger.info(
-                                        f"API Call Stats - Requests: {used_requests}/{self.request_limit}, "
-                                        f"Tokens: {used_tokens}/{self.usage_limits.total_tokens_limit}, "
-                                        f"Request Tokens: {request_usage.request_tokens}, "
-                                        f"Response Tokens: {request_usage.response_tokens}, "
-                                        f"Total Tokens: {request_usage.total_tokens}, "
-                                        f"Remaining Requests: {remaining_requests}, "
-                                        f"Remaining Tokens: {remaining_tokens}"
-                                    )
-                            else:
-                                # Just log usage without limits
-                                if debug:
-                                    logger.info(
-                                        f"Usage recorded (limits disabled): "
-                                        f"Request Tokens: {request_usage.request_tokens}, "
-                                        f"Response Tokens: {request_usage.response_tokens}, "
-                                        f"Total Tokens: {request_usage.total_tokens}"
-                                    )
 
                         if hasattr(response, "choices"):
                             response = response.choices[0].message.content.strip()
@@ -1392,7 +1396,7 @@ class BaseReactAgent:
                     event_router=event_router,
                 )
                 if debug:
-                    logger.info(f"current steps: {current_steps}")
+                    logger.info("current steps: %d", current_steps)
                 # check for final answer
                 if parsed_response.answer is not None:
                     last_valid_response = parsed_response.answer
@@ -1458,7 +1462,10 @@ class BaseReactAgent:
                     await execute_action()
 
                 if parsed_response.error is not None:
-                    logger.error(f"Error in parsed response: {parsed_response.error}")
+                    logger.error(
+                        "Error in parsed response: %s",
+                        LazyLogPayload(parsed_response.error),
+                    )
                     # we need to continue the loop if there is an error in parsing
                     session_state.messages.append(
                         Message(
@@ -0,0 +1,316 @@
+"""Context-window aware compaction of the ReAct working memory.
+
+Every tool round appends an observation block to `SessionState.messages` and
+the whole list is re-sent on each LLM call. `WorkingMemoryCompactor` keeps an
+estimate of the working set's token count and, once it crosses a fraction of
+the model's context window, rewrites older observations:
+
+1. large observations are truncated and the full payload is kept by reference
+   in an `ObservationStore`, one per agent and session;
+2. if that is not enough, older observations are collapsed to a reference stub.
+
+The agent can read a compacted payload back with the `expand_observation`
+tool, which is listed in the system prompt whenever compaction is enabled.
+Only the in-flight working set is compacted; the memory store still holds the
+full messages.
+"""
+
+from __future__ import annotations as _annotations
+
+import re
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from omnicoreagent.core.agents.types import Message
+from omnicoreagent.core.tools.local_tools_registry import ToolRegistry
+
+DEFAULT_CONTEXT_WINDOW = 100000
+COMPACTED_PREFIX = "[compacted observation"
+OBSERVATION_PREFIX = "<observation_marker>"
+_REF_RE = re.compile(r"ref_id=(obs_[0-9a-f]+)")
+
+
+@dataclass
+class CompactionConfig:
+    """Settings for working-memory compaction (the `context_compaction` agent config)."""
+
+    enabled: bool = True
+    max_context_tokens: int | None = None
+    """Context window to budget against; defaults to the LLM's max_context_length."""
+    trigger_ratio: float = 0.8
+    """Compact once the working set exceeds this fraction of the context window."""
+    target_ratio: float = 0.6
+    """Compact until the working set is below this fraction of the context window."""
+    keep_recent_observations: int = 2
+    """Most recent observations that are never compacted."""
+    max_observation_chars: int = 2000
+    """Characters of an observation kept inline when it is truncated."""
+    chars_per_token: float = 4.0
+
+    def __post_init__(self) -> None:
+        if not 0 < self.target_ratio <= self.trigger_ratio <= 1:
+            raise ValueError(
+                "context_compaction requires 0 < target_ratio <= trigger_ratio <= 1"
+            )
+        if self.keep_recent_observations < 0 or self.max_observation_chars < 0:
+            raise ValueError(
+                "keep_recent_observations and max_observation_chars must be non-negative"
+            )
+
+
+@dataclass
+class CompactionResult:
+    tokens_before: int
+    tokens_after: int
+    context_window: int
+    compacted_messages: int
+    references: list[str] = field(default_factory=list)
+
+
+class ObservationStore:
+    """Bounded LRU of full observation payloads, keyed by reference id."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._payloads: OrderedDict[str, str] = OrderedDict()
+
+    def put(self, content: str) -> str:
+        ref_id = f"obs_{uuid.uuid4().hex[:12]}"
+        self._payloads[ref_id] = content
+        while len(self._payloads) > self.max_entries:
+            self._payloads.popitem(last=False)
+        return ref_id
+
+    def get(self, ref_id: str) -> str | None:
+        content = self._payloads.get(ref_id)
+        if content is not None:
+            self._payloads.move_to_end(ref_id)
+        return content
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+
+def _get_role_and_content(message: Any) -> tuple[str | None, str]:
+    if isinstance(message, dict):
+        return message.get("role"), message.get("content") or ""
+    return getattr(message, "role", None), getattr(message, "content", "") or ""
+
+
+def _replace_content(message: Any, content: str) -> Any:
+    if isinstance(message, dict):
+        return {**message, "content": content}
+    if isinstance(message, Message):
+        return message.model_copy(update={"content": content})
+    return Message(role=_get_role_and_content(message)[0], content=content)
+
+
+class WorkingMemoryCompactor:
+    """Keeps the per-step prompt within a budget derived from the context window."""
+
+    def __init__(
+        self,
+        config: CompactionConfig | None = None,
+        store: ObservationStore | None = None,
+    ):
+        self.config = config or CompactionConfig()
+        self.store = ObservationStore() if store is None else store
+        self.total_compactions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.enabled
+
+    def estimate_tokens(self, messages: list[Any]) -> int:
+        chars_per_token = self.config.chars_per_token
+        total = 0
+        for message in messages:
+            # ~4 tokens of per-message framing overhead
+            total += int(len(_get_role_and_content(message)[1]) / chars_per_token) + 4
+        return total
+
+    def resolve_context_window(self, llm_connection: Any = None) -> int:
+        if self.config.max_context_tokens:
+            return self.config.max_context_tokens
+        llm_config = getattr(llm_connection, "llm_config", None) or {}
+        return llm_config.get("max_context_length") or DEFAULT_CONTEXT_WINDOW
+
+    @staticmethod
+    def _is_observation(message: Any) -> bool:
+        role, content = _get_role_and_content(message)
+        if role == "tool":
+            return True
+        return role == "user" and (
+            content.startswith(OBSERVATION_PREFIX)
+            or content.startswith(COMPACTED_PREFIX)
+        )
+
+    def _truncate(self, content: str, store: ObservationStore) -> tuple[str, str]:
+        keep = self.config.max_observation_chars
+        ref_id = store.put(content)
+        return (
+            f"{COMPACTED_PREFIX} ref_id={ref_id}, showing first {keep} of "
+            f"{len(content)} chars; call expand_observation to read it all]\n"
+            f"{content[:keep]}",
+            ref_id,
+        )
+
+    def _stub(self, content: str, store: ObservationStore) -> tuple[str, str]:
+        match = None
+        if content.startswith(COMPACTED_PREFIX):
+            match = _REF_RE.search(content[:200])
+        if match and store.get(match.group(1)) is not None:
+            ref_id = match.group(1)
+            size = len(store.get(ref_id))
+        else:
+            ref_id = store.put(content)
+            size = len(content)
+        return (
+            f"{COMPACTED_PREFIX} ref_id={ref_id}, {size} chars omitted; "
+            "call expand_observation to read it]",
+            ref_id,
+        )
+
+    def compact(
+        self,
+        messages: list[Any],
+        llm_connection: Any = None,
+        store: ObservationStore | None = None,
+    ) -> tuple[list[Any], CompactionResult | None]:
+        """Return (messages, result); result is None when no compaction was needed.
+
+        Full payloads go to `store`, the session's own store, or the compactor's.
+        """
+        if not self.config.enabled:
+            return messages, None
+        store = self.store if store is None else store
+
+        context_window = self.resolve_context_window(llm_connection)
+        tokens_before = self.estimate_tokens(messages)
+        if tokens_before <= context_window * self.config.trigger_ratio:
+            return messages, None
+
+        target = context_window * self.config.target_ratio
+        observation_indexes = [
+            index
+            for index, message in enumerate(messages)
+            if index > 0 and self._is_observation(message)
+        ]
+        keep = self.config.keep_recent_observations
+        candidates = (
+            observation_indexes[: len(observation_indexes) - keep]
+            if keep
+            else observation_indexes
+        )
+
+        messages = list(messages)
+        tokens = tokens_before
+        compacted: set[int] = set()
+        references: list[str] = []
+
+        # oldest first: truncate large payloads, then collapse to reference stubs
+        for stage in (self._truncate, self._stub):
+            for index in candidates:
+                if tokens <= target:
+                    break
+                content = _get_role_and_content(messages[index])[1]
+                if stage is self._truncate and (
+                    content.startswith(COMPACTED_PREFIX)
+                    or len(content) <= self.config.max_observation_chars
+                ):
+                    continue
+                if (
+                    stage is self._stub
+                    and content.startswith(COMPACTED_PREFIX)
+                    and ("chars omitted" in content[:200])
+                ):
+                    continue
+                new_content, ref_id = stage(content, store)
+                if len(new_content) >= len(content):
+                    continue
+                messages[index] = _replace_content(messages[index], new_content)
+                tokens -= int(
+                    (len(content) - len(new_content)) / self.config.chars_per_token
+                )
+                compacted.add(index)
+                if ref_id not in references:
+                    references.append(ref_id)
+
+        if not compacted:
+            return messages, None
+
+        self.total_compactions += 1
+        return messages, CompactionResult(
+            tokens_before=tokens_before,
+            tokens_after=self.estimate_tokens(messages),
+            context_window=context_window,
+            compacted_messages=len(compacted),
+            references=references,
+        )
+
+
+def build_tool_registry_observation_tool(
+    registry: ToolRegistry, store: ObservationStore
+) -> ToolRegistry:
+    """Register the `expand_observation` tool used to read compacted observations."""
+
+    @registry.register_tool(
+        name="expand_observation",
+        description="""
+        Read the full content of a compacted tool observation.
+
+        Older tool outputs are compacted to save context space and replaced with
+        a note like "[compacted observation ref_id=obs_..., ...]". Call this tool
+        with that ref_id only when you need details that are no longer visible.
+        """,
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "ref_id": {
+                    "type": "string",
+                    "description": "The ref_id from the compacted observation note, e.g. 'obs_1a2b3c4d5e6f'.",
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Character offset to start reading from (default 0).",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of characters to return (default 8000).",
+                },
+            },
+            "required": ["ref_id"],
+            "additionalProperties": False,
+        },
+        execution_mode="inline",
+    )
+    def expand_observation(ref_id: str, offset: int = 0, limit: int = 8000) -> str:
+        content = store.get(ref_id.strip())
+        if content is None:
+            return f"No compacted observation found for ref_id '{ref_id}'."
+        offset, limit = int(offset), int(limit)
+        chunk = content[offset : offset + limit]
+        remaining = len(content) - (offset + len(chunk))
+        if remaining > 0:
+            chunk += f"\n[{remaining} more chars; call again with offset={offset + len(chunk)}]"
+        return chunk
+
+    return registry
+
+
+class ObservationToolRegistry(ToolRegistry):
+    """Per-run copy of a tool registry with `expand_observation` added.
+
+    Built before the system prompt is rendered, so the caller's registry is
+    never modified.
+    """
+
+    def __init__(self, base: ToolRegistry | None = None, *, store: ObservationStore):
+        super().__init__()
+        if base is not None:
+            self.tools.update(base.tools)
+            self.tool_descriptions.update(base.tool_descriptions)
+            self.tool_schemas.update(base.tool_schemas)
+        build_tool_registry_observation_tool(registry=self, store=store)
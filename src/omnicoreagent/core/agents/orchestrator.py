@@ -1,20 +1,23 @@
+import asyncio
+import uuid
 from collections.abc import Callable
 from typing import Any
 
 from omnicoreagent.core.agents.base import BaseReactAgent
 from omnicoreagent.core.agents.react_agent import ReactAgent
+from omnicoreagent.core.agents.response_parser import parse_agent_response
 from omnicoreagent.core.agents.token_usage import (
     Usage,
     UsageLimitExceeded,
-    session_stats,
-    usage,
+    UsageScope,
+    record_request_usage,
+    usage_ledger,
 )
 from omnicoreagent.core.agents.types import AgentConfig, ParsedResponse
 from omnicoreagent.core.constants import AGENTS_REGISTRY
 from omnicoreagent.core.system_prompts import generate_react_agent_prompt_template
 from omnicoreagent.core.utils import logger, track
 import json
-import re
 from omnicoreagent.core.events.base import (
     Event,
     EventType,
@@ -49,6 +52,7 @@ class OrchestratorAgent(BaseReactAgent):
         self.current_date_time = current_date_time
         self.orchestrator_messages = []
         self.max_steps = 20
+        self.max_parallel_agent_calls = config.max_parallel_agent_calls
         self.debug = debug
 
     @track("extract_action_or_answer")
@@ -69,53 +73,40 @@ class OrchestratorAgent(BaseReactAgent):
     ) -> ParsedResponse:
         """Parse LLM response to extract XML-formatted agent calls or final answers."""
         try:
+            parsed = parse_agent_response(response)
             # Check for XML-style agent call format
-            if "<agent_call>" in response and "</agent_call>" in response:
+            if parsed.agent_call_error:
+                return ParsedResponse(error=parsed.agent_call_error)
+            if parsed.agent_calls:
                 if debug:
                     logger.info(
                         "XML agent call format detected in response: %s", response
                     )
-                agent_name_match = re.search(
-                    r"<agent_name>(.*?)</agent_name>", response, re.DOTALL
-                )
-                task_match = re.search(r"<task>(.*?)</task>", response, re.DOTALL)
-                if agent_name_match and task_match:
-                    agent_name = agent_name_match.group(1).strip()
-                    task = task_match.group(1).strip()
+                # Validate agent exists in registry
+                agent_names = [name.lower() for name in self.agents_registry.keys()]
+                calls = []
+                for agent_call in parsed.agent_calls:
                     # strip away if Agent or agent is part of the agent name
                     agent_name = (
-                        agent_name.replace("Agent", "").replace("agent", "").strip()
+                        agent_call.agent_name.replace("Agent", "")
+                        .replace("agent", "")
+                        .strip()
                     )
-
-                    # Validate agent exists in registry
-                    agent_names = [name.lower() for name in self.agents_registry.keys()]
-                    if agent_name.lower() in agent_names:
-                        action_json = json.dumps(
-                            {"agent_name": agent_name, "task": task}
-                        )
-                        return ParsedResponse(action=True, data=action_json)
-                    else:
+                    if agent_name.lower() not in agent_names:
                         logger.warning("Agent not found: %s", agent_name)
                         return ParsedResponse(error=f"Agent {agent_name} not found")
-                else:
-                    return ParsedResponse(
-                        error="Invalid XML agent call format - missing agent_name or task"
-                    )
+                    calls.append({"agent_name": agent_name, "task": agent_call.task})
+                # a single call keeps the original object shape, a batch is a list
+                action_json = json.dumps(calls[0] if len(calls) == 1 else calls)
+                return ParsedResponse(action=True, data=action_json)
 
             # Check for XML-style final answer format
-            if "<final_answer>" in response and "</final_answer>" in response:
+            if parsed.final_answer is not None:
                 if debug:
                     logger.info(
                         "XML final answer format detected in response: %s", response
                     )
-                final_answer_match = re.search(
-                    r"<final_answer>(.*?)</final_answer>", response, re.DOTALL
-                )
-                if final_answer_match:
-                    answer = final_answer_match.group(1).strip()
-                    return ParsedResponse(answer=answer)
-                else:
-                    return ParsedResponse(error="Invalid XML final answer format")
+                return ParsedResponse(answer=parsed.final_answer)
 
             # If no XML tags found, treat as conversational response (likely final answer after agent observation)
             if debug:
@@ -187,8 +178,13 @@ class OrchestratorAgent(BaseReactAgent):
         total_tokens_limit: int,
         session_id: str,
         event_router: Callable[[str, Event], Any] = None,  # Event router callable
+        record_observation: bool = True,
     ) -> str:
-        """Execute agent and return JSON-formatted observation"""
+        """Execute agent and return JSON-formatted observation
+
+        With `record_observation=False` the caller is responsible for adding the
+        observation to the orchestrator messages and history (see `act_batch`).
+        """
         try:
 
             @track("agent_system_prompt_creation")
@@ -271,7 +267,8 @@ class OrchestratorAgent(BaseReactAgent):
                     metadata={"agent_name": agent_name},
                 )
 
-            await update_observation_messages()
+            if record_observation:
+                await update_observation_messages()
             return observation
         except Exception as e:
             logger.error("Error executing agent: %s", str(e))
@@ -288,6 +285,51 @@ class OrchestratorAgent(BaseReactAgent):
                 await event_router(session_id=session_id, event=event)
             return str(e)
 
+    @track("act_batch")
+    async def act_batch(
+        self,
+        agent_calls: list[dict[str, str]],
+        add_message_to_history: Callable[[str, str, dict | None], Any],
+        session_id: str,
+        **act_kwargs,
+    ) -> list[str]:
+        """Run independent agent calls concurrently and record one combined observation.
+
+        At most `max_parallel_agent_calls` agents run at a time. Calls to the
+        same agent run one after the other, in order: they write that agent's
+        history of the shared session, which concurrent runs would interleave.
+        """
+        semaphore = asyncio.Semaphore(self.max_parallel_agent_calls)
+        agent_locks = {call["agent_name"]: asyncio.Lock() for call in agent_calls}
+
+        async def run_call(call: dict[str, str]) -> str:
+            async with agent_locks[call["agent_name"]], semaphore:
+                return await self.act(
+                    agent_name=call["agent_name"],
+                    task=call["task"],
+                    add_message_to_history=add_message_to_history,
+                    session_id=session_id,
+                    record_observation=False,
+                    **act_kwargs,
+                )
+
+        observations = await asyncio.gather(*(run_call(call) for call in agent_calls))
+        observations = [str(observation) for observation in observations]
+        combined = "\n\n".join(
+            f"{call['agent_name']} Agent Observation:\n{observation}"
+            for call, observation in zip(agent_calls, observations)
+        )
+        self.orchestrator_messages.append({"role": "user", "content": combined})
+        await add_message_to_history(
+            role="user",
+            content=combined,
+            session_id=session_id,
+            metadata={
+                "agent_name": ", ".join(call["agent_name"] for call in agent_calls)
+            },
+        )
+        return observations
+
     @track("agent_registry_tool")
     async def agent_registry_tool(self, mcp_tools: dict[str, Any]) -> str:
         """
@@ -366,11 +408,17 @@ class OrchestratorAgent(BaseReactAgent):
             metadata={"agent_name": "orchestrator"},
         )
         await self.update_llm_working_memory(message_history, session_id)
+        usage_scope = UsageScope(
+            agent_name="orchestrator", session_id=session_id, run_id=uuid.uuid4().hex
+        )
+        limit_scope = UsageScope(agent_name="orchestrator", session_id=session_id)
         current_steps = 0
         while current_steps < self.max_steps:
             current_steps += 1
             if self._limits_enabled:
-                self.usage_limits.check_before_request(usage=usage)
+                self.usage_limits.check_before_request(
+                    usage=usage_ledger.usage_for(**limit_scope.as_dict())
+                )
             try:
                 if self.debug:
                     logger.info(
@@ -381,39 +429,27 @@ class OrchestratorAgent(BaseReactAgent):
                     # check if it has usage
                     if hasattr(response, "usage"):
                         request_usage = Usage(
-                            requests=current_steps,
+                            requests=1,
                             request_tokens=response.usage.prompt_tokens,
                             response_tokens=response.usage.completion_tokens,
                             total_tokens=response.usage.total_tokens,
                         )
-                        usage.incr(request_usage)
-                        # Check if we've exceeded token limits
-                        self.usage_limits.check_tokens(usage)
-                        # Show remaining resources
-                        remaining_tokens = self.usage_limits.remaining_tokens(usage)
-                        used_tokens = usage.total_tokens
-                        used_requests = usage.requests
-                        remaining_requests = self.request_limit - used_requests
-                        session_stats.update(
-                            {
-                                "used_requests": used_requests,
-                                "used_tokens": used_tokens,
-                                "remaining_requests": remaining_requests,
-                                "remaining_tokens": remaining_tokens,
-                                "request_tokens": request_usage.request_tokens,
-                                "response_tokens": request_usage.response_tokens,
-                                "total_tokens": request_usage.total_tokens,
-                            }
+                        stats = record_request_usage(
+                            ledger=usage_ledger,
+                            scope=usage_scope,
+                            usage_limits=self.usage_limits,
+                            incr_usage=request_usage,
+                            limit_scope=limit_scope,
                         )
                         if self.debug:
                             logger.info(
-                                f"API Call Stats - Requests: {used_requests}/{self.request_limit}, "
-                                f"Tokens: {used_tokens}/{self.usage_limits.total_tokens_limit}, "
+                                f"API Call Stats - Requests: {stats['used_requests']}/{self.request_limit}, "
+                                f"Tokens: {stats['used_tokens']}/{self.usage_limits.total_tokens_limit}, "
                                 f"Request Tokens: {request_usage.request_tokens}, "
                                 f"Response Tokens: {request_usage.response_tokens}, "
                                 f"Total Tokens: {request_usage.total_tokens}, "
-                                f"Remaining Requests: {remaining_requests}, "
-                                f"Remaining Tokens: {remaining_tokens}"
+                                f"Remaining Requests: {stats['remaining_requests']}, "
+                                f"Remaining Tokens: {stats['remaining_tokens']}"
                             )
                     if hasattr(response, "choices"):
                         response = response.choices[0].message.content.strip()
@@ -464,21 +500,22 @@ class OrchestratorAgent(BaseReactAgent):
             elif parsed_response.action is not None:
                 # Parse the action data from the XML response
                 action_data = json.loads(parsed_response.data)
-                # Emit agent call event
-                event = Event(
-                    type=EventType.AGENT_MESSAGE,
-                    payload=AgentMessagePayload(
-                        message=f"Dispatching to agent: {action_data['agent_name']} with task: {action_data['task']}"
-                    ),
-                    agent_name="orchestrator",
+                agent_calls = (
+                    action_data if isinstance(action_data, list) else [action_data]
                 )
-                if event_router:
-                    await event_router(session_id=session_id, event=event)
-                # Call the agent and emit observation event after
-                observation = await self.act(
+                # Emit agent call events
+                for call in agent_calls:
+                    event = Event(
+                        type=EventType.AGENT_MESSAGE,
+                        payload=AgentMessagePayload(
+                            message=f"Dispatching to agent: {call['agent_name']} with task: {call['task']}"
+                        ),
+                        agent_name="orchestrator",
+                    )
+                    if event_router:
+                        await event_router(session_id=session_id, event=event)
+                act_kwargs = dict(
                     sessions=sessions,
-                    agent_name=action_data["agent_name"],
-                    task=action_data["task"],
                     add_message_to_history=add_message_to_history,
                     llm_connection=llm_connection,
                     mcp_tools=mcp_tools,
@@ -490,22 +527,34 @@ class OrchestratorAgent(BaseReactAgent):
                     session_id=session_id,
                     event_router=event_router,  # Pass event_router callable
                 )
-                # Ensure observation is a string for event payload
-                if not isinstance(observation, str):
-                    observation = str(observation)
-                # Emit agent observation event
-                event = Event(
-                    type=EventType.TOOL_CALL_RESULT,
-                    payload=ToolCallResultPayload(
-                        tool_name=action_data["agent_name"],
-                        tool_args={"task": action_data["task"]},
-                        result=observation,
-                        tool_call_id=None,
-                    ),
-                    agent_name="orchestrator",
-                )
-                if event_router:
-                    await event_router(session_id=session_id, event=event)
+                # Call the agent(s) and emit observation events after
+                if len(agent_calls) == 1:
+                    observations = [
+                        await self.act(
+                            agent_name=agent_calls[0]["agent_name"],
+                            task=agent_calls[0]["task"],
+                            **act_kwargs,
+                        )
+                    ]
+                else:
+                    observations = await self.act_batch(agent_calls, **act_kwargs)
+                for call, observation in zip(agent_calls, observations):
+                    # Ensure observation is a string for event payload
+                    if not isinstance(observation, str):
+                        observation = str(observation)
+                    # Emit agent observation event
+                    event = Event(
+                        type=EventType.TOOL_CALL_RESULT,
+                        payload=ToolCallResultPayload(
+                            tool_name=call["agent_name"],
+                            tool_args={"task": call["task"]},
+                            result=observation,
+                            tool_call_id=None,
+                        ),
+                        agent_name="orchestrator",
+                    )
+                    if event_router:
+                        await event_router(session_id=session_id, event=event)
                 continue
             elif parsed_response.error is not None:
                 error_message = parsed_response.error
@@ -19,6 +19,7 @@ class ReactAgent(BaseReactAgent):
             tools_results_limit=config.tools_results_limit,
             tools_similarity_threshold=config.tools_similarity_threshold,
             memory_tool_backend=config.memory_tool_backend,
+            context_compaction=config.context_compaction,
         )
 
     async def _run(
@@ -0,0 +1,325 @@
+"""Single-pass parser for the XML response format used by the ReAct agents.
+
+The LLM responses are "XML-ish": tags such as <thought>, <tool_calls>,
+<tool_call>, <final_answer> and <agent_call> are mixed with free text, JSON
+and occasionally unbalanced markup. Instead of running a regex per tag over
+the whole response, the tokenizer walks the text once, builds a light element
+tree (keeping source offsets so raw inner text can be sliced out) and the
+typed `AgentResponse` is derived from that tree.
+
+`IncrementalResponseParser` accepts the response in chunks so a streaming
+consumer can react to completed elements (e.g. emit the thought as soon as
+</thought> arrives) without re-scanning the buffer.
+"""
+
+from __future__ import annotations as _annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+from omnicoreagent.core.agents.types import ParsedResponse
+
+_TAG_RE = re.compile(r"<(/?)([A-Za-z_][\w\-]*)\s*>")
+# A trailing fragment that could still become a tag once more text arrives.
+_PARTIAL_TAG_RE = re.compile(r"</?(?:[A-Za-z_][\w\-]*\s*)?$")
+
+TOOL_NAME_TAGS = ("tool_name", "name")
+TOOL_ARGS_TAGS = ("parameters", "args")
+
+
+@dataclass(slots=True)
+class Element:
+    """A tag in the response, with offsets into the source text."""
+
+    name: str
+    start: int
+    """Offset just after the opening tag."""
+    end: int | None = None
+    """Offset of the closing tag; None while the element is still open."""
+    closed: bool = False
+    """False if the element was never explicitly closed (malformed or truncated)."""
+    children: list[Element] = field(default_factory=list)
+    source: str = ""
+
+    @property
+    def raw(self) -> str:
+        """Raw inner text including any nested markup."""
+        end = self.end if self.end is not None else len(self.source)
+        return self.source[self.start : end]
+
+    @property
+    def text(self) -> str:
+        return self.raw.strip()
+
+    def child(self, *names: str) -> Element | None:
+        """First direct child matching any of names, in priority order."""
+        for name in names:
+            for element in self.children:
+                if element.name == name:
+                    return element
+        return None
+
+    def find(self, *names: str) -> Element | None:
+        """First descendant (document order) matching any of names, in priority order."""
+        for name in names:
+            for element in self.iter():
+                if element.name == name:
+                    return element
+        return None
+
+    def find_all(self, name: str) -> list[Element]:
+        return [element for element in self.iter() if element.name == name]
+
+    def iter(self) -> Iterator[Element]:
+        for element in self.children:
+            yield element
+            yield from element.iter()
+
+
+@dataclass(slots=True)
+class ParsedToolCall:
+    name: str
+    parameters: dict[str, Any]
+
+
+@dataclass(slots=True)
+class ParsedAgentCall:
+    agent_name: str
+    task: str
+
+
+@dataclass(slots=True)
+class AgentResponse:
+    """Typed view of an LLM response."""
+
+    thought: str | None = None
+    tool_calls: list[ParsedToolCall] = field(default_factory=list)
+    agent_calls: list[ParsedAgentCall] = field(default_factory=list)
+    final_answer: str | None = None
+    error: str | None = None
+    """Malformed tool call, if any."""
+    agent_call_error: str | None = None
+    """Malformed agent call, if any."""
+    has_tags: bool = False
+
+
+class IncrementalResponseParser:
+    """Incremental tag tokenizer and tree builder.
+
+    Call `feed` with successive chunks and `close` once the response is
+    complete. `feed` returns the elements that were closed by that chunk.
+    """
+
+    def __init__(self):
+        self.root = Element(name="#root", start=0)
+        self._stack: list[Element] = [self.root]
+        self._text = ""
+        self._scan_pos = 0
+        self.has_tags = False
+        self.index: dict[str, list[Element]] = {}
+        """Elements by tag name, in document order."""
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def feed(self, chunk: str, final: bool = False) -> list[Element]:
+        """Tokenize a chunk; pass final=True when no more text will follow."""
+        if not chunk:
+            return []
+        text = self._text = self._text + chunk
+        self.root.source = text
+        stack = self._stack
+        index = self.index
+        completed = []
+        pos = self._scan_pos
+        for match in _TAG_RE.finditer(text, pos):
+            is_close, name = match.groups()
+            pos = match.end()
+            if not is_close:
+                element = Element(name, pos, source=text)
+                stack[-1].children.append(element)
+                stack.append(element)
+                if name in index:
+                    index[name].append(element)
+                else:
+                    index[name] = [element]
+                continue
+            # close the nearest matching open element, implicitly closing any
+            # unbalanced elements opened after it; stray closing tags are ignored
+            for depth in range(len(stack) - 1, 0, -1):
+                if stack[depth].name == name:
+                    close_at = match.start()
+                    while len(stack) > depth:
+                        element = stack.pop()
+                        element.end = close_at
+                        element.source = text
+                        completed.append(element)
+                    element.closed = True
+                    break
+        self.has_tags = bool(index)
+        if final:
+            self._scan_pos = len(text)
+            return completed
+        # hold back a possible partial tag at the end of the buffer
+        partial = _PARTIAL_TAG_RE.search(text, pos)
+        self._scan_pos = partial.start() if partial else len(text)
+        return completed
+
+    def first(self, *names: str) -> Element | None:
+        """First element in the document matching any of names, in priority order."""
+        for name in names:
+            elements = self.index.get(name)
+            if elements:
+                return elements[0]
+        return None
+
+    def close(self) -> Element:
+        """Finish parsing; unclosed elements end at the end of the text."""
+        while len(self._stack) > 1:
+            element = self._stack.pop()
+            element.end = len(self._text)
+            element.source = self._text
+        return self.root
+
+
+def parse_tree(response: str) -> IncrementalResponseParser:
+    """Parse a complete response into an element tree in a single pass."""
+    parser = IncrementalResponseParser()
+    parser.feed(response, final=True)
+    parser.close()
+    return parser
+
+
+def _parse_tool_args(args_element: Element) -> dict[str, Any]:
+    args_str = args_element.text
+    if args_str.startswith("{") and args_str.endswith("}"):
+        return json.loads(args_str)
+    args = {}
+    for child in args_element.children:
+        if not child.closed:
+            continue
+        value = child.text
+        if (value.startswith("[") and value.endswith("]")) or (
+            value.startswith("{") and value.endswith("}")
+        ):
+            try:
+                args[child.name] = json.loads(value)
+            except json.JSONDecodeError:
+                args[child.name] = value
+        else:
+            args[child.name] = value
+    return args
+
+
+def _first_closed(elements: list[Element]) -> Element | None:
+    return next((element for element in elements if element.closed), None)
+
+
+def _find_closed(block: Element, *names: str) -> Element | None:
+    """First closed descendant matching any of names, in priority order."""
+    for name in names:
+        element = _first_closed(block.find_all(name))
+        if element is not None:
+            return element
+    return None
+
+
+def parse_agent_response(response: str) -> AgentResponse:
+    """Parse a ReAct response into thought, tool calls, agent calls and final answer.
+
+    Only explicitly closed elements are used, so a truncated tool call is
+    rejected rather than run with partial arguments.
+    """
+    tree = parse_tree(response)
+    result = AgentResponse(has_tags=tree.has_tags)
+    if not tree.has_tags:
+        return result
+
+    thought = _first_closed(tree.index.get("thought", []))
+    if thought is not None:
+        result.thought = thought.text
+
+    # tool and agent calls quoted in the thought or the answer are not calls
+    quoted = {
+        id(element)
+        for tag in ("thought", "final_answer")
+        for outer in tree.index.get(tag, [])
+        if outer.closed
+        for element in outer.iter()
+    }
+    container = _first_closed(
+        [e for e in tree.index.get("tool_calls", []) if id(e) not in quoted]
+    )
+    if container is not None:
+        blocks = [e for e in container.find_all("tool_call") if e.closed]
+    else:
+        block = _first_closed(
+            [e for e in tree.index.get("tool_call", []) if id(e) not in quoted]
+        )
+        blocks = [block] if block is not None else []
+
+    for block in blocks:
+        name_element = _find_closed(block, *TOOL_NAME_TAGS)
+        args_element = _find_closed(block, *TOOL_ARGS_TAGS)
+        if name_element is None or args_element is None:
+            result.error = "Invalid tool call format - missing name or parameters"
+            result.tool_calls = []
+            break
+        try:
+            parameters = _parse_tool_args(args_element)
+        except json.JSONDecodeError as e:
+            result.error = f"Invalid JSON in args: {str(e)}"
+            result.tool_calls = []
+            break
+        result.tool_calls.append(
+            ParsedToolCall(name=name_element.text, parameters=parameters)
+        )
+
+    agent_blocks = [
+        e for e in tree.index.get("agent_call", []) if e.closed and id(e) not in quoted
+    ]
+    for block in agent_blocks:
+        agent_name = _find_closed(block, "agent_name")
+        task = _find_closed(block, "task")
+        if agent_name is None or task is None:
+            result.agent_call_error = (
+                "Invalid XML agent call format - missing agent_name or task"
+            )
+            result.agent_calls = []
+            break
+        result.agent_calls.append(
+            ParsedAgentCall(agent_name=agent_name.text, task=task.text)
+        )
+
+    final_answer = _first_closed(tree.index.get("final_answer", []))
+    if final_answer is not None:
+        result.final_answer = final_answer.text
+    return result
+
+
+def to_tool_parsed_response(parsed: AgentResponse) -> ParsedResponse:
+    """Map a parsed response onto the ReAct agent's ParsedResponse contract."""
+    if parsed.error:
+        return ParsedResponse(error=parsed.error)
+    if parsed.tool_calls:
+        return ParsedResponse(
+            action=True,
+            data=json.dumps(
+                [
+                    {"tool": call.name, "parameters": call.parameters}
+                    for call in parsed.tool_calls
+                ]
+            ),
+        )
+    if parsed.final_answer is not None:
+        return ParsedResponse(answer=parsed.final_answer)
+    if parsed.has_tags:
+        return ParsedResponse(
+            error="Response contains XML tags but not in the required format. You MUST use <thought> and <final_answer> tags for all responses."
+        )
+    return ParsedResponse(
+        error="Response must use XML format. You MUST wrap your response in <thought> and <final_answer> tags. Example: <thought>Your reasoning here</thought><final_answer>Your answer here</final_answer>"
+    )
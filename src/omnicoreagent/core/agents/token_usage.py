@@ -1,7 +1,13 @@
 from __future__ import annotations as _annotations
 
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Callable
 from copy import copy
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from omnicoreagent.core.utils import logger
 
 
 class UsageLimitExceeded(Exception):
@@ -217,7 +223,213 @@ class UsageLimits:
             )
 
 
-# to store the api stats
+@dataclass(frozen=True)
+class UsageScope:
+    """Key of a usage ledger entry.
+
+    A run belongs to one session of one agent; `None` fields act as wildcards when
+    querying the ledger.
+    """
+
+    agent_name: str | None = None
+    session_id: str | None = None
+    run_id: str | None = None
+
+    def matches(self, other: UsageScope) -> bool:
+        """Returns `True` if `other` falls inside this (possibly partial) scope."""
+        return all(
+            value is None or value == getattr(other, name)
+            for name, value in (
+                ("agent_name", self.agent_name),
+                ("session_id", self.session_id),
+                ("run_id", self.run_id),
+            )
+        )
+
+    def as_dict(self) -> dict[str, str | None]:
+        return {
+            "agent_name": self.agent_name,
+            "session_id": self.session_id,
+            "run_id": self.run_id,
+        }
+
+
+UsageExporter = Callable[[UsageScope, Usage], None]
+
+_ROLLUP_FIELDS = {"agent": "agent_name", "session": "session_id", "run": "run_id"}
+
+
+class UsageLedger:
+    """Usage accounting scoped by (agent, session, run).
+
+    `record` only appends to a deque, which is atomic in CPython, so agents and
+    worker threads never contend on a lock when reporting usage. Pending records
+    are folded into per-scope totals when the ledger is read. Rollups are derived
+    from the per-run totals, so limits can be enforced for any agent, session or
+    run without one scope's traffic counting against another. Per-(agent, session)
+    totals are also kept as records are folded in, so the limit check an agent
+    makes before every request does not scan the runs.
+    """
+
+    def __init__(self, max_scopes: int = 10000):
+        self.max_scopes = max_scopes
+        """Maximum number of run scopes kept; the oldest runs are evicted first."""
+        self._pending: deque[tuple[UsageScope, Usage]] = deque()
+        self._totals: OrderedDict[UsageScope, Usage] = OrderedDict()
+        self._sessions: dict[tuple[str | None, str | None], Usage] = {}
+        self._session_runs: dict[tuple[str | None, str | None], int] = {}
+        self._drain_lock = threading.Lock()
+        self._exporters: list[UsageExporter] = []
+
+    def record(self, scope: UsageScope, incr_usage: Usage) -> None:
+        """Record usage for a scope and forward it to the registered exporters."""
+        self._pending.append((scope, incr_usage))
+        for exporter in self._exporters:
+            try:
+                exporter(scope, incr_usage)
+            except Exception as e:
+                logger.warning(f"Usage exporter {exporter!r} failed: {e}")
+
+    def add_exporter(self, exporter: UsageExporter) -> None:
+        """Register a callback invoked with `(scope, usage)` for every recorded request."""
+        self._exporters.append(exporter)
+
+    def remove_exporter(self, exporter: UsageExporter) -> None:
+        if exporter in self._exporters:
+            self._exporters.remove(exporter)
+
+    def _drain(self) -> None:
+        if not self._pending:
+            return
+        with self._drain_lock:
+            while self._pending:
+                scope, incr_usage = self._pending.popleft()
+                key = (scope.agent_name, scope.session_id)
+                total = self._totals.get(scope)
+                if total is None:
+                    total = self._totals[scope] = Usage()
+                    self._session_runs[key] = self._session_runs.get(key, 0) + 1
+                    self._sessions.setdefault(key, Usage())
+                total.incr(incr_usage)
+                self._sessions[key].incr(incr_usage)
+            while len(self._totals) > self.max_scopes:
+                self._forget(*self._totals.popitem(last=False))
+
+    def _forget(self, scope: UsageScope, scope_usage: Usage) -> None:
+        """Take a dropped run out of its session total; call with `_drain_lock` held."""
+        key = (scope.agent_name, scope.session_id)
+        self._session_runs[key] -= 1
+        if not self._session_runs[key]:
+            del self._session_runs[key]
+            del self._sessions[key]
+            return
+        session = self._sessions[key]
+        session.requests -= scope_usage.requests
+        for name in ("request_tokens", "response_tokens", "total_tokens"):
+            value = getattr(scope_usage, name)
+            if value is not None:
+                setattr(session, name, (getattr(session, name) or 0) - value)
+        for name, value in scope_usage.details.items():
+            session.details[name] = session.details.get(name, 0) - value
+
+    def usage_for(
+        self,
+        agent_name: str | None = None,
+        session_id: str | None = None,
+        run_id: str | None = None,
+    ) -> Usage:
+        """Sum the usage of every run inside the given scope (`None` matches anything)."""
+        self._drain()
+        query = UsageScope(agent_name, session_id, run_id)
+        total = Usage()
+        if agent_name is not None and session_id is not None:
+            if run_id is None:
+                scope_usage = self._sessions.get((agent_name, session_id))
+            else:
+                scope_usage = self._totals.get(query)
+            if scope_usage is not None:
+                total.incr(scope_usage)
+            return total
+        for scope, scope_usage in list(self._totals.items()):
+            if query.matches(scope):
+                total.incr(scope_usage)
+        return total
+
+    def rollup(
+        self, by: str = "agent", **filters: str | None
+    ) -> dict[str | None, Usage]:
+        """Aggregate usage per agent, session or run.
+
+        Args:
+            by: One of `"agent"`, `"session"` or `"run"`.
+            filters: Optional `agent_name`, `session_id` or `run_id` to narrow the rollup.
+        """
+        if by not in _ROLLUP_FIELDS:
+            raise ValueError(f"by must be one of {sorted(_ROLLUP_FIELDS)}, got {by!r}")
+        self._drain()
+        query = UsageScope(**filters)
+        result: dict[str | None, Usage] = {}
+        for scope, scope_usage in list(self._totals.items()):
+            if query.matches(scope):
+                key = getattr(scope, _ROLLUP_FIELDS[by])
+                result.setdefault(key, Usage()).incr(scope_usage)
+        return result
+
+    def export(self) -> list[dict[str, Any]]:
+        """Snapshot of every run scope, suitable for JSON serialization."""
+        self._drain()
+        return [
+            {**scope.as_dict(), **asdict(scope_usage)}
+            for scope, scope_usage in list(self._totals.items())
+        ]
+
+    def reset(self, **filters: str | None) -> None:
+        """Forget the usage of every run inside the given scope (everything by default)."""
+        self._drain()
+        query = UsageScope(**filters)
+        with self._drain_lock:
+            for scope in [scope for scope in self._totals if query.matches(scope)]:
+                self._forget(scope, self._totals.pop(scope))
+
+
+def record_request_usage(
+    ledger: UsageLedger,
+    scope: UsageScope,
+    usage_limits: UsageLimits | None,
+    incr_usage: Usage,
+    limit_scope: UsageScope | None = None,
+) -> dict[str, Any]:
+    """Record one LLM request and enforce limits against `limit_scope`.
+
+    Updates `session_stats` with the usage of `limit_scope` (defaults to `scope`)
+    and returns it. Raises `UsageLimitExceeded` if a token limit is exceeded.
+    """
+    ledger.record(scope, incr_usage)
+    limit_scope = limit_scope or scope
+    scoped_usage = ledger.usage_for(**limit_scope.as_dict())
+    stats = {
+        "used_requests": scoped_usage.requests,
+        "used_tokens": scoped_usage.total_tokens,
+        "remaining_requests": 0,
+        "remaining_tokens": 0,
+        "request_tokens": incr_usage.request_tokens,
+        "response_tokens": incr_usage.response_tokens,
+        "total_tokens": incr_usage.total_tokens,
+    }
+    if usage_limits is not None:
+        if usage_limits.request_limit:
+            stats["remaining_requests"] = (
+                usage_limits.request_limit - scoped_usage.requests
+            )
+        if usage_limits.total_tokens_limit:
+            stats["remaining_tokens"] = usage_limits.remaining_tokens(scoped_usage)
+    session_stats.update(stats)
+    if usage_limits is not None:
+        usage_limits.check_tokens(scoped_usage)
+    return stats
+
+
+# stats of the most recent request, shown by the CLI `/api_stats` command
 session_stats = {
     "used_requests": 0,
     "used_tokens": 0,
@@ -227,4 +439,4 @@ session_stats = {
     "response_tokens": 0,
     "total_tokens": 0,
 }
-usage = Usage()
+usage_ledger = UsageLedger()
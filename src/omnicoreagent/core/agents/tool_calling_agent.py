@@ -1,4 +1,5 @@
 import json
+import uuid
 from collections.abc import Callable
 from typing import Any
 
@@ -6,8 +7,9 @@ from omnicoreagent.core.agents.token_usage import (
     Usage,
     UsageLimitExceeded,
     UsageLimits,
-    session_stats,
-    usage,
+    UsageScope,
+    record_request_usage,
+    usage_ledger,
 )
 from omnicoreagent.core.agents.types import AgentConfig
 from omnicoreagent.core.events.base import (
@@ -19,6 +21,8 @@ from omnicoreagent.core.events.base import (
     UserMessagePayload,
     ToolCallErrorPayload,
 )
+from omnicoreagent.core.run_timing import timed
+from omnicoreagent.core.tools.tools_handler import MCPToolHandler
 from omnicoreagent.core.utils import logger, track
 
 
@@ -182,9 +186,10 @@ class ToolCallingAgent:
                     ]
 
                     if tool_name in tool_names:
-                        result = await sessions[server_name]["session"].call_tool(
-                            tool_name, tool_args
-                        )
+                        with timed("tool"):
+                            result = await MCPToolHandler(
+                                sessions=sessions, server_name=server_name
+                            ).call(tool_name, tool_args)
                         tool_content = (
                             result.content
                             if hasattr(result, "content")
@@ -298,6 +303,10 @@ class ToolCallingAgent:
         available_tools = available_tools
 
         current_steps = 0
+        usage_scope = UsageScope(
+            agent_name=self.agent_name, session_id=session_id, run_id=uuid.uuid4().hex
+        )
+        limit_scope = UsageScope(agent_name=self.agent_name, session_id=session_id)
         # Initialize messages with system prompt
         self.messages = [{"role": "system", "content": system_prompt}]
 
@@ -331,7 +340,9 @@ class ToolCallingAgent:
         try:
             # Initial LLM API call
             current_steps += 1
-            self.usage_limits.check_before_request(usage=usage)
+            self.usage_limits.check_before_request(
+                usage=usage_ledger.usage_for(**limit_scope.as_dict())
+            )
             response = await llm_connection.llm_call(
                 messages=self.messages, tools=all_available_tools
             )
@@ -339,39 +350,27 @@ class ToolCallingAgent:
                 # check if it has usage
                 if hasattr(response, "usage"):
                     request_usage = Usage(
-                        requests=current_steps,
+                        requests=1,
                         request_tokens=response.usage.prompt_tokens,
                         response_tokens=response.usage.completion_tokens,
                         total_tokens=response.usage.total_tokens,
                     )
-                    usage.incr(request_usage)
-                    # Check if we've exceeded token limits
-                    self.usage_limits.check_tokens(usage)
-                    # Show remaining resources
-                    remaining_tokens = self.usage_limits.remaining_tokens(usage)
-                    used_tokens = usage.total_tokens
-                    used_requests = usage.requests
-                    remaining_requests = self.request_limit - used_requests
-                    session_stats.update(
-                        {
-                            "used_requests": used_requests,
-                            "used_tokens": used_tokens,
-                            "remaining_requests": remaining_requests,
-                            "remaining_tokens": remaining_tokens,
-                            "request_tokens": request_usage.request_tokens,
-                            "response_tokens": request_usage.response_tokens,
-                            "total_tokens": request_usage.total_tokens,
-                        }
+                    stats = record_request_usage(
+                        ledger=usage_ledger,
+                        scope=usage_scope,
+                        usage_limits=self.usage_limits,
+                        incr_usage=request_usage,
+                        limit_scope=limit_scope,
                     )
                     if self.debug:
                         logger.info(
-                            f"API Call Stats - Requests: {used_requests}/{self.request_limit}, "
-                            f"Tokens: {used_tokens}/{self.usage_limits.total_tokens_limit}, "
+                            f"API Call Stats - Requests: {stats['used_requests']}/{self.request_limit}, "
+                            f"Tokens: {stats['used_tokens']}/{self.usage_limits.total_tokens_limit}, "
                             f"Request Tokens: {request_usage.request_tokens}, "
                             f"Response Tokens: {request_usage.response_tokens}, "
                             f"Total Tokens: {request_usage.total_tokens}, "
-                            f"Remaining Requests: {remaining_requests}, "
-                            f"Remaining Tokens: {remaining_tokens}"
+                            f"Remaining Requests: {stats['remaining_requests']}, "
+                            f"Remaining Tokens: {stats['remaining_tokens']}"
                         )
         except UsageLimitExceeded as e:
             error_message = f"Usage limit error: {e}"
@@ -463,39 +462,27 @@ class ToolCallingAgent:
                     # check if it has usage
                     if hasattr(second_response, "usage"):
                         request_usage = Usage(
-                            requests=current_steps,
+                            requests=1,
                             request_tokens=second_response.usage.prompt_tokens,
                             response_tokens=second_response.usage.completion_tokens,
                             total_tokens=second_response.usage.total_tokens,
                         )
-                        usage.incr(request_usage)
-                        # Check if we've exceeded token limits
-                        self.usage_limits.check_tokens(usage)
-                        # Show remaining resources
-                        remaining_tokens = self.usage_limits.remaining_tokens(usage)
-                        used_tokens = usage.total_tokens
-                        used_requests = usage.requests
-                        remaining_requests = self.request_limit - used_requests
-                        session_stats.update(
-                            {
-                                "used_requests": used_requests,
-                                "used_tokens": used_tokens,
-                                "remaining_requests": remaining_requests,
-                                "remaining_tokens": remaining_tokens,
-                                "request_tokens": request_usage.request_tokens,
-                                "response_tokens": request_usage.response_tokens,
-                                "total_tokens": request_usage.total_tokens,
-                            }
+                        stats = record_request_usage(
+                            ledger=usage_ledger,
+                            scope=usage_scope,
+                            usage_limits=self.usage_limits,
+                            incr_usage=request_usage,
+                            limit_scope=limit_scope,
                         )
                         if self.debug:
                             logger.info(
-                                f"API Call Stats - Requests: {used_requests}/{self.request_limit}, "
-                                f"Tokens: {used_tokens}/{self.usage_limits.total_tokens_limit}, "
+                                f"API Call Stats - Requests: {stats['used_requests']}/{self.request_limit}, "
+                                f"Tokens: {stats['used_tokens']}/{self.usage_limits.total_tokens_limit}, "
                                 f"Request Tokens: {request_usage.request_tokens}, "
                                 f"Response Tokens: {request_usage.response_tokens}, "
                                 f"Total Tokens: {request_usage.total_tokens}, "
-                                f"Remaining Requests: {remaining_requests}, "
-                                f"Remaining Tokens: {remaining_tokens}"
+                                f"Remaining Requests: {stats['remaining_requests']}, "
+                                f"Remaining Tokens: {stats['remaining_tokens']}"
                             )
 
                     if hasattr(second_response, "choices"):
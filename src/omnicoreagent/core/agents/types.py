@@ -44,6 +44,20 @@ class AgentConfig(BaseModel):
         description="Similarity threshold for tool retrieval",
     )
 
+    # --- Orchestration ---
+    max_parallel_agent_calls: int = Field(
+        default=4,
+        ge=1,
+        le=64,
+        description="Max agent calls of one orchestrator step that run concurrently",
+    )
+
+    # --- Working Memory Compaction ---
+    context_compaction: dict = Field(
+        default_factory=dict,
+        description="Overrides for in-loop context compaction, e.g. {'trigger_ratio': 0.8}",
+    )
+
     # --- Memory Tool Backend ---
     memory_tool_backend: str | None = Field(
         default=None,
@@ -165,3 +179,4 @@ class SessionState(BaseModel):
     loop_detector: Any  # RobustLoopDetector instance
     assistant_with_tool_calls: dict | None
     pending_tool_responses: list[dict]
+    observations: Any = None  # ObservationStore of compacted payloads
@@ -459,9 +459,16 @@ class DatabaseMessageStore:
                 .first()
             )
             if existing:
-                logger.debug(
-                    f"Tool {tool_name} already stored for {mcp_server_name}, skipping insert"
-                )
+                if existing.raw_tool == raw_tool:
+                    logger.debug(
+                        f"Tool {tool_name} already stored for {mcp_server_name}, skipping insert"
+                    )
+                    return
+                # the server changed the tool: replace its stored enrichment
+                existing.raw_tool = raw_tool
+                existing.enriched_tool = enriched_tool
+                session.commit()
+                logger.debug(f"Updated tool {tool_name} for server {mcp_server_name}")
                 return
 
             tool = StoredTool(
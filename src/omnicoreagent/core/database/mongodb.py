@@ -238,11 +238,20 @@ class MongoDb(AbstractMemoryStore):
     ) -> None:
         try:
             await self._ensure_connected()
-            if await self.tool_exists(tool_name, mcp_server_name):
+            existing = await self.tool_exists(tool_name, mcp_server_name)
+            if existing and existing.get("raw_tool") == raw_tool:
                 logger.debug(
                     f"Tool {tool_name} already stored for {mcp_server_name}, skipping insert"
                 )
                 return
+            if existing:
+                # the server changed the tool: replace its stored enrichment
+                await self.stored_tools_collection.update_one(
+                    {"tool_name": tool_name, "mcp_server_name": mcp_server_name},
+                    {"$set": {"raw_tool": raw_tool, "enriched_tool": enriched_tool}},
+                )
+                logger.debug(f"Updated tool {tool_name} for server {mcp_server_name}")
+                return
 
             doc = {
                 "tool_name": tool_name,
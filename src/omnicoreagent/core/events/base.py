@@ -1,10 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import AsyncIterator, Any, Dict, List, Optional, Union
+from typing import AsyncIterator, Any, Dict, List, Optional, Tuple, Union
 from enum import Enum
 from datetime import datetime
 from uuid import uuid4
 from typing import Type
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class EventType(str, Enum):
@@ -15,6 +15,7 @@ class EventType(str, Enum):
     TOOL_CALL_ERROR = "tool_call_error"
     FINAL_ANSWER = "final_answer"
     AGENT_THOUGHT = "agent_thought"
+    CONTEXT_COMPACTED = "context_compacted"
     # Background agent events
     BACKGROUND_TASK_STARTED = "background_task_started"
     BACKGROUND_TASK_COMPLETED = "background_task_completed"
@@ -56,6 +57,14 @@ class AgentThoughtPayload(BaseModel):
     message: str
 
 
+class ContextCompactedPayload(BaseModel):
+    tokens_before: int
+    tokens_after: int
+    context_window: int
+    compacted_messages: int
+    references: List[str] = []
+
+
 # Background agent payload models
 class BackgroundTaskStartedPayload(BaseModel):
     agent_id: str
@@ -100,6 +109,7 @@ EventPayload = Union[
     ToolCallErrorPayload,
     FinalAnswerPayload,
     AgentThoughtPayload,
+    ContextCompactedPayload,
     BackgroundTaskStartedPayload,
     BackgroundTaskCompletedPayload,
     BackgroundTaskErrorPayload,
@@ -114,6 +124,26 @@ class Event(BaseModel):
     agent_name: str
     event_id: str = Field(default_factory=lambda: str(uuid4()))
 
+    @model_validator(mode="before")
+    @classmethod
+    def _payload_from_type(cls, data: Any) -> Any:
+        """Use `type` as the payload discriminator.
+
+        Several payload models share the same shape (e.g. `message: str`), so
+        trying the union members in turn can pick the wrong one. The payload
+        model is looked up from EVENT_PAYLOAD_MAP instead.
+        """
+        if isinstance(data, dict):
+            payload = data.get("payload")
+            event_type = data.get("type")
+            if isinstance(payload, dict) and event_type is not None:
+                try:
+                    model = EVENT_PAYLOAD_MAP[EventType(event_type)]
+                except (KeyError, ValueError):
+                    return data
+                data = {**data, "payload": model.model_validate(payload)}
+        return data
+
 
 EVENT_PAYLOAD_MAP: dict[EventType, Type[BaseModel]] = {
     EventType.USER_MESSAGE: UserMessagePayload,
@@ -123,6 +153,7 @@ EVENT_PAYLOAD_MAP: dict[EventType, Type[BaseModel]] = {
     EventType.TOOL_CALL_ERROR: ToolCallErrorPayload,
     EventType.FINAL_ANSWER: FinalAnswerPayload,
     EventType.AGENT_THOUGHT: AgentThoughtPayload,
+    EventType.CONTEXT_COMPACTED: ContextCompactedPayload,
     EventType.BACKGROUND_TASK_STARTED: BackgroundTaskStartedPayload,
     EventType.BACKGROUND_TASK_COMPLETED: BackgroundTaskCompletedPayload,
     EventType.BACKGROUND_TASK_ERROR: BackgroundTaskErrorPayload,
@@ -144,6 +175,11 @@ class BaseEventStore(ABC):
         validate_event(event)
         raise NotImplementedError("Subclasses must implement this method")
 
+    async def append_batch(self, events: List[Tuple[str, Event]]) -> None:
+        """Append `(session_id, event)` pairs in order; stores may override to batch I/O."""
+        for session_id, event in events:
+            await self.append(session_id=session_id, event=event)
+
     @abstractmethod
     async def get_events(self, session_id: str) -> List[Event]:
         raise NotImplementedError("Subclasses must implement this method")
@@ -0,0 +1,110 @@
+"""
+Event serialization for event stores.
+
+Events are encoded as compact JSON (orjson when it is installed, the standard
+library otherwise) and decoded straight into the payload model named by the
+event `type`. Payload strings larger than the inline limit, typically tool
+results, can be moved out of the event body into separate blobs and replaced
+by a `{"__ref__": key, "size": n}` marker; the store keeps the blobs next to
+the event and hands them back on decode.
+"""
+
+import json
+from typing import Any, Dict, Optional, Tuple
+
+from decouple import config
+
+from omnicoreagent.core.events.base import Event
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+EVENT_PAYLOAD_INLINE_LIMIT = config(
+    "EVENT_PAYLOAD_INLINE_LIMIT", default=16384, cast=int
+)
+REF_KEY = "__ref__"
+
+
+def dumps(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def event_to_dict(event: Event) -> Dict[str, Any]:
+    return event.model_dump(mode="json")
+
+
+def split_large_fields(
+    data: Dict[str, Any], inline_limit: Optional[int] = None
+) -> Dict[str, str]:
+    """Move payload strings longer than `inline_limit` out of `data` (in place).
+
+    Returns the blobs keyed by reference; the payload keeps a ref marker.
+    """
+    inline_limit = EVENT_PAYLOAD_INLINE_LIMIT if inline_limit is None else inline_limit
+    payload = data.get("payload")
+    if inline_limit <= 0 or not isinstance(payload, dict):
+        return {}
+    blobs: Dict[str, str] = {}
+    for field_name, value in payload.items():
+        if isinstance(value, str) and len(value) > inline_limit:
+            key = f"{data['event_id']}:{field_name}"
+            blobs[key] = value
+            payload[field_name] = {REF_KEY: key, "size": len(value)}
+    return blobs
+
+
+def find_refs(data: Dict[str, Any]) -> list[str]:
+    payload = data.get("payload")
+    if not isinstance(payload, dict):
+        return []
+    return [
+        value[REF_KEY]
+        for value in payload.values()
+        if isinstance(value, dict) and REF_KEY in value
+    ]
+
+
+def inline_blobs(data: Dict[str, Any], blobs: Dict[str, Optional[str]]) -> None:
+    """Replace ref markers in `data` with their blobs (in place)."""
+    payload = data.get("payload")
+    if not isinstance(payload, dict):
+        return
+    for field_name, value in payload.items():
+        if isinstance(value, dict) and REF_KEY in value:
+            blob = blobs.get(value[REF_KEY])
+            payload[field_name] = (
+                blob
+                if blob is not None
+                else f"[payload no longer available: {value['size']} chars]"
+            )
+
+
+def encode_event(
+    event: Event, inline_limit: Optional[int] = None
+) -> Tuple[bytes, Dict[str, str]]:
+    """Encode an event, returning the body and any out-of-line blobs."""
+    data = event_to_dict(event)
+    blobs = split_large_fields(data, inline_limit)
+    return dumps(data), blobs
+
+
+def decode_event_data(
+    data: Dict[str, Any], blobs: Optional[Dict[str, Optional[str]]] = None
+) -> Event:
+    inline_blobs(data, blobs or {})
+    return Event.model_validate(data)
+
+
+def decode_event(body: bytes | str, blobs: Optional[Dict[str, str]] = None) -> Event:
+    """Decode an event body produced by `encode_event` (or plain `Event` JSON)."""
+    return decode_event_data(loads(body), blobs)
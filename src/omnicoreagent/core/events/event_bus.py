@@ -0,0 +1,156 @@
+"""
+Asynchronous event publishing.
+
+Agents emit an event for every thought, message, tool call and answer. The
+`EventPublisher` takes those events off the agent's critical path: `publish`
+only enqueues into a bounded local queue, and a single background task drains
+the queue in batches into the event store (pipelined `XADD`s for Redis). One
+FIFO queue and one writer keep events in order within each session.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from omnicoreagent.core.events.base import BaseEventStore, Event
+from omnicoreagent.core.utils import logger
+
+OVERFLOW_POLICIES = ("block", "drop_newest", "drop_oldest")
+
+
+class EventPublisher:
+    """Bounded queue plus background task that batches events into an event store."""
+
+    def __init__(
+        self,
+        event_store: BaseEventStore,
+        queue_size: int = 10000,
+        batch_size: int = 100,
+        overflow_policy: str = "block",
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy '{overflow_policy}'. "
+                f"Options: {', '.join(OVERFLOW_POLICIES)}"
+            )
+        self.event_store = event_store
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.overflow_policy = overflow_policy
+        self._queue: asyncio.Queue[Tuple[str, Event]] = asyncio.Queue(queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._metrics = {
+            "enqueued": 0,
+            "published": 0,
+            "dropped": 0,
+            "blocked": 0,
+            "batches": 0,
+            "max_batch": 0,
+            "errors": 0,
+            "publish_seconds": 0.0,
+        }
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        return self._loop
+
+    def _ensure_started(self):
+        if self._task is None or self._task.done():
+            self._loop = asyncio.get_running_loop()
+            self._task = asyncio.create_task(self._run(), name="omnicoreagent-events")
+
+    async def publish(self, session_id: str, event: Event) -> None:
+        """Enqueue an event; only waits when the queue is full and the policy is `block`."""
+        self._ensure_started()
+        item = (session_id, event)
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            if self.overflow_policy == "block":
+                self._metrics["blocked"] += 1
+                await self._queue.put(item)
+            elif self.overflow_policy == "drop_oldest":
+                self._queue.get_nowait()
+                self._queue.task_done()
+                self._queue.put_nowait(item)
+                self._metrics["dropped"] += 1
+            else:
+                self._metrics["dropped"] += 1
+                return
+        self._metrics["enqueued"] += 1
+
+    async def _run(self):
+        while True:
+            batch: List[Tuple[str, Event]] = [await self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            started = time.perf_counter()
+            try:
+                await self._write_batch(batch)
+            finally:
+                self._metrics["publish_seconds"] += time.perf_counter() - started
+                self._metrics["batches"] += 1
+                self._metrics["max_batch"] = max(self._metrics["max_batch"], len(batch))
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write_batch(self, batch: List[Tuple[str, Event]]):
+        try:
+            await self.event_store.append_batch(batch)
+            self._metrics["published"] += len(batch)
+            return
+        except Exception as e:
+            logger.warning(f"Batched event publish failed, retrying one by one: {e}")
+        for session_id, event in batch:
+            try:
+                await self.event_store.append(session_id=session_id, event=event)
+                self._metrics["published"] += 1
+            except Exception as e:
+                self._metrics["errors"] += 1
+                logger.error(f"Failed to publish event {event.event_id}: {e}")
+
+    async def flush(self) -> None:
+        """Wait until every enqueued event has been written to the store."""
+        if self._task is not None and not self._task.done():
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """Flush pending events and stop the background task."""
+        await self.flush()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def detach(self) -> List[Tuple[str, Event]]:
+        """Stop the publisher from outside its event loop.
+
+        Its task is cancelled on its own loop, if that loop still runs, and the
+        events it had not started writing are returned for the caller to store.
+        """
+        pending: List[Tuple[str, Event]] = []
+        while True:
+            try:
+                pending.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+            self._queue.task_done()
+        task, self._task = self._task, None
+        if task is not None and not task.done() and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(task.cancel)
+        return pending
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            **self._metrics,
+            "queue_depth": self._queue.qsize(),
+            "queue_size": self.queue_size,
+            "overflow_policy": self.overflow_policy,
+        }
@@ -2,28 +2,49 @@
 Event Router for dynamic event store selection.
 """
 
+import asyncio
 from typing import Optional, Dict, Any, List
+from decouple import config
 from omnicoreagent.core.utils import logger
 from omnicoreagent.core.events.base import BaseEventStore, Event
+from omnicoreagent.core.events.event_bus import EventPublisher
 from omnicoreagent.core.events.in_memory import InMemoryEventStore
 from omnicoreagent.core.events.redis_stream import RedisStreamEventStore
 
+# "auto" publishes asynchronously for stores that do I/O (everything but in-memory)
+EVENT_ASYNC_PUBLISH = config("EVENT_ASYNC_PUBLISH", default="auto")
+EVENT_PUBLISH_QUEUE_SIZE = config("EVENT_PUBLISH_QUEUE_SIZE", default=10000, cast=int)
+EVENT_PUBLISH_BATCH_SIZE = config("EVENT_PUBLISH_BATCH_SIZE", default=100, cast=int)
+EVENT_PUBLISH_OVERFLOW = config("EVENT_PUBLISH_OVERFLOW", default="block")
+
 
 class EventRouter:
     """Router for managing different event store backends."""
 
-    def __init__(self, event_store_type: str = "in_memory"):
+    def __init__(
+        self,
+        event_store_type: str = "in_memory",
+        async_publish: Optional[bool] = None,
+        event_store: Optional[BaseEventStore] = None,
+    ):
         """
         Initialize EventRouter.
 
         Args:
             event_store_type: Type of event store ("in_memory", "redis_stream")
+            async_publish: Hand events to a background publisher instead of writing
+                them inline. Defaults to EVENT_ASYNC_PUBLISH ("auto", "true", "false").
+            event_store: Use this store instead of creating one from
+                `event_store_type`, which is then only a label.
         """
         self.event_store_type = event_store_type
-        self._event_store: Optional[BaseEventStore] = None
+        self.async_publish = async_publish
+        self._event_store: Optional[BaseEventStore] = event_store
+        self._publisher: Optional[EventPublisher] = None
 
         # Initialize the event store
-        self._initialize_event_store()
+        if event_store is None:
+            self._initialize_event_store()
 
     def __str__(self):
         """Return a readable string representation of the EventRouter."""
@@ -57,26 +78,95 @@ class EventRouter:
             logger.info("Falling back to in-memory event store")
             self._event_store = InMemoryEventStore()
 
+    def _use_publisher(self) -> bool:
+        if self.async_publish is not None:
+            return self.async_publish
+        mode = str(EVENT_ASYNC_PUBLISH).lower()
+        if mode == "auto":
+            return not isinstance(self._event_store, InMemoryEventStore)
+        return mode in ("true", "1", "yes", "on")
+
+    async def _get_publisher(self) -> EventPublisher:
+        loop = asyncio.get_running_loop()
+        previous = self._publisher
+        if (
+            previous is not None
+            and previous.event_store is self._event_store
+            and previous.loop in (None, loop)
+        ):
+            return previous
+        self._publisher = EventPublisher(
+            event_store=self._event_store,
+            queue_size=EVENT_PUBLISH_QUEUE_SIZE,
+            batch_size=EVENT_PUBLISH_BATCH_SIZE,
+            overflow_policy=EVENT_PUBLISH_OVERFLOW,
+        )
+        if previous is not None:
+            await self._retire_publisher(previous, loop)
+        return self._publisher
+
+    @staticmethod
+    async def _retire_publisher(
+        publisher: EventPublisher, loop: asyncio.AbstractEventLoop
+    ) -> None:
+        """Write out a replaced publisher's queued events and stop its task."""
+        if publisher.loop in (None, loop):
+            await publisher.close()
+            return
+        # its task belongs to another loop: store what it still holds from here
+        pending = publisher.detach()
+        if pending:
+            try:
+                await publisher.event_store.append_batch(pending)
+            except Exception as e:
+                logger.error(
+                    f"Lost {len(pending)} events of a replaced event publisher: {e}"
+                )
+
     async def append(self, session_id: str, event: Event) -> None:
-        """Append an event to the current event store."""
+        """Append an event to the current event store.
+
+        With async publishing this only enqueues the event; call `flush` to wait
+        until it has been written.
+        """
         if not self._event_store:
             raise RuntimeError("No event store available")
 
-        await self._event_store.append(session_id=session_id, event=event)
+        if self._use_publisher():
+            publisher = await self._get_publisher()
+            await publisher.publish(session_id=session_id, event=event)
+        else:
+            await self._event_store.append(session_id=session_id, event=event)
+
+    async def flush(self) -> None:
+        """Wait until every event handed to the background publisher is stored."""
+        if self._publisher is not None:
+            await self._publisher.flush()
+
+    async def close(self) -> None:
+        """Flush pending events and stop the background publisher."""
+        if self._publisher is not None:
+            await self._publisher.close()
+            self._publisher = None
 
     async def get_events(self, session_id: str) -> List[Event]:
         """Get events from the current event store."""
         if not self._event_store:
             raise RuntimeError("No event store available")
 
+        await self.flush()
         return await self._event_store.get_events(session_id=session_id)
 
-    async def stream(self, session_id: str):
-        """Stream events from the current event store."""
+    async def stream(self, session_id: str, **kwargs):
+        """Stream events from the current event store.
+
+        Extra keyword arguments are store specific, e.g. `from_seq` for the
+        in-memory store or `last_id` / `consumer_group` for Redis streams.
+        """
         if not self._event_store:
             raise RuntimeError("No event store available")
 
-        async for event in self._event_store.stream(session_id=session_id):
+        async for event in self._event_store.stream(session_id=session_id, **kwargs):
             yield event
 
     def get_event_store_type(self) -> str:
@@ -89,7 +179,17 @@ class EventRouter:
 
     def get_event_store_info(self) -> Dict[str, Any]:
         """Get information about the current event store."""
-        return {"type": self.event_store_type, "available": self.is_available()}
+        return {
+            "type": self.event_store_type,
+            "available": self.is_available(),
+            "async_publish": self._use_publisher(),
+        }
+
+    def get_publisher_metrics(self) -> Dict[str, Any]:
+        """Queue depth, batch, backpressure and drop counters of the background publisher."""
+        if self._publisher is None:
+            return {}
+        return self._publisher.get_metrics()
 
     def switch_event_store(self, event_store_type: str):
         """Switch to a different event store type."""
@@ -1,23 +1,276 @@
-from collections import defaultdict
 import asyncio
-from typing import AsyncIterator
+import time
+from typing import AsyncIterator, Optional
+
+from decouple import config
+
 from omnicoreagent.core.events.base import BaseEventStore, Event
+from omnicoreagent.core.utils import logger
+
+EVENT_BUFFER_SIZE = config("EVENT_BUFFER_SIZE", default=1000, cast=int)
+EVENT_SESSION_IDLE_TTL = config("EVENT_SESSION_IDLE_TTL", default=3600, cast=float)
+EVENT_SUBSCRIBER_POLICY = config("EVENT_SUBSCRIBER_POLICY", default="drop_oldest")
+EVENT_BLOCK_TIMEOUT = config("EVENT_BLOCK_TIMEOUT", default=5.0, cast=float)
+
+BACKPRESSURE_POLICIES = ("drop_oldest", "block", "disconnect")
+LATEST = -1
+"""Pass as `from_seq` to only receive events appended after subscribing."""
+
+
+class _SessionChannel:
+    """Fixed-size ring buffer of one session's events, addressed by sequence number."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.buffer: list[Optional[Event]] = [None] * capacity
+        self.first_seq = 0
+        self.next_seq = 0
+        self.subscribers: set["Subscription"] = set()
+        self.last_activity = time.monotonic()
+        self._appended = asyncio.Event()
+        self._consumed = asyncio.Event()
+
+    def __len__(self) -> int:
+        return self.next_seq - self.first_seq
+
+    def get(self, seq: int) -> Event:
+        return self.buffer[seq % self.capacity]
+
+    def put(self, event: Event) -> int:
+        seq = self.next_seq
+        self.buffer[seq % self.capacity] = event
+        self.next_seq += 1
+        if len(self) > self.capacity:
+            self.first_seq = self.next_seq - self.capacity
+        self.last_activity = time.monotonic()
+        # wake every waiting subscriber, then arm a fresh signal
+        self._appended.set()
+        self._appended = asyncio.Event()
+        return seq
+
+    def notify_consumed(self):
+        self.last_activity = time.monotonic()
+        self._consumed.set()
+        self._consumed = asyncio.Event()
+
+    async def wait_appended(self):
+        await self._appended.wait()
+
+    async def wait_consumed(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._consumed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+class Subscription:
+    """An independent cursor over a session's event buffer.
+
+    `cursor` is the sequence number of the next event to be delivered, so a
+    client can resume later with `subscribe(session_id, from_seq=cursor)`.
+    """
+
+    def __init__(
+        self, store: "InMemoryEventStore", session_id: str, cursor: int, policy: str
+    ):
+        self.store = store
+        self.session_id = session_id
+        self.cursor = cursor
+        self.policy = policy
+        self.dropped = 0
+        self.closed = False
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> Event:
+        while True:
+            if self.closed:
+                raise StopAsyncIteration
+            channel = self.store._channels.get(self.session_id)
+            if channel is None:
+                # the session was evicted; keep waiting on a fresh channel
+                channel = self.store._get_channel(self.session_id)
+                channel.subscribers.add(self)
+                self.cursor = channel.first_seq
+            if self.cursor < channel.first_seq:
+                missed = channel.first_seq - self.cursor
+                if self.policy == "disconnect":
+                    logger.warning(
+                        f"Disconnecting slow subscriber on session {self.session_id}: "
+                        f"{missed} events behind"
+                    )
+                    self.close()
+                    raise StopAsyncIteration
+                self.dropped += missed
+                self.cursor = channel.first_seq
+            if self.cursor < channel.next_seq:
+                event = channel.get(self.cursor)
+                self.cursor += 1
+                channel.notify_consumed()
+                return event
+            await channel.wait_appended()
+
+    def lag(self) -> int:
+        channel = self.store._channels.get(self.session_id)
+        return channel.next_seq - self.cursor if channel else 0
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        channel = self.store._channels.get(self.session_id)
+        if channel is not None:
+            channel.subscribers.discard(self)
+            channel.notify_consumed()
 
 
 class InMemoryEventStore(BaseEventStore):
-    def __init__(self):
-        self.logs: dict[str, list[Event]] = defaultdict(list)
-        self.queues: dict[str, asyncio.Queue] = defaultdict(asyncio.Queue)
+    """Broadcast event store: every subscriber of a session sees every event.
+
+    Each session keeps the last `buffer_size` events in a ring buffer. Subscribers
+    read with their own cursor, so an SSE endpoint and an audit logger no longer
+    steal events from each other. When a subscriber falls more than `buffer_size`
+    events behind, its policy decides what happens:
+
+    - `drop_oldest`: skip the overwritten events and keep reading;
+    - `block`: `append` waits (up to `block_timeout`) for the subscriber to catch up;
+      a subscriber that misses the deadline is downgraded to `drop_oldest`, so a
+      reader that went away stalls the writer only once;
+    - `disconnect`: end the subscriber's stream so it can resume from its cursor.
+
+    Sessions without subscribers are evicted after `idle_ttl` seconds of inactivity.
+    """
+
+    def __init__(
+        self,
+        buffer_size: int | None = None,
+        idle_ttl: float | None = None,
+        default_policy: str | None = None,
+        block_timeout: float | None = None,
+    ):
+        self.buffer_size = buffer_size or EVENT_BUFFER_SIZE
+        self.idle_ttl = EVENT_SESSION_IDLE_TTL if idle_ttl is None else idle_ttl
+        self.default_policy = default_policy or EVENT_SUBSCRIBER_POLICY
+        self.block_timeout = (
+            EVENT_BLOCK_TIMEOUT if block_timeout is None else block_timeout
+        )
+        if self.buffer_size <= 0:
+            raise ValueError("buffer_size must be positive")
+        if self.default_policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(
+                f"Unknown backpressure policy '{self.default_policy}'. "
+                f"Options: {', '.join(BACKPRESSURE_POLICIES)}"
+            )
+        self._channels: dict[str, _SessionChannel] = {}
+        self._last_sweep = time.monotonic()
+
+    def _get_channel(self, session_id: str) -> _SessionChannel:
+        channel = self._channels.get(session_id)
+        if channel is None:
+            channel = self._channels[session_id] = _SessionChannel(self.buffer_size)
+        return channel
+
+    def _evict_idle_sessions(self):
+        now = time.monotonic()
+        if self.idle_ttl <= 0 or now - self._last_sweep < min(self.idle_ttl, 60):
+            return
+        self._last_sweep = now
+        for session_id, channel in list(self._channels.items()):
+            if not channel.subscribers and now - channel.last_activity > self.idle_ttl:
+                del self._channels[session_id]
+                logger.debug(f"Evicted idle event session {session_id}")
 
     async def append(self, session_id: str, event: Event) -> None:
-        self.logs[session_id].append(event)
-        self.queues[session_id].put_nowait(event)
+        self._evict_idle_sessions()
+        channel = self._get_channel(session_id)
+        if len(channel) >= channel.capacity:
+            # "block" subscribers that have not read the oldest event hold the writer back
+            while blocking := [
+                subscriber
+                for subscriber in channel.subscribers
+                if subscriber.policy == "block"
+                and not subscriber.closed
+                and subscriber.cursor <= channel.first_seq
+            ]:
+                if not await channel.wait_consumed(self.block_timeout):
+                    logger.warning(
+                        f"{len(blocking)} blocking subscriber(s) on session "
+                        f"{session_id} did not catch up within {self.block_timeout}s; "
+                        "downgrading them to drop_oldest"
+                    )
+                    for subscriber in blocking:
+                        subscriber.policy = "drop_oldest"
+                    break
+        channel.put(event)
 
     async def get_events(self, session_id: str) -> list[Event]:
-        return self.logs[session_id]
+        channel = self._channels.get(session_id)
+        if channel is None:
+            return []
+        return [channel.get(seq) for seq in range(channel.first_seq, channel.next_seq)]
 
-    async def stream(self, session_id: str) -> AsyncIterator[Event]:
-        queue = self.queues[session_id]
-        while True:
-            event = await queue.get()
-            yield event
+    def subscribe(
+        self,
+        session_id: str,
+        from_seq: int | None = None,
+        policy: str | None = None,
+    ) -> Subscription:
+        """Open an independent subscription to a session's events.
+
+        Args:
+            session_id: Session to follow.
+            from_seq: Sequence number to replay from. `None` replays everything
+                still buffered, `LATEST` only delivers new events.
+            policy: Backpressure policy for this subscriber, defaults to the store's.
+        """
+        policy = policy or self.default_policy
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(
+                f"Unknown backpressure policy '{policy}'. "
+                f"Options: {', '.join(BACKPRESSURE_POLICIES)}"
+            )
+        channel = self._get_channel(session_id)
+        if from_seq is None:
+            cursor = channel.first_seq
+        elif from_seq == LATEST:
+            cursor = channel.next_seq
+        else:
+            cursor = min(max(from_seq, 0), channel.next_seq)
+        subscription = Subscription(self, session_id, cursor, policy)
+        channel.subscribers.add(subscription)
+        return subscription
+
+    async def stream(
+        self,
+        session_id: str,
+        from_seq: int | None = None,
+        policy: str | None = None,
+    ) -> AsyncIterator[Event]:
+        subscription = self.subscribe(session_id, from_seq=from_seq, policy=policy)
+        try:
+            async for event in subscription:
+                yield event
+        finally:
+            subscription.close()
+
+    def get_stats(self, session_id: str) -> dict:
+        """Buffer and subscriber statistics for a session."""
+        channel = self._channels.get(session_id)
+        if channel is None:
+            return {"buffered": 0, "first_seq": 0, "next_seq": 0, "subscribers": []}
+        return {
+            "buffered": len(channel),
+            "first_seq": channel.first_seq,
+            "next_seq": channel.next_seq,
+            "subscribers": [
+                {
+                    "policy": subscriber.policy,
+                    "cursor": subscriber.cursor,
+                    "lag": channel.next_seq - subscriber.cursor,
+                    "dropped": subscriber.dropped,
+                }
+                for subscriber in channel.subscribers
+            ],
+        }
@@ -1,31 +1,226 @@
+import time
+from typing import AsyncIterator, List, Optional, Tuple
+
 import redis.asyncio as redis
-from typing import AsyncIterator, List
 from decouple import config
+from redis.exceptions import ResponseError
+
 from omnicoreagent.core.events.base import BaseEventStore, Event
+from omnicoreagent.core.events.codec import (
+    decode_event_data,
+    encode_event,
+    find_refs,
+    loads,
+)
+from omnicoreagent.core.memory_store.redis_memory import get_redis_manager
+from omnicoreagent.core.utils import logger
 
 REDIS_URL = config("REDIS_URL", default="redis://localhost:6379/0")
+EVENT_STREAM_READ_COUNT = config("EVENT_STREAM_READ_COUNT", default=100, cast=int)
+# kept below the pooled client's 5s socket timeout
+EVENT_STREAM_BLOCK_MS = config("EVENT_STREAM_BLOCK_MS", default=2000, cast=int)
+EVENT_STREAM_START = config("EVENT_STREAM_START", default="earliest")
+EVENT_STREAM_MAXLEN = config("EVENT_STREAM_MAXLEN", default=10000, cast=int)
+EVENT_STREAM_RETENTION_SECONDS = config(
+    "EVENT_STREAM_RETENTION_SECONDS", default=0, cast=int
+)
+EVENT_STREAM_PAGE_SIZE = config("EVENT_STREAM_PAGE_SIZE", default=500, cast=int)
+EVENT_BLOB_TTL_SECONDS = config("EVENT_BLOB_TTL_SECONDS", default=86400, cast=int)
 
 
 class RedisStreamEventStore(BaseEventStore):
-    def __init__(self):
-        self.redis = redis.from_url(REDIS_URL, decode_responses=True)
+    """Event store backed by one Redis stream per session.
+
+    Reads are batched (`count`) and resumable from any stream ID; `stream` can
+    also read through a consumer group so several SSE workers share a session.
+    Streams are trimmed on write with `MAXLEN ~` or, when a retention period is
+    set, `MINID ~`. The Redis client is the pooled one shared with the Redis
+    memory store.
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        read_count: Optional[int] = None,
+        block_ms: Optional[int] = None,
+        maxlen: Optional[int] = None,
+        retention_seconds: Optional[int] = None,
+    ):
+        self.redis_url = redis_url or REDIS_URL
+        self.read_count = read_count or EVENT_STREAM_READ_COUNT
+        self.block_ms = block_ms or EVENT_STREAM_BLOCK_MS
+        self.maxlen = EVENT_STREAM_MAXLEN if maxlen is None else maxlen
+        self.retention_seconds = (
+            EVENT_STREAM_RETENTION_SECONDS
+            if retention_seconds is None
+            else retention_seconds
+        )
+        self._redis: Optional[redis.Redis] = None
+
+    async def _get_redis(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = await get_redis_manager().get_client(self.redis_url)
+        return self._redis
+
+    @staticmethod
+    def _stream_name(session_id: str) -> str:
+        return f"omnicoreagent_events:{session_id}"
+
+    def _trim_args(self) -> dict:
+        if self.retention_seconds > 0:
+            cutoff_ms = int((time.time() - self.retention_seconds) * 1000)
+            return {"minid": f"{cutoff_ms}-0", "approximate": True}
+        if self.maxlen > 0:
+            return {"maxlen": self.maxlen, "approximate": True}
+        return {}
+
+    @staticmethod
+    def _blob_name(ref: str) -> str:
+        return f"omnicoreagent_event_blobs:{ref}"
+
+    def _blob_ttl(self) -> int:
+        return max(self.retention_seconds, EVENT_BLOB_TTL_SECONDS)
+
+    def _queue_writes(self, pipe, session_id: str, event: Event, trim_args: dict):
+        body, blobs = encode_event(event)
+        for ref, blob in blobs.items():
+            pipe.set(self._blob_name(ref), blob, ex=self._blob_ttl())
+        pipe.xadd(self._stream_name(session_id), {"event": body}, **trim_args)
+
+    async def _decode_entries(self, client: redis.Redis, entries) -> List[Event]:
+        """Decode stream entries, fetching all out-of-line payloads in one MGET."""
+        decoded = [loads(data["event"]) for _, data in entries if data]
+        refs = [ref for data in decoded for ref in find_refs(data)]
+        blobs = {}
+        if refs:
+            values = await client.mget([self._blob_name(ref) for ref in refs])
+            blobs = dict(zip(refs, values))
+        return [decode_event_data(data, blobs) for data in decoded]
 
     async def append(self, session_id: str, event: Event):
-        stream_name = f"omnicoreagent_events:{session_id}"
-        await self.redis.xadd(stream_name, {"event": event.json()})
+        await self.append_batch([(session_id, event)])
+
+    async def append_batch(self, events: List[Tuple[str, Event]]) -> None:
+        client = await self._get_redis()
+        trim_args = self._trim_args()
+        async with client.pipeline(transaction=False) as pipe:
+            for session_id, event in events:
+                self._queue_writes(pipe, session_id, event, trim_args)
+            await pipe.execute()
+
+    async def get_events_page(
+        self, session_id: str, after_id: str = "-", count: Optional[int] = None
+    ) -> Tuple[List[Event], Optional[str]]:
+        """Read up to `count` events after `after_id`.
+
+        Returns the events and the ID to pass as `after_id` for the next page, or
+        `None` when the stream has been read to the end.
+        """
+        client = await self._get_redis()
+        count = count or EVENT_STREAM_PAGE_SIZE
+        start = after_id if after_id == "-" else f"({after_id}"
+        entries = await client.xrange(
+            self._stream_name(session_id), min=start, max="+", count=count
+        )
+        events = await self._decode_entries(client, entries)
+        next_id = entries[-1][0] if len(entries) == count else None
+        return events, next_id
 
     async def get_events(self, session_id: str) -> List[Event]:
-        stream_name = f"omnicoreagent_events:{session_id}"
-        events = await self.redis.xrange(stream_name, min="-", max="+")
-        return [Event.parse_raw(entry[1]["event"]) for entry in events]
+        events: List[Event] = []
+        after_id: Optional[str] = "-"
+        while after_id is not None:
+            page, after_id = await self.get_events_page(session_id, after_id)
+            events.extend(page)
+        return events
+
+    async def _resolve_start(self, client: redis.Redis, stream_name: str, last_id):
+        start = last_id or EVENT_STREAM_START
+        if start in ("latest", "$"):
+            # pin "$" to a concrete ID so nothing is missed between reads
+            newest = await client.xrevrange(stream_name, count=1)
+            return newest[0][0] if newest else "0-0"
+        if start in ("earliest", "0"):
+            return "0-0"
+        return start
+
+    async def stream(
+        self,
+        session_id: str,
+        last_id: Optional[str] = None,
+        consumer_group: Optional[str] = None,
+        consumer_name: Optional[str] = None,
+    ) -> AsyncIterator[Event]:
+        """Yield events as they are appended.
+
+        Args:
+            session_id: Session to follow.
+            last_id: Resume after this stream ID; "earliest" (default, see
+                EVENT_STREAM_START) replays the stream like the in-memory store,
+                "latest" only yields new events.
+            consumer_group: Read through this consumer group so that each event is
+                delivered to one of the group's consumers. Pending (unacknowledged)
+                events of `consumer_name` are redelivered first.
+            consumer_name: Name of this consumer within the group.
+        """
+        client = await self._get_redis()
+        stream_name = self._stream_name(session_id)
+        if consumer_group:
+            async for event in self._stream_group(
+                client, stream_name, consumer_group, consumer_name, last_id
+            ):
+                yield event
+            return
+
+        cursor = await self._resolve_start(client, stream_name, last_id)
+        while True:
+            results = await client.xread(
+                {stream_name: cursor}, count=self.read_count, block=self.block_ms
+            )
+            for _, entries in results or []:
+                events = await self._decode_entries(client, entries)
+                cursor = entries[-1][0]
+                for event in events:
+                    yield event
 
-    async def stream(self, session_id: str) -> AsyncIterator[Event]:
-        stream_name = f"omnicoreagent_events:{session_id}"
-        last_id = "0-0"
+    async def _stream_group(
+        self,
+        client: redis.Redis,
+        stream_name: str,
+        group: str,
+        consumer: Optional[str],
+        last_id: Optional[str],
+    ) -> AsyncIterator[Event]:
+        consumer = consumer or f"consumer-{id(self)}"
+        start = await self._resolve_start(client, stream_name, last_id)
+        try:
+            await client.xgroup_create(stream_name, group, id=start, mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        # first drain this consumer's pending entries, then switch to new ones
+        cursor = "0"
         while True:
-            results = await self.redis.xread({stream_name: last_id}, block=0, count=1)
-            if results:
-                _, entries = results[0]
-                for entry_id, data in entries:
-                    last_id = entry_id
-                    yield Event.parse_raw(data["event"])
+            results = await client.xreadgroup(
+                group,
+                consumer,
+                {stream_name: cursor},
+                count=self.read_count,
+                block=None if cursor == "0" else self.block_ms,
+            )
+            entries = results[0][1] if results else []
+            if cursor == "0" and not entries:
+                cursor = ">"
+                continue
+            for entry_id, data in entries:
+                if data is None:
+                    # the entry was trimmed while pending
+                    await client.xack(stream_name, group, entry_id)
+                    continue
+                (event,) = await self._decode_entries(client, [(entry_id, data)])
+                yield event
+                await client.xack(stream_name, group, entry_id)
+            if cursor == "0" and entries:
+                logger.debug(
+                    f"Redelivered {len(entries)} pending events on {stream_name}"
+                )
@@ -5,6 +5,7 @@ import random
 
 from dotenv import load_dotenv
 import litellm
+from omnicoreagent.core.run_timing import record_tokens, timed
 from omnicoreagent.core.utils import logger
 import warnings
 
@@ -37,9 +38,9 @@ logging.getLogger("litellm.proxy").disabled = True
 
 # Set log levels to critical
 for logger_name in ["LiteLLM", "litellm", "litellm.proxy"]:
-    logger = logging.getLogger(logger_name)
-    logger.setLevel(logging.CRITICAL)
-    logger.propagate = False
+    litellm_logger = logging.getLogger(logger_name)
+    litellm_logger.setLevel(logging.CRITICAL)
+    litellm_logger.propagate = False
 
 
 def retry_with_backoff(max_retries=3, base_delay=1, max_delay=60, backoff_factor=2):
@@ -90,18 +91,23 @@ def retry_with_backoff(max_retries=3, base_delay=1, max_delay=60, backoff_factor
                             total_delay = delay + jitter
 
                             logger.warning(
-                                f"Retryable error on attempt {attempt + 1}/{max_retries + 1}: {e}"
+                                "Retryable error on attempt %d/%d: %s",
+                                attempt + 1,
+                                max_retries + 1,
+                                e,
                             )
-                            logger.info(f"Retrying in {total_delay:.2f} seconds...")
+                            logger.info("Retrying in %.2f seconds...", total_delay)
 
                             time.sleep(total_delay)
                             continue
                         else:
                             logger.error(
-                                f"Max retries ({max_retries}) exceeded. Last error: {e}"
+                                "Max retries (%d) exceeded. Last error: %s",
+                                max_retries,
+                                e,
                             )
                     else:
-                        logger.error(f"Non-retryable error: {e}")
+                        logger.error("Non-retryable error: %s", e)
                         break
 
             raise last_exception
@@ -125,7 +131,7 @@ class LLMConnection:
                 logger.info("updating llm configuration")
                 llm_config_result = self.llm_configuration()
                 if llm_config_result:
-                    logger.info(f"LLM configuration: {self.llm_config}")
+                    logger.info("LLM configuration: %s", self.llm_config)
 
                     self._set_llm_environment_variables()
                 else:
@@ -141,11 +147,11 @@ class LLMConnection:
                 try:
                     logger.info("updating embedding configuration")
                     self.embedding_configuration()
-                    logger.info(f"Embedding configuration: {self.embedding_config}")
+                    logger.info("Embedding configuration: %s", self.embedding_config)
 
                     self._set_embedding_environment_variables()
                 except Exception as e:
-                    logger.warning(f"Failed to load embedding configuration: {e}")
+                    logger.warning("Failed to load embedding configuration: %s", e)
                     self.embedding_config = None
         else:
             logger.debug(
@@ -208,6 +214,7 @@ class LLMConnection:
                 "model": full_model,
                 "temperature": llm_config.get("temperature"),
                 "max_tokens": llm_config.get("max_tokens"),
+                "max_context_length": llm_config.get("max_context_length"),
                 "top_p": llm_config.get("top_p"),
             }
 
@@ -234,7 +241,7 @@ class LLMConnection:
 
             return self.llm_config
         except Exception as e:
-            logger.error(f"Error loading LLM configuration: {e}")
+            logger.error("Error loading LLM configuration: %s", e)
             return None
 
     def embedding_configuration(self):
@@ -335,7 +342,7 @@ class LLMConnection:
             return self.embedding_config
 
         except Exception as e:
-            logger.error(f"Error loading embedding configuration: {e}")
+            logger.error("Error loading embedding configuration: %s", e)
             return None
 
     @retry_with_backoff(max_retries=3, base_delay=1, max_delay=30)
@@ -489,7 +496,7 @@ class LLMConnection:
         elif provider == "azure" or provider == "azureopenai":
             os.environ["AZURE_API_KEY"] = api_key
 
-        logger.debug(f"Set environment variable for LLM provider: {provider}")
+        logger.debug("Set environment variable for LLM provider: %s", provider)
 
     def _set_embedding_environment_variables(self):
         """Set environment variables only for the configured embedding provider."""
@@ -520,7 +527,7 @@ class LLMConnection:
         elif provider == "vertex_ai":
             pass
 
-        logger.debug(f"Set environment variable for embedding provider: {provider}")
+        logger.debug("Set environment variable for embedding provider: %s", provider)
 
     def is_embedding_available(self) -> bool:
         """Check if embedding functionality is available (API key is set)"""
@@ -590,14 +597,16 @@ class LLMConnection:
 
             litellm.drop_params = True
 
-            response = await litellm.acompletion(**params)
+            with timed("llm"):
+                response = await litellm.acompletion(**params)
+            usage = getattr(response, "usage", None)
+            record_tokens(getattr(usage, "total_tokens", None))
             return response
 
         except Exception as e:
-            error_message = (
-                f"Error calling LLM with model {self.llm_config.get('model')}: {e}"
+            logger.error(
+                "Error calling LLM with model %s: %s", self.llm_config.get("model"), e
             )
-            logger.error(error_message)
             return None
 
     @retry_with_backoff(max_retries=3, base_delay=1, max_delay=30)
@@ -642,8 +651,7 @@ class LLMConnection:
             return response
 
         except Exception as e:
-            error_message = (
-                f"Error calling LLM with model {self.llm_config.get('model')}: {e}"
+            logger.error(
+                "Error calling LLM with model %s: %s", self.llm_config.get("model"), e
             )
-            logger.error(error_message)
             return None
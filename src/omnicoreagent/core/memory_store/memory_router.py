@@ -3,6 +3,7 @@ from decouple import config as decouple_config
 from omnicoreagent.core.memory_store.in_memory import InMemoryStore
 from omnicoreagent.core.memory_store.database_memory import DatabaseMemory
 from omnicoreagent.core.memory_store.redis_memory import RedisMemoryStore
+from omnicoreagent.core.run_timing import timed
 from omnicoreagent.core.utils import logger
 from omnicoreagent.core.utils import normalize_metadata
 from omnicoreagent.core.database.mongodb import MongoDb
@@ -78,12 +79,14 @@ class MemoryRouter:
             )
         metadata = normalize_metadata(metadata)
 
-        await self.memory_store.store_message(role, content, metadata, session_id)
+        with timed("memory"):
+            await self.memory_store.store_message(role, content, metadata, session_id)
 
     async def get_messages(
         self, session_id: str, agent_name: str = None
     ) -> list[dict[str, Any]]:
-        messages = await self.memory_store.get_messages(session_id, agent_name)
+        with timed("memory"):
+            messages = await self.memory_store.get_messages(session_id, agent_name)
         # convert from msg_metadata to metadata
         for message in messages:
             message["metadata"] = message.pop("msg_metadata", None)
@@ -14,6 +14,9 @@ REDIS_URL = config("REDIS_URL", default=None)
 class RedisConnectionManager:
     """
     Redis connection manager for efficient connection pooling and reuse.
+
+    One pooled client is kept per Redis URL, so the memory store and the Redis
+    event store share connections when they point at the same server.
     """
 
     _instance = None
@@ -27,17 +30,19 @@ class RedisConnectionManager:
     def __init__(self):
         if not hasattr(self, "_initialized"):
             self._initialized = True
-            self._client = None
+            self._clients: dict[str, redis.Redis] = {}
             self._connection_count = 0
             logger.debug("RedisConnectionManager initialized")
 
-    async def get_client(self) -> redis.Redis:
-        """Get or create Redis client with connection pooling."""
+    async def get_client(self, redis_url: Optional[str] = None) -> redis.Redis:
+        """Get or create the pooled Redis client for `redis_url` (defaults to REDIS_URL)."""
+        redis_url = redis_url or REDIS_URL
         with self._lock:
-            if self._client is None:
+            client = self._clients.get(redis_url)
+            if client is None:
                 try:
-                    self._client = redis.from_url(
-                        REDIS_URL,
+                    client = self._clients[redis_url] = redis.from_url(
+                        redis_url,
                         decode_responses=True,
                         max_connections=20,  # Connection pool size
                         retry_on_timeout=True,
@@ -46,7 +51,7 @@ class RedisConnectionManager:
                         health_check_interval=30,
                     )
                     logger.debug(
-                        f"[RedisManager] Created Redis connection pool: {REDIS_URL}"
+                        f"[RedisManager] Created Redis connection pool: {redis_url}"
                     )
                 except Exception as e:
                     logger.error(f"[RedisManager] Failed to create Redis client: {e}")
@@ -56,7 +61,7 @@ class RedisConnectionManager:
             logger.debug(
                 f"[RedisManager] Redis connection usage count: {self._connection_count}"
             )
-            return self._client
+            return client
 
     def release_client(self):
         """Release a Redis client (decrement usage count)."""
@@ -70,11 +75,13 @@ class RedisConnectionManager:
     async def close_all(self):
         """Close all Redis connections."""
         with self._lock:
-            if self._client:
-                await self._client.close()
-                self._client = None
-                self._connection_count = 0
-                logger.debug("[RedisManager] Closed all Redis connections")
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._connection_count = 0
+        for client in clients:
+            await client.close()
+        if clients:
+            logger.debug("[RedisManager] Closed all Redis connections")
 
 
 # Global Redis connection manager
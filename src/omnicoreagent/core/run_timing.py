@@ -0,0 +1,140 @@
+"""
+Per-run phase timers.
+
+`collect_run_timings()` opens a collector for the current run; `timed(phase)`
+blocks around LLM calls, tool calls and memory access add their wall time to it.
+The collector lives in a context variable, so tasks spawned during the run (e.g.
+concurrent tool calls) report into it as well, and `timed` costs one lookup when
+no run is being timed. `LatencyHistogram` aggregates such timings over many runs
+or calls.
+"""
+
+import math
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Log-linear buckets: 8 per power of two from 1ms, ~9% relative error, up to ~70min
+_MIN_SECONDS = 0.001
+_SUB_BUCKETS = 8
+_BUCKETS = 22 * _SUB_BUCKETS
+
+
+class RunTimings:
+    """Seconds and call counts per phase of one run, plus the LLM tokens it used."""
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.tokens = 0
+
+    def add(self, phase: str, seconds: float, calls: int = 1) -> None:
+        self.seconds[phase] += seconds
+        self.calls[phase] += calls
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "seconds": dict(self.seconds),
+            "calls": dict(self.calls),
+            "tokens": self.tokens,
+        }
+
+
+_current_timings: ContextVar[Optional[RunTimings]] = ContextVar(
+    "omnicoreagent_run_timings", default=None
+)
+
+
+@contextmanager
+def collect_run_timings() -> Iterator[RunTimings]:
+    """Time the phases of everything run inside this block."""
+    timings = RunTimings()
+    reset_token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(reset_token)
+
+
+@contextmanager
+def timed(phase: str, calls: int = 1) -> Iterator[None]:
+    """Add the block's wall time to `phase` of the run being timed, if any."""
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - started, calls)
+
+
+def record_tokens(tokens: Optional[int]) -> None:
+    """Count LLM tokens against the run being timed, if any."""
+    timings = _current_timings.get()
+    if timings is not None and tokens:
+        timings.tokens += tokens
+
+
+def _bucket_upper(index: int) -> float:
+    return _MIN_SECONDS * 2 ** (index / _SUB_BUCKETS)
+
+
+class LatencyHistogram:
+    """Fixed-memory latency histogram with percentiles within ~9% of the true value."""
+
+    def __init__(self):
+        # the last slot counts values above the largest bucket
+        self.counts = [0] * (_BUCKETS + 2)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        seconds = max(seconds, 0.0)
+        if seconds <= _MIN_SECONDS:
+            index = 0
+        else:
+            index = min(
+                math.ceil(math.log2(seconds / _MIN_SECONDS) * _SUB_BUCKETS - 1e-9),
+                _BUCKETS + 1,
+            )
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                if index > _BUCKETS:
+                    return self.max
+                return min(_bucket_upper(index), self.max)
+        return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+    def cumulative_buckets(self) -> List[Tuple[float, int]]:
+        """(upper bound, cumulative count) at every power of two, for exposition."""
+        buckets, seen = [], 0
+        for index, bucket_count in enumerate(self.counts[: _BUCKETS + 1]):
+            seen += bucket_count
+            if index % _SUB_BUCKETS == 0:
+                buckets.append((_bucket_upper(index), seen))
+        return buckets
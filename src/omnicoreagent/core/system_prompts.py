@@ -233,8 +233,8 @@ def generate_orchestrator_prompt_template(current_date_time: str):
 <behavior_rules>
   <never>Never respond directly to user tasks</never>
   <always>Always begin with deep understanding of the request</always>
-  <one_action>Only delegate one subtask per response</one_action>
-  <wait>Wait for agent observation before next action</wait>
+  <one_action>Delegate one subtask per response, or a batch of several agent calls when the subtasks are independent of each other</one_action>
+  <wait>Wait for agent observations before next action</wait>
   <never_final>Never respond with <final_answer> until all subtasks are complete</never_final>
   <always_xml>Always wrap all outputs using valid XML tags</always_xml>
 
@@ -247,6 +247,18 @@ def generate_orchestrator_prompt_template(current_date_time: str):
 </agent_call>
 </agent_call_format>
 
+<batch_agent_call_format>
+ <!-- independent subtasks only: all calls run at the same time and their observations come back together -->
+ <agent_call>
+  <agent_name>first_agent</agent_name>
+  <task>first independent subtask</task>
+ </agent_call>
+ <agent_call>
+  <agent_name>second_agent</agent_name>
+  <task>second independent subtask</task>
+ </agent_call>
+</batch_agent_call_format>
+
 <final_answer_format>
   <final_answer>Summarized result from all real observations</final_answer>
 </final_answer_format>
@@ -329,7 +341,7 @@ def generate_orchestrator_prompt_template(current_date_time: str):
 <common_mistakes>
   <mistake>❌ Including markdown or bullets</mistake>
   <mistake>❌ Using "Final Answer:" without finishing all subtasks</mistake>
-  <mistake>❌ Delegating multiple subtasks at once</mistake>
+  <mistake>❌ Batching subtasks where one needs another's result</mistake>
   <mistake>❌ Using unregistered agent names</mistake>
   <mistake>❌ Predicting results instead of waiting for real observations</mistake>
 </common_mistakes>
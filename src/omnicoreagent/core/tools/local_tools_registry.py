@@ -1,8 +1,207 @@
 import inspect
 import asyncio
+import os
+import pickle
+import threading
 from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Any, Dict, List
 
+from decouple import config as decouple_config
+
+EXECUTION_MODES = ("inline", "thread", "process")
+
+LOCAL_TOOL_THREAD_WORKERS = decouple_config(
+    "LOCAL_TOOL_THREAD_WORKERS", default=min(32, (os.cpu_count() or 1) + 4), cast=int
+)
+LOCAL_TOOL_PROCESS_WORKERS = decouple_config(
+    "LOCAL_TOOL_PROCESS_WORKERS", default=os.cpu_count() or 1, cast=int
+)
+
+
+class ToolExecutionPool:
+    """Shared, bounded executors used to run synchronous local tools off the event loop.
+
+    Threads are used by default for blocking I/O style tools; a process pool is
+    created lazily for CPU-bound tools registered with ``execution_mode="process"``.
+    """
+
+    def __init__(
+        self,
+        thread_workers: int = LOCAL_TOOL_THREAD_WORKERS,
+        process_workers: int = LOCAL_TOOL_PROCESS_WORKERS,
+    ):
+        self.thread_workers = max(1, thread_workers)
+        self.process_workers = max(1, process_workers)
+        self._thread_pool: ThreadPoolExecutor | None = None
+        self._process_pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._queued = {"thread": 0, "process": 0}
+        self._running = {"thread": 0, "process": 0}
+        self._completed = {"thread": 0, "process": 0}
+        self._failed = {"thread": 0, "process": 0}
+        # functions already known to pickle, so process calls check them once
+        self._picklable_functions: set = set()
+
+    def _get_executor(self, mode: str) -> Executor:
+        with self._lock:
+            if mode == "thread":
+                if self._thread_pool is None:
+                    self._thread_pool = ThreadPoolExecutor(
+                        max_workers=self.thread_workers,
+                        thread_name_prefix="omnicoreagent-tool",
+                    )
+                return self._thread_pool
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.process_workers
+                )
+            return self._process_pool
+
+    def _track(
+        self, mode: str, call: dict[str, bool], func: Callable, kwargs: dict[str, Any]
+    ) -> Any:
+        """Runs inside the worker thread so queued/running counts stay accurate."""
+        with self._lock:
+            self._dequeue(mode, call)
+            self._running[mode] += 1
+        try:
+            return func(**kwargs)
+        finally:
+            with self._lock:
+                self._running[mode] -= 1
+
+    def _dequeue(self, mode: str, call: dict[str, bool]):
+        """Count a call as no longer queued, once; the caller holds the lock."""
+        if not call["dequeued"]:
+            call["dequeued"] = True
+            self._queued[mode] -= 1
+
+    def ensure_picklable(self, tool_name: str, func: Callable, kwargs: dict[str, Any]):
+        """Raise a ValueError if a process-mode call cannot be sent to a worker.
+
+        The function is checked once per tool; arguments are only pickled when
+        they are not plain JSON values, which always pickle.
+        """
+        if func not in self._picklable_functions:
+            try:
+                pickle.dumps(func)
+            except Exception as e:
+                raise ValueError(
+                    f"Tool '{tool_name}' cannot run in process mode: function is not picklable ({e})"
+                )
+            self._picklable_functions.add(func)
+        for key, value in kwargs.items():
+            if _is_plain(value):
+                continue
+            try:
+                pickle.dumps(value)
+            except Exception as e:
+                raise ValueError(
+                    f"Tool '{tool_name}' cannot run in process mode: argument '{key}' is not picklable ({e})"
+                )
+
+    async def run(
+        self, mode: str, func: Callable, kwargs: dict[str, Any], tool_name: str = ""
+    ) -> Any:
+        """Run a synchronous callable in the pool selected by ``mode``."""
+        loop = asyncio.get_running_loop()
+        if mode == "process":
+            self.ensure_picklable(tool_name or func.__name__, func, kwargs)
+            executor = self._get_executor("process")
+            # worker start is not observable across processes, so in-flight
+            # process calls are reported as running
+            with self._lock:
+                self._running["process"] += 1
+            try:
+                result = await loop.run_in_executor(
+                    executor, _call_with_kwargs, func, kwargs
+                )
+            except Exception:
+                with self._lock:
+                    self._failed["process"] += 1
+                raise
+            finally:
+                with self._lock:
+                    self._running["process"] -= 1
+            with self._lock:
+                self._completed["process"] += 1
+            return result
+
+        executor = self._get_executor("thread")
+        call = {"dequeued": False}
+        with self._lock:
+            self._queued["thread"] += 1
+        try:
+            result = await loop.run_in_executor(
+                executor, self._track, "thread", call, func, kwargs
+            )
+        except Exception:
+            with self._lock:
+                self._failed["thread"] += 1
+            raise
+        finally:
+            # a call cancelled while still queued never reaches _track
+            with self._lock:
+                self._dequeue("thread", call)
+        with self._lock:
+            self._completed["thread"] += 1
+        return result
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Return pool sizes, queue depths and completion counters per pool."""
+        with self._lock:
+            return {
+                mode: {
+                    "max_workers": (
+                        self.thread_workers
+                        if mode == "thread"
+                        else self.process_workers
+                    ),
+                    "started": (
+                        self._thread_pool is not None
+                        if mode == "thread"
+                        else self._process_pool is not None
+                    ),
+                    "queued": self._queued[mode],
+                    "running": self._running[mode],
+                    "completed": self._completed[mode],
+                    "failed": self._failed[mode],
+                }
+                for mode in ("thread", "process")
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Shut down any executors that have been started."""
+        with self._lock:
+            thread_pool, self._thread_pool = self._thread_pool, None
+            process_pool, self._process_pool = self._process_pool, None
+        if thread_pool:
+            thread_pool.shutdown(wait=wait)
+        if process_pool:
+            process_pool.shutdown(wait=wait)
+
+
+def _is_plain(value: Any) -> bool:
+    """Whether a value is made of JSON types only, like LLM tool arguments."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(_is_plain(item) for item in value)
+    if isinstance(value, dict):
+        return all(
+            isinstance(key, str) and _is_plain(item) for key, item in value.items()
+        )
+    return False
+
+
+def _call_with_kwargs(func: Callable, kwargs: dict[str, Any]) -> Any:
+    # module level so it can be pickled for the process pool
+    return func(**kwargs)
+
+
+tool_execution_pool = ToolExecutionPool()
+
 
 class Tool:
     def __init__(
@@ -11,12 +210,25 @@ class Tool:
         description: str,
         inputSchema: dict[str, Any],
         function: Callable,
+        execution_mode: str | None = None,
     ):
         self.name = name
         self.description = description
         self.inputSchema = inputSchema
         self.function = function
         self.is_async = asyncio.iscoroutinefunction(function)
+        if execution_mode is None:
+            execution_mode = "inline" if self.is_async else "thread"
+        if execution_mode not in EXECUTION_MODES:
+            raise ValueError(
+                f"Invalid execution_mode '{execution_mode}' for tool '{name}'. "
+                f"Expected one of {EXECUTION_MODES}"
+            )
+        if self.is_async and execution_mode != "inline":
+            raise ValueError(
+                f"Tool '{name}' is async and can only use the 'inline' execution mode"
+            )
+        self.execution_mode = execution_mode
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -24,6 +236,7 @@ class Tool:
             "description": self.description,
             "inputSchema": self.inputSchema,
             "function": self.function,
+            "execution_mode": self.execution_mode,
         }
 
     async def execute(self, parameters: Dict[str, Any]) -> Any:
@@ -43,11 +256,16 @@ class Tool:
         # Execute the function
         if self.is_async:
             return await self.function(**func_params)
-        else:
+        if self.execution_mode == "inline":
             return self.function(**func_params)
+        return await tool_execution_pool.run(
+            self.execution_mode, self.function, func_params, tool_name=self.name
+        )
 
     def __repr__(self):
-        return f"<Tool name={self.name} async={self.is_async}>"
+        return (
+            f"<Tool name={self.name} async={self.is_async} mode={self.execution_mode}>"
+        )
 
 
 class ToolRegistry:
@@ -73,7 +291,17 @@ class ToolRegistry:
         name: str | None = None,
         inputSchema: dict[str, Any] | None = None,
         description: str = "",
+        execution_mode: str | None = None,
     ):
+        """Register a function as a local tool.
+
+        execution_mode controls how synchronous tools run:
+        - "thread" (default for sync tools): shared bounded thread pool
+        - "process": process pool for CPU-bound work; function and arguments must be picklable
+        - "inline": call directly on the event loop (only for trivial, non-blocking tools)
+        Async tools always run inline on the event loop.
+        """
+
         def decorator(func: Callable):
             tool_name = name or func.__name__.lower()
 
@@ -90,6 +318,7 @@ class ToolRegistry:
                 description=final_description.strip(),
                 inputSchema=final_schema,
                 function=func,
+                execution_mode=execution_mode,
             )
             self.tools[tool_name] = tool
             return func
@@ -116,6 +345,10 @@ class ToolRegistry:
             )
         return tools
 
+    def get_execution_metrics(self) -> Dict[str, Any]:
+        """Get execution pool metrics shared by all local tools"""
+        return tool_execution_pool.get_metrics()
+
     def get_tool_schemas(self) -> Dict[str, Dict[str, Any]]:
         """Get all tool schemas for MCP integration"""
         schemas = {}
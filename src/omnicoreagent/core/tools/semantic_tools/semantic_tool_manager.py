@@ -307,25 +307,25 @@ class SemanticToolManager(BaseVectorDBHandler):
                     if isinstance(input_schema, dict)
                     else {}
                 )
-                # check if tool exist we continue
+                # Build raw payload
+                tool_payload = {
+                    "name": str(name),
+                    "description": str(description),
+                    "parameters": args,
+                }
+
+                # reuse the stored enrichment unless the server changed the tool
                 tool_exist = await tool_exists(
                     tool_name=str(name), mcp_server_name=server_name
                 )
 
-                if tool_exist:
+                if tool_exist and tool_exist.get("raw_tool") == tool_payload:
                     # add the tool to mcp_tool_registry
                     MCP_TOOLS_REGISTRY[name] = tool_exist
 
                     logger.info(f"this tool already exist: {name}")
                     return
 
-                # Build raw payload
-                tool_payload = {
-                    "name": str(name),
-                    "description": str(description),
-                    "parameters": args,
-                }
-
                 user_content = json.dumps(tool_payload, ensure_ascii=False)
 
                 llm_messages = [
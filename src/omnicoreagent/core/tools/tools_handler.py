@@ -2,6 +2,7 @@ import json
 from abc import ABC, abstractmethod
 from collections.abc import Callable
 from typing import Any
+from omnicoreagent.core.run_timing import timed
 from omnicoreagent.core.utils import logger
 import asyncio
 
@@ -94,8 +95,12 @@ class MCPToolHandler(BaseToolHandler):
             }
 
     async def call(self, tool_name: str, tool_args: dict[str, Any]) -> Any:
-        session = self.sessions[self.server_name]["session"]
-        return await session.call_tool(tool_name, tool_args)
+        session_info = self.sessions[self.server_name]
+        call_gate = session_info.get("call_gate")
+        if call_gate is None:
+            return await session_info["session"].call_tool(tool_name, tool_args)
+        # bounded, timed out and hedged per the server's call policy
+        return await call_gate.call(session_info["session"], tool_name, tool_args)
 
 
 class LocalToolHandler(BaseToolHandler):
@@ -196,7 +201,8 @@ class ToolExecutor:
 
                 tasks.append(self.tool_handler.call(name, args))
 
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            with timed("tool", calls=len(tasks)):
+                results = await asyncio.gather(*tasks, return_exceptions=True)
 
             for name, args, result in zip(split_tool_names, tool_args, results):
                 # Cleanup retriever args
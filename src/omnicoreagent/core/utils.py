@@ -1,12 +1,15 @@
+import atexit
 import hashlib
 import json
 import logging
+import queue
 import platform
 import re
 import subprocess
 import sys
 import uuid
 from collections import defaultdict, deque
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Any
 from types import SimpleNamespace
@@ -44,6 +47,12 @@ def is_embedding_requirements_met() -> bool:
     return ENABLE_VECTOR_DB and EMBEDDING_API_KEY is not None
 
 
+# Logging controls
+# Dumping the full working-memory history on every agent step is expensive, keep it opt-in
+LOG_HISTORY_DUMPS = decouple_config("LOG_HISTORY_DUMPS", default=False, cast=bool)
+# Maximum number of characters of any single payload (tool output, message, history) written to the log
+LOG_MAX_PAYLOAD_CHARS = decouple_config("LOG_MAX_PAYLOAD_CHARS", default=2000, cast=int)
+
 # Remove any existing handlers
 for handler in logger.handlers[:]:
     logger.removeHandler(handler)
@@ -72,14 +81,63 @@ file_formatter = logging.Formatter(
 console_handler.setFormatter(console_formatter)
 file_handler.setFormatter(file_formatter)
 
-# Add handlers
-logger.addHandler(console_handler)
-logger.addHandler(file_handler)
-
 # Configure handlers to flush immediately
 console_handler.flush = sys.stdout.flush
 file_handler.flush = lambda: file_handler.stream.flush()
 
+# Records are handed to a background listener thread so stdout and file I/O
+# never run on the event loop; the handlers above are driven by the listener.
+log_queue = queue.SimpleQueue()
+queue_handler = QueueHandler(log_queue)
+log_listener = QueueListener(
+    log_queue, console_handler, file_handler, respect_handler_level=True
+)
+logger.addHandler(queue_handler)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+
+def truncate_for_log(value: Any, limit: int | None = None) -> str:
+    """Return str(value) capped at `limit` characters (LOG_MAX_PAYLOAD_CHARS by default)."""
+    limit = LOG_MAX_PAYLOAD_CHARS if limit is None else limit
+    text = value if isinstance(value, str) else str(value)
+    if limit <= 0 or len(text) <= limit:
+        return text
+    return f"{text[:limit]}... [{len(text) - limit} chars truncated]"
+
+
+class LazyLogPayload:
+    """Defer building and truncating a log payload until a handler formats it.
+
+    Pass as a logging argument (``logger.debug("x: %s", LazyLogPayload(obj))``) so
+    nothing is rendered when the level is disabled.
+    """
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: Any, limit: int | None = None):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self) -> str:
+        value = self.value() if callable(self.value) else self.value
+        return truncate_for_log(value, self.limit)
+
+
+def format_messages_for_log(messages: list, limit: int | None = None) -> str:
+    """Compact, size-capped rendering of a message list for history dumps."""
+    limit = LOG_MAX_PAYLOAD_CHARS if limit is None else limit
+    per_message = max(limit // max(len(messages), 1), 80) if limit > 0 else 0
+    lines = []
+    for message in messages:
+        if isinstance(message, dict):
+            role, content = message.get("role"), message.get("content")
+        else:
+            role = getattr(message, "role", None)
+            content = getattr(message, "content", message)
+        lines.append(f"{role}: {truncate_for_log(content, per_message)}")
+    return truncate_for_log("\n".join(lines), limit)
+
 
 def clean_json_response(json_response):
     """Clean and extract JSON from the response."""
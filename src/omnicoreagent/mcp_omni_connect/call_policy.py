@@ -0,0 +1,221 @@
+"""
+Per-server policy for MCP tool calls.
+
+Every session gets an `MCPCallGate` built from the `call_policy` entry of its
+server config. The gate bounds the calls in flight to that server, so a slow
+server queues its own callers instead of absorbing every agent's calls; callers
+that wait longer than `queue_timeout` for a slot fail with `MCPServerBusyError`.
+Calls get a timeout per tool, and tools declared idempotent are hedged: a second
+request is sent if the first is slow and a slot is free, and a transient failure
+(timeout or connection error) is retried. The gate records latency, queue wait
+and in-flight counts for `MCPClient.get_call_stats()`.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+import httpx
+from mcp.shared.exceptions import McpError
+
+from omnicoreagent.core.run_timing import LatencyHistogram
+
+# session read timeout, used for calls without a policy timeout
+DEFAULT_READ_TIMEOUT = 300
+
+
+class MCPServerBusyError(TimeoutError):
+    """No call slot of a server became free within the policy's queue timeout."""
+
+
+@dataclass
+class MCPCallPolicy:
+    """How calls to one MCP server are bounded, timed out and retried."""
+
+    max_in_flight: Optional[int] = None
+    queue_timeout: Optional[float] = None
+    call_timeout: Optional[float] = None
+    tool_timeouts: Dict[str, float] = field(default_factory=dict)
+    idempotent_tools: List[str] = field(default_factory=list)
+    hedge_after: Optional[float] = None
+    retries: int = 1
+
+    def __post_init__(self):
+        if self.max_in_flight is not None and self.max_in_flight <= 0:
+            raise ValueError("max_in_flight must be positive")
+        for name in ("queue_timeout", "call_timeout", "hedge_after"):
+            value = getattr(self, name)
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive")
+        if any(timeout <= 0 for timeout in self.tool_timeouts.values()):
+            raise ValueError("tool_timeouts must be positive")
+        if self.retries < 0:
+            raise ValueError("retries must not be negative")
+
+    @classmethod
+    def from_config(cls, data: Optional[Dict[str, Any]]) -> "MCPCallPolicy":
+        return cls(**(data or {}))
+
+    def timeout_for(self, tool_name: str) -> Optional[float]:
+        return self.tool_timeouts.get(tool_name, self.call_timeout)
+
+    def is_idempotent(self, tool_name: str) -> bool:
+        return tool_name in self.idempotent_tools or "*" in self.idempotent_tools
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Failures a repeated call may not hit: timeouts and lost connections."""
+    if isinstance(exc, McpError):
+        return exc.error.code == httpx.codes.REQUEST_TIMEOUT
+    return isinstance(exc, (TimeoutError, ConnectionError, httpx.TransportError))
+
+
+class MCPCallGate:
+    """Applies an `MCPCallPolicy` to the tool calls of one session."""
+
+    def __init__(self, server_name: str, policy: Optional[MCPCallPolicy] = None):
+        self.server_name = server_name
+        self.policy = policy or MCPCallPolicy()
+        self._slots = (
+            asyncio.Semaphore(self.policy.max_in_flight)
+            if self.policy.max_in_flight
+            else None
+        )
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.queued = 0
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.retries = 0
+        self.hedges = 0
+        self.latency = LatencyHistogram()
+        self.queue_wait = LatencyHistogram()
+
+    async def call(self, session: Any, tool_name: str, tool_args: Any) -> Any:
+        """`session.call_tool` within the server's concurrency and timeout policy."""
+        await self._acquire()
+        started = time.perf_counter()
+        self.calls += 1
+        try:
+            if self.policy.is_idempotent(tool_name):
+                return await self._call_hedged(session, tool_name, tool_args)
+            return await self._call_once(session, tool_name, tool_args)
+        except BaseException as e:
+            if not isinstance(e, asyncio.CancelledError):
+                self.errors += 1
+            raise
+        finally:
+            self.latency.record(time.perf_counter() - started)
+            self._release()
+
+    async def _acquire(self):
+        started = time.perf_counter()
+        if self._slots is not None:
+            self.queued += 1
+            try:
+                await asyncio.wait_for(
+                    self._slots.acquire(), timeout=self.policy.queue_timeout
+                )
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise MCPServerBusyError(
+                    f"MCP server {self.server_name} is busy: no call slot free "
+                    f"within {self.policy.queue_timeout}s"
+                ) from None
+            finally:
+                self.queued -= 1
+        self.queue_wait.record(time.perf_counter() - started)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _release(self):
+        self.in_flight -= 1
+        if self._slots is not None:
+            self._slots.release()
+
+    def _has_free_slot(self) -> bool:
+        return self._slots is None or not self._slots.locked()
+
+    async def _call_once(self, session: Any, tool_name: str, tool_args: Any) -> Any:
+        timeout = self.policy.timeout_for(tool_name)
+        try:
+            return await session.call_tool(
+                tool_name,
+                tool_args,
+                read_timeout_seconds=timedelta(seconds=timeout) if timeout else None,
+            )
+        except McpError as e:
+            if e.error.code == httpx.codes.REQUEST_TIMEOUT:
+                self.timeouts += 1
+            raise
+
+    async def _call_hedge(self, session: Any, tool_name: str, tool_args: Any) -> Any:
+        """A second request for a slow call, holding a slot of its own."""
+        await self._acquire()
+        try:
+            return await self._call_once(session, tool_name, tool_args)
+        finally:
+            self._release()
+
+    async def _call_hedged(self, session: Any, tool_name: str, tool_args: Any) -> Any:
+        """First successful result of the call, its hedge and its retries."""
+        pending = {asyncio.create_task(self._call_once(session, tool_name, tool_args))}
+        can_hedge = self.policy.hedge_after is not None
+        retries_left = self.policy.retries
+        last_error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=self.policy.hedge_after if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    # the call is slow: hedge once, if it does not take a queued slot
+                    can_hedge = False
+                    if self._has_free_slot():
+                        self.hedges += 1
+                        pending.add(
+                            asyncio.create_task(
+                                self._call_hedge(session, tool_name, tool_args)
+                            )
+                        )
+                    continue
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+                    if not is_transient(last_error):
+                        raise last_error
+                if not pending and retries_left:
+                    retries_left -= 1
+                    self.retries += 1
+                    pending.add(
+                        asyncio.create_task(
+                            self._call_once(session, tool_name, tool_args)
+                        )
+                    )
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "queued": self.queued,
+            "max_in_flight": self.policy.max_in_flight,
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "latency": self.latency.snapshot(),
+            "queue_wait": self.queue_wait.snapshot(),
+        }
@@ -1,3 +1,4 @@
+import asyncio
 import json
 from enum import Enum
 from typing import Any
@@ -28,9 +29,6 @@ from omnicoreagent.mcp_omni_connect.prompts import (
     get_prompt_with_react_agent,
     list_prompts,
 )
-from omnicoreagent.mcp_omni_connect.refresh_server_capabilities import (
-    refresh_capabilities,
-)
 from omnicoreagent.mcp_omni_connect.resources import (
     list_resources,
     read_resource,
@@ -40,7 +38,6 @@ from omnicoreagent.mcp_omni_connect.resources import (
 from omnicoreagent.core.system_prompts import (
     generate_orchestrator_prompt_template,
     generate_react_agent_prompt,
-    generate_react_agent_role_prompt,
     generate_system_prompt,
 )
 from omnicoreagent.mcp_omni_connect.tools import list_tools
@@ -695,15 +692,12 @@ class MCPClientCLI:
             transient=True,
         ) as progress:
             progress.add_task("Refreshing capabilities...", total=None)
-            await refresh_capabilities(
-                sessions=self.client.sessions,
-                server_names=self.client.server_names,
-                available_tools=self.client.available_tools,
-                available_resources=self.client.available_resources,
-                available_prompts=self.client.available_prompts,
-                debug=self.client.debug,
-                llm_connection=self.client.llm_connection,
-                generate_react_agent_role_prompt=generate_react_agent_role_prompt,
+            # through the client, so capability listeners see the deltas
+            await asyncio.gather(
+                *(
+                    self.client.refresh_server(server_name)
+                    for server_name in list(self.client.server_names)
+                )
             )
         self.console.print("[green]Capabilities refreshed successfully[/]")
 
@@ -4,6 +4,7 @@ import os
 from contextlib import AsyncExitStack
 from dataclasses import dataclass, field
 from datetime import timedelta
+from functools import partial
 from pathlib import Path
 from typing import Any
 import anyio
@@ -15,11 +16,25 @@ from mcp.client.stdio import stdio_client
 from mcp.client.streamable_http import streamablehttp_client
 
 from omnicoreagent.core.llm import LLMConnection
-from omnicoreagent.mcp_omni_connect.notifications import handle_notifications
+from omnicoreagent.mcp_omni_connect.call_policy import (
+    DEFAULT_READ_TIMEOUT,
+    MCPCallGate,
+    MCPCallPolicy,
+)
+from omnicoreagent.mcp_omni_connect.notifications import (
+    CAPABILITY_LIST_CHANGED,
+    CapabilityRefreshScheduler,
+    SessionNotifications,
+)
 from omnicoreagent.mcp_omni_connect.refresh_server_capabilities import (
-    refresh_capabilities,
+    CapabilityDelta,
+    refresh_server_capabilities,
 )
 from omnicoreagent.mcp_omni_connect.sampling import samplingCallback
+from omnicoreagent.mcp_omni_connect.session_pool import (
+    MCP_SESSION_POOL,
+    mcp_session_pool,
+)
 from omnicoreagent.core.utils import logger
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from urllib.parse import parse_qs, urlparse
@@ -218,6 +233,9 @@ class MCPClient:
         self.available_resources = {}
         self.available_prompts = {}
         self.server_names = []
+        # awaited with the CapabilityDelta of every refresh that changed something
+        self.capability_listeners = []
+        self.refresh_scheduler = CapabilityRefreshScheduler(self.refresh_server)
         self.added_servers_names = {}  # this to map the name used in the config and the actual server name gotten after initialization
         self.debug = debug
         self.system_prompt = None
@@ -261,23 +279,65 @@ class MCPClient:
                 logger.info(f"Server connection result: {result}")
         except Exception as e:
             logger.info(f"start servers task error: {e}")
-        # start the notification stream with an asyncio task
-        asyncio.create_task(
-            handle_notifications(
-                sessions=self.sessions,
-                debug=self.debug,
-                server_names=self.server_names,
-                available_tools=self.available_tools,
-                available_resources=self.available_resources,
-                available_prompts=self.available_prompts,
-                refresh_capabilities=refresh_capabilities,
-            )
+
+    async def refresh_server(self, server_name: str) -> CapabilityDelta:
+        """Refresh one server's capabilities and notify the capability listeners."""
+        delta = await refresh_server_capabilities(
+            sessions=self.sessions,
+            server_name=server_name,
+            available_tools=self.available_tools,
+            available_resources=self.available_resources,
+            available_prompts=self.available_prompts,
+            debug=self.debug,
         )
+        if delta.has_changes:
+            for listener in list(self.capability_listeners):
+                try:
+                    await listener(delta)
+                except Exception as e:
+                    logger.error(f"Capability listener failed for {server_name}: {e}")
+        return delta
+
+    def get_call_stats(self) -> dict:
+        """Latency, queueing and in-flight stats of the tool calls per server."""
+        return {
+            server_name: info["call_gate"].get_stats()
+            for server_name, info in self.sessions.items()
+            if info.get("call_gate")
+        }
 
-    async def _connect_to_single_server(self, server, server_added_name):
+    async def _on_server_notification(self, server_name: str, notification: Any):
+        """Refresh the server whose tools, resources or prompts changed."""
+        method = getattr(notification, "method", None)
+        if self.debug:
+            logger.debug(f"Received {method} from {server_name}")
+        if method in CAPABILITY_LIST_CHANGED:
+            logger.info(
+                f"{CAPABILITY_LIST_CHANGED[method].capitalize()} list changed "
+                f"on {server_name}"
+            )
+            self.refresh_scheduler.request(server_name)
+        elif method == "notifications/progress":
+            params = notification.params
+            logger.info(
+                f"Progress from {server_name}: {params.progress}/{params.total}"
+            )
+
+    def _sampling_key(self):
+        """Which clients may share a session, given the sampling callback it uses.
+
+        The default callback only reads the shared servers config, so it answers
+        alike for every client; any other callback keeps its session to itself.
+        """
+        if type(self.sampling_callback) is samplingCallback:
+            return "default"
+        return id(self.sampling_callback)
+
+    async def _open_session(self, server) -> dict:
+        """Open the transport and MCP session for one server config."""
+        # create AsyncExitStack per mcp server to ensure we can remove it safely without cancelling all tasks
+        stack = AsyncExitStack()
         try:
-            # create AsyncExitStack per mcp server to ensure we can remove it safely without cancelling all tasks
-            stack = AsyncExitStack()
             transport_type = server["srv_config"].get("transport_type", "stdio")
             read_stream = None
             write_stream = None
@@ -379,15 +439,59 @@ class MCPClient:
 
                 read_stream, write_stream = transport
 
+            notifications = SessionNotifications()
+            call_gate = MCPCallGate(
+                server["name"],
+                MCPCallPolicy.from_config(server["srv_config"].get("call_policy")),
+            )
             session = await stack.enter_async_context(
                 ClientSession(
                     read_stream,
                     write_stream,
                     sampling_callback=self.sampling_callback._sampling,
-                    read_timeout_seconds=timedelta(seconds=300),  # 5 minutes timeout
+                    read_timeout_seconds=timedelta(seconds=DEFAULT_READ_TIMEOUT),
+                    message_handler=notifications,
                 )
             )
             init_result = await session.initialize()
+        except BaseException:
+            await stack.aclose()
+            raise
+        return {
+            "session": session,
+            "read_stream": read_stream,
+            "write_stream": write_stream,
+            "transport_type": transport_type,
+            "init_result": init_result,
+            "stack": stack,
+            "notifications": notifications,
+            "call_gate": call_gate,
+        }
+
+    async def _connect_to_single_server(self, server, server_added_name):
+        try:
+            srv_config = server["srv_config"]
+            auth_config = srv_config.get("auth", None)
+            use_oauth = auth_config and auth_config.get("method") == "oauth"
+            pool_key = None
+            if MCP_SESSION_POOL and not use_oauth:
+                # identical server configs across agents share one session
+                pooled = await mcp_session_pool.acquire(
+                    srv_config,
+                    lambda: self._open_session(server),
+                    client_id=id(self),
+                    sampling_key=self._sampling_key(),
+                )
+                opened = pooled.session_info
+                pool_key = pooled.key
+            else:
+                opened = await self._open_session(server)
+            session = opened["session"]
+            read_stream = opened["read_stream"]
+            write_stream = opened["write_stream"]
+            transport_type = opened["transport_type"]
+            stack = None if pool_key else opened["stack"]
+            init_result = opened["init_result"]
             server_name = init_result.serverInfo.name
             capabilities = init_result.capabilities
             if server_name in self.server_names:
@@ -396,7 +500,9 @@ class MCPClient:
                 )
                 if self.debug:
                     logger.error(error_message)
-                await stack.aclose()
+                await self._close_session_resources(
+                    server_name, {"stack": stack, "pool_key": pool_key}
+                )
                 return error_message
             self.server_names.append(server_name)
             server_name_data = {server_added_name: server_name}
@@ -409,20 +515,19 @@ class MCPClient:
                 "capabilities": capabilities,
                 "transport_type": transport_type,
                 "stack": stack,
+                "pool_key": pool_key,
+                "notifications": opened["notifications"],
+                "call_gate": opened["call_gate"],
             }
+            opened["notifications"].subscribe(
+                id(self), partial(self._on_server_notification, server_name)
+            )
             if self.debug:
                 logger.info(
                     f"Successfully connected to {server_name} via {transport_type}"
                 )
-            # refresh capabilities to ensure we have the latest tools, resources, and prompts
-            await refresh_capabilities(
-                sessions=self.sessions,
-                server_names=self.server_names,
-                available_tools=self.available_tools,
-                available_resources=self.available_resources,
-                available_prompts=self.available_prompts,
-                debug=self.debug,
-            )
+            # load the tools, resources and prompts of the new server only
+            await self.refresh_server(server_name)
 
             return f"{server_name} connected succesfully"
         except Exception as e:
@@ -485,6 +590,7 @@ class MCPClient:
             logger.error(error_message)
             return error_message
 
+        self.refresh_scheduler.cancel(name)
         self.sessions.pop(name, None)
         self.server_names.remove(name)
         self.added_servers_names = {
@@ -501,6 +607,14 @@ class MCPClient:
     async def _close_session_resources(self, server_name: str, session_info: dict):
         """Tear down the per-server context stack, which closes streams and session."""
 
+        notifications = session_info.get("notifications")
+        if notifications:
+            notifications.unsubscribe(id(self))
+        pool_key = session_info.get("pool_key")
+        if pool_key:
+            # shared session: only closed once its last client releases it
+            await mcp_session_pool.release(pool_key, client_id=id(self))
+            return
         stack: AsyncExitStack = session_info.get("stack")
         if not stack:
             logger.warning(f"No context stack found for {server_name}")
@@ -553,6 +667,7 @@ class MCPClient:
                 logger.error(f"Error during server cleanup: {e}")
 
             # Clear any remaining data structures
+            self.refresh_scheduler.cancel()
             self.server_names.clear()
             self.added_servers_names.clear()
             self.sessions.clear()
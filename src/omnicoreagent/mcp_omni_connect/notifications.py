@@ -1,128 +1,144 @@
+"""
+Notifications sent by MCP servers.
+
+Each ClientSession runs its own receive loop and hands every message to its
+`message_handler`, so all sessions are read concurrently. `SessionNotifications`
+is that handler for one session: it fans notifications out to the process-wide
+listeners and to the clients using the session, which may be several when the
+session is pooled. List-changed notifications become per-server refreshes
+through `CapabilityRefreshScheduler`, which debounces and coalesces them.
+"""
+
 import asyncio
-from collections.abc import Callable
-from typing import Any
+from collections.abc import Awaitable, Callable
+from typing import Any, Optional
 
-from mcp.types import (
-    ProgressNotification,
-    PromptListChangedNotification,
-    ResourceListChangedNotification,
-    ResourceUpdatedNotification,
-    ToolListChangedNotification,
-)
+from decouple import config
+from mcp.types import ServerNotification
 
 from omnicoreagent.core.utils import logger
 
+# seconds to wait for more list-changed notifications before refreshing a server
+MCP_NOTIFICATION_DEBOUNCE = config("MCP_NOTIFICATION_DEBOUNCE", default=0.5, cast=float)
+
+CAPABILITY_LIST_CHANGED = {
+    "notifications/tools/list_changed": "tools",
+    "notifications/resources/list_changed": "resources",
+    "notifications/prompts/list_changed": "prompts",
+}
+
+NotificationListener = Callable[[Any], Awaitable[None]]
+
+# process-wide listeners for server notifications, e.g. resource triggers
+_notification_listeners: list[NotificationListener] = []
+_listener_tasks: set[asyncio.Task] = set()
+
+
+def add_notification_listener(listener: NotificationListener):
+    """Call `listener(notification)` for every notification any MCP server sends."""
+    _notification_listeners.append(listener)
+
+
+def remove_notification_listener(listener: NotificationListener):
+    if listener in _notification_listeners:
+        _notification_listeners.remove(listener)
+
+
+def _spawn(coro: Awaitable[None]):
+    task = asyncio.create_task(coro)
+    _listener_tasks.add(task)
+    task.add_done_callback(_listener_tasks.discard)
+
+
+async def dispatch_server_message(message: Any):
+    """Fan a server notification out to the process-wide listeners.
 
-async def handle_notifications(
-    sessions: dict[str, dict[str, Any]],
-    debug: bool = False,
-    server_names: list[str] = None,
-    available_tools: dict[str, Any] = None,
-    available_resources: dict[str, Any] = None,
-    available_prompts: dict[str, Any] = None,
-    refresh_capabilities: Callable[[], Any] = None,
-):
-    """Handle incoming notifications from the server."""
-    try:
-        for server_name in sessions:
-            async for message in sessions[server_name]["session"].incoming_messages:
-                logger.debug(f"Received notification from {server_name}: {message}")
-
-                # Common refresh function for capability changes
-                async def refresh_capabilities_task():
-                    try:
-                        logger.info(f"Starting capability refresh for {server_name}")
-
-                        await refresh_capabilities(
-                            sessions=sessions,
-                            server_names=server_names,
-                            available_tools=available_tools,
-                            available_resources=available_resources,
-                            available_prompts=available_prompts,
-                            debug=debug,
-                        )
-                        logger.info(
-                            f"Successfully refreshed capabilities after notification from {server_name}"
-                        )
-                        # Force flush logs
-                        for handler in logger.handlers:
-                            handler.flush()
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to refresh capabilities after notification from {server_name}: {str(e)}"
-                        )
-                        # Force flush logs
-                        for handler in logger.handlers:
-                            handler.flush()
+    Listeners run as separate tasks because this is awaited inside the session's
+    receive loop; a listener that calls back into the session would deadlock it.
+    """
+    if not isinstance(message, ServerNotification):
+        return
+    for listener in list(_notification_listeners):
+        _spawn(listener(message.root))
 
+
+class SessionNotifications:
+    """`message_handler` of one ClientSession.
+
+    Besides the process-wide listeners it notifies the clients subscribed to
+    this session, so each client learns which of its servers sent what.
+    """
+
+    def __init__(self):
+        self._subscribers: dict[Any, NotificationListener] = {}
+
+    def subscribe(self, client_id: Any, listener: NotificationListener):
+        self._subscribers[client_id] = listener
+
+    def unsubscribe(self, client_id: Any):
+        self._subscribers.pop(client_id, None)
+
+    async def __call__(self, message: Any):
+        await dispatch_server_message(message)
+        if not isinstance(message, ServerNotification):
+            return
+        for listener in list(self._subscribers.values()):
+            _spawn(listener(message.root))
+
+
+class CapabilityRefreshScheduler:
+    """Debounced, coalesced refreshes of single servers.
+
+    `request(server)` marks the server stale. A refresh starts `debounce`
+    seconds later and takes in every request made meanwhile; requests made
+    while it runs lead to exactly one more refresh afterwards. At most one
+    refresh per server is in flight, so a storm of notifications costs a
+    couple of refreshes instead of one each.
+    """
+
+    def __init__(
+        self,
+        refresh: Callable[[str], Awaitable[Any]],
+        debounce: Optional[float] = None,
+    ):
+        self.refresh = refresh
+        self.debounce = MCP_NOTIFICATION_DEBOUNCE if debounce is None else debounce
+        self.requests = 0
+        self.refreshes = 0
+        self._stale: set[str] = set()
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def request(self, server_name: str):
+        self.requests += 1
+        self._stale.add(server_name)
+        task = self._tasks.get(server_name)
+        if task is None or task.done():
+            self._tasks[server_name] = asyncio.create_task(
+                self._refresh_while_stale(server_name)
+            )
+
+    async def _refresh_while_stale(self, server_name: str):
+        try:
+            while server_name in self._stale:
+                await asyncio.sleep(self.debounce)
+                self._stale.discard(server_name)
+                self.refreshes += 1
                 try:
-                    match message.root:
-                        case ResourceUpdatedNotification(params=params):
-                            logger.info(
-                                f"Resource updated: {params.uri} from {server_name}"
-                            )
-                            # Create and track the task
-                            task = asyncio.create_task(refresh_capabilities_task())
-                            # Add a callback to log completion
-                            task.add_done_callback(
-                                lambda t: logger.debug(
-                                    f"Capability refresh task completed for {server_name}"
-                                )
-                            )
-
-                        case ResourceListChangedNotification(params=params):
-                            logger.info(f"Resource list changed from {server_name}")
-                            task = asyncio.create_task(refresh_capabilities_task())
-                            task.add_done_callback(
-                                lambda t: logger.debug(
-                                    f"Capability refresh task completed for {server_name}"
-                                )
-                            )
-
-                        case ToolListChangedNotification(params=params):
-                            logger.info(f"Tool list changed from {server_name}")
-                            task = asyncio.create_task(refresh_capabilities_task())
-                            task.add_done_callback(
-                                lambda t: logger.debug(
-                                    f"Capability refresh task completed for {server_name}"
-                                )
-                            )
-
-                        case PromptListChangedNotification(params=params):
-                            logger.info(f"Prompt list changed from {server_name}")
-                            task = asyncio.create_task(refresh_capabilities_task())
-                            task.add_done_callback(
-                                lambda t: logger.debug(
-                                    f"Capability refresh task completed for {server_name}"
-                                )
-                            )
-
-                        case ProgressNotification(params=params):
-                            progress_percentage = (
-                                (params.progress / params.total * 100)
-                                if params.total > 0
-                                else 0
-                            )
-                            logger.info(
-                                f"Progress from {server_name}: {params.progress}/{params.total} "
-                                f"({progress_percentage:.1f}%)"
-                            )
-
-                        case _:
-                            logger.warning(
-                                f"Unhandled notification type from {server_name}: {type(message.root).__name__}"
-                            )
+                    await self.refresh(server_name)
+                    logger.info(f"Refreshed capabilities of {server_name}")
                 except Exception as e:
                     logger.error(
-                        f"Error processing notification from {server_name}: {str(e)}"
+                        f"Failed to refresh capabilities of {server_name}: {e}"
                     )
-                    continue
-
-    except AttributeError:
-        logger.warning(f"No notification received from {server_name}")
-    except Exception as e:
-        logger.error(f"Fatal error in notification handler: {str(e)}")
-    finally:
-        # Force flush logs at the end of the handler
-        for handler in logger.handlers:
-            handler.flush()
+        finally:
+            if self._tasks.get(server_name) is asyncio.current_task():
+                del self._tasks[server_name]
+
+    def cancel(self, server_name: Optional[str] = None):
+        """Drop pending refreshes of one server, or of all servers."""
+        names = [server_name] if server_name else list(self._tasks)
+        for name in names:
+            self._stale.discard(name)
+            task = self._tasks.pop(name, None)
+            if task:
+                task.cancel()
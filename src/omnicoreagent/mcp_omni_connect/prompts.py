@@ -1,7 +1,7 @@
 from collections.abc import Callable
 from typing import Any
 
-from omnicoreagent.core.agents.token_usage import UsageLimits, usage
+from omnicoreagent.core.agents.token_usage import UsageLimits, usage_ledger
 from omnicoreagent.core.utils import logger
 
 
@@ -54,8 +54,10 @@ async def get_prompt(
     usage_limits = UsageLimits(
         request_limit=request_limit, total_tokens_limit=total_tokens_limit
     )
-    usage_limits.check_before_request(usage=usage)
     agent_name = "tool_calling_agent"
+    usage_limits.check_before_request(
+        usage=usage_ledger.usage_for(agent_name=agent_name, session_id=chat_id)
+    )
     server_name, found = await find_prompt_server(name, available_prompts)
     if debug:
         logger.info(f"Getting prompt: {name} from {server_name}")
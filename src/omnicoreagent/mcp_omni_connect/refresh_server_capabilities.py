@@ -1,7 +1,155 @@
-from collections.abc import Callable
-from typing import Any
+"""
+Refresh of the tools, resources and prompts exposed by connected MCP servers.
+
+Each server is refreshed on its own: its three lists are fetched concurrently,
+following pagination cursors, and servers are refreshed concurrently with each
+other. Capabilities a server did not advertise at initialization are not
+requested. The new lists are diffed against the cached ones, the cache is only
+replaced for kinds that changed, and the returned `CapabilityDelta` names the
+added, removed and changed entries so dependent caches can update just those.
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
 from omnicoreagent.core.utils import logger
 
+CAPABILITY_KINDS = ("tools", "resources", "prompts")
+
+
+@dataclass
+class CapabilityDelta:
+    """Entries of one server that changed in a refresh, by kind.
+
+    Tools and prompts are keyed by name, resources by URI.
+    """
+
+    server_name: str
+    added: dict[str, list[str]] = field(default_factory=dict)
+    removed: dict[str, list[str]] = field(default_factory=dict)
+    changed: dict[str, list[str]] = field(default_factory=dict)
+
+    @property
+    def has_changes(self) -> bool:
+        return (
+            any(self.added.values())
+            or any(self.removed.values())
+            or any(self.changed.values())
+        )
+
+    def kind_changed(self, kind: str) -> bool:
+        return bool(
+            self.added.get(kind) or self.removed.get(kind) or self.changed.get(kind)
+        )
+
+    def record(self, kind: str, previous: dict[str, str], current: dict[str, str]):
+        self.added[kind] = sorted(current.keys() - previous.keys())
+        self.removed[kind] = sorted(previous.keys() - current.keys())
+        self.changed[kind] = sorted(
+            key
+            for key in current.keys() & previous.keys()
+            if current[key] != previous[key]
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "server_name": self.server_name,
+            "added": self.added,
+            "removed": self.removed,
+            "changed": self.changed,
+        }
+
+
+def _entry_key(kind: str, item: Any) -> str:
+    return str(item.uri) if kind == "resources" else str(item.name)
+
+
+def _entry_fingerprint(item: Any) -> str:
+    data = item.model_dump(mode="json") if hasattr(item, "model_dump") else item
+    return json.dumps(data, sort_keys=True, default=str)
+
+
+async def _list_all(session: Any, kind: str) -> list[Any]:
+    """Every page of `session.list_<kind>()`."""
+    list_page = getattr(session, f"list_{kind}")
+    items: list[Any] = []
+    cursor = None
+    while True:
+        response = await list_page(cursor=cursor)
+        if not response:
+            break
+        items.extend(getattr(response, kind) or [])
+        cursor = getattr(response, "nextCursor", None)
+        if not cursor:
+            break
+    return items
+
+
+async def _list_kind(
+    server_name: str, session: Any, capabilities: Any, kind: str
+) -> Optional[list[Any]]:
+    """A server's entries of one kind; None if listing failed and the cache stays."""
+    if capabilities is not None and getattr(capabilities, kind, None) is None:
+        return []
+    try:
+        return await _list_all(session, kind)
+    except Exception as e:
+        logger.info(f"{server_name} does not support {kind}: {e}")
+        return None
+
+
+async def refresh_server_capabilities(
+    sessions: dict[str, Any],
+    server_name: str,
+    available_tools: dict[str, Any],
+    available_resources: dict[str, Any],
+    available_prompts: dict[str, Any],
+    debug: bool = False,
+) -> CapabilityDelta:
+    """Refresh the capabilities of one server and return what changed."""
+    if not sessions.get(server_name, {}).get("connected", False):
+        raise ValueError(f"Not connected to server: {server_name}")
+
+    delta = CapabilityDelta(server_name)
+    session = sessions[server_name].get("session")
+    if not session:
+        logger.warning(f"No session found for server: {server_name}")
+        return delta
+
+    capabilities = sessions[server_name].get("capabilities")
+    listed = await asyncio.gather(
+        *(
+            _list_kind(server_name, session, capabilities, kind)
+            for kind in CAPABILITY_KINDS
+        )
+    )
+    caches = {
+        "tools": available_tools,
+        "resources": available_resources,
+        "prompts": available_prompts,
+    }
+    for kind, items in zip(CAPABILITY_KINDS, listed):
+        cache = caches[kind]
+        if items is None:
+            cache.setdefault(server_name, [])
+            continue
+        delta.record(
+            kind,
+            {
+                _entry_key(kind, item): _entry_fingerprint(item)
+                for item in cache.get(server_name, [])
+            },
+            {_entry_key(kind, item): _entry_fingerprint(item) for item in items},
+        )
+        if server_name not in cache or delta.kind_changed(kind):
+            cache[server_name] = items
+
+    if debug:
+        logger.info(f"Refreshed capabilities of {server_name}: {delta.as_dict()}")
+    return delta
+
 
 async def refresh_capabilities(
     sessions: dict[str, Any],
@@ -10,46 +158,25 @@ async def refresh_capabilities(
     available_resources: dict[str, Any],
     available_prompts: dict[str, Any],
     debug: bool,
-) -> None:
-    """Refresh the capabilities of the server and update system prompt"""
+) -> dict[str, CapabilityDelta]:
+    """Refresh the capabilities of several servers concurrently."""
     for server_name in server_names:
         if not sessions.get(server_name, {}).get("connected", False):
             raise ValueError(f"Not connected to server: {server_name}")
 
-        session = sessions[server_name].get("session")
-        if not session:
-            logger.warning(f"No session found for server: {server_name}")
-            continue
-
-        # List all tools
-        try:
-            tools_response = await session.list_tools()
-            available_tools[server_name] = (
-                tools_response.tools if tools_response else []
-            )
-        except Exception as e:
-            logger.info(f"{server_name} does not support tools: {e}")
-            available_tools[server_name] = []
-
-        # List all resources
-        try:
-            resources_response = await session.list_resources()
-            available_resources[server_name] = (
-                resources_response.resources if resources_response else []
+    deltas = await asyncio.gather(
+        *(
+            refresh_server_capabilities(
+                sessions=sessions,
+                server_name=server_name,
+                available_tools=available_tools,
+                available_resources=available_resources,
+                available_prompts=available_prompts,
+                debug=debug,
             )
-        except Exception as e:
-            logger.info(f"{server_name} does not support resources: {e}")
-            available_resources[server_name] = []
-
-        # List all prompts
-        try:
-            prompts_response = await session.list_prompts()
-            available_prompts[server_name] = (
-                prompts_response.prompts if prompts_response else []
-            )
-        except Exception as e:
-            logger.info(f"{server_name} does not support prompts: {e}")
-            available_prompts[server_name] = []
+            for server_name in server_names
+        )
+    )
 
     if debug:
         logger.info(f"Refreshed capabilities for {server_names}")
@@ -65,5 +192,4 @@ async def refresh_capabilities(
                 for item in items:
                     logger.info(f"    - {item.name}")
 
-    if debug:
-        logger.info("Updated system prompt with new capabilities")
+    return {delta.server_name: delta for delta in deltas}
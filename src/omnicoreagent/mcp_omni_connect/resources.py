@@ -5,8 +5,9 @@ from omnicoreagent.core.agents.token_usage import (
     Usage,
     UsageLimitExceeded,
     UsageLimits,
-    session_stats,
-    usage,
+    UsageScope,
+    record_request_usage,
+    usage_ledger,
 )
 from omnicoreagent.core.utils import logger
 
@@ -100,7 +101,10 @@ async def read_resource(
     usage_limits = UsageLimits(
         request_limit=request_limit, total_tokens_limit=total_tokens_limit
     )
-    usage_limits.check_before_request(usage=usage)
+    usage_scope = UsageScope(agent_name="resource_reader")
+    usage_limits.check_before_request(
+        usage=usage_ledger.usage_for(**usage_scope.as_dict())
+    )
     server_name, found = await find_resource_server(uri, available_resources)
     if not found:
         error_message = f"Resource not found: {uri}"
@@ -128,34 +132,21 @@ async def read_resource(
                     response_tokens=llm_response.usage.completion_tokens,
                     total_tokens=llm_response.usage.total_tokens,
                 )
-                usage.incr(request_usage)
-                # Check if we've exceeded token limits
-                usage_limits.check_tokens(usage)
-                # Show remaining resources
-                remaining_tokens = usage_limits.remaining_tokens(usage)
-                used_tokens = usage.total_tokens
-                used_requests = usage.requests
-                remaining_requests = request_limit - used_requests
-                session_stats.update(
-                    {
-                        "used_requests": used_requests,
-                        "used_tokens": used_tokens,
-                        "remaining_requests": remaining_requests,
-                        "remaining_tokens": remaining_tokens,
-                        "request_tokens": request_usage.request_tokens,
-                        "response_tokens": request_usage.response_tokens,
-                        "total_tokens": request_usage.total_tokens,
-                    }
+                stats = record_request_usage(
+                    ledger=usage_ledger,
+                    scope=usage_scope,
+                    usage_limits=usage_limits,
+                    incr_usage=request_usage,
                 )
                 if debug:
                     logger.info(
-                        f"API Call Stats - Requests: {used_requests}/{request_limit}, "
-                        f"Tokens: {used_tokens}/{usage_limits.total_tokens_limit}, "
+                        f"API Call Stats - Requests: {stats['used_requests']}/{request_limit}, "
+                        f"Tokens: {stats['used_tokens']}/{usage_limits.total_tokens_limit}, "
                         f"Request Tokens: {request_usage.request_tokens}, "
                         f"Response Tokens: {request_usage.response_tokens}, "
                         f"Total Tokens: {request_usage.total_tokens}, "
-                        f"Remaining Requests: {remaining_requests}, "
-                        f"Remaining Tokens: {remaining_tokens}"
+                        f"Remaining Requests: {stats['remaining_requests']}, "
+                        f"Remaining Tokens: {stats['remaining_tokens']}"
                     )
 
             if hasattr(llm_response, "choices"):
@@ -0,0 +1,158 @@
+"""
+Process-wide pool of MCP server sessions.
+
+Every `OmniAgent` owns its own `MCPClient`, so several agents configured with
+the same server used to spawn one subprocess (or HTTP session) each. The pool
+keys sessions by their server config and sampling callback: the first client
+to connect opens the session, later clients with an identical config and
+callback share it, and the session is closed when the last of them releases it.
+
+anyio requires a session's context stack to be closed by the task that entered
+it, and the clients sharing a session connect and disconnect from arbitrary
+tasks. Each pooled session is therefore owned by a dedicated task that opens
+the stack, waits until the last release and then closes it.
+"""
+
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from decouple import config
+
+from omnicoreagent.core.utils import logger
+
+MCP_SESSION_POOL = config("MCP_SESSION_POOL", default=True, cast=bool)
+
+
+@dataclass
+class PooledSession:
+    """An open MCP session shared by every client that acquired its config."""
+
+    key: str
+    session_info: Dict[str, Any] = field(default_factory=dict)
+    refcount: int = 0
+    clients: set = field(default_factory=set)
+    owner: Optional[asyncio.Task] = None
+    closing: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class MCPSessionPool:
+    """Reference-counted MCP sessions keyed by server config."""
+
+    def __init__(self):
+        self._sessions: Dict[str, PooledSession] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def config_key(srv_config: Dict[str, Any], sampling_key: Any = None) -> str:
+        """Stable key for a server config and sampling callback.
+
+        Equal configs share a session only if their clients answer sampling
+        requests alike, as the session calls back into the client that opened it.
+        """
+        canonical = json.dumps(srv_config, sort_keys=True, default=str)
+        if sampling_key is not None:
+            canonical += f"|sampling:{sampling_key}"
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    async def acquire(
+        self,
+        srv_config: Dict[str, Any],
+        open_session: Callable[[], Awaitable[Dict[str, Any]]],
+        client_id: Any = None,
+        sampling_key: Any = None,
+    ) -> PooledSession:
+        """Return the shared session for `srv_config`, opening it if needed.
+
+        `open_session` is only awaited when no session exists for the key, in
+        the session's owner task; it must return the session info dict including
+        the `stack` that owns the session's resources. Concurrent acquires of the
+        same key wait for a single open.
+        """
+        key = self.config_key(srv_config, sampling_key)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            pooled = self._sessions.get(key)
+            if pooled is None:
+                pooled = PooledSession(key)
+                opened = asyncio.get_running_loop().create_future()
+                pooled.owner = asyncio.create_task(
+                    self._own(pooled, open_session, opened)
+                )
+                try:
+                    pooled.session_info = await opened
+                except asyncio.CancelledError:
+                    # nobody will release it: let the owner close it once open
+                    pooled.closing.set()
+                    raise
+                self._sessions[key] = pooled
+            else:
+                logger.debug(f"Reusing pooled MCP session {key[:12]}")
+            pooled.refcount += 1
+            if client_id is not None:
+                pooled.clients.add(client_id)
+            return pooled
+
+    async def release(self, key: str, client_id: Any = None) -> bool:
+        """Drop one reference; closes the session when none are left.
+
+        Returns True if the session was closed.
+        """
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            pooled = self._sessions.get(key)
+            if pooled is None:
+                return False
+            pooled.refcount -= 1
+            pooled.clients.discard(client_id)
+            if pooled.refcount > 0:
+                return False
+            del self._sessions[key]
+        # the owner task entered the stack, so it is the one to close it
+        pooled.closing.set()
+        if pooled.owner is not None:
+            await asyncio.gather(pooled.owner, return_exceptions=True)
+        return True
+
+    @staticmethod
+    async def _own(
+        pooled: PooledSession,
+        open_session: Callable[[], Awaitable[Dict[str, Any]]],
+        opened: asyncio.Future,
+    ):
+        """Open the session, hold it until the last release, then close it."""
+        try:
+            session_info = await open_session()
+        except BaseException as e:
+            if not opened.done():
+                opened.set_exception(e)
+            return
+        opened.set_result(session_info)
+        try:
+            await pooled.closing.wait()
+        finally:
+            stack = session_info.get("stack")
+            if stack is not None:
+                try:
+                    await stack.aclose()
+                except Exception as e:
+                    logger.error(
+                        f"Error closing pooled MCP session {pooled.key[:12]}: {e}"
+                    )
+            logger.debug(f"Closed pooled MCP session {pooled.key[:12]}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self._sessions),
+            "references": sum(p.refcount for p in self._sessions.values()),
+            "shared": {
+                key[:12]: pooled.refcount
+                for key, pooled in self._sessions.items()
+                if pooled.refcount > 1
+            },
+        }
+
+
+mcp_session_pool = MCPSessionPool()
@@ -10,7 +10,17 @@ from .background_agent import (
     BackgroundAgentManager,
     TaskRegistry,
     APSchedulerBackend,
+    AsyncIOSchedulerBackend,
     BackgroundTaskScheduler,
+    RedisLeaseCoordinator,
+    RedisTaskRegistry,
+    WorkerPool,
+    BaseTrigger,
+    FileWatchTrigger,
+    MCPResourceTrigger,
+    QueueTrigger,
+    RedisPubSubTrigger,
+    RedisStreamTrigger,
 )
 
 __all__ = [
@@ -19,5 +29,15 @@ __all__ = [
     "BackgroundAgentManager",
     "TaskRegistry",
     "APSchedulerBackend",
+    "AsyncIOSchedulerBackend",
     "BackgroundTaskScheduler",
+    "RedisLeaseCoordinator",
+    "RedisTaskRegistry",
+    "WorkerPool",
+    "BaseTrigger",
+    "FileWatchTrigger",
+    "MCPResourceTrigger",
+    "QueueTrigger",
+    "RedisPubSubTrigger",
+    "RedisStreamTrigger",
 ]
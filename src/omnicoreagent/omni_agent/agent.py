@@ -4,7 +4,11 @@ from typing import Any, Dict, List, Optional, Union
 
 from omnicoreagent.core.agents.react_agent import ReactAgent
 from omnicoreagent.core.agents.types import AgentConfig as ReactAgentConfig
+from omnicoreagent.core.constants import MCP_TOOLS_REGISTRY
 from omnicoreagent.mcp_omni_connect.client import Configuration, MCPClient
+from omnicoreagent.mcp_omni_connect.refresh_server_capabilities import (
+    CapabilityDelta,
+)
 from omnicoreagent.core.llm import LLMConnection
 from omnicoreagent.core.memory_store.memory_router import MemoryRouter
 from omnicoreagent.omni_agent.config import (
@@ -196,6 +200,35 @@ class OmniAgent:
                     store_tool=store_tool,
                     tool_exists=tool_exists,
                 )
+                self._semantic_tools_manager = semantic_tools_manager
+                # later refreshes only re-enrich the tools that changed
+                if self._update_tools_knowledge_base not in (
+                    self.mcp_client.capability_listeners
+                ):
+                    self.mcp_client.capability_listeners.append(
+                        self._update_tools_knowledge_base
+                    )
+
+    async def _update_tools_knowledge_base(self, delta: CapabilityDelta):
+        """Apply a server's tool changes to the tools knowledge base."""
+        stale = delta.removed.get("tools", []) + delta.changed.get("tools", [])
+        for tool_name in stale:
+            MCP_TOOLS_REGISTRY.pop(tool_name, None)
+
+        updated = set(delta.added.get("tools", []) + delta.changed.get("tools", []))
+        if not updated:
+            return
+        tools = [
+            tool
+            for tool in self.mcp_client.available_tools.get(delta.server_name, [])
+            if str(getattr(tool, "name", None)) in updated
+        ]
+        await self._semantic_tools_manager._process_tools_for_server(
+            server_name=delta.server_name,
+            tools=tools,
+            store_tool=self.memory_router.store_tool,
+            tool_exists=self.memory_router.tool_exists,
+        )
 
     async def run(self, query: str, session_id: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -325,6 +358,9 @@ class OmniAgent:
         if self.mcp_client:
             await self.mcp_client.cleanup()
 
+        # make sure queued events reach the event store
+        await self.event_router.flush()
+
         # Clean up config files
         self._cleanup_config()
 
@@ -8,13 +8,33 @@ background agents that can execute tasks automatically.
 from .background_agents import BackgroundOmniAgent
 from .background_agent_manager import BackgroundAgentManager
 from .task_registry import TaskRegistry
-from .scheduler_backend import APSchedulerBackend
+from .scheduler_backend import APSchedulerBackend, AsyncIOSchedulerBackend
 from .base import BackgroundTaskScheduler
+from .distributed import RedisLeaseCoordinator, RedisTaskRegistry
+from .worker_pool import WorkerPool
+from .triggers import (
+    BaseTrigger,
+    FileWatchTrigger,
+    MCPResourceTrigger,
+    QueueTrigger,
+    RedisPubSubTrigger,
+    RedisStreamTrigger,
+)
 
 __all__ = [
     "BackgroundOmniAgent",
     "BackgroundAgentManager",
     "TaskRegistry",
     "APSchedulerBackend",
+    "AsyncIOSchedulerBackend",
     "BackgroundTaskScheduler",
+    "RedisLeaseCoordinator",
+    "RedisTaskRegistry",
+    "WorkerPool",
+    "BaseTrigger",
+    "FileWatchTrigger",
+    "MCPResourceTrigger",
+    "QueueTrigger",
+    "RedisPubSubTrigger",
+    "RedisStreamTrigger",
 ]
@@ -5,19 +5,36 @@ Background Agent Manager for orchestrating multiple background agents.
 import asyncio
 
 from typing import Any, Dict, List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 
 from omnicoreagent.omni_agent.background_agent.background_agents import (
     BackgroundOmniAgent,
 )
 from omnicoreagent.omni_agent.background_agent.task_registry import TaskRegistry
+from omnicoreagent.omni_agent.background_agent.triggers import BaseTrigger, fingerprint
+from omnicoreagent.omni_agent.background_agent.worker_pool import WorkerPool
+from omnicoreagent.omni_agent.background_agent.base import BackgroundTaskScheduler
+from omnicoreagent.omni_agent.background_agent.distributed import (
+    RedisLeaseCoordinator,
+)
+from omnicoreagent.omni_agent.background_agent.metrics import (
+    RunListener,
+    render_prometheus,
+)
 from omnicoreagent.omni_agent.background_agent.scheduler_backend import (
-    APSchedulerBackend,
+    AsyncIOSchedulerBackend,
 )
 from omnicoreagent.core.memory_store.memory_router import MemoryRouter
 from omnicoreagent.core.events.event_router import EventRouter
 from omnicoreagent.core.utils import logger
 
+# interval schedules of distributed agents are anchored here so that every node
+# fires in the same slots
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+LEASE_SWEEPER_JOB_ID = "__lease_sweeper__"
+# how often a triggered run checks whether the agent's scheduled run has finished
+TRIGGER_BUSY_POLL_SECONDS = 0.1
+
 
 class BackgroundAgentManager:
     """Manager for orchestrating multiple background agents."""
@@ -26,6 +43,10 @@ class BackgroundAgentManager:
         self,
         memory_router: Optional[MemoryRouter] = None,
         event_router: Optional[EventRouter] = None,
+        scheduler: Optional[BackgroundTaskScheduler] = None,
+        task_registry: Optional[TaskRegistry] = None,
+        coordinator: Optional[RedisLeaseCoordinator] = None,
+        worker_pool: Optional[WorkerPool] = None,
     ):
         """
         Initialize BackgroundAgentManager.
@@ -33,13 +54,39 @@ class BackgroundAgentManager:
         Args:
             memory_router: Optional shared memory router for all agents
             event_router: Optional shared event router for all agents
+            scheduler: Optional scheduler backend, defaults to an
+                AsyncIOSchedulerBackend running tasks on the application's loop
+            task_registry: Optional task registry, e.g. a RedisTaskRegistry shared
+                by several replicas; in-memory by default
+            coordinator: Optional lease coordinator that makes replicas run each
+                agent once per interval instead of once per replica
+            worker_pool: Optional pool of subprocess workers; agents are then
+                created and run in the workers instead of this process
         """
         self.memory_router = memory_router or MemoryRouter(memory_store_type="memory")
         self.event_router = event_router or EventRouter(event_store_type="memory")
 
         # Core components
-        self.task_registry = TaskRegistry()
-        self.scheduler = APSchedulerBackend()
+        self.task_registry = task_registry or TaskRegistry()
+        self.scheduler = scheduler or AsyncIOSchedulerBackend()
+        self.coordinator = coordinator
+        if coordinator is not None and not self.scheduler.runs_on_event_loop:
+            raise ValueError("Distributed mode requires an event-loop scheduler")
+        self.worker_pool = worker_pool
+        if worker_pool is not None and not self.scheduler.runs_on_event_loop:
+            raise ValueError("Worker pool mode requires an event-loop scheduler")
+        self._stolen_runs: set = set()
+
+        # Event triggers per agent, changes that arrived during a run, and the
+        # outcome of the follow-up run their triggers wait for
+        self.triggers: Dict[str, List[BaseTrigger]] = {}
+        self._trigger_runs: set = set()
+        self._pending_trigger_events: Dict[str, List[Dict[str, Any]]] = {}
+        self._pending_trigger_runs: Dict[str, asyncio.Future] = {}
+        self._paused_agents: set = set()
+
+        # Callbacks invoked with (agent_id, run) after every run of any agent
+        self._run_listeners: List[RunListener] = []
 
         # Agent storage
         self.agents: Dict[str, BackgroundOmniAgent] = {}
@@ -69,6 +116,9 @@ class BackgroundAgentManager:
             if agent_id in self.agents:
                 raise ValueError(f"Agent with ID {agent_id} already exists")
 
+            # Triggers stay in this process, whatever runs the agent
+            triggers = config.pop("triggers", None) or []
+
             # Extract task_config from agent config and register it
             task_config = config.pop("task_config", None)
             if not task_config:
@@ -78,18 +128,25 @@ class BackgroundAgentManager:
             self.task_registry.register(agent_id, task_config)
             logger.info(f"Registered task in TaskRegistry for agent {agent_id}")
 
-            # Create the background agent with TaskRegistry
-            agent = BackgroundOmniAgent(
-                config=config,
-                memory_router=self.memory_router,
-                event_router=self.event_router,
-                task_registry=self.task_registry,  # Pass TaskRegistry to agent
-            )
-            mcp_tools = config.get("mcp_tools", False)
-            if mcp_tools:
-                await agent.connect_mcp_servers()
+            if self.worker_pool is not None:
+                # The agent lives in a worker process, which also connects its
+                # MCP servers; its events are forwarded to our event router
+                await self.worker_pool.start(self.event_router)
+                agent = await self.worker_pool.create_agent(config, self.task_registry)
+            else:
+                # Create the background agent with TaskRegistry
+                agent = BackgroundOmniAgent(
+                    config=config,
+                    memory_router=self.memory_router,
+                    event_router=self.event_router,
+                    task_registry=self.task_registry,  # Pass TaskRegistry to agent
+                )
+                mcp_tools = config.get("mcp_tools", False)
+                if mcp_tools:
+                    await agent.connect_mcp_servers()
 
             # Store agent and config
+            agent.run_metrics.listeners = self._run_listeners
             self.agents[agent_id] = agent
             self.agent_configs[agent_id] = config.copy()
 
@@ -102,6 +159,8 @@ class BackgroundAgentManager:
 
             # Register task in scheduler (now manager is guaranteed to be running)
             self._schedule_agent(agent_id, agent)
+            for trigger in triggers:
+                await self.add_trigger(agent_id, trigger)
 
             # Get event streaming information using agent's method
             event_stream_info = agent.get_event_stream_info()
@@ -187,35 +246,75 @@ class BackgroundAgentManager:
         """List all registered task agent IDs."""
         return self.task_registry.get_agent_ids()
 
+    def _agent_runner(self, agent_id: str, agent: BackgroundOmniAgent, steal=False):
+        """Coroutine function running one scheduled execution of the agent."""
+
+        async def run_agent_task(**kwargs):
+            """Run the agent task on the scheduler's event loop."""
+            try:
+                if self.coordinator is None:
+                    await agent.run_task(**kwargs)
+                else:
+                    await self.coordinator.run_exclusive(
+                        agent_id,
+                        agent.interval,
+                        lambda token: agent.run_task(
+                            fencing_token=token,
+                            fence=self.coordinator.fence(agent_id, token),
+                            **kwargs,
+                        ),
+                        steal=steal,
+                    )
+            except Exception as e:
+                logger.error(f"Error in scheduled task for agent {agent_id}: {e}")
+
+        return run_agent_task
+
     def _schedule_agent(self, agent_id: str, agent: BackgroundOmniAgent):
         """Schedule an agent for execution."""
+        if agent.interval is None:
+            logger.info(f"Agent {agent_id} has no interval, it only runs on triggers")
+            return
         try:
-            # Create a wrapper function to handle the async run_task method
-            def run_agent_task(**kwargs):
-                """Wrapper to run the async agent task in a new event loop."""
-                import asyncio
-
-                try:
-                    # Create a new event loop for this task
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-
-                    # Run the async task
-                    loop.run_until_complete(agent.run_task())
-
-                except Exception as e:
-                    logger.error(f"Error in scheduled task for agent {agent_id}: {e}")
-                finally:
-                    # Clean up the event loop
-                    if loop and not loop.is_closed():
-                        loop.close()
+            if self.scheduler.runs_on_event_loop:
+                run_agent_task = self._agent_runner(agent_id, agent)
+                schedule_options = {
+                    option: getattr(agent, option)
+                    for option in ("jitter", "misfire_grace_time")
+                    if getattr(agent, option, None) is not None
+                }
+                if self.coordinator is not None:
+                    schedule_options["start_date"] = _EPOCH
+            else:
+
+                def run_agent_task(**kwargs):
+                    """Wrapper to run the async agent task in a new event loop."""
+                    loop = None
+                    try:
+                        # Create a new event loop for this task
+                        loop = asyncio.new_event_loop()
+                        asyncio.set_event_loop(loop)
+
+                        # Run the async task
+                        loop.run_until_complete(agent.run_task())
+
+                    except Exception as e:
+                        logger.error(
+                            f"Error in scheduled task for agent {agent_id}: {e}"
+                        )
+                    finally:
+                        # Clean up the event loop
+                        if loop and not loop.is_closed():
+                            loop.close()
+
+                schedule_options = {"max_instances": 1}
 
             # Schedule the agent task
             self.scheduler.schedule_task(
                 agent_id=agent_id,
                 interval=agent.interval,
                 task_fn=run_agent_task,
-                max_instances=1,
+                **schedule_options,
             )
             logger.info(f"Scheduled agent {agent_id} with interval {agent.interval}s")
 
@@ -223,6 +322,119 @@ class BackgroundAgentManager:
             logger.error(f"Failed to schedule agent {agent_id}: {e}")
             raise
 
+    async def add_trigger(self, agent_id: str, trigger: BaseTrigger):
+        """Run the agent whenever `trigger` reports changed input."""
+        if agent_id not in self.agents:
+            raise ValueError(f"Agent {agent_id} not found")
+        self.triggers.setdefault(agent_id, []).append(trigger)
+        await trigger.start(
+            self.agents[agent_id],
+            lambda events: self._on_trigger(agent_id, events),
+        )
+        logger.info(f"Added {type(trigger).__name__} to agent {agent_id}")
+
+    async def _stop_triggers(self, agent_id: str):
+        for trigger in self.triggers.pop(agent_id, []):
+            await trigger.stop()
+        self._pending_trigger_events.pop(agent_id, None)
+        pending_run = self._pending_trigger_runs.pop(agent_id, None)
+        if pending_run is not None and not pending_run.done():
+            pending_run.set_result(False)
+
+    async def _on_trigger(self, agent_id: str, events: List[Dict[str, Any]]) -> bool:
+        """Run the agent for a batch of trigger events.
+
+        Events arriving while a triggered run is in progress are coalesced into
+        one follow-up run, so no change is lost and runs never overlap. Returns
+        whether a run for `events` completed, which is when the trigger may
+        treat their input as seen.
+        """
+        agent = self.agents.get(agent_id)
+        if agent is None or agent_id in self._paused_agents:
+            return False
+        if agent_id in self._trigger_runs:
+            self._pending_trigger_events.setdefault(agent_id, []).extend(events)
+            pending_run = self._pending_trigger_runs.get(agent_id)
+            if pending_run is None:
+                pending_run = asyncio.get_running_loop().create_future()
+                self._pending_trigger_runs[agent_id] = pending_run
+            return await asyncio.shield(pending_run)
+        self._trigger_runs.add(agent_id)
+        pending_run = None
+        try:
+            completed = await self._run_triggered(agent_id, agent, events)
+            while True:
+                events = self._pending_trigger_events.pop(agent_id, None)
+                pending_run = self._pending_trigger_runs.pop(agent_id, None)
+                if not events:
+                    break
+                follow_up = await self._run_triggered(agent_id, agent, events)
+                if pending_run is not None and not pending_run.done():
+                    pending_run.set_result(follow_up)
+            return completed
+        finally:
+            self._trigger_runs.discard(agent_id)
+            if pending_run is not None and not pending_run.done():
+                pending_run.set_result(False)
+
+    async def _run_triggered(
+        self, agent_id: str, agent, events: List[Dict[str, Any]]
+    ) -> bool:
+        """Run the agent for trigger events, returning whether the run completed.
+
+        A scheduled run in progress would make `run_task` skip the events, so
+        the triggered run waits for it to finish. With a lease coordinator the
+        replicas that saw the same change let one of them run it.
+        """
+        while agent.is_running:
+            await asyncio.sleep(TRIGGER_BUSY_POLL_SECONDS)
+            if (
+                agent_id in self._paused_agents
+                or self.agents.get(agent_id) is not agent
+            ):
+                return False
+        try:
+            if self.coordinator is None:
+                await agent.run_task(trigger_events=events)
+                return True
+            return await self.coordinator.run_change(
+                agent_id,
+                self._change_key(events),
+                lambda token: agent.run_task(
+                    fencing_token=token,
+                    fence=self.coordinator.fence(agent_id, token),
+                    trigger_events=events,
+                ),
+            )
+        except Exception as e:
+            logger.error(f"Error in triggered task for agent {agent_id}: {e}")
+            return False
+
+    @staticmethod
+    def _change_key(events: List[Dict[str, Any]]) -> str:
+        """Name of a batch of changes that every replica derives alike."""
+        return fingerprint(
+            sorted(
+                (
+                    event["source"],
+                    event["key"],
+                    event.get("fingerprint") or fingerprint(event.get("data")),
+                )
+                for event in events
+            )
+        )
+
+    async def _steal_orphaned_runs(self):
+        """Take over runs whose node died: claimed slots without a live lease."""
+        for agent_id, agent in self.agents.items():
+            if agent.is_running or not self.scheduler.is_task_scheduled(agent_id):
+                continue
+            task = asyncio.create_task(
+                self._agent_runner(agent_id, agent, steal=True)()
+            )
+            self._stolen_runs.add(task)
+            task.add_done_callback(self._stolen_runs.discard)
+
     def start(self):
         """Start the manager and all agents."""
         try:
@@ -237,6 +449,13 @@ class BackgroundAgentManager:
             for agent_id, agent in self.agents.items():
                 self._schedule_agent(agent_id, agent)
 
+            if self.coordinator is not None:
+                self.scheduler.schedule_task(
+                    agent_id=LEASE_SWEEPER_JOB_ID,
+                    interval=self.coordinator.lease_ttl,
+                    task_fn=self._steal_orphaned_runs,
+                )
+
             self.is_running = True
             logger.info("BackgroundAgentManager started successfully")
 
@@ -251,16 +470,22 @@ class BackgroundAgentManager:
                 logger.warning("Manager is not running")
                 return
 
-            # Shutdown scheduler
+            # Shutdown scheduler and triggers
             self.scheduler.shutdown()
+            for agent_id in list(self.triggers):
+                asyncio.create_task(self._stop_triggers(agent_id))
 
             # Cleanup agents
-            for agent_id, agent in self.agents.items():
-                try:
-                    asyncio.create_task(agent.cleanup())
-                    logger.info(f"Cleaned up agent {agent_id}")
-                except Exception as e:
-                    logger.error(f"Failed to cleanup agent {agent_id}: {e}")
+            if self.worker_pool is not None:
+                # stopping the workers cleans up the agents living in them
+                asyncio.create_task(self.worker_pool.shutdown())
+            else:
+                for agent_id, agent in self.agents.items():
+                    try:
+                        asyncio.create_task(agent.cleanup())
+                        logger.info(f"Cleaned up agent {agent_id}")
+                    except Exception as e:
+                        logger.error(f"Failed to cleanup agent {agent_id}: {e}")
 
             self.is_running = False
             logger.info("BackgroundAgentManager shutdown successfully")
@@ -319,6 +544,9 @@ class BackgroundAgentManager:
             "memory_router": self.memory_router.get_memory_store_info(),
             "event_router": self.event_router.get_event_store_info(),
             "scheduler_running": self.scheduler.is_running(),
+            "worker_pool": self.worker_pool.get_stats()
+            if self.worker_pool is not None
+            else None,
         }
 
     def list_agents(self) -> List[str]:
@@ -332,6 +560,7 @@ class BackgroundAgentManager:
 
         try:
             self.scheduler.remove_task(agent_id)
+            self._paused_agents.add(agent_id)
             logger.info(f"Paused agent {agent_id}")
 
         except Exception as e:
@@ -346,6 +575,7 @@ class BackgroundAgentManager:
         try:
             agent = self.agents[agent_id]
             self._schedule_agent(agent_id, agent)
+            self._paused_agents.discard(agent_id)
             logger.info(f"Resumed agent {agent_id}")
 
         except Exception as e:
@@ -362,6 +592,9 @@ class BackgroundAgentManager:
             if self.scheduler.is_task_scheduled(agent_id):
                 self.scheduler.remove_task(agent_id)
 
+            # Triggers stay registered but are ignored until the agent starts
+            self._paused_agents.add(agent_id)
+
             # Trigger agent cleanup (non-blocking)
             agent = self.agents[agent_id]
             asyncio.create_task(agent.cleanup())
@@ -386,6 +619,7 @@ class BackgroundAgentManager:
             if self.scheduler.is_task_scheduled(agent_id):
                 self.scheduler.remove_task(agent_id)
             self._schedule_agent(agent_id, agent)
+            self._paused_agents.discard(agent_id)
             logger.info(f"Started (scheduled) agent {agent_id}")
 
         except Exception as e:
@@ -429,7 +663,9 @@ class BackgroundAgentManager:
             if self.task_registry.exists(agent_id):
                 self.task_registry.remove(agent_id)
 
-            # Cleanup agent
+            # Stop its triggers and cleanup agent
+            asyncio.create_task(self._stop_triggers(agent_id))
+            self._paused_agents.discard(agent_id)
             agent = self.agents[agent_id]
             asyncio.create_task(agent.cleanup())
 
@@ -510,6 +746,8 @@ class BackgroundAgentManager:
             "agent_id": agent_id,
             "run_count": agent.run_count,
             "error_count": agent.error_count,
+            "llm_runs_skipped": agent.llm_runs_skipped,
+            "session_rotations": agent.session_rotations,
             "last_run": agent.last_run.isoformat() if agent.last_run else None,
             "is_running": agent.is_running,
             "interval": agent.interval,
@@ -517,8 +755,47 @@ class BackgroundAgentManager:
             "retry_delay": agent.retry_delay,
             "has_task": agent.has_task(),
             "task_query": agent.get_task_query() if agent.has_task() else None,
+            **(
+                self.scheduler.get_job_stats(agent_id)
+                if hasattr(self.scheduler, "get_job_stats")
+                else {}
+            ),
+            **(
+                self.coordinator.get_stats(agent_id)
+                if self.coordinator is not None
+                else {}
+            ),
+            "triggers": [
+                trigger.get_stats() for trigger in self.triggers.get(agent_id, [])
+            ],
+            **agent.run_metrics.snapshot(),
         }
 
+    def add_run_listener(self, listener: RunListener):
+        """Call `listener(agent_id, run)` after every run, e.g. to push metrics.
+
+        `run` holds the status, total/LLM/tool/memory seconds, call counts and
+        tokens of the run.
+        """
+        self._run_listeners.append(listener)
+
+    def remove_run_listener(self, listener: RunListener):
+        if listener in self._run_listeners:
+            self._run_listeners.remove(listener)
+
+    def render_prometheus(self) -> str:
+        """Metrics of every agent in the Prometheus text exposition format."""
+        get_job_stats = getattr(self.scheduler, "get_job_stats", None)
+        return render_prometheus(
+            agents={
+                agent_id: agent.run_metrics for agent_id, agent in self.agents.items()
+            },
+            schedule_lag=getattr(self.scheduler, "schedule_lag", None),
+            job_stats={agent_id: get_job_stats(agent_id) for agent_id in self.agents}
+            if get_job_stats
+            else None,
+        )
+
     def get_all_metrics(self) -> Dict[str, Dict[str, Any]]:
         """Get metrics for all agents."""
         metrics = {}
@@ -3,14 +3,17 @@ Background OmniAgent for self-flying automation.
 """
 
 import asyncio
+import time
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from datetime import datetime
 
 from omnicoreagent.omni_agent.agent import OmniAgent
 
 from omnicoreagent.core.memory_store.memory_router import MemoryRouter
 
+from omnicoreagent.core.run_timing import RunTimings, collect_run_timings
+from omnicoreagent.core.tools.tools_handler import MCPToolHandler
 from omnicoreagent.core.utils import logger
 from omnicoreagent.core.events.event_router import EventRouter
 from omnicoreagent.core.events.base import (
@@ -21,7 +24,16 @@ from omnicoreagent.core.events.base import (
     BackgroundTaskErrorPayload,
     BackgroundAgentStatusPayload,
 )
+from omnicoreagent.omni_agent.background_agent.distributed import LeaseLostError
+from omnicoreagent.omni_agent.background_agent.metrics import AgentRunMetrics
+from omnicoreagent.omni_agent.background_agent.session_rotation import (
+    DIGEST_PREFIX,
+    SessionRotationPolicy,
+    archive_segment,
+    build_digest,
+)
 from omnicoreagent.omni_agent.background_agent.task_registry import TaskRegistry
+from omnicoreagent.omni_agent.background_agent.triggers import fingerprint
 
 
 class BackgroundOmniAgent(OmniAgent):
@@ -70,6 +82,9 @@ class BackgroundOmniAgent(OmniAgent):
         self.interval = config.get("interval", 3600)  # Default: 1 hour
         self.max_retries = config.get("max_retries", 3)
         self.retry_delay = config.get("retry_delay", 60)  # seconds
+        # Scheduling overrides for event-loop schedulers, backend defaults if None
+        self.jitter = config.get("jitter")  # seconds
+        self.misfire_grace_time = config.get("misfire_grace_time")  # seconds
 
         # Task registry integration (required)
         if task_registry is None:
@@ -84,6 +99,22 @@ class BackgroundOmniAgent(OmniAgent):
         self.last_run = None
         self.run_count = 0
         self.error_count = 0
+        self.run_metrics = AgentRunMetrics()
+        # Run-state checkpoint of the last full run, see _execute_with_retries
+        self.checkpoint: Optional[Dict[str, Any]] = None
+        self.llm_runs_skipped = 0
+        # Session rollup, see _maybe_rotate_session
+        self.session_rotation = SessionRotationPolicy(
+            **(config.get("session_rotation") or {})
+        )
+        self.segment = 0
+        self.segment_runs = 0
+        self.session_rotations = 0
+        self.last_archive: Optional[str] = None
+        # LLM tokens of the segment's runs, summed from each run's own timings
+        self.segment_tokens = 0
+        # lease check of the current run in distributed mode, see run_task
+        self._fence: Optional[Callable[[], Awaitable[bool]]] = None
 
         logger.info(
             f"Initialized BackgroundOmniAgent: {self.agent_id} with session_id: {self.session_id}"
@@ -149,21 +180,42 @@ class BackgroundOmniAgent(OmniAgent):
         """Check if the agent has a task registered."""
         return self.task_registry.exists(self.agent_id)
 
-    async def run_task(self, **kwargs):
-        """Execute the background task."""
+    async def run_task(
+        self,
+        fencing_token: Optional[int] = None,
+        fence: Optional[Callable[[], Awaitable[bool]]] = None,
+        **kwargs,
+    ):
+        """Execute the background task.
+
+        In distributed mode `fence()` tells whether this run still holds the
+        agent's lease; it is checked before each side effect of the run.
+        """
         if self.is_running:
             logger.warning(
                 f"Agent {self.agent_id} is already running, skipping execution"
             )
             return
+        # claimed before the first await, so a concurrent run sees it
+        self.is_running = True
 
         # Check if task is registered
-        if not self.has_task():
+        try:
+            registered = await self.task_registry.exists_async(self.agent_id)
+        except BaseException:
+            self.is_running = False
+            raise
+        if not registered:
+            self.is_running = False
             raise ValueError(
                 f"No task registered for agent {self.agent_id}. Register a task first using TaskRegistry."
             )
 
-        self.is_running = True
+        self._fence = fence
+        if fencing_token is not None:
+            kwargs_info = {**kwargs, "fencing_token": fencing_token}
+        else:
+            kwargs_info = kwargs
         # Use the main session_id for consistency - don't create new session IDs for each run
         task_session_id = self.session_id
 
@@ -176,7 +228,7 @@ class BackgroundOmniAgent(OmniAgent):
                     session_id=task_session_id,
                     timestamp=datetime.now().isoformat(),
                     run_count=self.run_count + 1,
-                    kwargs=kwargs,
+                    kwargs=kwargs_info,
                 ),
                 agent_name=self.agent_id,
             )
@@ -199,8 +251,18 @@ class BackgroundOmniAgent(OmniAgent):
                 session_id=task_session_id, event=status_event
             )
 
-            # Execute task with retries
-            result = await self._execute_with_retries(**kwargs)
+            # Execute task with retries, timing its LLM, tool and memory phases
+            with collect_run_timings() as timings:
+                started = time.perf_counter()
+                try:
+                    result = await self._execute_with_retries(**kwargs)
+                except Exception:
+                    self._observe_run("error", started, timings)
+                    raise
+            cached = isinstance(result, dict) and result.get("cached")
+            self._observe_run("cached" if cached else "success", started, timings)
+
+            await self._check_fence("reporting its result")
 
             # Update metrics
             self.run_count += 1
@@ -238,9 +300,19 @@ class BackgroundOmniAgent(OmniAgent):
                 session_id=task_session_id, event=status_event
             )
 
+            if not cached:
+                self.segment_runs += 1
+                self.segment_tokens += timings.tokens
+                await self._check_fence("rotating its session")
+                await self._maybe_rotate_session()
+
             logger.info(f"Background task completed for agent {self.agent_id}")
             return result
 
+        except LeaseLostError:
+            # another node owns the run now; it reports the outcome
+            raise
+
         except Exception as e:
             self.error_count += 1
 
@@ -282,23 +354,80 @@ class BackgroundOmniAgent(OmniAgent):
 
         finally:
             self.is_running = False
+            self._fence = None
+
+    async def _check_fence(self, stage: str):
+        """Raise LeaseLostError if another node took over this run's lease."""
+        if self._fence is not None and not await self._fence():
+            raise LeaseLostError(f"Agent {self.agent_id} lost its lease before {stage}")
+
+    async def _get_task_config_async(self) -> Dict[str, Any]:
+        """`get_task_config` without blocking the event loop on a remote registry."""
+        task_config = await self.task_registry.get_async(self.agent_id)
+        if not task_config:
+            raise ValueError(
+                f"No task registered for agent {self.agent_id}. Use TaskRegistry to register a task first."
+            )
+        return task_config
 
     async def _execute_with_retries(self, **kwargs):
-        """Execute task with retry logic."""
+        """Execute task with retry logic.
+
+        If the task declares `probe_tools`, those tools are called first. When
+        their outputs and the query match the checkpoint of the last full run,
+        the LLM is skipped and the checkpointed result is returned with
+        `cached=True`.
+        """
         last_error = None
 
+        # Get task query from TaskRegistry (no fallback)
+        task_config = await self._get_task_config_async()
+        task_query = kwargs.get("query") or task_config.get("query")
+        if not task_query:
+            raise ValueError(f"Task for agent {self.agent_id} is missing 'query' field")
+        if kwargs.get("trigger_events"):
+            task_query = self._with_trigger_context(
+                task_query, kwargs["trigger_events"]
+            )
+
+        probe_fingerprint = None
+        probe_tools = task_config.get("probe_tools")
+        if probe_tools:
+            observations = await self._run_probe(probe_tools)
+            if observations is not None:
+                probe_fingerprint = fingerprint(
+                    {"query": task_query, "observations": observations}
+                )
+                if (
+                    self.checkpoint
+                    and self.checkpoint["probe_fingerprint"] == probe_fingerprint
+                ):
+                    self.llm_runs_skipped += 1
+                    logger.info(
+                        f"Probe outputs of agent {self.agent_id} are unchanged, "
+                        "skipping the LLM and reusing the last result"
+                    )
+                    return {
+                        **self.checkpoint["result"],
+                        "cached": True,
+                        "checkpoint_updated_at": self.checkpoint["updated_at"],
+                    }
+                task_query = self._with_probe_context(task_query, observations)
+
         for attempt in range(self.max_retries + 1):
             try:
-                # Get task query from TaskRegistry (no fallback)
-                task_query = kwargs.get("query") or self.get_task_query()
-
+                await self._check_fence("running the agent")
                 # Run the agent using the base OmniAgent run method with consistent session_id
                 result = await self.run(
                     query=task_query,
                     session_id=self.session_id,  # Use consistent session_id
                 )
 
-                return result
+                await self._check_fence("saving its checkpoint")
+                return self._save_checkpoint(probe_fingerprint, result)
+
+            except LeaseLostError:
+                raise
 
             except Exception as e:
                 last_error = e
@@ -314,6 +443,144 @@ class BackgroundOmniAgent(OmniAgent):
         # All retries exhausted
         raise last_error
 
+    async def _run_probe(self, probe_tools: List[Any]) -> Optional[List[Dict]]:
+        """Call the task's data-gathering tools; None if any of them fails.
+
+        Each entry is a tool name or a `{"tool": name, "args": {...}}` dict.
+        """
+        specs = [
+            {"tool": spec, "args": {}} if isinstance(spec, str) else spec
+            for spec in probe_tools
+        ]
+        try:
+            outputs = await asyncio.gather(
+                *(self._call_probe_tool(s["tool"], s.get("args", {})) for s in specs)
+            )
+        except Exception as e:
+            logger.warning(
+                f"Probe of agent {self.agent_id} failed, running the full task: {e}"
+            )
+            return None
+        return [
+            {"tool": spec["tool"], "args": spec.get("args", {}), "output": output}
+            for spec, output in zip(specs, outputs)
+        ]
+
+    async def _call_probe_tool(self, tool_name: str, tool_args: Dict[str, Any]):
+        if self.local_tools and self.local_tools.get_tool(tool_name):
+            return await self.local_tools.execute_tool(tool_name, tool_args)
+
+        if self.mcp_client:
+            for server_name, tools in self.mcp_client.available_tools.items():
+                if any(getattr(tool, "name", tool) == tool_name for tool in tools):
+                    result = await MCPToolHandler(
+                        sessions=self.mcp_client.sessions, server_name=server_name
+                    ).call(tool_name, tool_args)
+                    if getattr(result, "isError", False):
+                        raise RuntimeError(f"Tool {tool_name} returned an error")
+                    return [
+                        getattr(item, "text", None) or str(item)
+                        for item in result.content
+                    ]
+        raise ValueError(f"Probe tool {tool_name} not found")
+
+    def _save_checkpoint(
+        self, probe_fingerprint: Optional[str], result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Record the outcome of a full run and flag whether the answer changed."""
+        answer_fingerprint = fingerprint(result.get("response"))
+        result = {
+            **result,
+            "cached": False,
+            "answer_changed": self.checkpoint is None
+            or self.checkpoint["answer_fingerprint"] != answer_fingerprint,
+        }
+        self.checkpoint = {
+            "probe_fingerprint": probe_fingerprint,
+            "answer_fingerprint": answer_fingerprint,
+            "result": result,
+            "updated_at": datetime.now().isoformat(),
+        }
+        return result
+
+    @staticmethod
+    def _with_probe_context(task_query: str, observations: List[Dict]) -> str:
+        """Hand the probe outputs to the agent so it does not fetch them again."""
+        outputs = "\n".join(
+            f"- {item['tool']}({item['args']}): {item['output']}"
+            for item in observations
+        )
+        return (
+            f"{task_query}\n\nThese tools were already called for this run, "
+            f"use their outputs instead of calling them again:\n{outputs}"
+        )
+
+    def _observe_run(self, status: str, started: float, timings: RunTimings):
+        timed_run = timings.as_dict()
+        self.run_metrics.observe(
+            self.agent_id,
+            {
+                "status": status,
+                "finished_at": datetime.now().isoformat(),
+                "seconds": {
+                    "total": time.perf_counter() - started,
+                    **timed_run["seconds"],
+                },
+                "calls": timed_run["calls"],
+                "tokens": timed_run["tokens"],
+            },
+        )
+
+    async def _maybe_rotate_session(self) -> bool:
+        """Archive, digest and restart the session once the segment is full.
+
+        Rotation errors are logged and retried after the next run, they never
+        fail the run itself.
+        """
+        policy = self.session_rotation
+        if not policy.enabled or not policy.is_due(
+            self.segment_runs, self.segment_tokens
+        ):
+            return False
+        try:
+            messages = await self.get_session_history(self.session_id)
+            self.last_archive = await archive_segment(
+                policy.archive_dir, self.agent_id, self.segment, messages
+            )
+            digest = await build_digest(self.llm_connection, messages, policy)
+            await self.clear_session_history(self.session_id)
+            await self.memory_router.store_message(
+                role="user",
+                content=f"{DIGEST_PREFIX}\n{digest}",
+                metadata={"agent_name": self.name},
+                session_id=self.session_id,
+            )
+        except Exception as e:
+            logger.error(f"Session rotation failed for agent {self.agent_id}: {e}")
+            return False
+
+        logger.info(
+            f"Rotated session of agent {self.agent_id}: segment {self.segment} "
+            f"({self.segment_runs} runs, {len(messages)} messages) archived to "
+            f"{self.last_archive}"
+        )
+        self.segment += 1
+        self.segment_runs = 0
+        self.session_rotations += 1
+        self.segment_tokens = 0
+        return True
+
+    @staticmethod
+    def _with_trigger_context(task_query: str, trigger_events: List[Dict]) -> str:
+        """Tell the agent which inputs changed when a trigger started the run."""
+        changes = "\n".join(
+            f"- {event['source']} {event['key']}"
+            + (f" ({event['count']} changes)" if event.get("count", 1) > 1 else "")
+            + (f": {event['data']}" if event.get("data") is not None else "")
+            for event in trigger_events
+        )
+        return f"{task_query}\n\nThis run was triggered by these changes:\n{changes}"
+
     def get_status(self) -> Dict[str, Any]:
         """Get current status of the background agent."""
         return {
@@ -323,6 +590,17 @@ class BackgroundOmniAgent(OmniAgent):
             "last_run": self.last_run.isoformat() if self.last_run else None,
             "run_count": self.run_count,
             "error_count": self.error_count,
+            "llm_runs_skipped": self.llm_runs_skipped,
+            "session_segment": {
+                "segment": self.segment,
+                "runs": self.segment_runs,
+                "tokens": self.segment_tokens,
+                "rotations": self.session_rotations,
+                "last_archive": self.last_archive,
+            },
+            "checkpoint_updated_at": self.checkpoint["updated_at"]
+            if self.checkpoint
+            else None,
             "interval": self.interval,
             "max_retries": self.max_retries,
             "available_tools": self._get_available_tools(),
@@ -359,6 +637,14 @@ class BackgroundOmniAgent(OmniAgent):
                 self.max_retries = new_config["max_retries"]
             if "retry_delay" in new_config:
                 self.retry_delay = new_config["retry_delay"]
+            if "jitter" in new_config:
+                self.jitter = new_config["jitter"]
+            if "misfire_grace_time" in new_config:
+                self.misfire_grace_time = new_config["misfire_grace_time"]
+            if "session_rotation" in new_config:
+                self.session_rotation = SessionRotationPolicy(
+                    **(new_config["session_rotation"] or {})
+                )
 
             logger.info(f"Updated configuration for agent {self.agent_id}")
 
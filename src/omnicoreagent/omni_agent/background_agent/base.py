@@ -9,6 +9,10 @@ from typing import Callable
 class BackgroundTaskScheduler(ABC):
     """Base class for background task schedulers."""
 
+    # True if the scheduler awaits coroutine tasks on the caller's event loop,
+    # False if it calls plain functions on its own threads.
+    runs_on_event_loop = False
+
     @abstractmethod
     def schedule_task(self, agent_id: str, interval: int, task_fn: Callable, **kwargs):
         """Schedule a task to run at specified intervals."""
@@ -0,0 +1,386 @@
+"""
+Distributed execution of background agents across several service replicas.
+
+Every replica schedules every agent; Redis decides which replica actually runs
+each interval:
+
+- Time is cut into slots of one interval (one minute for cron schedules). The
+  first node to fire in a slot claims it, so each agent runs once per slot no
+  matter how many replicas are up.
+- The claiming node holds a per-agent lease that it extends with heartbeats. Each
+  lease carries a fencing token from a per-agent counter; a node that lost its
+  lease (e.g. a long GC pause) can no longer complete or extend it, and its run
+  is cancelled. The run also checks its token before each side effect (the LLM
+  run, the checkpoint, the completion events, session rotation) and drops the
+  rest of the run once another node holds the lease.
+- If a node dies mid-run its lease expires. Other nodes periodically sweep for
+  slots that are claimed but have no live lease and steal them.
+- Triggered runs claim a slot named after the change instead of a time slot, so
+  a change seen by every replica (a Redis stream entry, a pub/sub message, an
+  MCP resource update) is run by one of them.
+"""
+
+import asyncio
+import json
+import socket
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+import redis
+from decouple import config
+
+from omnicoreagent.core.memory_store.redis_memory import get_redis_manager
+from omnicoreagent.core.utils import logger
+from omnicoreagent.omni_agent.background_agent.task_registry import TaskRegistry
+
+REDIS_URL = config("REDIS_URL", default="redis://localhost:6379/0")
+BACKGROUND_LEASE_TTL = config("BACKGROUND_LEASE_TTL", default=30, cast=int)
+
+# cron expressions fire at most once a minute
+CRON_SLOT_SECONDS = 60
+# how long a handled change is remembered, so late replicas do not run it again
+CHANGE_SLOT_SECONDS = 3600
+# how often a triggered run retries while another run holds the agent's lease
+CHANGE_LEASE_POLL_SECONDS = 1.0
+
+# KEYS: slot, lease, fence. ARGV: node id, lease ms, slot ttl ms, steal flag.
+# A slot is free, claimed by a node id, or "done". It can be taken when nobody
+# holds the lease and it is free (regular run) or claimed (steal).
+_ACQUIRE_LUA = """
+local state = redis.call('GET', KEYS[1])
+if state == 'done' then return 0 end
+if ARGV[4] == '1' and not state then return 0 end
+if redis.call('EXISTS', KEYS[2]) == 1 then return 0 end
+local token = redis.call('INCR', KEYS[3])
+redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[3])
+redis.call('SET', KEYS[2], ARGV[1] .. ':' .. token, 'PX', ARGV[2])
+return token
+"""
+
+# KEYS: lease. ARGV: owner, lease ms.
+_HEARTBEAT_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# KEYS: lease, slot. ARGV: owner, slot ttl ms.
+_COMPLETE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    redis.call('SET', KEYS[2], 'done', 'PX', ARGV[2])
+    return 1
+end
+return 0
+"""
+
+
+def default_node_id() -> str:
+    return f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+
+
+def slot_seconds(interval: Union[int, str]) -> int:
+    """Length of one run slot for an agent's schedule."""
+    return interval if isinstance(interval, int) else CRON_SLOT_SECONDS
+
+
+class LeaseLostError(RuntimeError):
+    """Another node holds the lease of a run; the run must not write anything."""
+
+
+class RedisTaskRegistry(TaskRegistry):
+    """TaskRegistry stored in a Redis hash, shared by every replica.
+
+    The synchronous Redis client keeps the `TaskRegistry` interface unchanged;
+    the reads made on every run (`get_async`, `exists_async`) go through a
+    thread so they do not block the event loop.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, key: Optional[str] = None):
+        self.redis_url = redis_url or REDIS_URL
+        self.key = key or "omnicoreagent_bg:tasks"
+        self._client: Optional[redis.Redis] = None
+
+    @property
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis.from_url(
+                self.redis_url, decode_responses=True, socket_timeout=5
+            )
+        return self._client
+
+    def register(self, agent_id: str, config: Dict):
+        """Register a new task configuration."""
+        try:
+            self.client.hset(self.key, agent_id, json.dumps(config))
+            logger.info(f"Registered task for agent: {agent_id}")
+        except Exception as e:
+            logger.error(f"Failed to register task for agent {agent_id}: {e}")
+            raise
+
+    def get(self, agent_id: str) -> Optional[Dict]:
+        """Get task configuration for an agent."""
+        raw = self.client.hget(self.key, agent_id)
+        return json.loads(raw) if raw else None
+
+    def all_tasks(self) -> List[Dict]:
+        """Get all registered task configurations."""
+        return [json.loads(raw) for raw in self.client.hvals(self.key)]
+
+    async def get_async(self, agent_id: str) -> Optional[Dict]:
+        return await asyncio.to_thread(self.get, agent_id)
+
+    async def exists_async(self, agent_id: str) -> bool:
+        return await asyncio.to_thread(self.exists, agent_id)
+
+    def remove(self, agent_id: str):
+        """Remove a task configuration."""
+        try:
+            if self.client.hdel(self.key, agent_id):
+                logger.info(f"Removed task for agent: {agent_id}")
+        except Exception as e:
+            logger.error(f"Failed to remove task for agent {agent_id}: {e}")
+            raise
+
+    def exists(self, agent_id: str) -> bool:
+        """Check if a task exists for the given agent ID."""
+        return bool(self.client.hexists(self.key, agent_id))
+
+    def update(self, agent_id: str, config: Dict):
+        """Update an existing task configuration."""
+        task_config = self.get(agent_id)
+        if task_config is None:
+            raise KeyError(f"Task for agent {agent_id} not found")
+        task_config.update(config)
+        self.client.hset(self.key, agent_id, json.dumps(task_config))
+        logger.info(f"Updated task for agent: {agent_id}")
+
+    def get_agent_ids(self) -> List[str]:
+        """Get all registered agent IDs."""
+        return list(self.client.hkeys(self.key))
+
+    def clear(self):
+        """Clear all registered tasks."""
+        self.client.delete(self.key)
+        logger.info("Cleared all registered tasks")
+
+
+class RedisLeaseCoordinator:
+    """Grants each background agent run to exactly one node per interval slot."""
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        node_id: Optional[str] = None,
+        lease_ttl: Optional[int] = None,
+        key_prefix: str = "omnicoreagent_bg",
+    ):
+        self.redis_url = redis_url or REDIS_URL
+        self.node_id = node_id or default_node_id()
+        self.lease_ttl = lease_ttl or BACKGROUND_LEASE_TTL
+        self.key_prefix = key_prefix
+        self.runs: Dict[str, int] = defaultdict(int)
+        self.stolen_runs: Dict[str, int] = defaultdict(int)
+        self.lost_leases: Dict[str, int] = defaultdict(int)
+        self._redis = None
+        self._scripts: Dict[str, Any] = {}
+
+    async def _get_redis(self):
+        if self._redis is None:
+            self._redis = await get_redis_manager().get_client(self.redis_url)
+            self._scripts = {
+                "acquire": self._redis.register_script(_ACQUIRE_LUA),
+                "heartbeat": self._redis.register_script(_HEARTBEAT_LUA),
+                "complete": self._redis.register_script(_COMPLETE_LUA),
+            }
+        return self._redis
+
+    def _keys(self, agent_id: str, slot: Union[int, str]) -> Dict[str, str]:
+        base = f"{self.key_prefix}:{agent_id}"
+        return {
+            "slot": f"{base}:slot:{slot}",
+            "lease": f"{base}:lease",
+            "fence": f"{base}:fence",
+        }
+
+    def _owner(self, token: int) -> str:
+        return f"{self.node_id}:{token}"
+
+    @staticmethod
+    def current_slot(interval: Union[int, str], now: Optional[float] = None) -> int:
+        return int((time.time() if now is None else now) // slot_seconds(interval))
+
+    async def acquire(
+        self,
+        agent_id: str,
+        interval: Union[int, str],
+        slot: Union[int, str],
+        steal: bool = False,
+    ) -> Optional[int]:
+        """Claim `slot` and the agent's lease. Returns the fencing token or None."""
+        await self._get_redis()
+        keys = self._keys(agent_id, slot)
+        token = await self._scripts["acquire"](
+            keys=[keys["slot"], keys["lease"], keys["fence"]],
+            args=[
+                self.node_id,
+                int(self.lease_ttl * 1000),
+                slot_seconds(interval) * 2000,
+                "1" if steal else "0",
+            ],
+        )
+        return int(token) or None
+
+    async def heartbeat(self, agent_id: str, token: int) -> bool:
+        """Extend the lease; False if this node no longer holds it."""
+        await self._get_redis()
+        extended = await self._scripts["heartbeat"](
+            keys=[self._keys(agent_id, 0)["lease"]],
+            args=[self._owner(token), int(self.lease_ttl * 1000)],
+        )
+        return bool(extended)
+
+    async def complete(
+        self,
+        agent_id: str,
+        interval: Union[int, str],
+        slot: Union[int, str],
+        token: int,
+    ) -> bool:
+        """Release the lease and mark the slot done, if `token` still owns it."""
+        await self._get_redis()
+        keys = self._keys(agent_id, slot)
+        completed = await self._scripts["complete"](
+            keys=[keys["lease"], keys["slot"]],
+            args=[self._owner(token), slot_seconds(interval) * 2000],
+        )
+        return bool(completed)
+
+    async def is_current(self, agent_id: str, token: int) -> bool:
+        """Whether `token` still holds the agent's lease, for fenced side effects."""
+        client = await self._get_redis()
+        return await client.get(self._keys(agent_id, 0)["lease"]) == self._owner(token)
+
+    def fence(self, agent_id: str, token: int) -> Callable[[], Awaitable[bool]]:
+        """Check passed to `run_task`: does this run still hold the lease?"""
+        return lambda: self.is_current(agent_id, token)
+
+    async def _keep_alive(self, agent_id: str, token: int, run: asyncio.Task, lost):
+        while not run.done():
+            await asyncio.sleep(self.lease_ttl / 3)
+            try:
+                alive = await self.heartbeat(agent_id, token)
+            except Exception as e:
+                logger.warning(f"Lease heartbeat for agent {agent_id} failed: {e}")
+                continue
+            if not alive:
+                logger.error(
+                    f"Node {self.node_id} lost the lease of agent {agent_id} "
+                    f"(token {token}), cancelling its run"
+                )
+                lost.set()
+                run.cancel()
+                return
+
+    async def run_exclusive(
+        self,
+        agent_id: str,
+        interval: Union[int, str],
+        run: Callable[[int], Awaitable[Any]],
+        steal: bool = False,
+    ) -> Any:
+        """Call `run(fencing_token)` if this node wins the agent's current slot.
+
+        Returns None without running when another node owns the slot or lease,
+        and when the run stopped with `LeaseLostError`.
+        """
+        slot = self.current_slot(interval)
+        token = await self.acquire(agent_id, interval, slot, steal=steal)
+        if token is None:
+            logger.debug(f"Agent {agent_id} slot {slot} is owned by another node")
+            return None
+        logger.info(
+            f"Node {self.node_id} {'stole' if steal else 'claimed'} agent "
+            f"{agent_id} slot {slot} with token {token}"
+        )
+        self.runs[agent_id] += 1
+        if steal:
+            self.stolen_runs[agent_id] += 1
+        return await self._run_leased(agent_id, interval, slot, token, run)
+
+    async def run_change(
+        self,
+        agent_id: str,
+        change_key: str,
+        run: Callable[[int], Awaitable[Any]],
+    ) -> bool:
+        """Call `run(fencing_token)` if this node is the first to claim a change.
+
+        `change_key` must be the same on every replica that saw the change. While
+        another run holds the agent's lease the claim is retried. Returns False
+        only if this node claimed the change and then lost the lease, i.e. the
+        change may not have been handled.
+        """
+        slot = f"change:{change_key}"
+        while True:
+            token = await self.acquire(agent_id, CHANGE_SLOT_SECONDS, slot)
+            if token is not None:
+                break
+            client = await self._get_redis()
+            if await client.exists(self._keys(agent_id, slot)["slot"]):
+                logger.debug(f"Change {change_key} of {agent_id} is handled elsewhere")
+                return True
+            await asyncio.sleep(CHANGE_LEASE_POLL_SECONDS)
+        logger.info(
+            f"Node {self.node_id} claimed change {change_key} of agent {agent_id} "
+            f"with token {token}"
+        )
+        self.runs[agent_id] += 1
+        lost_leases = self.lost_leases[agent_id]
+        await self._run_leased(agent_id, CHANGE_SLOT_SECONDS, slot, token, run)
+        return self.lost_leases[agent_id] == lost_leases
+
+    async def _run_leased(
+        self,
+        agent_id: str,
+        interval: Union[int, str],
+        slot: Union[int, str],
+        token: int,
+        run: Callable[[int], Awaitable[Any]],
+    ) -> Any:
+        """Run under a claimed lease, keep it alive and complete the slot."""
+        lost = asyncio.Event()
+        run_task = asyncio.create_task(run(token))
+        keep_alive = asyncio.create_task(
+            self._keep_alive(agent_id, token, run_task, lost)
+        )
+        try:
+            return await run_task
+        except LeaseLostError as e:
+            logger.error(f"Node {self.node_id} dropped a run of {agent_id}: {e}")
+            lost.set()
+            self.lost_leases[agent_id] += 1
+            return None
+        except asyncio.CancelledError:
+            if lost.is_set():
+                self.lost_leases[agent_id] += 1
+                return None
+            raise
+        finally:
+            keep_alive.cancel()
+            if not lost.is_set():
+                try:
+                    await self.complete(agent_id, interval, slot, token)
+                except Exception as e:
+                    logger.warning(f"Could not complete lease of {agent_id}: {e}")
+
+    def get_stats(self, agent_id: str) -> Dict[str, Any]:
+        return {
+            "node_id": self.node_id,
+            "lease_runs": self.runs.get(agent_id, 0),
+            "stolen_runs": self.stolen_runs.get(agent_id, 0),
+            "lost_leases": self.lost_leases.get(agent_id, 0),
+        }
@@ -0,0 +1,167 @@
+"""
+Run metrics of background agents and their Prometheus text exposition.
+
+Each agent keeps HDR-style latency histograms of its runs (total, LLM, tool and
+memory time), counters of runs, LLM/tool calls and tokens, and the phase
+breakdown of its last run. The scheduler backend adds schedule lag and misfires.
+`BackgroundAgentManager.render_prometheus()` exposes all of it in the Prometheus
+text format, and run listeners receive every run as it completes.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+from omnicoreagent.core.run_timing import LatencyHistogram
+from omnicoreagent.core.utils import logger
+
+RUN_PHASES = ("total", "llm", "tool", "memory")
+
+RunListener = Callable[[str, Dict[str, Any]], None]
+
+
+class AgentRunMetrics:
+    """Latency histograms and counters of one background agent's runs."""
+
+    def __init__(self):
+        self.latency = {phase: LatencyHistogram() for phase in RUN_PHASES}
+        self.runs = 0
+        self.errors = 0
+        self.cached_runs = 0
+        self.llm_calls = 0
+        self.tool_calls = 0
+        self.tokens = 0
+        self.last_run: Optional[Dict[str, Any]] = None
+        self.listeners: List[RunListener] = []
+
+    def observe(self, agent_id: str, run: Dict[str, Any]) -> None:
+        """Record a finished run, as built by `BackgroundOmniAgent.run_task`."""
+        self.runs += 1
+        if run["status"] == "error":
+            self.errors += 1
+        elif run["status"] == "cached":
+            self.cached_runs += 1
+        self.latency["total"].record(run["seconds"]["total"])
+        for phase in RUN_PHASES[1:]:
+            if run["calls"].get(phase):
+                self.latency[phase].record(run["seconds"].get(phase, 0.0))
+        self.llm_calls += run["calls"].get("llm", 0)
+        self.tool_calls += run["calls"].get("tool", 0)
+        self.tokens += run.get("tokens", 0)
+        self.last_run = run
+        for listener in self.listeners:
+            try:
+                listener(agent_id, run)
+            except Exception as e:
+                logger.warning(f"Run listener {listener!r} failed: {e}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        full_runs = self.runs - self.cached_runs
+        return {
+            "latency": {
+                phase: histogram.snapshot() for phase, histogram in self.latency.items()
+            },
+            "llm_calls": self.llm_calls,
+            "tool_calls": self.tool_calls,
+            "tokens": self.tokens,
+            "tokens_per_run": self.tokens / full_runs if full_runs else 0.0,
+            "last_run_breakdown": self.last_run,
+        }
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_values(labels: Dict[str, str]) -> str:
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _histogram_lines(
+    name: str, labels: Dict[str, str], histogram: LatencyHistogram
+) -> List[str]:
+    lines = [
+        f"{name}_bucket{_label_values({**labels, 'le': f'{upper:g}'})} {count}"
+        for upper, count in histogram.cumulative_buckets()
+    ]
+    lines.append(
+        f"{name}_bucket{_label_values({**labels, 'le': '+Inf'})} {histogram.count}"
+    )
+    lines.append(f"{name}_sum{_label_values(labels)} {histogram.sum:g}")
+    lines.append(f"{name}_count{_label_values(labels)} {histogram.count}")
+    return lines
+
+
+def render_prometheus(
+    agents: Dict[str, AgentRunMetrics],
+    schedule_lag: Optional[Dict[str, LatencyHistogram]] = None,
+    job_stats: Optional[Dict[str, Dict[str, int]]] = None,
+    prefix: str = "omnicoreagent_background",
+) -> str:
+    """Prometheus text exposition (version 0.0.4) of background agent metrics."""
+    schedule_lag = schedule_lag or {}
+    job_stats = job_stats or {}
+    lines = [
+        f"# HELP {prefix}_run_seconds Wall time of agent runs, by phase.",
+        f"# TYPE {prefix}_run_seconds histogram",
+    ]
+    for agent_id, metrics in agents.items():
+        for phase, histogram in metrics.latency.items():
+            lines += _histogram_lines(
+                f"{prefix}_run_seconds",
+                {"agent_id": agent_id, "phase": phase},
+                histogram,
+            )
+
+    lines += [
+        f"# HELP {prefix}_schedule_lag_seconds Start delay of scheduled runs.",
+        f"# TYPE {prefix}_schedule_lag_seconds histogram",
+    ]
+    for agent_id in agents:
+        if agent_id in schedule_lag:
+            lines += _histogram_lines(
+                f"{prefix}_schedule_lag_seconds",
+                {"agent_id": agent_id},
+                schedule_lag[agent_id],
+            )
+
+    lines += [
+        f"# HELP {prefix}_runs_total Finished runs, by status.",
+        f"# TYPE {prefix}_runs_total counter",
+    ]
+    for agent_id, metrics in agents.items():
+        for status, count in (
+            ("success", metrics.runs - metrics.errors - metrics.cached_runs),
+            ("cached", metrics.cached_runs),
+            ("error", metrics.errors),
+        ):
+            labels = _label_values({"agent_id": agent_id, "status": status})
+            lines.append(f"{prefix}_runs_total{labels} {count}")
+
+    counters = [
+        ("llm_calls_total", "LLM calls made by runs.", lambda m: m.llm_calls),
+        ("tool_calls_total", "Tool calls made by runs.", lambda m: m.tool_calls),
+        ("tokens_total", "LLM tokens used by runs.", lambda m: m.tokens),
+    ]
+    for name, help_text, value in counters:
+        lines += [
+            f"# HELP {prefix}_{name} {help_text}",
+            f"# TYPE {prefix}_{name} counter",
+        ]
+        for agent_id, metrics in agents.items():
+            labels = _label_values({"agent_id": agent_id})
+            lines.append(f"{prefix}_{name}{labels} {value(metrics)}")
+
+    for name, stat, help_text in (
+        ("misfires_total", "misfires", "Runs dropped for starting too late."),
+        ("skipped_runs_total", "skipped_runs", "Runs skipped, one was in progress."),
+    ):
+        lines += [
+            f"# HELP {prefix}_{name} {help_text}",
+            f"# TYPE {prefix}_{name} counter",
+        ]
+        for agent_id in agents:
+            labels = _label_values({"agent_id": agent_id})
+            lines.append(
+                f"{prefix}_{name}{labels} {job_stats.get(agent_id, {}).get(stat, 0)}"
+            )
+    return "\n".join(lines) + "\n"
@@ -1,13 +1,24 @@
 """
-APScheduler backend for background task scheduling.
+APScheduler backends for background task scheduling.
 """
 
+import asyncio
+from collections import defaultdict
+from datetime import datetime
+
+from apscheduler.events import (
+    EVENT_JOB_MAX_INSTANCES,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_SUBMITTED,
+)
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
 from typing import Any, Callable, Dict, Union, Optional
 from omnicoreagent.core.utils import logger
 from .base import BackgroundTaskScheduler
+from .metrics import LatencyHistogram
 
 
 class APSchedulerBackend(BackgroundTaskScheduler):
@@ -135,3 +146,146 @@ class APSchedulerBackend(BackgroundTaskScheduler):
         except Exception as e:
             logger.error(f"Failed to resume job for agent {agent_id}: {e}")
             raise
+
+
+class AsyncIOSchedulerBackend(APSchedulerBackend):
+    """APScheduler backend that runs coroutine tasks on the application's event loop.
+
+    Unlike `APSchedulerBackend`, which calls tasks on a worker thread, every run is
+    an asyncio task on one loop, so agents keep using the MCP sessions, Redis pools
+    and HTTP clients they created there. Each agent gets at most `max_instances`
+    concurrent runs; a run that is due while the previous one is still going is
+    skipped and counted, and a run that could not start within
+    `misfire_grace_time` seconds of its due time is dropped and counted as a misfire.
+    `jitter` spreads the start times of agents sharing an interval. The delay
+    between each run's due time and its start is kept as a per-agent histogram.
+    """
+
+    runs_on_event_loop = True
+
+    def __init__(
+        self,
+        jitter: Optional[float] = None,
+        misfire_grace_time: Optional[int] = 60,
+        max_instances: int = 1,
+        event_loop: Optional[asyncio.AbstractEventLoop] = None,
+    ):
+        scheduler_kwargs = {"event_loop": event_loop} if event_loop else {}
+        self.scheduler = AsyncIOScheduler(**scheduler_kwargs)
+        self.scheduler.add_listener(
+            self._on_job_skipped, EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES
+        )
+        self.scheduler.add_listener(self._on_job_submitted, EVENT_JOB_SUBMITTED)
+        self.jitter = jitter
+        self.misfire_grace_time = misfire_grace_time
+        self.max_instances = max_instances
+        self.misfires: Dict[str, int] = defaultdict(int)
+        self.skipped_runs: Dict[str, int] = defaultdict(int)
+        self.schedule_lag: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self._running = False
+
+    def _on_job_submitted(self, event):
+        due = max(event.scheduled_run_times)
+        lag = (datetime.now(due.tzinfo) - due).total_seconds()
+        self.schedule_lag[event.job_id].record(lag)
+
+    def _on_job_skipped(self, event):
+        if event.code == EVENT_JOB_MISSED:
+            self.misfires[event.job_id] += 1
+            logger.warning(
+                f"Missed run of agent {event.job_id} due at "
+                f"{event.scheduled_run_time.isoformat()}"
+            )
+        else:
+            self.skipped_runs[event.job_id] += 1
+            logger.warning(
+                f"Skipped run of agent {event.job_id}: previous run still in progress"
+            )
+
+    def schedule_task(
+        self,
+        agent_id: str,
+        interval: Union[int, str],
+        task_fn: Callable,
+        jitter: Optional[float] = None,
+        misfire_grace_time: Optional[int] = None,
+        max_instances: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        **kwargs,
+    ):
+        """Schedule a coroutine function to run at specified intervals.
+
+        Args:
+            agent_id: Unique identifier for the agent
+            interval: Interval in seconds (int) or cron expression (str)
+            task_fn: Coroutine function to execute
+            jitter: Max random delay in seconds added to each run, overrides the
+                backend default
+            misfire_grace_time: Seconds a late run may still start, overrides the
+                backend default
+            max_instances: Concurrent runs allowed for this agent, overrides the
+                backend default
+            start_date: Anchor of interval schedules; nodes sharing an anchor fire
+                at the same times
+            **kwargs: Additional arguments for the task function
+        """
+        if not asyncio.iscoroutinefunction(task_fn):
+            raise TypeError(
+                f"AsyncIOSchedulerBackend needs a coroutine function for {agent_id}"
+            )
+        jitter = self.jitter if jitter is None else jitter
+        try:
+            if isinstance(interval, int):
+                trigger = IntervalTrigger(
+                    seconds=interval, start_date=start_date, jitter=jitter
+                )
+            elif isinstance(interval, str):
+                trigger = CronTrigger.from_crontab(interval)
+                trigger.jitter = jitter
+            else:
+                raise ValueError(f"Invalid interval type: {type(interval)}")
+
+            self.scheduler.add_job(
+                func=task_fn,
+                trigger=trigger,
+                id=agent_id,
+                replace_existing=True,
+                kwargs=kwargs,
+                max_instances=max_instances or self.max_instances,
+                coalesce=True,
+                misfire_grace_time=(
+                    self.misfire_grace_time
+                    if misfire_grace_time is None
+                    else misfire_grace_time
+                ),
+            )
+            logger.info(
+                f"Scheduled task for agent {agent_id} on the event loop with "
+                f"interval: {interval}"
+            )
+        except Exception as e:
+            logger.error(f"Failed to schedule task for agent {agent_id}: {e}")
+            raise
+
+    def start(self):
+        """Start the scheduler on the running event loop."""
+        if not self._running:
+            self.scheduler.start()
+            self._running = True
+            logger.info("AsyncIO scheduler backend started")
+
+    def shutdown(self):
+        """Shutdown the scheduler without waiting for running tasks."""
+        if self._running:
+            self.scheduler.shutdown(wait=False)
+            self._running = False
+            logger.info("AsyncIO scheduler backend shutdown")
+
+    def get_job_stats(self, agent_id: str) -> Dict[str, Any]:
+        """Missed and skipped runs of an agent, and how late its runs start."""
+        lag = self.schedule_lag.get(agent_id)
+        return {
+            "misfires": self.misfires.get(agent_id, 0),
+            "skipped_runs": self.skipped_runs.get(agent_id, 0),
+            "schedule_lag": lag.snapshot() if lag else None,
+        }
@@ -0,0 +1,154 @@
+"""
+Bounded history for long-lived background agent sessions.
+
+A background agent keeps one session for its whole life, so without rotation
+every run reloads the messages of all previous runs. With a rotation policy,
+once a segment of the session reaches `max_runs` runs or `max_tokens` LLM
+tokens:
+
+1. the segment's raw messages are written to a JSONL file in `archive_dir`;
+2. they are summarized into a compact digest (by the agent's LLM, or an
+   extract of the latest exchanges if the LLM is unavailable);
+3. the session's memory is cleared and seeded with the digest, which starts the
+   next segment.
+
+The session id does not change, so event streams keep working across segments.
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from decouple import config
+
+from omnicoreagent.core.utils import logger
+
+BACKGROUND_SESSION_ARCHIVE_DIR = config(
+    "BACKGROUND_SESSION_ARCHIVE_DIR", default=".omniagent_cache/session_archive"
+)
+
+DIGEST_PREFIX = "[Digest of earlier runs]"
+
+DIGEST_PROMPT = """You maintain the long-term notes of a background agent that runs
+the same task repeatedly. Summarize the conversation below into a digest the
+agent will read at the start of its next runs instead of the full history.
+
+Keep:
+- findings, values and decisions later runs need, with their dates
+- open issues, pending follow-ups and alerts already sent
+- anything from an earlier digest that is still relevant
+
+Drop tool call details and repeated routine results. Answer with the digest only,
+in at most {max_words} words."""
+
+
+@dataclass
+class SessionRotationPolicy:
+    """When to roll a background agent's session over (the `session_rotation` config)."""
+
+    max_runs: Optional[int] = None
+    """Rotate after this many full runs in the current segment."""
+    max_tokens: Optional[int] = None
+    """Rotate once the segment's runs used this many LLM tokens."""
+    archive_dir: Optional[str] = None
+    """Directory of the archived segments; defaults to BACKGROUND_SESSION_ARCHIVE_DIR."""
+    digest_max_words: int = 300
+    max_transcript_chars: int = 40000
+    """Characters of the segment sent to the LLM for the digest (most recent kept)."""
+
+    def __post_init__(self) -> None:
+        for name in ("max_runs", "max_tokens"):
+            value = getattr(self, name)
+            if value is not None and value <= 0:
+                raise ValueError(f"session_rotation {name} must be positive")
+        if self.archive_dir is None:
+            self.archive_dir = BACKGROUND_SESSION_ARCHIVE_DIR
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_runs is not None or self.max_tokens is not None
+
+    def is_due(self, segment_runs: int, segment_tokens: int) -> bool:
+        return (self.max_runs is not None and segment_runs >= self.max_runs) or (
+            self.max_tokens is not None and segment_tokens >= self.max_tokens
+        )
+
+
+def _archive_segment(path: Path, messages: List[Dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for message in messages:
+            f.write(json.dumps(message, default=str) + "\n")
+
+
+async def archive_segment(
+    archive_dir: str, agent_id: str, segment: int, messages: List[Dict[str, Any]]
+) -> str:
+    """Write a segment's raw messages to `<archive_dir>/<agent_id>/`. Returns the path."""
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+    path = Path(archive_dir) / agent_id / f"segment_{segment:05d}_{stamp}.jsonl"
+    await asyncio.to_thread(_archive_segment, path, messages)
+    return str(path)
+
+
+def _transcript(messages: List[Dict[str, Any]], max_chars: int) -> str:
+    transcript = "\n\n".join(
+        f"{message.get('timestamp') or ''} {message['role']}: {message['content']}"
+        for message in messages
+    )
+    return transcript[-max_chars:]
+
+
+def _extractive_digest(messages: List[Dict[str, Any]], max_words: int) -> str:
+    """Earlier digest plus the latest task/answer pairs, newest first, within budget."""
+    digest = next(
+        (
+            message["content"][len(DIGEST_PREFIX) :].strip()
+            for message in messages
+            if str(message["content"]).startswith(DIGEST_PREFIX)
+        ),
+        None,
+    )
+    answers = [
+        f"{message.get('timestamp') or ''} {message['content']}"
+        for message in messages
+        if message["role"] == "assistant"
+    ]
+    parts, words = [], 0
+    for answer in reversed(answers):
+        words += len(answer.split())
+        if words > max_words and parts:
+            break
+        parts.append(answer)
+    if digest:
+        parts.append(f"Earlier: {digest}")
+    return "\n".join(parts)
+
+
+async def build_digest(
+    llm_connection: Any, messages: List[Dict[str, Any]], policy: SessionRotationPolicy
+) -> str:
+    """Summarize a segment with the agent's LLM, falling back to an extract."""
+    try:
+        response = await llm_connection.llm_call(
+            messages=[
+                {
+                    "role": "system",
+                    "content": DIGEST_PROMPT.format(max_words=policy.digest_max_words),
+                },
+                {
+                    "role": "user",
+                    "content": _transcript(messages, policy.max_transcript_chars),
+                },
+            ]
+        )
+        if response and hasattr(response, "choices"):
+            content = response.choices[0].message.content
+            if content and content.strip():
+                return content.strip()
+    except Exception as e:
+        logger.warning(f"Digest generation failed, keeping an extract instead: {e}")
+    return _extractive_digest(messages, policy.digest_max_words)
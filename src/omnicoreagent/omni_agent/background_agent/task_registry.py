@@ -43,6 +43,14 @@ class TaskRegistry:
         """Check if a task exists for the given agent ID."""
         return agent_id in self._tasks
 
+    async def get_async(self, agent_id: str) -> Optional[Dict]:
+        """`get` for the run path; remote registries do not block the event loop."""
+        return self.get(agent_id)
+
+    async def exists_async(self, agent_id: str) -> bool:
+        """`exists` for the run path; remote registries do not block the event loop."""
+        return self.exists(agent_id)
+
     def update(self, agent_id: str, config: Dict):
         """Update an existing task configuration."""
         if agent_id in self._tasks:
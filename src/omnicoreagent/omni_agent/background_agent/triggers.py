@@ -0,0 +1,438 @@
+"""
+Event triggers for background agents.
+
+A trigger watches an input (a Redis stream or pub/sub channel, a directory, a
+subscribed MCP resource or an in-process queue) and runs its agent when that
+input changes, instead of or in addition to the agent's interval.
+
+Changes are debounced and coalesced: every change restarts a `debounce` timer
+(bounded by `max_wait`), changes to the same key are merged into one event that
+counts them, and changes whose fingerprint equals the one of the last completed
+run are dropped, so a burst of writes, or a rewrite of identical content, costs
+a single run or none. Fingerprints are only recorded once the callback reports
+that the run completed, so a failed or skipped run does not hide the change.
+"""
+
+import asyncio
+import fnmatch
+import hashlib
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from pydantic import AnyUrl
+
+from omnicoreagent.core.memory_store.redis_memory import get_redis_manager
+from omnicoreagent.core.utils import logger
+from omnicoreagent.mcp_omni_connect.notifications import (
+    add_notification_listener,
+    remove_notification_listener,
+)
+
+try:
+    from watchfiles import awatch
+except ImportError:  # pragma: no cover - depends on the environment
+    awatch = None
+
+TriggerCallback = Callable[[List[Dict[str, Any]]], Awaitable[bool]]
+
+
+def fingerprint(data: Any) -> str:
+    """Stable hash of JSON-like data, used to detect unchanged input."""
+    if isinstance(data, bytes):
+        raw = data
+    else:
+        raw = json.dumps(data, sort_keys=True, default=str).encode()
+    return hashlib.sha256(raw).hexdigest()
+
+
+class BaseTrigger(ABC):
+    """Runs an agent when its source reports changes, debounced and coalesced."""
+
+    source = "trigger"
+
+    def __init__(self, debounce: float = 1.0, max_wait: Optional[float] = None):
+        """
+        Args:
+            debounce: Seconds without new changes before the agent runs
+            max_wait: Upper bound in seconds between the first change and the run,
+                so a constant stream of changes still triggers runs
+        """
+        self.debounce = debounce
+        self.max_wait = max_wait
+        self.agent = None
+        self._callback: Optional[TriggerCallback] = None
+        self._listen_task: Optional[asyncio.Task] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._first_pending_at: Optional[float] = None
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._fired_fingerprints: Dict[str, str] = {}
+        self._fire_tasks: set = set()
+        self.changes_received = 0
+        self.unchanged_skipped = 0
+        self.fires = 0
+
+    @abstractmethod
+    async def listen(self):
+        """Watch the source and call `emit` for every change, until cancelled."""
+
+    async def start(self, agent, callback: TriggerCallback):
+        """Start watching; `callback(events)` is awaited for every debounced batch.
+
+        The callback returns whether the agent completed a run for the events;
+        only then are their fingerprints kept to drop identical changes.
+        """
+        self.agent = agent
+        self._callback = callback
+        self._listen_task = asyncio.create_task(self._listen())
+
+    async def _listen(self):
+        try:
+            await self.listen()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"{type(self).__name__} stopped: {e}")
+
+    async def stop(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._listen_task is not None:
+            self._listen_task.cancel()
+            await asyncio.gather(self._listen_task, return_exceptions=True)
+            self._listen_task = None
+        self._pending.clear()
+
+    def emit(
+        self, key: str, data: Any = None, change_fingerprint: Optional[str] = None
+    ):
+        """Report a change of `key`; changes with the last run's fingerprint are dropped."""
+        self.changes_received += 1
+        if (
+            change_fingerprint is not None
+            and self._fired_fingerprints.get(key) == change_fingerprint
+        ):
+            self.unchanged_skipped += 1
+            return
+        previous = self._pending.get(key)
+        self._pending[key] = {
+            "source": self.source,
+            "key": key,
+            "data": data,
+            "fingerprint": change_fingerprint,
+            "count": previous["count"] + 1 if previous else 1,
+        }
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self._first_pending_at is None:
+            self._first_pending_at = now
+        delay = self.debounce
+        if self.max_wait is not None:
+            delay = max(0.0, min(delay, self._first_pending_at + self.max_wait - now))
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = loop.call_later(delay, self._flush)
+
+    def _flush(self):
+        self._timer = None
+        self._first_pending_at = None
+        events = list(self._pending.values())
+        self._pending.clear()
+        if not events or self._callback is None:
+            return
+        self.fires += 1
+        task = asyncio.create_task(self._fire(events))
+        self._fire_tasks.add(task)
+        task.add_done_callback(self._fire_tasks.discard)
+
+    async def _fire(self, events: List[Dict[str, Any]]):
+        if not await self._callback(events):
+            return
+        for event in events:
+            if event["fingerprint"] is not None:
+                self._fired_fingerprints[event["key"]] = event["fingerprint"]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "trigger": type(self).__name__,
+            "changes_received": self.changes_received,
+            "unchanged_skipped": self.unchanged_skipped,
+            "fires": self.fires,
+            "pending": len(self._pending),
+        }
+
+
+class QueueTrigger(BaseTrigger):
+    """In-process queue, e.g. fed by a webhook endpoint: `await trigger.put(payload)`."""
+
+    source = "queue"
+
+    def __init__(
+        self,
+        key: str = "queue",
+        maxsize: int = 0,
+        dedupe: bool = True,
+        debounce: float = 1.0,
+        max_wait: Optional[float] = None,
+    ):
+        super().__init__(debounce=debounce, max_wait=max_wait)
+        self.key = key
+        self.dedupe = dedupe
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    async def put(self, payload: Any, key: Optional[str] = None):
+        await self.queue.put((key or self.key, payload))
+
+    def put_nowait(self, payload: Any, key: Optional[str] = None):
+        self.queue.put_nowait((key or self.key, payload))
+
+    async def listen(self):
+        while True:
+            key, payload = await self.queue.get()
+            self.emit(key, payload, fingerprint(payload) if self.dedupe else None)
+
+
+class RedisStreamTrigger(BaseTrigger):
+    """Fires on new entries of Redis streams."""
+
+    source = "redis_stream"
+
+    def __init__(
+        self,
+        streams: Sequence[str],
+        redis_url: Optional[str] = None,
+        start_id: str = "$",
+        block_ms: int = 2000,
+        debounce: float = 1.0,
+        max_wait: Optional[float] = None,
+    ):
+        super().__init__(debounce=debounce, max_wait=max_wait)
+        self.streams = list(streams)
+        self.redis_url = redis_url
+        self.last_ids = {stream: start_id for stream in self.streams}
+        # kept below the pooled client's 5s socket timeout
+        self.block_ms = block_ms
+
+    async def listen(self):
+        client = await get_redis_manager().get_client(self.redis_url)
+        while True:
+            response = await client.xread(self.last_ids, count=100, block=self.block_ms)
+            for stream, entries in response or []:
+                for entry_id, fields in entries:
+                    self.last_ids[stream] = entry_id
+                    self.emit(stream, {"id": entry_id, "fields": fields})
+
+
+class RedisPubSubTrigger(BaseTrigger):
+    """Fires on messages published to Redis channels or channel patterns."""
+
+    source = "redis_pubsub"
+
+    def __init__(
+        self,
+        channels: Sequence[str] = (),
+        patterns: Sequence[str] = (),
+        redis_url: Optional[str] = None,
+        dedupe: bool = True,
+        debounce: float = 1.0,
+        max_wait: Optional[float] = None,
+    ):
+        if not channels and not patterns:
+            raise ValueError("RedisPubSubTrigger needs channels or patterns")
+        super().__init__(debounce=debounce, max_wait=max_wait)
+        self.channels = list(channels)
+        self.patterns = list(patterns)
+        self.redis_url = redis_url
+        self.dedupe = dedupe
+
+    async def listen(self):
+        client = await get_redis_manager().get_client(self.redis_url)
+        pubsub = client.pubsub()
+        try:
+            if self.channels:
+                await pubsub.subscribe(*self.channels)
+            if self.patterns:
+                await pubsub.psubscribe(*self.patterns)
+            while True:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+                if message is None:
+                    continue
+                data = message["data"]
+                self.emit(
+                    message["channel"], data, fingerprint(data) if self.dedupe else None
+                )
+        finally:
+            await pubsub.aclose()
+
+
+class FileWatchTrigger(BaseTrigger):
+    """Fires when files under a directory are created, modified or deleted.
+
+    Uses `watchfiles` when it is installed and polls modification times every
+    `poll_interval` seconds otherwise. Files are fingerprinted by content, so
+    saving a file without changing it does not trigger a run.
+    """
+
+    source = "file"
+
+    def __init__(
+        self,
+        path: str,
+        patterns: Optional[Sequence[str]] = None,
+        recursive: bool = True,
+        poll_interval: float = 2.0,
+        debounce: float = 1.0,
+        max_wait: Optional[float] = None,
+    ):
+        super().__init__(debounce=debounce, max_wait=max_wait)
+        self.path = os.path.abspath(path)
+        self.patterns = list(patterns) if patterns else None
+        self.recursive = recursive
+        self.poll_interval = poll_interval
+
+    def _matches(self, path: str) -> bool:
+        if not self.recursive and os.path.dirname(path) != self.path:
+            return False
+        if self.patterns is None:
+            return True
+        name = os.path.basename(path)
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.patterns)
+
+    @staticmethod
+    def _content_fingerprint(path: str) -> str:
+        try:
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+            return digest.hexdigest()
+        except FileNotFoundError:
+            return "deleted"
+
+    async def _emit_file(self, path: str, change: str):
+        if not self._matches(path) or os.path.isdir(path):
+            return
+        file_fingerprint = await asyncio.to_thread(self._content_fingerprint, path)
+        if file_fingerprint == "deleted":
+            change = "deleted"
+        self.emit(path, {"path": path, "change": change}, file_fingerprint)
+
+    def _snapshot(self) -> Dict[str, tuple]:
+        snapshot = {}
+        for root, dirs, files in os.walk(self.path):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+            if not self.recursive:
+                break
+        return snapshot
+
+    async def listen(self):
+        if awatch is not None:
+            async for changes in awatch(self.path, recursive=self.recursive):
+                for change, path in changes:
+                    await self._emit_file(path, change.name)
+            return
+
+        previous = await asyncio.to_thread(self._snapshot)
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            current = await asyncio.to_thread(self._snapshot)
+            for path in current.keys() | previous.keys():
+                if path not in current:
+                    await self._emit_file(path, "deleted")
+                elif path not in previous:
+                    await self._emit_file(path, "added")
+                elif current[path] != previous[path]:
+                    await self._emit_file(path, "modified")
+            previous = current
+
+
+class MCPResourceTrigger(BaseTrigger):
+    """Fires on `notifications/resources/updated` for subscribed MCP resources.
+
+    The resources are subscribed on the agent's MCP servers that list them, or on
+    every server that supports subscriptions if none does (templated resources).
+    With `compare_content` the resource is read on every notification and the
+    run is skipped if its content did not change.
+    """
+
+    source = "mcp_resource"
+
+    def __init__(
+        self,
+        uris: Sequence[str],
+        compare_content: bool = True,
+        debounce: float = 1.0,
+        max_wait: Optional[float] = None,
+    ):
+        super().__init__(debounce=debounce, max_wait=max_wait)
+        self.uris = [str(uri) for uri in uris]
+        self.compare_content = compare_content
+        self._sessions: Dict[str, Any] = {}
+
+    def _subscribable_sessions(self, uri: str) -> List[Any]:
+        client = getattr(self.agent, "mcp_client", None)
+        if client is None:
+            raise RuntimeError(
+                "MCPResourceTrigger needs an in-process agent with MCP servers"
+            )
+        listing, subscribable = [], []
+        for server_name, info in client.sessions.items():
+            resources = client.available_resources.get(server_name, [])
+            if any(str(resource.uri) == uri for resource in resources):
+                listing.append(info["session"])
+            capabilities = info.get("capabilities")
+            resource_caps = getattr(capabilities, "resources", None)
+            if getattr(resource_caps, "subscribe", False):
+                subscribable.append(info["session"])
+        return listing or subscribable
+
+    async def _on_notification(self, notification: Any):
+        if getattr(notification, "method", None) != "notifications/resources/updated":
+            return
+        params = notification.params
+        uri = str(params.uri)
+        if uri not in self._sessions:
+            return
+        content_fingerprint = None
+        if self.compare_content:
+            try:
+                result = await self._sessions[uri].read_resource(params.uri)
+                content_fingerprint = fingerprint(
+                    [content.model_dump() for content in result.contents]
+                )
+            except Exception as e:
+                logger.warning(f"Could not read updated resource {uri}: {e}")
+        self.emit(uri, {"uri": uri}, content_fingerprint)
+
+    async def listen(self):
+        for uri in self.uris:
+            for session in self._subscribable_sessions(uri):
+                try:
+                    await session.subscribe_resource(AnyUrl(uri))
+                    self._sessions[uri] = session
+                    break
+                except Exception as e:
+                    logger.warning(f"Could not subscribe to resource {uri}: {e}")
+            if uri not in self._sessions:
+                logger.warning(f"No MCP server accepted a subscription to {uri}")
+        add_notification_listener(self._on_notification)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            remove_notification_listener(self._on_notification)
+            for uri, session in self._sessions.items():
+                try:
+                    await session.unsubscribe_resource(AnyUrl(uri))
+                except Exception:
+                    pass
+            self._sessions.clear()
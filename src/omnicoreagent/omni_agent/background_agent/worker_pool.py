@@ -0,0 +1,578 @@
+"""
+Subprocess worker pool for background agents.
+
+Each worker is a separate Python process with its own event loop, GIL and
+connections (LLM clients, MCP sessions, memory store), so heavy background runs
+do not slow down the interactive process. The parent talks to the workers over
+multiprocessing queues:
+
+- parent -> worker: `create`, `run`, `update`, `remove` and `stop` commands
+- worker -> parent: command replies (with the agent's run counters) and every
+  event the agent emits, which the parent appends to its own `EventRouter`
+
+Agents are placed on the least loaded worker, where load is the number of runs
+in flight plus the estimated duty cycle (average run time / interval) of the
+agents already assigned to it. A worker that dies is restarted and its agents
+are recreated on it.
+"""
+
+import asyncio
+import itertools
+import multiprocessing
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from omnicoreagent.core.events.base import BaseEventStore, Event
+from omnicoreagent.core.events.codec import decode_event, dumps, event_to_dict
+from omnicoreagent.core.events.event_router import EventRouter
+from omnicoreagent.core.memory_store.memory_router import MemoryRouter
+from omnicoreagent.core.utils import logger
+from omnicoreagent.omni_agent.background_agent.background_agents import (
+    BackgroundOmniAgent,
+)
+from omnicoreagent.omni_agent.background_agent.distributed import (
+    LeaseLostError,
+    slot_seconds,
+)
+from omnicoreagent.omni_agent.background_agent.metrics import AgentRunMetrics
+from omnicoreagent.omni_agent.background_agent.task_registry import TaskRegistry
+
+_STOP = ("stop",)
+_READER_CLOSED = ("closed",)
+
+
+class _ForwardingEventStore(BaseEventStore):
+    """Worker-side event store that ships every event to the parent process."""
+
+    def __init__(self, results):
+        self.results = results
+
+    async def append(self, session_id: str, event: Event) -> None:
+        self.results.put(("event", session_id, dumps(event_to_dict(event))))
+
+    async def get_events(self, session_id: str) -> List[Event]:
+        raise NotImplementedError("Events are stored by the parent process")
+
+    async def stream(self, session_id: str):
+        raise NotImplementedError("Events are streamed by the parent process")
+        yield  # pragma: no cover
+
+
+def _agent_counters(agent) -> Dict[str, Any]:
+    """Counters sent back to the handle; custom agent classes may lack some."""
+    run_metrics = getattr(agent, "run_metrics", None)
+    last_run = getattr(agent, "last_run", None)
+    return {
+        "run_count": getattr(agent, "run_count", 0),
+        "error_count": getattr(agent, "error_count", 0),
+        "llm_runs_skipped": getattr(agent, "llm_runs_skipped", 0),
+        "session_rotations": getattr(agent, "session_rotations", 0),
+        "last_run_metrics": run_metrics.last_run if run_metrics else None,
+        "last_run": last_run.isoformat() if last_run else None,
+    }
+
+
+class _WorkerRuntime:
+    """Event loop of a worker process: builds agents and runs them on request."""
+
+    def __init__(self, worker_id: int, commands, results, agent_class, memory_type):
+        self.worker_id = worker_id
+        self.commands = commands
+        self.results = results
+        self.agent_class = agent_class
+        self.memory_router = MemoryRouter(memory_store_type=memory_type)
+        self.event_router = EventRouter(
+            event_store_type="worker_forward",
+            async_publish=False,
+            event_store=_ForwardingEventStore(results),
+        )
+        self.task_registry = TaskRegistry()
+        self.agents: Dict[str, Any] = {}
+        self._runs: set = set()
+
+    def _reply(self, request_id: str, ok: bool, payload: Dict[str, Any]):
+        self.results.put(("reply", self.worker_id, request_id, ok, payload))
+
+    async def serve(self):
+        loop = asyncio.get_running_loop()
+        self.results.put(("ready", self.worker_id, os.getpid()))
+        while True:
+            message = await loop.run_in_executor(None, self.commands.get)
+            if message == _STOP:
+                break
+            kind, request_id = message[0], message[1]
+            handler = getattr(self, f"_handle_{kind}")
+            task = asyncio.create_task(self._handle(handler, request_id, *message[2:]))
+            self._runs.add(task)
+            task.add_done_callback(self._runs.discard)
+        for task in list(self._runs):
+            task.cancel()
+        for agent in self.agents.values():
+            try:
+                await agent.cleanup()
+            except Exception as e:
+                logger.warning(f"Worker {self.worker_id}: cleanup failed: {e}")
+
+    async def _handle(self, handler, request_id: str, *args):
+        try:
+            self._reply(request_id, True, await handler(*args))
+        except Exception as e:
+            logger.error(f"Worker {self.worker_id}: {handler.__name__} failed: {e}")
+            self._reply(request_id, False, {"error": str(e)})
+
+    async def _handle_create(
+        self,
+        agent_id: str,
+        config: Dict,
+        task_config: Dict,
+        session_id: Optional[str],
+    ):
+        self.task_registry.register(agent_id, task_config)
+        agent = self.agent_class(
+            config=config,
+            memory_router=self.memory_router,
+            event_router=self.event_router,
+            task_registry=self.task_registry,
+        )
+        if session_id:
+            # recreated agents (config update, worker restart) keep their session
+            agent.session_id = session_id
+        if config.get("mcp_tools"):
+            await agent.connect_mcp_servers()
+        self.agents[agent_id] = agent
+        return {"session_id": agent.get_session_id()}
+
+    async def _handle_run(self, agent_id: str, task_config: Dict, kwargs: Dict):
+        agent = self.agents[agent_id]
+        # the parent's registry is the source of truth for the task definition
+        self.task_registry.register(agent_id, task_config)
+        try:
+            result = await agent.run_task(**kwargs)
+        except Exception as e:
+            return {"error": str(e), **_agent_counters(agent)}
+        return {"result": result, **_agent_counters(agent)}
+
+    async def _handle_update(self, agent_id: str, new_config: Dict):
+        await self.agents[agent_id].update_config(new_config)
+        return {}
+
+    async def _handle_remove(self, agent_id: str):
+        agent = self.agents.pop(agent_id, None)
+        if agent is not None:
+            await agent.cleanup()
+        self.task_registry.remove(agent_id)
+        return {}
+
+
+def _worker_main(worker_id: int, commands, results, agent_class, memory_type):
+    runtime = _WorkerRuntime(worker_id, commands, results, agent_class, memory_type)
+    asyncio.run(runtime.serve())
+
+
+class WorkerAgentHandle:
+    """Parent-side stand-in for a background agent that lives in a worker process.
+
+    Offers the parts of the `BackgroundOmniAgent` interface the manager uses; runs
+    are forwarded to the worker and events arrive through the parent's router.
+    """
+
+    def __init__(
+        self,
+        pool: "WorkerPool",
+        config: Dict[str, Any],
+        task_registry: TaskRegistry,
+    ):
+        self.pool = pool
+        self.config = config
+        self.task_registry = task_registry
+        self.agent_id = config["agent_id"]
+        self.interval = config.get("interval", 3600)
+        self.max_retries = config.get("max_retries", 3)
+        self.retry_delay = config.get("retry_delay", 60)
+        self.jitter = config.get("jitter")
+        self.misfire_grace_time = config.get("misfire_grace_time")
+        self.worker_id: Optional[int] = None
+        self.session_id: Optional[str] = None
+        self.is_running = False
+        self.last_run: Optional[datetime] = None
+        self.run_count = 0
+        self.error_count = 0
+        self.llm_runs_skipped = 0
+        self.session_rotations = 0
+        self.run_metrics = AgentRunMetrics()
+        self.avg_run_seconds = 0.0
+
+    @property
+    def duty_cycle(self) -> float:
+        """Estimated share of the time this agent keeps its worker busy."""
+        return self.avg_run_seconds / slot_seconds(self.interval)
+
+    def get_session_id(self) -> str:
+        return self.session_id
+
+    def has_task(self) -> bool:
+        return self.task_registry.exists(self.agent_id)
+
+    def get_task_config(self) -> Dict[str, Any]:
+        task_config = self.task_registry.get(self.agent_id)
+        if not task_config:
+            raise ValueError(f"No task registered for agent {self.agent_id}")
+        return task_config
+
+    def get_task_query(self) -> str:
+        task_config = self.get_task_config()
+        if "query" not in task_config:
+            raise ValueError(f"Task for agent {self.agent_id} is missing 'query' field")
+        return task_config["query"]
+
+    def get_event_stream_info(self) -> Dict[str, Any]:
+        event_router = self.pool.event_router
+        return {
+            "agent_id": self.agent_id,
+            "session_id": self.session_id,
+            "event_store_type": event_router.get_event_store_type(),
+            "event_store_available": event_router.is_available(),
+            "event_store_info": event_router.get_event_store_info(),
+        }
+
+    async def stream_events(self, session_id: str):
+        async for event in self.pool.event_router.stream(session_id=session_id):
+            yield event
+
+    async def get_events(self, session_id: str) -> List[Event]:
+        return await self.pool.event_router.get_events(session_id=session_id)
+
+    async def run_task(
+        self,
+        fencing_token: Optional[int] = None,
+        fence: Optional[Callable[[], Awaitable[bool]]] = None,
+        **kwargs,
+    ):
+        """Run the task on the agent's worker and wait for its result.
+
+        The lease `fence` cannot be sent to the worker, so in distributed mode it
+        is only checked before the run is handed over.
+        """
+        if self.is_running:
+            logger.warning(
+                f"Agent {self.agent_id} is already running, skipping execution"
+            )
+            return
+        # claimed before the first await, so a concurrent run sees it
+        self.is_running = True
+        started_at = asyncio.get_running_loop().time()
+        try:
+            task_config = await self.task_registry.get_async(self.agent_id)
+            if not task_config:
+                raise ValueError(
+                    f"No task registered for agent {self.agent_id}. Register a task first using TaskRegistry."
+                )
+            if fence is not None and not await fence():
+                raise LeaseLostError(
+                    f"Agent {self.agent_id} lost its lease before running"
+                )
+            if fencing_token is not None:
+                kwargs = {**kwargs, "fencing_token": fencing_token}
+            if self.worker_id is None:
+                # cleaned up by stop_agent, placed again on its next run
+                await self.pool.place(self)
+            reply = await self.pool.request(
+                self.worker_id,
+                "run",
+                self.agent_id,
+                task_config,
+                kwargs,
+                inflight=True,
+            )
+        finally:
+            self.is_running = False
+        elapsed = asyncio.get_running_loop().time() - started_at
+        self.avg_run_seconds = (
+            elapsed
+            if not self.avg_run_seconds
+            else 0.8 * self.avg_run_seconds + 0.2 * elapsed
+        )
+        self.run_count = reply.get("run_count", self.run_count)
+        self.error_count = reply.get("error_count", self.error_count)
+        self.llm_runs_skipped = reply.get("llm_runs_skipped", self.llm_runs_skipped)
+        self.session_rotations = reply.get("session_rotations", self.session_rotations)
+        run = reply.get("last_run_metrics")
+        if run and run != self.run_metrics.last_run:
+            self.run_metrics.observe(self.agent_id, run)
+        if reply.get("last_run"):
+            self.last_run = datetime.fromisoformat(reply["last_run"])
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+        return reply.get("result")
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "agent_id": self.agent_id,
+            "session_id": self.session_id,
+            "is_running": self.is_running,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "run_count": self.run_count,
+            "error_count": self.error_count,
+            "interval": self.interval,
+            "max_retries": self.max_retries,
+            "worker_id": self.worker_id,
+            "event_stream_info": self.get_event_stream_info(),
+            "has_task": self.has_task(),
+            "current_task_query": self.get_task_query() if self.has_task() else None,
+        }
+
+    async def update_config(self, new_config: Dict[str, Any]):
+        for option in (
+            "interval",
+            "max_retries",
+            "retry_delay",
+            "jitter",
+            "misfire_grace_time",
+        ):
+            if option in new_config:
+                setattr(self, option, new_config[option])
+        self.config.update(new_config)
+        if self.worker_id is not None:
+            await self.pool.request(self.worker_id, "update", self.agent_id, new_config)
+
+    async def cleanup(self):
+        await self.pool.remove_agent(self.agent_id)
+
+
+class _Worker:
+    def __init__(self, worker_id: int, process, commands, ready: asyncio.Future):
+        self.worker_id = worker_id
+        self.process = process
+        self.commands = commands
+        # resolved with the worker's pid once its event loop is serving
+        self.ready = ready
+        self.agents: Dict[str, WorkerAgentHandle] = {}
+        self.inflight = 0
+        self.restarts = 0
+
+    @property
+    def load(self) -> float:
+        return self.inflight + sum(h.duty_cycle for h in self.agents.values())
+
+
+class WorkerPool:
+    """Runs background agents in subprocess workers, placed by load."""
+
+    def __init__(
+        self,
+        num_workers: Optional[int] = None,
+        agent_class: type = BackgroundOmniAgent,
+        memory_store_type: str = "in_memory",
+        mp_context: str = "spawn",
+        request_timeout: Optional[float] = None,
+    ):
+        """
+        Args:
+            num_workers: Number of worker processes, defaults to the CPU count
+            agent_class: Agent class instantiated inside the workers
+            memory_store_type: Memory store of the workers; use a shared store
+                ("redis", "database") to share history with the parent
+            mp_context: multiprocessing start method
+            request_timeout: Seconds to wait for a worker reply (None = no limit)
+        """
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.agent_class = agent_class
+        self.memory_store_type = memory_store_type
+        self.request_timeout = request_timeout
+        self.event_router: Optional[EventRouter] = None
+        self._context = multiprocessing.get_context(mp_context)
+        self._results = None
+        self._workers: List[_Worker] = []
+        self._handles: Dict[str, WorkerAgentHandle] = {}
+        self._pending: Dict[str, Tuple[int, asyncio.Future]] = {}
+        self._reader: Optional[asyncio.Task] = None
+        self._watchdog: Optional[asyncio.Task] = None
+        self._request_ids = itertools.count()
+        self.started = False
+
+    async def start(self, event_router: EventRouter):
+        """Spawn the workers; their events are appended to `event_router`."""
+        if self.started:
+            return
+        self.event_router = event_router
+        self._results = self._context.Queue()
+        self._reader = asyncio.create_task(self._read_results())
+        self._workers = [
+            self._spawn(worker_id) for worker_id in range(self.num_workers)
+        ]
+        await asyncio.gather(*(worker.ready for worker in self._workers))
+        self._watchdog = asyncio.create_task(self._watch_workers())
+        self.started = True
+        logger.info(f"Started background worker pool with {self.num_workers} workers")
+
+    def _spawn(self, worker_id: int) -> _Worker:
+        commands = self._context.Queue()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(
+                worker_id,
+                commands,
+                self._results,
+                self.agent_class,
+                self.memory_store_type,
+            ),
+            name=f"omnicoreagent-bg-worker-{worker_id}",
+            daemon=True,
+        )
+        ready = asyncio.get_running_loop().create_future()
+        process.start()
+        return _Worker(worker_id, process, commands, ready)
+
+    async def _read_results(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await loop.run_in_executor(None, self._results.get)
+            if message == _READER_CLOSED:
+                return
+            try:
+                await self._dispatch(message)
+            except Exception as e:
+                logger.error(f"Worker pool failed to handle {message[0]}: {e}")
+
+    async def _dispatch(self, message: tuple):
+        kind = message[0]
+        if kind == "event":
+            _, session_id, body = message
+            await self.event_router.append(session_id, decode_event(body))
+        elif kind == "reply":
+            _, worker_id, request_id, ok, payload = message
+            _, future = self._pending.pop(request_id, (None, None))
+            if future is not None and not future.done():
+                if ok:
+                    future.set_result(payload)
+                else:
+                    future.set_exception(RuntimeError(payload.get("error")))
+        elif kind == "ready":
+            _, worker_id, pid = message
+            ready = self._workers[worker_id].ready
+            if not ready.done():
+                ready.set_result(pid)
+
+    async def request(self, worker_id: int, kind: str, *args, inflight=False):
+        """Send a command to a worker and wait for its reply payload."""
+        worker = self._workers[worker_id]
+        request_id = f"{next(self._request_ids)}-{uuid.uuid4().hex[:6]}"
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = (worker_id, future)
+        if inflight:
+            worker.inflight += 1
+        try:
+            worker.commands.put((kind, request_id, *args))
+            return await asyncio.wait_for(future, self.request_timeout)
+        finally:
+            self._pending.pop(request_id, None)
+            if inflight:
+                worker.inflight -= 1
+
+    def least_loaded_worker(self) -> _Worker:
+        return min(self._workers, key=lambda w: (w.load, len(w.agents)))
+
+    async def create_agent(
+        self, config: Dict[str, Any], task_registry: TaskRegistry
+    ) -> WorkerAgentHandle:
+        """Create the agent on the least loaded worker and return its handle."""
+        handle = WorkerAgentHandle(self, dict(config), task_registry)
+        await self.place(handle)
+        return handle
+
+    async def place(self, handle: WorkerAgentHandle):
+        """Create the handle's agent on the least loaded worker."""
+        worker = self.least_loaded_worker()
+        await self.create_on_worker(handle, worker.worker_id)
+        self._handles[handle.agent_id] = handle
+        logger.info(
+            f"Placed background agent {handle.agent_id} on worker {worker.worker_id}"
+        )
+
+    async def create_on_worker(self, handle: WorkerAgentHandle, worker_id: int):
+        reply = await self.request(
+            worker_id,
+            "create",
+            handle.agent_id,
+            handle.config,
+            handle.task_registry.get(handle.agent_id) or {},
+            handle.session_id,
+        )
+        handle.worker_id = worker_id
+        handle.session_id = reply["session_id"]
+        self._workers[worker_id].agents[handle.agent_id] = handle
+
+    async def remove_agent(self, agent_id: str):
+        handle = self._handles.pop(agent_id, None)
+        if handle is None or handle.worker_id is None or not self.started:
+            return
+        worker_id, handle.worker_id = handle.worker_id, None
+        self._workers[worker_id].agents.pop(agent_id, None)
+        await self.request(worker_id, "remove", agent_id)
+
+    async def _watch_workers(self, interval: float = 1.0):
+        while True:
+            await asyncio.sleep(interval)
+            for worker in list(self._workers):
+                if worker.process.is_alive():
+                    continue
+                logger.error(
+                    f"Background worker {worker.worker_id} exited with code "
+                    f"{worker.process.exitcode}, restarting it"
+                )
+                try:
+                    await self._restart(worker)
+                except Exception as e:
+                    logger.error(f"Failed to restart worker {worker.worker_id}: {e}")
+
+    async def _restart(self, worker: _Worker):
+        for request_id, (worker_id, future) in list(self._pending.items()):
+            if worker_id == worker.worker_id and not future.done():
+                future.set_exception(
+                    RuntimeError(f"Background worker {worker_id} died")
+                )
+        replacement = self._spawn(worker.worker_id)
+        replacement.restarts = worker.restarts + 1
+        self._workers[worker.worker_id] = replacement
+        await replacement.ready
+        for handle in worker.agents.values():
+            handle.is_running = False
+            await self.create_on_worker(handle, worker.worker_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workers": [
+                {
+                    "worker_id": worker.worker_id,
+                    "pid": worker.ready.result() if worker.ready.done() else None,
+                    "alive": worker.process.is_alive(),
+                    "agents": sorted(worker.agents),
+                    "inflight": worker.inflight,
+                    "load": round(worker.load, 4),
+                    "restarts": worker.restarts,
+                }
+                for worker in self._workers
+            ]
+        }
+
+    async def shutdown(self, timeout: float = 10.0):
+        """Stop the workers, cleaning up their agents, and the result reader."""
+        if not self.started:
+            return
+        self.started = False
+        if self._watchdog is not None:
+            self._watchdog.cancel()
+        for worker in self._workers:
+            worker.commands.put(_STOP)
+        loop = asyncio.get_running_loop()
+        for worker in self._workers:
+            await loop.run_in_executor(None, worker.process.join, timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+        self._results.put(_READER_CLOSED)
+        await self._reader
+        self._workers = []
+        self._handles.clear()
+        logger.info("Background worker pool shutdown")
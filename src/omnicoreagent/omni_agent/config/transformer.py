@@ -4,6 +4,7 @@ from dataclasses import dataclass, asdict, field
 from enum import Enum
 import uuid
 from omnicoreagent.core.utils import logger
+from omnicoreagent.mcp_omni_connect.call_policy import MCPCallPolicy
 from decouple import config
 
 
@@ -55,6 +56,8 @@ class MCPToolConfig:
     timeout: Optional[int] = 60
     sse_read_timeout: Optional[int] = 120
     auth: Optional[Dict[str, Any]] = None
+    # per-server call limits, see mcp_omni_connect.call_policy.MCPCallPolicy
+    call_policy: Optional[Dict[str, Any]] = None
 
     def __post_init__(self):
         if not self.name:
@@ -80,6 +83,7 @@ class AgentConfig:
     memory_results_limit: int = 5
     memory_similarity_threshold: float = 0.5
     memory_tool_backend: str = None
+    context_compaction: dict = field(default_factory=dict)
 
 
 class ConfigTransformer:
@@ -276,6 +280,11 @@ class ConfigTransformer:
             # Validate transport-specific requirements
             self._validate_tool_transport(tool)
 
+            if tool.call_policy is not None:
+                if not isinstance(tool.call_policy, dict):
+                    raise ValueError("call_policy must be a dictionary")
+                MCPCallPolicy.from_config(tool.call_policy)
+
     def _validate_tool_transport(self, tool: MCPToolConfig):
         """Validate tool transport configuration"""
         if tool.transport_type in [TransportType.SSE, TransportType.STREAMABLE_HTTP]:
@@ -352,6 +361,8 @@ class ConfigTransformer:
         for tool in tools:
             transformer = self.supported_transports[tool.transport_type]
             servers[tool.name] = transformer(tool)
+            if tool.call_policy:
+                servers[tool.name]["call_policy"] = tool.call_policy
 
         return servers
 
@@ -1,6 +1,13 @@
 from .parallel_agent import ParallelAgent
 from .sequential_agent import SequentialAgent
 from .router_agent import RouterAgent
+from .graph_agent import GraphAgent, GraphNode
 
 
-__all__ = ["ParallelAgent", "SequentialAgent", "RouterAgent"]
+__all__ = [
+    "ParallelAgent",
+    "SequentialAgent",
+    "RouterAgent",
+    "GraphAgent",
+    "GraphNode",
+]
@@ -0,0 +1,308 @@
+from omnicoreagent.omni_agent.agent import OmniAgent
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Union
+from omnicoreagent.core.utils import logger
+from omnicoreagent.omni_agent.workflow.utils import connect_agents
+import asyncio
+import hashlib
+import time
+import uuid
+
+InputMapping = Union[str, Callable[[Dict[str, str]], str]]
+
+
+@dataclass
+class GraphNode:
+    """A node of a GraphAgent: an agent plus the nodes whose output it consumes.
+
+    `input_map` builds the node's query from its inputs, a dict holding the graph's
+    initial task under "input" and the response of each dependency under its node
+    name. It is either a format string such as "Compare:\\n{fetch_a}\\n{fetch_b}" or a
+    callable taking that dict. Without it, root nodes get the initial task, nodes
+    with one dependency get its response and nodes with several get all of them.
+    """
+
+    name: str
+    agent: OmniAgent
+    depends_on: List[str] = field(default_factory=list)
+    input_map: Optional[InputMapping] = None
+
+
+class GraphAgent:
+    """Runs OmniAgents as a DAG, each node starting as soon as its dependencies finish.
+
+    Independent nodes run concurrently, at most `max_concurrency` at a time. Node
+    outputs are memoized by a hash of their input, so re-running the graph skips
+    every node whose input has not changed; `run(rerun=[...])` forces nodes to run
+    again. The output, status and latency of every node from the last run are kept
+    in `node_results`.
+    """
+
+    DEFAULT_TASK = "Please follow your system instructions and process accordingly."
+
+    def __init__(
+        self,
+        nodes: List[GraphNode],
+        max_concurrency: Optional[int] = None,
+        max_retries: int = 3,
+        node_timeout: Optional[float] = None,
+    ):
+        if not nodes:
+            raise ValueError("GraphAgent requires at least one node")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.nodes: Dict[str, GraphNode] = {}
+        for node in nodes:
+            if node.name in self.nodes:
+                raise ValueError(f"Duplicate graph node '{node.name}'")
+            self.nodes[node.name] = node
+        self.order = self._topological_order()
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.node_timeout = node_timeout
+        self.node_results: Dict[str, dict] = {}
+        self._cache: Dict[str, dict] = {}
+        self._initialized = False
+
+    def _topological_order(self) -> List[str]:
+        """Validate the dependencies and return the node names in execution order."""
+        in_degree = {name: 0 for name in self.nodes}
+        dependents: Dict[str, List[str]] = {name: [] for name in self.nodes}
+        for node in self.nodes.values():
+            for dep in node.depends_on:
+                if dep not in self.nodes:
+                    raise ValueError(
+                        f"Node '{node.name}' depends on unknown node '{dep}'"
+                    )
+                in_degree[node.name] += 1
+                dependents[dep].append(node.name)
+
+        ready = [name for name, degree in in_degree.items() if degree == 0]
+        order = []
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for dependent in dependents[name]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(self.nodes):
+            cyclic = sorted(set(self.nodes) - set(order))
+            raise ValueError(f"GraphAgent nodes form a cycle: {', '.join(cyclic)}")
+        return order
+
+    @property
+    def sub_agents(self) -> List[OmniAgent]:
+        """Distinct agents of the graph; an agent may back several nodes."""
+        agents = []
+        for node in self.nodes.values():
+            if not any(agent is node.agent for agent in agents):
+                agents.append(node.agent)
+        return agents
+
+    @property
+    def sinks(self) -> List[str]:
+        """Nodes no other node depends on; their responses form the graph output."""
+        used = {dep for node in self.nodes.values() for dep in node.depends_on}
+        return [name for name in self.order if name not in used]
+
+    async def initialize(self):
+        """Connect MCP servers for all sub-agents."""
+        if self._initialized:
+            return
+        logger.info("GraphAgent: Initializing MCP servers for sub-agents")
+        await connect_agents(self.sub_agents)
+        self._initialized = True
+
+    def _build_query(self, node: GraphNode, inputs: Dict[str, str]) -> str:
+        if isinstance(node.input_map, str):
+            return node.input_map.format(**inputs)
+        if callable(node.input_map):
+            return node.input_map(inputs)
+        if not node.depends_on:
+            return inputs["input"]
+        if len(node.depends_on) == 1:
+            return inputs[node.depends_on[0]]
+        return "\n\n".join(f"[{dep}]\n{inputs[dep]}" for dep in node.depends_on)
+
+    @staticmethod
+    def _input_hash(node: GraphNode, query: str) -> str:
+        agent_name = getattr(node.agent, "name", "")
+        key = f"{node.name}\x00{agent_name}\x00{query}"
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def invalidate(self, *node_names: str):
+        """Drop memoized outputs so the given nodes (all if none given) run again."""
+        for name in node_names or list(self._cache):
+            if name not in self.nodes:
+                raise ValueError(f"Unknown graph node '{name}'")
+            self._cache.pop(name, None)
+
+    async def run(
+        self,
+        initial_task: Optional[str] = None,
+        session_id: Optional[str] = None,
+        rerun: Optional[Iterable[str]] = None,
+    ) -> dict:
+        """Run the graph and return the sink output plus every node's result.
+
+        Args:
+            initial_task: Input for the root nodes, DEFAULT_TASK if not given.
+            session_id: Shared session ID, generated if not provided.
+            rerun: Nodes to run again even if their input is unchanged.
+        """
+        if not self._initialized:
+            raise RuntimeError(
+                "GraphAgent must be initialized Call `await <your_instance>.initialize()` before using it"
+            )
+        if not initial_task:
+            initial_task = self.DEFAULT_TASK
+        if not session_id:
+            session_id = str(uuid.uuid4())
+        if rerun:
+            self.invalidate(*rerun)
+
+        semaphore = (
+            asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+        )
+        tasks: Dict[str, asyncio.Task] = {}
+        # creating tasks in topological order means every dependency task exists
+        for name in self.order:
+            tasks[name] = asyncio.create_task(
+                self._run_node(
+                    self.nodes[name], initial_task, session_id, tasks, semaphore
+                )
+            )
+        try:
+            results = dict(zip(tasks, await asyncio.gather(*tasks.values())))
+        finally:
+            for task in tasks.values():
+                task.cancel()
+        self.node_results = results
+
+        sinks = self.sinks
+        failed = [name for name in self.order if results[name]["status"] == "failed"]
+        if len(sinks) == 1:
+            response = results[sinks[0]]["response"]
+        else:
+            response = "\n\n".join(
+                f"[{name}]\n{results[name]['response']}"
+                for name in sinks
+                if results[name]["response"] is not None
+            )
+        output = {"response": response, "session_id": session_id, "nodes": results}
+        if failed:
+            output["failed_nodes"] = failed
+        return output
+
+    async def _run_node(
+        self,
+        node: GraphNode,
+        initial_task: str,
+        session_id: str,
+        tasks: Dict[str, asyncio.Task],
+        semaphore: Optional[asyncio.Semaphore],
+    ) -> dict:
+        upstream = [await tasks[dep] for dep in node.depends_on]
+        failed_deps = [
+            dep
+            for dep, res in zip(node.depends_on, upstream)
+            if res["status"] not in ("success", "cached")
+        ]
+        if failed_deps:
+            logger.warning(
+                f"GraphAgent: Skipping '{node.name}', upstream failed: {failed_deps}"
+            )
+            return {
+                "response": None,
+                "status": "skipped",
+                "error": f"Upstream nodes failed: {', '.join(failed_deps)}",
+                "elapsed_seconds": 0.0,
+            }
+
+        inputs = {"input": initial_task}
+        inputs.update(
+            {dep: res["response"] for dep, res in zip(node.depends_on, upstream)}
+        )
+        query = self._build_query(node, inputs)
+        input_hash = self._input_hash(node, query)
+        cached = self._cache.get(node.name)
+        if cached is not None and cached["input_hash"] == input_hash:
+            logger.info(f"GraphAgent: '{node.name}' input unchanged, reusing output")
+            return {**cached, "status": "cached", "elapsed_seconds": 0.0}
+
+        if semaphore is not None:
+            await semaphore.acquire()
+        started_at = time.perf_counter()
+        try:
+            response, error = await asyncio.wait_for(
+                self._run_with_retries(node, query, session_id), self.node_timeout
+            )
+        except asyncio.TimeoutError:
+            logger.error(
+                f"GraphAgent: '{node.name}' timed out after {self.node_timeout}s"
+            )
+            response, error = None, f"Timed out after {self.node_timeout}s"
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+        elapsed = round(time.perf_counter() - started_at, 4)
+
+        if error is not None:
+            return {
+                "response": None,
+                "status": "failed",
+                "error": error,
+                "input_hash": input_hash,
+                "elapsed_seconds": elapsed,
+            }
+        result = {
+            "response": response,
+            "status": "success",
+            "input_hash": input_hash,
+            "elapsed_seconds": elapsed,
+        }
+        self._cache[node.name] = {"response": response, "input_hash": input_hash}
+        return result
+
+    async def _run_with_retries(self, node: GraphNode, query: str, session_id: str):
+        """Returns (response, error) after at most `max_retries` attempts."""
+        retry_count = 0
+        while True:
+            try:
+                output = await node.agent.run(query=query, session_id=session_id)
+                return output.get("response", ""), None
+            except Exception as exc:
+                retry_count += 1
+                logger.warning(
+                    f"{node.name}: Attempt {retry_count}/{self.max_retries} failed: {exc}"
+                )
+                if retry_count >= self.max_retries:
+                    logger.error(f"{node.name}: Max retries reached")
+                    return None, str(exc)
+
+    async def __call__(
+        self,
+        initial_task: Optional[str] = None,
+        session_id: Optional[str] = None,
+        **run_kwargs,
+    ):
+        auto_init = not self._initialized
+        try:
+            if auto_init:
+                await self.initialize()
+            return await self.run(
+                initial_task=initial_task, session_id=session_id, **run_kwargs
+            )
+        finally:
+            if auto_init:
+                await self.shutdown()
+
+    async def shutdown(self):
+        for agent in self.sub_agents:
+            if getattr(agent, "mcp_tools", None):
+                try:
+                    await agent.cleanup()
+                    logger.info(f"{agent.name}: MCP cleanup successful")
+                except Exception as exc:
+                    logger.warning(f"{agent.name}: MCP cleanup failed: {exc}")
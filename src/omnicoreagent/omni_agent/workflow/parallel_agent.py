@@ -1,20 +1,41 @@
 from omnicoreagent.omni_agent.agent import OmniAgent
-from typing import List, Optional, Dict
+from typing import AsyncIterator, List, Optional, Dict
 from omnicoreagent.core.utils import logger
+from omnicoreagent.omni_agent.workflow.utils import connect_agents
 import asyncio
+import time
 import uuid
+from contextlib import aclosing
+
+COMPLETION_MODES = ("all", "first_success", "quorum")
 
 
 class ParallelAgent:
-    """Runs a list of OmniAgents in parallel, each with its own optional task, sharing a session ID if provided."""
+    """Runs a list of OmniAgents in parallel, each with its own optional task, sharing a session ID if provided.
+
+    At most `max_concurrency` sub-agents run at once (unbounded by default) and each
+    one gets `agent_timeout` seconds, retries included. Results can be consumed as
+    they complete with `as_completed`, or collected with `run`, which can also stop
+    early on the first success or once a quorum of agents has succeeded.
+    """
 
     DEFAULT_TASK = "Please follow your system instructions and process accordingly."
 
-    def __init__(self, sub_agents: List[OmniAgent], max_retries: int = 3):
+    def __init__(
+        self,
+        sub_agents: List[OmniAgent],
+        max_retries: int = 3,
+        max_concurrency: Optional[int] = None,
+        agent_timeout: Optional[float] = None,
+    ):
         if not sub_agents:
             raise ValueError("ParallelAgent requires at least one sub-agent")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
         self.sub_agents = sub_agents
         self.max_retries = max_retries
+        self.max_concurrency = max_concurrency
+        self.agent_timeout = agent_timeout
         self._initialized = False
 
     async def initialize(self):
@@ -22,55 +43,179 @@ class ParallelAgent:
         if self._initialized:
             return
         logger.info("RouterAgent: Initializing MCP servers for router and sub-agents")
-        for agent in self.sub_agents:
-            if getattr(agent, "mcp_tools", None):
-                try:
-                    await agent.connect_mcp_servers()
-                    logger.info(f"{agent.name}: MCP servers connected")
-                except Exception as exc:
-                    logger.warning(f"{agent.name}: MCP connection failed: {exc}")
+        await connect_agents(self.sub_agents)
         self._initialized = True
 
-    async def run(
-        self,
-        agent_tasks: Optional[Dict[str, Optional[str]]] = None,
-        session_id: Optional[str] = None,
-    ) -> dict:
+    def _check_initialized(self):
         if not self._initialized:
             raise RuntimeError(
                 "ParalleAgent must be initialized `Call `await <your_instance>.initialize()` before using it`"
             )
-        if not session_id:
-            session_id = str(uuid.uuid4())
 
-        tasks = []
+    def _launch(
+        self,
+        agent_tasks: Optional[Dict[str, Optional[str]]],
+        session_id: str,
+        agent_timeouts: Optional[Dict[str, float]],
+    ) -> Dict[asyncio.Task, str]:
+        semaphore = (
+            asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+        )
+        tasks = {}
         for idx, agent_service in enumerate(self.sub_agents, start=1):
             agent_name = getattr(agent_service, "name", f"Agent_{idx}")
-            task = (agent_tasks or {}).get(agent_name) or self.DEFAULT_TASK
             # convert task to query
-            query = task
-            tasks.append(
-                asyncio.create_task(
-                    self._run_single_agent(agent_service, query, session_id, idx)
+            query = (agent_tasks or {}).get(agent_name) or self.DEFAULT_TASK
+            timeout = (agent_timeouts or {}).get(agent_name, self.agent_timeout)
+            task = asyncio.create_task(
+                self._run_single_agent(
+                    agent_service, query, session_id, idx, semaphore, timeout
                 )
             )
+            tasks[task] = agent_name
+        return tasks
+
+    async def as_completed(
+        self,
+        agent_tasks: Optional[Dict[str, Optional[str]]] = None,
+        session_id: Optional[str] = None,
+        agent_timeouts: Optional[Dict[str, float]] = None,
+    ) -> AsyncIterator[dict]:
+        """Yield each sub-agent's result dict as soon as it finishes.
 
-        results = await asyncio.gather(*tasks)
-        return {res["agent_name"]: res for res in results}
+        Sub-agents that are still running when the caller stops iterating are cancelled.
+        """
+        self._check_initialized()
+        if not session_id:
+            session_id = str(uuid.uuid4())
+
+        pending = set(self._launch(agent_tasks, session_id, agent_timeouts))
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def run(
+        self,
+        agent_tasks: Optional[Dict[str, Optional[str]]] = None,
+        session_id: Optional[str] = None,
+        completion: str = "all",
+        quorum: Optional[int] = None,
+        agent_timeouts: Optional[Dict[str, float]] = None,
+    ) -> dict:
+        """Run every sub-agent and return their results keyed by agent name.
+
+        Args:
+            agent_tasks: Optional task per agent name; others use DEFAULT_TASK.
+            session_id: Shared session ID, generated if not provided.
+            completion: "all" waits for every agent, "first_success" returns after the
+                first successful agent and "quorum" after `quorum` successes. Agents
+                still running at that point are cancelled.
+            quorum: Number of successes required when `completion="quorum"`.
+            agent_timeouts: Per-agent overrides of `agent_timeout`, in seconds.
+        """
+        self._check_initialized()
+        if completion not in COMPLETION_MODES:
+            raise ValueError(
+                f"Unknown completion mode '{completion}'. "
+                f"Options: {', '.join(COMPLETION_MODES)}"
+            )
+        if completion == "quorum" and not quorum:
+            raise ValueError("completion='quorum' requires a quorum count")
+        required = {"all": None, "first_success": 1, "quorum": quorum}[completion]
+
+        if not session_id:
+            session_id = str(uuid.uuid4())
+
+        results = {}
+        successes = 0
+        async with aclosing(
+            self.as_completed(
+                agent_tasks=agent_tasks,
+                session_id=session_id,
+                agent_timeouts=agent_timeouts,
+            )
+        ) as completed:
+            async for res in completed:
+                results[res["agent_name"]] = res
+                if res["status"] == "success":
+                    successes += 1
+                if required is not None and successes >= required:
+                    # leaving the block cancels the agents still running
+                    break
+
+        # agents cancelled by an early return are still reported
+        for idx, agent_service in enumerate(self.sub_agents, start=1):
+            agent_name = getattr(agent_service, "name", f"Agent_{idx}")
+            if agent_name not in results:
+                results[agent_name] = {
+                    "response": None,
+                    "session_id": session_id,
+                    "agent_name": agent_name,
+                    "status": "cancelled",
+                    "elapsed_seconds": None,
+                }
+        return results
 
     async def _run_single_agent(
-        self, agent_service: OmniAgent, query: str, session_id: str, idx: int
+        self,
+        agent_service: OmniAgent,
+        query: str,
+        session_id: str,
+        idx: int,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        timeout: Optional[float] = None,
     ) -> dict:
-        """Runs an agent with retry logic and MCP management."""
+        """Runs an agent with retry logic, a concurrency slot and an optional deadline."""
         agent_name = getattr(agent_service, "name", f"Agent_{idx}")
+        queued_at = time.perf_counter()
+        if semaphore is not None:
+            await semaphore.acquire()
+        started_at = time.perf_counter()
+        try:
+            final_output = await asyncio.wait_for(
+                self._run_with_retries(agent_service, agent_name, query, session_id),
+                timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"{agent_name}: Timed out after {timeout}s")
+            final_output = {
+                "response": query,
+                "session_id": session_id,
+                "failed_agent": agent_name,
+                "error": f"Timed out after {timeout}s",
+                "status": "timeout",
+            }
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+        return {
+            "agent_name": agent_name,
+            "status": "success",
+            **final_output,
+            "queued_seconds": round(started_at - queued_at, 4),
+            "elapsed_seconds": round(time.perf_counter() - started_at, 4),
+        }
+
+    async def _run_with_retries(
+        self, agent_service: OmniAgent, agent_name: str, query: str, session_id: str
+    ) -> dict:
         final_output = {}
         retry_count = 0
 
         while retry_count < self.max_retries:
             try:
-                # Run the agent (shield prevents cancellation from breaking cleanup)
-                final_output = await asyncio.shield(
-                    agent_service.run(query=query, session_id=session_id)
+                final_output = await agent_service.run(
+                    query=query, session_id=session_id
                 )
                 break
 
@@ -86,6 +231,7 @@ class ParallelAgent:
                         "session_id": session_id,
                         "failed_agent": agent_name,
                         "error": str(exc),
+                        "status": "failed",
                     }
                     break
 
@@ -95,12 +241,15 @@ class ParallelAgent:
         self,
         agent_tasks: Optional[Dict[str, Optional[str]]] = None,
         session_id: Optional[str] = None,
+        **run_kwargs,
     ):
         auto_init = not self._initialized
         try:
             if auto_init:
                 await self.initialize()
-            return await self.run(agent_tasks=agent_tasks, session_id=session_id)
+            return await self.run(
+                agent_tasks=agent_tasks, session_id=session_id, **run_kwargs
+            )
         finally:
             if auto_init:
                 await self.shutdown()
@@ -1,7 +1,17 @@
 from omnicoreagent.omni_agent.agent import OmniAgent
 from omnicoreagent.core.utils import logger
-from typing import List, Optional, Dict
+from omnicoreagent.omni_agent.workflow.utils import connect_agents
+from omnicoreagent.omni_agent.workflow.routing import (
+    ROUTER_CAPABILITY_CACHE,
+    CapabilityCache,
+    EmbeddingRouteClassifier,
+    RouteCache,
+    capability_fingerprint,
+    extract_embeddings,
+)
+from typing import Any, Dict, List, Optional
 import asyncio
+import time
 import uuid
 import re
 
@@ -13,6 +23,10 @@ class RouterAgent:
     - Builds an internal RouterAgent OmniAgent with those configs.
     - Eagerly connects MCP servers at startup.
     - Routes user task and executes chosen agent.
+
+    Routing is tiered: a cache of previous decisions is checked first, then (when an
+    `embedding_config` is given) the task embedding is compared with each agent's
+    capability summary. Only tasks without a confident match go to the LLM router.
     """
 
     DEFAULT_TASK = "Please follow your system instructions and process accordingly."
@@ -26,6 +40,11 @@ class RouterAgent:
         event_router=None,
         debug: bool = False,
         max_retries: int = 3,
+        embedding_config: Optional[Dict[str, Any]] = None,
+        route_similarity_threshold: float = 0.5,
+        route_margin: float = 0.05,
+        route_cache_size: int = 1024,
+        capability_cache_path: Optional[str] = None,
     ):
         if not sub_agents:
             raise ValueError("RouterAgent requires at least one sub-agent")
@@ -41,6 +60,19 @@ class RouterAgent:
         self.memory_router = memory_router
         self.event_router = event_router
         self.debug = debug
+        self.embedding_config = embedding_config
+        self.route_cache = RouteCache(max_size=route_cache_size)
+        self.route_classifier = EmbeddingRouteClassifier(
+            embed=self._embed,
+            threshold=route_similarity_threshold,
+            margin=route_margin,
+        )
+        self.route_counts = {"cache": 0, "embedding": 0, "llm": 0}
+        self.capability_cache = CapabilityCache(
+            ROUTER_CAPABILITY_CACHE
+            if capability_cache_path is None
+            else capability_cache_path
+        )
 
         self._initialized = False
 
@@ -51,14 +83,20 @@ class RouterAgent:
         if self._initialized:
             return
         logger.info("RouterAgent: Initializing MCP servers for router and sub-agents")
-        for agent in list(self.sub_agents.values()):
-            if getattr(agent, "mcp_tools", None):
-                try:
-                    await agent.connect_mcp_servers()
-                    logger.info(f"{agent.name}: MCP servers connected")
-                except Exception as exc:
-                    logger.warning(f"{agent.name}: MCP connection failed: {exc}")
-            await self.create_agent_capabilities_registry(agent=agent)
+        await connect_agents(self.sub_agents.values())
+        await asyncio.gather(
+            *(
+                self.create_agent_capabilities_registry(agent=agent)
+                for agent in self.sub_agents.values()
+            )
+        )
+        # keep the sub-agent order regardless of which summary finished first
+        self.agent_registry = {
+            name: self.agent_registry[name]
+            for name in self.sub_agents
+            if name in self.agent_registry
+        }
+        self.capability_cache.save()
 
         # check the router agent if None
         if not self.router_agent:
@@ -70,23 +108,44 @@ class RouterAgent:
                 agent_config=self.agent_config,
                 memory_router=self.memory_router,
                 event_router=self.event_router,
+                embedding_config=self.embedding_config,
                 debug=self.debug,
             )
 
+        self.route_cache.clear()
+        await self._fit_route_classifier()
         self._initialized = True
 
+    async def _embed(self, texts: List[str]) -> Optional[List[List[float]]]:
+        response = await self.router_agent.llm_connection.embedding_call(texts)
+        return extract_embeddings(response)
+
+    async def _fit_route_classifier(self):
+        """Embed the capability summaries for the embedding routing tier."""
+        llm_connection = getattr(self.router_agent, "llm_connection", None)
+        if not getattr(llm_connection, "embedding_config", None):
+            return
+        try:
+            if await self.route_classifier.fit(self.agent_registry):
+                logger.info("RouterAgent: Embedding routing enabled")
+                return
+        except Exception as exc:
+            logger.warning(f"RouterAgent: Embedding capability summaries failed: {exc}")
+        logger.warning("RouterAgent: Embedding routing disabled, using the LLM router")
+
     async def create_agent_capabilities_registry(self, agent) -> str:
         """
         Generate a system prompt instructing an LLM to summarize the agent's capabilities.
 
         The LLM should produce 2-5 concise sentences that describe everything the agent can do
-        based on its system instruction and tools.
+        based on its system instruction and tools. Summaries are cached on disk by a
+        fingerprint of both and only regenerated when it changes.
 
         Parameters:
             agent: The agent instance. Must have `system_instruction` and optional `tools` attributes.
 
         Returns:
-            A string system prompt for the LLM.
+            The agent's capability summary.
         """
         agent_available_tools = await agent.list_all_available_tools()
         agent_system_intruction = getattr(
@@ -94,6 +153,15 @@ class RouterAgent:
         )
         agent_name = getattr(agent, "name", "")
 
+        fingerprint = capability_fingerprint(
+            agent_name, agent_system_intruction, agent_available_tools
+        )
+        cached_summary = self.capability_cache.get(agent_name, fingerprint)
+        if cached_summary:
+            logger.info(f"RouterAgent: Reusing cached capabilities for {agent_name}")
+            self.agent_registry[agent_name] = cached_summary
+            return cached_summary
+
         tools_text = ""
         if agent_available_tools:
             tools_text = " The agent has the following tools available:\n" + "\n".join(
@@ -139,9 +207,12 @@ class RouterAgent:
 
             # now append the agent name and response as its capabilities
             self.agent_registry[agent_name] = response
+            if isinstance(response, str) and response:
+                self.capability_cache.put(agent_name, fingerprint, response)
         except Exception as e:
             logger.info(f"error occurs during agent registry process: {str(e)}")
             self.agent_registry[agent_name] = agent_system_intruction
+        return self.agent_registry[agent_name]
 
     async def run(
         self, task: Optional[str] = None, session_id: Optional[str] = None
@@ -160,6 +231,52 @@ class RouterAgent:
 
         logger.info(f"RouterAgent: Routing task -> {task}")
 
+        routing_started = time.perf_counter()
+        query = task
+        chosen_agent, routed_by = await self._route_fast(task)
+        if chosen_agent is None:
+            chosen_agent, query = await self._route_llm(task, session_id)
+            routed_by = "llm"
+        routing = {
+            "routed_by": routed_by,
+            "routing_seconds": round(time.perf_counter() - routing_started, 4),
+        }
+
+        if not chosen_agent:
+            return {
+                "error": f"RouterAgent could not resolve a valid agent after {self.max_retries} retries.",
+                "session_id": session_id,
+                "response": task,
+                "routing": routing,
+            }
+        self.route_counts[routed_by] += 1
+
+        # Run the selected agent safely
+        result = await self._run_single_agent(chosen_agent, query, session_id)
+        result["routing"] = routing
+        return result
+
+    async def _route_fast(self, task: str):
+        """Cache and embedding tiers; returns (agent, tier) or (None, None)."""
+        cached = self.route_cache.get(task)
+        if cached in self.sub_agents:
+            return self.sub_agents[cached], "cache"
+        if not self.route_classifier.ready:
+            return None, None
+        try:
+            match = await self.route_classifier.classify(task)
+        except Exception as exc:
+            logger.warning(f"RouterAgent: Embedding routing failed: {exc}")
+            return None, None
+        if match is None:
+            return None, None
+        agent_name, score = match
+        logger.info(f"RouterAgent: Embedding routed to {agent_name} ({score:.3f})")
+        self.route_cache.put(task, agent_name)
+        return self.sub_agents[agent_name], "embedding"
+
+    async def _route_llm(self, task: str, session_id: str):
+        """Ask the LLM router; returns (agent, query), agent None if it never decided."""
         retry_count = 0
         chosen_agent = None
         query = task
@@ -177,6 +294,7 @@ class RouterAgent:
 
                 if agent_name in self.sub_agents:
                     chosen_agent = self.sub_agents[agent_name]
+                    self.route_cache.put(task, agent_name)
                     break
 
             retry_count += 1
@@ -195,15 +313,17 @@ class RouterAgent:
                 f"User task: {task}"
             )
 
-        if not chosen_agent:
-            return {
-                "error": f"RouterAgent could not resolve a valid agent after {self.max_retries} retries.",
-                "session_id": session_id,
-                "response": task,
-            }
+        return chosen_agent, query
 
-        # Run the selected agent safely
-        return await self._run_single_agent(chosen_agent, query, session_id)
+    def get_routing_stats(self) -> dict:
+        """Decisions per routing tier plus route cache statistics."""
+        return {
+            **self.route_counts,
+            "cache_size": len(self.route_cache),
+            "cache_hits": self.route_cache.hits,
+            "cache_misses": self.route_cache.misses,
+            "embedding_routing": self.route_classifier.ready,
+        }
 
     async def _run_single_agent(
         self, agent: OmniAgent, query: str, session_id: str
@@ -0,0 +1,215 @@
+"""
+Fast routing tiers used by RouterAgent before it falls back to the LLM router.
+
+1. `RouteCache`: LRU of normalized task -> agent name decisions.
+2. `EmbeddingRouteClassifier`: cosine similarity between the task embedding
+   and each agent's capability summary. A route is only accepted when the best
+   score clears `threshold` and beats the runner-up by at least `margin`;
+   ambiguous tasks return None and go to the LLM router.
+
+`CapabilityCache` persists the capability summaries those tiers are built on,
+keyed by a fingerprint of each agent's system instruction and tool schemas.
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from decouple import config
+
+from omnicoreagent.core.utils import logger
+
+ROUTER_CAPABILITY_CACHE = config(
+    "ROUTER_CAPABILITY_CACHE", default=".omniagent_cache/router_capabilities.json"
+)
+
+EmbedFn = Callable[[List[str]], Awaitable[Optional[List[List[float]]]]]
+
+
+def normalize_task(task: str) -> str:
+    return re.sub(r"\s+", " ", task).strip().lower()
+
+
+class RouteCache:
+    """LRU cache of routing decisions keyed by normalized task text."""
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, task: str) -> Optional[str]:
+        key = normalize_task(task)
+        agent_name = self._entries.get(key)
+        if agent_name is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return agent_name
+
+    def put(self, task: str, agent_name: str):
+        if self.max_size <= 0:
+            return
+        key = normalize_task(task)
+        self._entries[key] = agent_name
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def extract_embeddings(response) -> Optional[List[List[float]]]:
+    """Pull the float vectors out of a LiteLLM embedding response."""
+    data = getattr(response, "data", None)
+    if not data:
+        return None
+    vectors = []
+    for item in data:
+        vector = item["embedding"] if isinstance(item, dict) else item.embedding
+        if not isinstance(vector, (list, tuple)):
+            # base64 encoded vectors are not supported by the fast path
+            return None
+        vectors.append(list(vector))
+    return vectors
+
+
+def _normalize_vector(vector: List[float]) -> List[float]:
+    norm = math.sqrt(sum(v * v for v in vector))
+    return [v / norm for v in vector] if norm else vector
+
+
+class EmbeddingRouteClassifier:
+    """Routes a task to the agent whose capability summary it is most similar to."""
+
+    def __init__(self, embed: EmbedFn, threshold: float = 0.5, margin: float = 0.05):
+        self.embed = embed
+        self.threshold = threshold
+        self.margin = margin
+        self._agent_vectors: Dict[str, List[float]] = {}
+
+    @property
+    def ready(self) -> bool:
+        return bool(self._agent_vectors)
+
+    async def fit(self, agent_registry: Dict[str, str]) -> bool:
+        """Embed every agent's capability summary. Returns False if embedding failed."""
+        names = list(agent_registry)
+        texts = [f"{name}: {agent_registry[name]}" for name in names]
+        vectors = await self.embed(texts) if texts else None
+        if not vectors or len(vectors) != len(names):
+            self._agent_vectors = {}
+            return False
+        self._agent_vectors = {
+            name: _normalize_vector(vector) for name, vector in zip(names, vectors)
+        }
+        return True
+
+    def scores(self, task_vector: List[float]) -> List[Tuple[str, float]]:
+        task_vector = _normalize_vector(task_vector)
+        scored = [
+            (name, sum(a * b for a, b in zip(task_vector, vector)))
+            for name, vector in self._agent_vectors.items()
+        ]
+        return sorted(scored, key=lambda item: item[1], reverse=True)
+
+    async def classify(self, task: str) -> Optional[Tuple[str, float]]:
+        """Return (agent_name, score) for a confident match, otherwise None."""
+        if not self.ready:
+            return None
+        vectors = await self.embed([task])
+        if not vectors:
+            return None
+        scored = self.scores(vectors[0])
+        best_name, best_score = scored[0]
+        runner_up = scored[1][1] if len(scored) > 1 else -1.0
+        if best_score < self.threshold or best_score - runner_up < self.margin:
+            logger.debug(
+                f"Embedding route ambiguous for task: best={best_name} "
+                f"({best_score:.3f}), runner-up score {runner_up:.3f}"
+            )
+            return None
+        return best_name, best_score
+
+
+def capability_fingerprint(
+    agent_name: str, system_instruction: str, tools: List[Dict[str, Any]]
+) -> str:
+    """Hash of everything a capability summary is generated from."""
+    tool_schemas = sorted(
+        (
+            {
+                "name": tool.get("name", ""),
+                "description": tool.get("description", ""),
+                "inputSchema": tool.get("inputSchema", {}),
+            }
+            for tool in tools
+        ),
+        key=lambda tool: tool["name"],
+    )
+    canonical = json.dumps(
+        {
+            "agent_name": agent_name,
+            "system_instruction": system_instruction,
+            "tools": tool_schemas,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class CapabilityCache:
+    """JSON file of capability summaries: agent name -> {fingerprint, summary}.
+
+    A summary is only reused while the agent's fingerprint is unchanged. An empty
+    path disables the cache.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else None
+        self._entries: Optional[Dict[str, Dict[str, str]]] = None
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        if self._entries is None:
+            self._entries = {}
+            if self.path is not None and self.path.exists():
+                try:
+                    self._entries = json.loads(self.path.read_text(encoding="utf-8"))
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Ignoring unreadable capability cache: {e}")
+        return self._entries
+
+    def get(self, agent_name: str, fingerprint: str) -> Optional[str]:
+        entry = self._load().get(agent_name)
+        if entry and entry.get("fingerprint") == fingerprint:
+            return entry.get("summary")
+        return None
+
+    def put(self, agent_name: str, fingerprint: str, summary: str):
+        self._load()[agent_name] = {"fingerprint": fingerprint, "summary": summary}
+        self._dirty = True
+
+    def save(self):
+        if self.path is None or not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(self._load(), indent=2), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Could not write capability cache {self.path}: {e}")
@@ -1,6 +1,7 @@
 from omnicoreagent.omni_agent.agent import OmniAgent
 from typing import List, Optional
 from omnicoreagent.core.utils import logger
+from omnicoreagent.omni_agent.workflow.utils import connect_agents
 import uuid
 
 
@@ -21,13 +22,7 @@ class SequentialAgent:
         if self._initialized:
             return
         logger.info("RouterAgent: Initializing MCP servers for router and sub-agents")
-        for agent in self.sub_agents:
-            if getattr(agent, "mcp_tools", None):
-                try:
-                    await agent.connect_mcp_servers()
-                    logger.info(f"{agent.name}: MCP servers connected")
-                except Exception as exc:
-                    logger.warning(f"{agent.name}: MCP connection failed: {exc}")
+        await connect_agents(self.sub_agents)
         self._initialized = True
 
     async def run(self, initial_task: str = None, session_id: str = None) -> dict:
@@ -0,0 +1,27 @@
+from omnicoreagent.omni_agent.agent import OmniAgent
+from omnicoreagent.core.utils import logger
+from typing import Iterable
+import asyncio
+
+
+async def _connect_agent(agent: OmniAgent):
+    try:
+        await agent.connect_mcp_servers()
+        logger.info(f"{agent.name}: MCP servers connected")
+    except Exception as exc:
+        logger.warning(f"{agent.name}: MCP connection failed: {exc}")
+
+
+async def connect_agents(agents: Iterable[OmniAgent]):
+    """Connect the MCP servers of all agents concurrently.
+
+    Agents configured with the same servers share their sessions through the
+    MCP session pool, so this mostly costs one connection per distinct server.
+    """
+    await asyncio.gather(
+        *(
+            _connect_agent(agent)
+            for agent in agents
+            if getattr(agent, "mcp_tools", None)
+        )
+    )
@@ -0,0 +1,101 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from omnicoreagent.omni_agent.background_agent.background_agents import (
+    BackgroundOmniAgent,
+)
+from omnicoreagent.omni_agent.background_agent.task_registry import TaskRegistry
+
+
+def make_agent(task_config, tool_outputs):
+    """A BackgroundOmniAgent without model or MCP setup, probing local tools."""
+    agent = BackgroundOmniAgent.__new__(BackgroundOmniAgent)
+    agent.agent_id = "agent_a"
+    agent.session_id = "background_agent_a"
+    agent.max_retries = 0
+    agent.retry_delay = 0
+    agent.checkpoint = None
+    agent.llm_runs_skipped = 0
+    agent._fence = None
+    agent.mcp_client = None
+    agent.task_registry = TaskRegistry()
+    agent.task_registry.register("agent_a", task_config)
+
+    agent.local_tools = MagicMock()
+    agent.local_tools.get_tool.side_effect = lambda name: name in tool_outputs
+    agent.local_tools.execute_tool = AsyncMock(
+        side_effect=lambda name, args: tool_outputs[name]
+    )
+    agent.run = AsyncMock(
+        return_value={"response": "disk is fine", "session_id": agent.session_id}
+    )
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_unchanged_probe_outputs_skip_the_llm():
+    outputs = {"disk_usage": {"used": 40}}
+    agent = make_agent({"query": "check disk", "probe_tools": ["disk_usage"]}, outputs)
+
+    first = await agent._execute_with_retries()
+    assert first["cached"] is False
+    assert first["answer_changed"] is True
+    assert "disk_usage({}): {'used': 40}" in agent.run.call_args.kwargs["query"]
+
+    second = await agent._execute_with_retries()
+    assert second["cached"] is True
+    assert second["response"] == "disk is fine"
+    assert agent.run.await_count == 1
+    assert agent.llm_runs_skipped == 1
+
+
+@pytest.mark.asyncio
+async def test_changed_probe_output_or_query_runs_the_llm():
+    outputs = {"disk_usage": {"used": 40}}
+    agent = make_agent(
+        {
+            "query": "check disk",
+            "probe_tools": [{"tool": "disk_usage", "args": {"path": "/"}}],
+        },
+        outputs,
+    )
+
+    await agent._execute_with_retries()
+    outputs["disk_usage"] = {"used": 95}
+    result = await agent._execute_with_retries()
+    assert result["cached"] is False
+    assert result["answer_changed"] is False
+
+    await agent._execute_with_retries(query="check disk and inodes")
+    assert agent.run.await_count == 3
+    assert agent.llm_runs_skipped == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_probe_falls_back_to_a_full_run():
+    agent = make_agent({"query": "check disk", "probe_tools": ["missing"]}, {})
+
+    await agent._execute_with_retries()
+    await agent._execute_with_retries()
+
+    assert agent.run.await_count == 2
+    assert agent.run.call_args.kwargs["query"] == "check disk"
+    assert agent.checkpoint["probe_fingerprint"] is None
+
+
+@pytest.mark.asyncio
+async def test_probe_calls_mcp_tools_on_their_server():
+    agent = make_agent({"query": "check disk", "probe_tools": ["df"]}, {})
+    session = MagicMock()
+    session.call_tool = AsyncMock(
+        return_value=MagicMock(isError=False, content=[MagicMock(text="40%")])
+    )
+    tool = MagicMock()
+    tool.name = "df"
+    agent.mcp_client = MagicMock()
+    agent.mcp_client.available_tools = {"system": [tool]}
+    agent.mcp_client.sessions = {"system": {"session": session}}
+
+    assert await agent._call_probe_tool("df", {}) == ["40%"]
+    session.call_tool.assert_awaited_once_with("df", {})
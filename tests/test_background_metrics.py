@@ -0,0 +1,148 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from omnicoreagent.core.run_timing import collect_run_timings, record_tokens, timed
+from omnicoreagent.omni_agent.background_agent.background_agent_manager import (
+    BackgroundAgentManager,
+)
+from omnicoreagent.omni_agent.background_agent.background_agents import (
+    BackgroundOmniAgent,
+)
+from omnicoreagent.omni_agent.background_agent.metrics import (
+    AgentRunMetrics,
+    LatencyHistogram,
+)
+from omnicoreagent.omni_agent.background_agent.session_rotation import (
+    SessionRotationPolicy,
+)
+from omnicoreagent.omni_agent.background_agent.task_registry import TaskRegistry
+
+
+def test_histogram_percentiles_are_within_bucket_precision():
+    histogram = LatencyHistogram()
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 1000
+    assert 0.5 <= snapshot["p50"] <= 0.5 * 1.1
+    assert 0.99 <= snapshot["p99"] <= 1.0
+    assert snapshot["max"] == 1.0
+    # exposition buckets are cumulative powers of two
+    buckets = dict(histogram.cumulative_buckets())
+    assert buckets[0.512] == 512
+    assert buckets[1.024] == 1000
+
+
+@pytest.mark.asyncio
+async def test_timers_collect_across_concurrent_tasks_only_inside_a_run():
+    async def tool_call():
+        with timed("tool"):
+            await asyncio.sleep(0.01)
+
+    with timed("tool"):
+        pass  # no run is being timed
+
+    with collect_run_timings() as timings:
+        await asyncio.gather(tool_call(), tool_call())
+        record_tokens(120)
+
+    assert timings.calls["tool"] == 2
+    assert timings.seconds["tool"] >= 0.02
+    assert timings.tokens == 120
+
+
+def make_agent():
+    """A BackgroundOmniAgent without model or MCP setup."""
+    agent = BackgroundOmniAgent.__new__(BackgroundOmniAgent)
+    agent.agent_id = "timed_agent"
+    agent.session_id = "background_timed_agent"
+    agent.is_running = False
+    agent.last_run = None
+    agent.run_count = agent.error_count = agent.segment_runs = 0
+    agent.segment_tokens = 0
+    agent.run_metrics = AgentRunMetrics()
+    agent.session_rotation = SessionRotationPolicy()
+    agent.event_router = MagicMock(append=AsyncMock())
+    agent.task_registry = TaskRegistry()
+    agent.task_registry.register("timed_agent", {"query": "check disk"})
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_run_task_records_phase_breakdown_and_notifies_listeners():
+    agent = make_agent()
+
+    async def execute(**kwargs):
+        with timed("llm"):
+            await asyncio.sleep(0.01)
+        record_tokens(300)
+        with timed("tool", calls=3):
+            pass
+        with timed("memory"):
+            pass
+        return {"response": "ok", "cached": False}
+
+    agent._execute_with_retries = execute
+    manager = BackgroundAgentManager(
+        memory_router=MagicMock(), event_router=MagicMock()
+    )
+    runs = []
+    manager.add_run_listener(lambda agent_id, run: runs.append((agent_id, run)))
+    agent.run_metrics.listeners = manager._run_listeners
+
+    await agent.run_task()
+
+    snapshot = agent.run_metrics.snapshot()
+    assert snapshot["latency"]["llm"]["count"] == 1
+    assert snapshot["latency"]["llm"]["max"] >= 0.01
+    assert snapshot["tool_calls"] == 3
+    assert snapshot["tokens_per_run"] == 300
+    assert agent.segment_tokens == 300
+    assert runs[0][0] == "timed_agent"
+    assert runs[0][1]["status"] == "success"
+    assert runs[0][1]["seconds"]["total"] >= runs[0][1]["seconds"]["llm"]
+
+    agent._execute_with_retries = AsyncMock(side_effect=RuntimeError("llm down"))
+    with pytest.raises(RuntimeError):
+        await agent.run_task()
+    assert agent.run_metrics.errors == 1
+
+
+def test_render_prometheus_exposes_histograms_and_counters():
+    manager = BackgroundAgentManager(
+        memory_router=MagicMock(), event_router=MagicMock()
+    )
+    agent = MagicMock(run_metrics=AgentRunMetrics())
+    agent.run_metrics.observe(
+        "agent_a",
+        {
+            "status": "cached",
+            "seconds": {"total": 0.2},
+            "calls": {},
+            "tokens": 0,
+        },
+    )
+    manager.agents["agent_a"] = agent
+    manager.scheduler.misfires["agent_a"] = 2
+    manager.scheduler.schedule_lag["agent_a"].record(0.05)
+
+    text = manager.render_prometheus()
+
+    assert (
+        'omnicoreagent_background_run_seconds_bucket{agent_id="agent_a",'
+        'phase="total",le="0.256"} 1'
+    ) in text
+    assert (
+        'omnicoreagent_background_run_seconds_count{agent_id="agent_a",phase="llm"} 0'
+    ) in text
+    assert (
+        'omnicoreagent_background_runs_total{agent_id="agent_a",status="cached"} 1'
+    ) in text
+    assert 'omnicoreagent_background_misfires_total{agent_id="agent_a"} 2' in text
+    assert (
+        'omnicoreagent_background_schedule_lag_seconds_count{agent_id="agent_a"} 1'
+    ) in text
+    assert "# TYPE omnicoreagent_background_run_seconds histogram" in text
@@ -0,0 +1,113 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from omnicoreagent.omni_agent.background_agent.background_agent_manager import (
+    BackgroundAgentManager,
+)
+from omnicoreagent.omni_agent.background_agent.scheduler_backend import (
+    APSchedulerBackend,
+    AsyncIOSchedulerBackend,
+)
+
+
+async def _fire_now(backend, agent_id):
+    backend.scheduler.modify_job(agent_id, next_run_time=datetime.now(timezone.utc))
+    backend.scheduler.wakeup()
+    await asyncio.sleep(0.05)
+
+
+@pytest.mark.asyncio
+async def test_asyncio_backend_runs_task_on_running_loop():
+    backend = AsyncIOSchedulerBackend()
+    loops = []
+
+    async def task():
+        loops.append(asyncio.get_running_loop())
+
+    backend.schedule_task("agent_a", 3600, task)
+    backend.start()
+    try:
+        await _fire_now(backend, "agent_a")
+    finally:
+        backend.shutdown()
+
+    assert loops == [asyncio.get_running_loop()]
+
+
+@pytest.mark.asyncio
+async def test_asyncio_backend_skips_overlapping_runs():
+    backend = AsyncIOSchedulerBackend()
+    release = asyncio.Event()
+    started = []
+
+    async def task():
+        started.append(1)
+        await release.wait()
+
+    backend.schedule_task("agent_a", 3600, task)
+    backend.start()
+    try:
+        await _fire_now(backend, "agent_a")
+        await _fire_now(backend, "agent_a")
+        release.set()
+        await asyncio.sleep(0)
+    finally:
+        backend.shutdown()
+
+    assert len(started) == 1
+    stats = backend.get_job_stats("agent_a")
+    assert (stats["misfires"], stats["skipped_runs"]) == (0, 1)
+    assert stats["schedule_lag"]["count"] == 1
+
+
+def test_asyncio_backend_applies_jitter_and_misfire_grace():
+    backend = AsyncIOSchedulerBackend(jitter=5, misfire_grace_time=30)
+
+    async def task():
+        pass
+
+    backend.schedule_task("interval_agent", 60, task)
+    backend.schedule_task("cron_agent", "*/5 * * * *", task, jitter=2)
+
+    interval_job = backend.scheduler.get_job("interval_agent")
+    cron_job = backend.scheduler.get_job("cron_agent")
+    assert interval_job.trigger.jitter == 5
+    assert interval_job.misfire_grace_time == 30
+    assert cron_job.trigger.jitter == 2
+
+    with pytest.raises(TypeError):
+        backend.schedule_task("sync_agent", 60, lambda: None)
+
+
+@pytest.mark.asyncio
+async def test_manager_schedules_coroutine_with_agent_overrides():
+    manager = BackgroundAgentManager(
+        memory_router=MagicMock(), event_router=MagicMock()
+    )
+    manager.scheduler = MagicMock(runs_on_event_loop=True)
+    agent = MagicMock(interval=120, jitter=3, misfire_grace_time=None)
+    agent.run_task = AsyncMock()
+
+    manager._schedule_agent("agent_a", agent)
+
+    kwargs = manager.scheduler.schedule_task.call_args.kwargs
+    assert kwargs["interval"] == 120
+    assert kwargs["jitter"] == 3
+    assert "misfire_grace_time" not in kwargs
+    await kwargs["task_fn"]()
+    agent.run_task.assert_awaited_once()
+
+
+def test_manager_keeps_thread_wrapper_for_thread_backend():
+    manager = BackgroundAgentManager(
+        memory_router=MagicMock(), event_router=MagicMock(), scheduler=MagicMock()
+    )
+    manager.scheduler.runs_on_event_loop = APSchedulerBackend.runs_on_event_loop
+    manager._schedule_agent("agent_a", MagicMock(interval=60))
+
+    kwargs = manager.scheduler.schedule_task.call_args.kwargs
+    assert not asyncio.iscoroutinefunction(kwargs["task_fn"])
+    assert kwargs["max_instances"] == 1
@@ -0,0 +1,236 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from mcp.types import (
+    ResourceUpdatedNotification,
+    ResourceUpdatedNotificationParams,
+    ServerNotification,
+    TextResourceContents,
+)
+
+from omnicoreagent.mcp_omni_connect.notifications import (
+    add_notification_listener,
+    dispatch_server_message,
+    remove_notification_listener,
+)
+from omnicoreagent.omni_agent.background_agent import triggers
+from omnicoreagent.omni_agent.background_agent.background_agent_manager import (
+    BackgroundAgentManager,
+)
+from omnicoreagent.omni_agent.background_agent.triggers import (
+    FileWatchTrigger,
+    MCPResourceTrigger,
+    QueueTrigger,
+)
+
+
+def collector():
+    batches = []
+
+    async def callback(events):
+        batches.append(events)
+        return True
+
+    return batches, callback
+
+
+@pytest.mark.asyncio
+async def test_queue_trigger_debounces_coalesces_and_skips_unchanged_input():
+    batches, callback = collector()
+    trigger = QueueTrigger(debounce=0.05)
+    await trigger.start(None, callback)
+    try:
+        for payload in ({"v": 1}, {"v": 2}, {"v": 3}):
+            await trigger.put(payload)
+        await asyncio.sleep(0.15)
+        assert len(batches) == 1
+        assert batches[0][0]["data"] == {"v": 3}
+        assert batches[0][0]["count"] == 3
+
+        # the same input as the last run does not trigger again
+        await trigger.put({"v": 3})
+        await asyncio.sleep(0.15)
+        assert len(batches) == 1
+        assert trigger.get_stats()["unchanged_skipped"] == 1
+    finally:
+        await trigger.stop()
+
+
+@pytest.mark.asyncio
+async def test_input_of_a_run_that_did_not_complete_triggers_again():
+    batches = []
+
+    async def callback(events):
+        batches.append(events)
+        return len(batches) > 1
+
+    trigger = QueueTrigger(debounce=0.02)
+    await trigger.start(None, callback)
+    try:
+        await trigger.put({"v": 1})
+        await asyncio.sleep(0.08)
+        await trigger.put({"v": 1})
+        await asyncio.sleep(0.08)
+        assert len(batches) == 2
+
+        # only now has a run seen the input
+        await trigger.put({"v": 1})
+        await asyncio.sleep(0.08)
+        assert len(batches) == 2
+        assert trigger.get_stats()["unchanged_skipped"] == 1
+    finally:
+        await trigger.stop()
+
+
+@pytest.mark.asyncio
+async def test_max_wait_bounds_the_debounce():
+    batches, callback = collector()
+    trigger = QueueTrigger(debounce=10, max_wait=0.05, dedupe=False)
+    await trigger.start(None, callback)
+    try:
+        await trigger.put("change")
+        await asyncio.sleep(0.15)
+        assert len(batches) == 1
+    finally:
+        await trigger.stop()
+
+
+@pytest.mark.asyncio
+async def test_file_watch_trigger_fires_on_content_changes_only(tmp_path, monkeypatch):
+    monkeypatch.setattr(triggers, "awatch", None)
+    watched = tmp_path / "report.csv"
+    watched.write_text("a,b\n")
+    batches, callback = collector()
+    trigger = FileWatchTrigger(
+        str(tmp_path), patterns=["*.csv"], poll_interval=0.02, debounce=0.02
+    )
+    await trigger.start(None, callback)
+    try:
+        await asyncio.sleep(0.05)
+        watched.write_text("a,b\n1,2\n")
+        (tmp_path / "notes.txt").write_text("ignored")
+        await asyncio.sleep(0.2)
+        assert len(batches) == 1
+        assert batches[0][0]["key"] == str(watched)
+        assert batches[0][0]["data"]["change"] == "modified"
+
+        # rewriting identical content only changes the mtime
+        watched.write_text("a,b\n1,2\n")
+        await asyncio.sleep(0.2)
+        assert len(batches) == 1
+    finally:
+        await trigger.stop()
+
+
+@pytest.mark.asyncio
+async def test_mcp_resource_trigger_subscribes_and_compares_content():
+    session = MagicMock()
+    session.subscribe_resource = AsyncMock()
+    session.unsubscribe_resource = AsyncMock()
+    session.read_resource = AsyncMock(
+        return_value=MagicMock(
+            contents=[TextResourceContents(uri="file:///data.json", text="{}")]
+        )
+    )
+    agent = MagicMock()
+    agent.mcp_client.sessions = {"files": {"session": session, "capabilities": None}}
+    agent.mcp_client.available_resources = {
+        "files": [MagicMock(uri="file:///data.json")]
+    }
+    batches, callback = collector()
+    trigger = MCPResourceTrigger(["file:///data.json"], debounce=0.02)
+    await trigger.start(agent, callback)
+    try:
+        await asyncio.sleep(0.02)
+        session.subscribe_resource.assert_awaited_once()
+
+        notification = ServerNotification(
+            ResourceUpdatedNotification(
+                method="notifications/resources/updated",
+                params=ResourceUpdatedNotificationParams(uri="file:///data.json"),
+            )
+        )
+        await dispatch_server_message(notification)
+        await asyncio.sleep(0.1)
+        await dispatch_server_message(notification)
+        await asyncio.sleep(0.1)
+
+        assert len(batches) == 1
+        assert batches[0][0]["key"] == "file:///data.json"
+        assert trigger.get_stats()["unchanged_skipped"] == 1
+    finally:
+        await trigger.stop()
+    session.unsubscribe_resource.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_ignores_non_notifications():
+    listener = AsyncMock()
+    add_notification_listener(listener)
+    try:
+        await dispatch_server_message(Exception("transport error"))
+        await asyncio.sleep(0)
+        listener.assert_not_awaited()
+    finally:
+        remove_notification_listener(listener)
+
+
+@pytest.mark.asyncio
+async def test_manager_coalesces_trigger_events_during_a_run():
+    manager = BackgroundAgentManager(
+        memory_router=MagicMock(), event_router=MagicMock()
+    )
+    release = asyncio.Event()
+    calls = []
+
+    async def run_task(trigger_events):
+        calls.append(trigger_events)
+        if len(calls) == 1:
+            await release.wait()
+
+    agent = MagicMock(run_task=run_task, is_running=False)
+    manager.agents["agent_a"] = agent
+
+    first = asyncio.create_task(manager._on_trigger("agent_a", [{"key": "a"}]))
+    await asyncio.sleep(0)
+    queued = [
+        asyncio.create_task(manager._on_trigger("agent_a", [{"key": key}]))
+        for key in ("b", "c")
+    ]
+    await asyncio.sleep(0)
+    release.set()
+
+    # queued events report completion once their follow-up run completed
+    assert await asyncio.gather(first, *queued) == [True, True, True]
+    assert calls == [[{"key": "a"}], [{"key": "b"}, {"key": "c"}]]
+
+    manager._paused_agents.add("agent_a")
+    assert not await manager._on_trigger("agent_a", [{"key": "d"}])
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_triggered_run_waits_for_a_scheduled_run_and_reports_failures(
+    monkeypatch,
+):
+    monkeypatch.setattr(
+        "omnicoreagent.omni_agent.background_agent.background_agent_manager."
+        "TRIGGER_BUSY_POLL_SECONDS",
+        0.01,
+    )
+    manager = BackgroundAgentManager(
+        memory_router=MagicMock(), event_router=MagicMock()
+    )
+    agent = MagicMock(run_task=AsyncMock(), is_running=True)
+    manager.agents["agent_a"] = agent
+
+    run = asyncio.create_task(manager._on_trigger("agent_a", [{"key": "a"}]))
+    await asyncio.sleep(0.05)
+    agent.run_task.assert_not_awaited()
+    agent.is_running = False
+    assert await run
+    agent.run_task.assert_awaited_once_with(trigger_events=[{"key": "a"}])
+
+    agent.run_task.side_effect = RuntimeError("model unavailable")
+    assert not await manager._on_trigger("agent_a", [{"key": "b"}])
@@ -0,0 +1,213 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from omnicoreagent.core.agents.base import BaseReactAgent
+from omnicoreagent.core.agents.context_compaction import (
+    CompactionConfig,
+    ObservationStore,
+    ObservationToolRegistry,
+    WorkingMemoryCompactor,
+    build_tool_registry_observation_tool,
+)
+from omnicoreagent.core.agents.types import Message
+from omnicoreagent.core.tools.local_tools_registry import ToolRegistry
+
+
+def observation(body: str) -> Message:
+    return Message(
+        role="user",
+        content=f"<observation_marker>OBSERVATION RESULT FROM TOOL CALLS</observation_marker>{body}",
+    )
+
+
+def build_history(observation_chars: int, count: int) -> list:
+    messages = [Message(role="system", content="system prompt")]
+    for index in range(count):
+        messages.append(
+            Message(role="assistant", content=f"<thought>step {index}</thought>")
+        )
+        messages.append(observation(str(index) * observation_chars))
+    return messages
+
+
+def test_no_compaction_below_trigger():
+    compactor = WorkingMemoryCompactor(
+        CompactionConfig(max_context_tokens=100000), store=ObservationStore()
+    )
+    messages = build_history(100, 3)
+    compacted, result = compactor.compact(messages)
+    assert result is None
+    assert compacted is messages
+
+
+def test_truncates_oldest_observations_and_keeps_recent():
+    store = ObservationStore()
+    compactor = WorkingMemoryCompactor(
+        CompactionConfig(
+            max_context_tokens=4000,
+            keep_recent_observations=1,
+            max_observation_chars=200,
+        ),
+        store=store,
+    )
+    messages = build_history(4000, 4)
+    compacted, result = compactor.compact(messages)
+
+    assert result is not None
+    assert result.tokens_after < result.tokens_before
+    assert result.tokens_after <= 4000 * 0.6
+    # the latest observation and the system prompt are untouched
+    assert compacted[-1].content == messages[-1].content
+    assert compacted[0].content == "system prompt"
+    # the original list is not mutated
+    assert messages[2].content.startswith("<observation_marker>")
+    assert compacted[2].content.startswith("[compacted observation ref_id=")
+    assert store.get(result.references[0]) == messages[2].content
+
+
+def test_stubs_when_truncation_is_not_enough():
+    compactor = WorkingMemoryCompactor(
+        CompactionConfig(
+            max_context_tokens=2000,
+            keep_recent_observations=1,
+            max_observation_chars=1500,
+        ),
+        store=ObservationStore(),
+    )
+    compacted, result = compactor.compact(build_history(2000, 5))
+    assert result is not None
+    assert "chars omitted" in compacted[2].content
+    assert result.tokens_after < result.tokens_before
+
+
+def test_handles_dict_tool_messages():
+    compactor = WorkingMemoryCompactor(
+        CompactionConfig(max_context_tokens=1000, keep_recent_observations=0),
+        store=ObservationStore(),
+    )
+    messages = [
+        {"role": "system", "content": "sys"},
+        {"role": "tool", "content": "x" * 8000, "tool_call_id": "1"},
+    ]
+    compacted, result = compactor.compact(messages)
+    assert result is not None
+    assert compacted[1]["tool_call_id"] == "1"
+    assert compacted[1]["content"].startswith("[compacted observation")
+
+
+def test_invalid_ratios_rejected():
+    with pytest.raises(ValueError):
+        CompactionConfig(trigger_ratio=0.5, target_ratio=0.7)
+
+
+def test_observation_store_is_bounded():
+    store = ObservationStore(max_entries=2)
+    first = store.put("a")
+    store.put("b")
+    store.put("c")
+    assert store.get(first) is None
+    assert len(store) == 2
+
+
+@pytest.mark.asyncio
+async def test_expand_observation_tool_pages_content():
+    store = ObservationStore()
+    ref_id = store.put("0123456789")
+    registry = build_tool_registry_observation_tool(ToolRegistry(), store=store)
+
+    first = await registry.execute_tool(
+        "expand_observation", {"ref_id": ref_id, "limit": 4}
+    )
+    assert first.startswith("0123")
+    assert "offset=4" in first
+    missing = await registry.execute_tool("expand_observation", {"ref_id": "obs_0"})
+    assert "No compacted observation" in missing
+
+
+@pytest.mark.asyncio
+async def test_observation_tool_registry_leaves_the_base_registry_unchanged():
+    base = ToolRegistry()
+
+    @base.register_tool(name="echo", execution_mode="inline")
+    def echo(text: str) -> str:
+        return text
+
+    store = ObservationStore()
+    ref_id = store.put("payload")
+    registry = ObservationToolRegistry(base, store=store)
+
+    assert set(registry.tools) == {"echo", "expand_observation"}
+    assert set(base.tools) == {"echo"}
+    assert await registry.execute_tool("echo", {"text": "hi"}) == "hi"
+    assert (
+        await registry.execute_tool("expand_observation", {"ref_id": ref_id})
+        == "payload"
+    )
+    assert set(ObservationToolRegistry(store=store).tools) == {"expand_observation"}
+
+
+def make_agent(**kwargs) -> BaseReactAgent:
+    return BaseReactAgent(
+        agent_name="agent",
+        max_steps=5,
+        tool_call_timeout=10,
+        request_limit=0,
+        total_tokens_limit=0,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_observations_are_kept_per_session():
+    agent = make_agent(
+        context_compaction={"max_context_tokens": 4000, "keep_recent_observations": 1}
+    )
+    first, second = agent._get_session_state("s1"), agent._get_session_state("s2")
+    first.messages = build_history(4000, 4)
+
+    result = await agent.compact_working_memory(first, llm_connection=None)
+
+    ref_id = result.references[0]
+    assert first.observations.get(ref_id) is not None
+    assert second.observations.get(ref_id) is None
+    assert make_agent()._get_session_state("s1").observations.get(ref_id) is None
+
+
+@pytest.mark.asyncio
+async def test_expand_observation_is_listed_in_the_system_prompt():
+    prompts = []
+
+    async def llm_call(messages):
+        prompts.append(messages[0].content)
+        response = MagicMock()
+        response.choices[0].message.content = "<final_answer>done</final_answer>"
+        response.usage = MagicMock(prompt_tokens=1, completion_tokens=1, total_tokens=2)
+        return response
+
+    llm_connection = MagicMock(llm_config={}, llm_call=llm_call)
+    registry = ToolRegistry()
+    await make_agent().run(
+        system_prompt="system prompt",
+        query="hi",
+        llm_connection=llm_connection,
+        add_message_to_history=AsyncMock(),
+        message_history=AsyncMock(return_value=[]),
+        local_tools=registry,
+        session_id="s1",
+    )
+
+    assert "expand_observation" in prompts[0]
+    assert "expand_observation" not in registry.tools
+
+    prompts.clear()
+    await make_agent(context_compaction={"enabled": False}).run(
+        system_prompt="system prompt",
+        query="hi",
+        llm_connection=llm_connection,
+        add_message_to_history=AsyncMock(),
+        message_history=AsyncMock(return_value=[]),
+        local_tools=ToolRegistry(),
+        session_id="s1",
+    )
+    assert "expand_observation" not in prompts[0]
@@ -0,0 +1,261 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from omnicoreagent.omni_agent.background_agent import distributed
+from omnicoreagent.omni_agent.background_agent.background_agent_manager import (
+    BackgroundAgentManager,
+)
+from omnicoreagent.omni_agent.background_agent.background_agents import (
+    BackgroundOmniAgent,
+)
+from omnicoreagent.omni_agent.background_agent.distributed import (
+    LeaseLostError,
+    RedisLeaseCoordinator,
+    RedisTaskRegistry,
+)
+from omnicoreagent.omni_agent.background_agent.task_registry import TaskRegistry
+from omnicoreagent.omni_agent.background_agent.worker_pool import WorkerAgentHandle
+
+
+@pytest.fixture
+def coordinator():
+    coordinator = RedisLeaseCoordinator(node_id="node-a", lease_ttl=30)
+    coordinator._redis = MagicMock()
+    coordinator._scripts = {
+        "acquire": AsyncMock(return_value=7),
+        "heartbeat": AsyncMock(return_value=1),
+        "complete": AsyncMock(return_value=1),
+    }
+    return coordinator
+
+
+@pytest.mark.asyncio
+async def test_run_exclusive_runs_with_fencing_token_and_completes(coordinator):
+    run = AsyncMock(return_value="done")
+
+    result = await coordinator.run_exclusive("agent_a", 60, run)
+
+    assert result == "done"
+    run.assert_awaited_once_with(7)
+    acquire_kwargs = coordinator._scripts["acquire"].call_args.kwargs
+    assert acquire_kwargs["keys"][0].startswith("omnicoreagent_bg:agent_a:slot:")
+    assert acquire_kwargs["args"] == ["node-a", 30000, 120000, "0"]
+    complete_kwargs = coordinator._scripts["complete"].call_args.kwargs
+    assert complete_kwargs["args"][0] == "node-a:7"
+    assert coordinator.get_stats("agent_a")["lease_runs"] == 1
+
+
+@pytest.mark.asyncio
+async def test_run_exclusive_skips_slot_owned_by_another_node(coordinator):
+    coordinator._scripts["acquire"].return_value = 0
+    run = AsyncMock()
+
+    assert await coordinator.run_exclusive("agent_a", 60, run, steal=True) is None
+    run.assert_not_awaited()
+    assert coordinator._scripts["acquire"].call_args.kwargs["args"][3] == "1"
+    coordinator._scripts["complete"].assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_lost_lease_cancels_run(coordinator):
+    coordinator.lease_ttl = 0.03
+    coordinator._scripts["heartbeat"].return_value = 0
+    cancelled = asyncio.Event()
+
+    async def run(token):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    assert await coordinator.run_exclusive("agent_a", 60, run) is None
+    assert cancelled.is_set()
+    coordinator._scripts["complete"].assert_not_awaited()
+    assert coordinator.get_stats("agent_a")["lost_leases"] == 1
+
+
+def test_redis_task_registry_round_trip():
+    registry = RedisTaskRegistry(key="tasks")
+    store = {}
+    registry._client = MagicMock()
+    registry._client.hset.side_effect = lambda key, field, value: store.update(
+        {field: value}
+    )
+    registry._client.hget.side_effect = lambda key, field: store.get(field)
+
+    registry.register("agent_a", {"query": "check disk", "interval": 60})
+    registry.update("agent_a", {"query": "check memory"})
+
+    assert json.loads(store["agent_a"]) == {"query": "check memory", "interval": 60}
+    assert registry.get("agent_a")["query"] == "check memory"
+    with pytest.raises(KeyError):
+        registry.update("missing", {})
+
+
+@pytest.mark.asyncio
+async def test_redis_task_registry_reads_off_the_event_loop():
+    registry = RedisTaskRegistry(key="tasks")
+    registry._client = MagicMock()
+    registry._client.hget.return_value = json.dumps({"query": "check disk"})
+    registry._client.hexists.return_value = 0
+
+    assert await registry.get_async("agent_a") == {"query": "check disk"}
+    assert not await registry.exists_async("agent_a")
+
+
+@pytest.mark.asyncio
+async def test_manager_routes_runs_through_coordinator(coordinator):
+    manager = BackgroundAgentManager(
+        memory_router=MagicMock(), event_router=MagicMock(), coordinator=coordinator
+    )
+    manager.scheduler = MagicMock(runs_on_event_loop=True)
+    agent = MagicMock(interval=60, jitter=None, misfire_grace_time=None)
+    agent.run_task = AsyncMock()
+
+    manager._schedule_agent("agent_a", agent)
+    kwargs = manager.scheduler.schedule_task.call_args.kwargs
+    assert kwargs["start_date"].year == 1970
+
+    await kwargs["task_fn"]()
+    agent.run_task.assert_awaited_once()
+    run_kwargs = agent.run_task.call_args.kwargs
+    assert run_kwargs["fencing_token"] == 7
+
+    coordinator._redis.get = AsyncMock(return_value="node-a:7")
+    assert await run_kwargs["fence"]()
+    coordinator._redis.get.return_value = "node-b:8"
+    assert not await run_kwargs["fence"]()
+
+
+def make_fenced_agent(fence):
+    """A BackgroundOmniAgent without model or MCP setup, run under `fence`."""
+    agent = BackgroundOmniAgent.__new__(BackgroundOmniAgent)
+    agent.agent_id = "agent_a"
+    agent.session_id = "background_agent_a"
+    agent.max_retries = 0
+    agent.retry_delay = 0
+    agent.checkpoint = None
+    agent.mcp_client = None
+    agent.local_tools = None
+    agent.task_registry = TaskRegistry()
+    agent.task_registry.register("agent_a", {"query": "check disk"})
+    agent._fence = fence
+    agent.run = AsyncMock(return_value={"response": "disk is fine"})
+    agent._save_checkpoint = MagicMock()
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_fenced_run_stops_before_side_effects_once_the_lease_is_lost():
+    agent = make_fenced_agent(AsyncMock(return_value=False))
+
+    with pytest.raises(LeaseLostError):
+        await agent._execute_with_retries()
+    agent.run.assert_not_awaited()
+
+    # the lease is lost while the model runs: the checkpoint is not written
+    agent = make_fenced_agent(AsyncMock(side_effect=[True, False]))
+    with pytest.raises(LeaseLostError):
+        await agent._execute_with_retries()
+    agent.run.assert_awaited_once()
+    agent._save_checkpoint.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_run_exclusive_drops_a_run_that_lost_its_lease(coordinator):
+    async def run(token):
+        raise LeaseLostError("lost")
+
+    assert await coordinator.run_exclusive("agent_a", 60, run) is None
+    coordinator._scripts["complete"].assert_not_awaited()
+    assert coordinator.get_stats("agent_a")["lost_leases"] == 1
+
+
+class SlowRegistry(TaskRegistry):
+    """A registry whose async reads yield to the event loop, like Redis."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = asyncio.Event()
+
+    async def get_async(self, agent_id):
+        await self.release.wait()
+        return self.get(agent_id)
+
+    async def exists_async(self, agent_id):
+        await self.release.wait()
+        return self.exists(agent_id)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_run_is_skipped_while_the_registry_is_read():
+    registry = SlowRegistry()
+    agent = make_fenced_agent(None)
+    agent.is_running = False
+    agent.task_registry = registry
+    handle = WorkerAgentHandle(MagicMock(), {"agent_id": "agent_a"}, registry)
+
+    for runner in (agent, handle):
+        first = asyncio.create_task(runner.run_task())
+        await asyncio.sleep(0)
+        assert runner.is_running
+        assert await runner.run_task() is None
+
+        # nothing is registered: the first run fails and frees the agent
+        registry.release.set()
+        with pytest.raises(ValueError):
+            await first
+        assert not runner.is_running
+        registry.release.clear()
+
+
+@pytest.mark.asyncio
+async def test_run_change_runs_each_change_on_one_node(coordinator, monkeypatch):
+    monkeypatch.setattr(distributed, "CHANGE_LEASE_POLL_SECONDS", 0)
+    coordinator._redis.exists = AsyncMock(return_value=0)
+    run = AsyncMock()
+
+    assert await coordinator.run_change("agent_a", "abc", run)
+    run.assert_awaited_once_with(7)
+    complete_keys = coordinator._scripts["complete"].call_args.kwargs["keys"]
+    assert complete_keys[1] == "omnicoreagent_bg:agent_a:slot:change:abc"
+
+    # another run holds the lease: retried until the change can be claimed
+    coordinator._scripts["acquire"].side_effect = [0, 0, 8]
+    run.reset_mock()
+    assert await coordinator.run_change("agent_a", "def", run)
+    run.assert_awaited_once_with(8)
+
+    # another node claimed the change
+    coordinator._scripts["acquire"].side_effect = None
+    coordinator._scripts["acquire"].return_value = 0
+    coordinator._redis.exists.return_value = 1
+    run.reset_mock()
+    assert await coordinator.run_change("agent_a", "ghi", run)
+    run.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_triggered_runs_go_through_the_coordinator(coordinator):
+    manager = BackgroundAgentManager(
+        memory_router=MagicMock(), event_router=MagicMock(), coordinator=coordinator
+    )
+    coordinator.run_change = AsyncMock(return_value=True)
+    agent = MagicMock(run_task=AsyncMock(), is_running=False)
+    manager.agents["agent_a"] = agent
+    events = [{"source": "redis_stream", "key": "orders", "data": {"id": "1-0"}}]
+
+    assert await manager._on_trigger("agent_a", events)
+    agent_id, change_key, run = coordinator.run_change.call_args.args
+    assert agent_id == "agent_a"
+    assert change_key == manager._change_key([dict(events[0], count=3)])
+    agent.run_task.assert_not_awaited()
+
+    await run(7)
+    run_kwargs = agent.run_task.call_args.kwargs
+    assert run_kwargs["fencing_token"] == 7
+    assert run_kwargs["trigger_events"] == events
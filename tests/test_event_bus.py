@@ -0,0 +1,157 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from omnicoreagent.core.events.base import (
+    BaseEventStore,
+    Event,
+    EventType,
+    FinalAnswerPayload,
+)
+from omnicoreagent.core.events.event_bus import EventPublisher
+from omnicoreagent.core.events.event_router import EventRouter
+
+
+def make_event(text: str) -> Event:
+    return Event(
+        type=EventType.FINAL_ANSWER,
+        payload=FinalAnswerPayload(message=text),
+        agent_name="agent",
+    )
+
+
+class SlowStore(BaseEventStore):
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.batches = []
+        self.events = {}
+
+    async def append(self, session_id, event):
+        await self.append_batch([(session_id, event)])
+
+    async def append_batch(self, events):
+        await asyncio.sleep(self.delay)
+        self.batches.append(len(events))
+        for session_id, event in events:
+            self.events.setdefault(session_id, []).append(event)
+
+    async def get_events(self, session_id):
+        return self.events.get(session_id, [])
+
+    async def stream(self, session_id):
+        yield None
+
+
+@pytest.mark.asyncio
+async def test_publish_does_not_wait_for_store_and_preserves_order():
+    store = SlowStore()
+    publisher = EventPublisher(store, batch_size=50)
+
+    started = time.perf_counter()
+    for index in range(20):
+        await publisher.publish(f"s{index % 2}", make_event(str(index)))
+    assert time.perf_counter() - started < store.delay
+
+    await publisher.flush()
+    assert [e.payload.message for e in store.events["s0"]] == [
+        str(i) for i in range(0, 20, 2)
+    ]
+    metrics = publisher.get_metrics()
+    assert metrics["published"] == 20
+    assert metrics["batches"] < 20
+    await publisher.close()
+
+
+@pytest.mark.asyncio
+async def test_overflow_policies_count_drops():
+    store = SlowStore(delay=0.2)
+    publisher = EventPublisher(store, queue_size=2, overflow_policy="drop_newest")
+    for index in range(6):
+        await publisher.publish("s", make_event(str(index)))
+    assert publisher.get_metrics()["dropped"] > 0
+    await publisher.close()
+
+    with pytest.raises(ValueError):
+        EventPublisher(store, overflow_policy="spill")
+
+
+@pytest.mark.asyncio
+async def test_event_router_flushes_before_reads():
+    router = EventRouter(event_store_type="in_memory", async_publish=True)
+    await router.append("s", make_event("hello"))
+    events = await router.get_events("s")
+    assert [e.payload.message for e in events] == ["hello"]
+    assert router.get_publisher_metrics()["published"] == 1
+    await router.close()
+
+    inline = EventRouter(event_store_type="in_memory")
+    assert inline.get_event_store_info()["async_publish"] is False
+
+
+@pytest.mark.asyncio
+async def test_replaced_publisher_is_flushed_and_closed():
+    router = EventRouter(event_store_type="in_memory", async_publish=True)
+    first, second = SlowStore(), SlowStore()
+    router._event_store = first
+    for i in range(3):
+        await router.append("s", make_event(str(i)))
+    old = router._publisher
+    old_task = old._task
+
+    router._event_store = second
+    await router.append("s", make_event("3"))
+    assert [e.payload.message for e in first.events["s"]] == ["0", "1", "2"]
+    assert old_task.done()
+    assert router._publisher is not old
+
+    await router.flush()
+    assert [e.payload.message for e in second.events["s"]] == ["3"]
+    await router.close()
+
+
+class StuckFirstBatchStore(SlowStore):
+    def __init__(self):
+        super().__init__(delay=0)
+        self.stuck = False
+
+    async def append_batch(self, events):
+        if not self.stuck:
+            self.stuck = True
+            await asyncio.sleep(3600)
+        await super().append_batch(events)
+
+
+@pytest.mark.asyncio
+async def test_publisher_from_another_loop_hands_over_its_queue():
+    router = EventRouter(event_store_type="in_memory", async_publish=True)
+    store = StuckFirstBatchStore()
+    router._event_store = store
+    other = asyncio.new_event_loop()
+    thread = threading.Thread(target=other.run_forever)
+    thread.start()
+
+    async def fill():
+        await router.append("s", make_event("0"))
+        await asyncio.sleep(0.01)
+        for i in (1, 2):
+            await router.append("s", make_event(str(i)))
+        return router._publisher._task
+
+    try:
+        old_task = asyncio.run_coroutine_threadsafe(fill(), other).result()
+        await router.append("s", make_event("3"))
+        await router.flush()
+        # "0" was being written on the other loop; the queued events move over
+        assert [e.payload.message for e in store.events["s"]] == ["1", "2", "3"]
+        for _ in range(100):
+            if old_task.done():
+                break
+            await asyncio.sleep(0.01)
+        assert old_task.cancelled()
+    finally:
+        await router.close()
+        other.call_soon_threadsafe(other.stop)
+        thread.join()
+        other.close()
@@ -0,0 +1,58 @@
+from omnicoreagent.core.events.base import (
+    AgentThoughtPayload,
+    BackgroundTaskCompletedPayload,
+    Event,
+    EventType,
+    FinalAnswerPayload,
+    ToolCallResultPayload,
+)
+from omnicoreagent.core.events.codec import decode_event, encode_event, loads
+
+
+def test_payload_model_follows_event_type():
+    for event_type, payload in (
+        (EventType.FINAL_ANSWER, FinalAnswerPayload(message="done")),
+        (EventType.AGENT_THOUGHT, AgentThoughtPayload(message="hmm")),
+    ):
+        event = Event(type=event_type, payload=payload, agent_name="a")
+        body, blobs = encode_event(event)
+        decoded = decode_event(body)
+        assert blobs == {}
+        assert type(decoded.payload) is type(payload)
+        assert decoded == event
+        # plain pydantic JSON from older producers still decodes
+        assert type(decode_event(event.model_dump_json()).payload) is type(payload)
+
+
+def test_large_fields_round_trip_through_blobs():
+    event = Event(
+        type=EventType.TOOL_CALL_RESULT,
+        payload=ToolCallResultPayload(
+            tool_name="read", tool_args={"path": "/x"}, result="r" * 100
+        ),
+        agent_name="a",
+    )
+    body, blobs = encode_event(event, inline_limit=10)
+    assert list(blobs.values()) == ["r" * 100]
+    assert loads(body)["payload"]["result"]["size"] == 100
+
+    assert decode_event(body, blobs) == event
+    expired = decode_event(body, {})
+    assert expired.payload.result.startswith("[payload no longer available")
+
+
+def test_none_values_round_trip():
+    event = Event(
+        type=EventType.BACKGROUND_TASK_COMPLETED,
+        payload=BackgroundTaskCompletedPayload(
+            agent_id="a",
+            session_id="s",
+            timestamp="2024-01-01T00:00:00",
+            run_count=1,
+            result=None,
+        ),
+        agent_name="a",
+    )
+    body, _ = encode_event(event)
+    assert loads(body)["payload"]["result"] is None
+    assert decode_event(body) == event
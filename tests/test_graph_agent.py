@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from omnicoreagent.omni_agent.workflow.graph_agent import GraphAgent, GraphNode
+
+
+class FakeAgent:
+    def __init__(self, name, delay=0.0, fail=False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.queries = []
+
+    async def run(self, query, session_id=None):
+        self.queries.append(query)
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.name} failed")
+        return {"response": f"{self.name}({query})", "session_id": session_id}
+
+
+async def make_graph(nodes, **kwargs):
+    graph = GraphAgent(nodes=nodes, **kwargs)
+    await graph.initialize()
+    return graph
+
+
+def test_graph_validation():
+    agent = FakeAgent("a")
+    with pytest.raises(ValueError, match="unknown node"):
+        GraphAgent([GraphNode("a", agent, depends_on=["missing"])])
+    with pytest.raises(ValueError, match="cycle"):
+        GraphAgent(
+            [
+                GraphNode("a", agent, depends_on=["b"]),
+                GraphNode("b", agent, depends_on=["a"]),
+            ]
+        )
+    with pytest.raises(ValueError, match="Duplicate"):
+        GraphAgent([GraphNode("a", agent), GraphNode("a", agent)])
+
+
+@pytest.mark.asyncio
+async def test_fan_out_fan_in_with_input_mapping():
+    fetch_a, fetch_b = FakeAgent("A", delay=0.05), FakeAgent("B", delay=0.05)
+    summarize = FakeAgent("S")
+    graph = await make_graph(
+        [
+            GraphNode("fetch_a", fetch_a),
+            GraphNode("fetch_b", fetch_b),
+            GraphNode(
+                "summary",
+                summarize,
+                depends_on=["fetch_a", "fetch_b"],
+                input_map="{input}: {fetch_a} + {fetch_b}",
+            ),
+        ]
+    )
+    result = await graph.run("topic", session_id="s1")
+
+    assert result["response"] == "S(topic: A(topic) + B(topic))"
+    assert result["session_id"] == "s1"
+    nodes = result["nodes"]
+    assert {nodes[name]["status"] for name in nodes} == {"success"}
+    # the two fetches ran concurrently
+    assert nodes["fetch_a"]["elapsed_seconds"] >= 0.05
+    assert graph.node_results is nodes
+
+
+@pytest.mark.asyncio
+async def test_memoization_and_rerun():
+    fetch, summarize = FakeAgent("F"), FakeAgent("S")
+    graph = await make_graph(
+        [GraphNode("fetch", fetch), GraphNode("summary", summarize, ["fetch"])]
+    )
+    await graph.run("topic")
+    second = await graph.run("topic")
+    assert second["nodes"]["fetch"]["status"] == "cached"
+    assert second["nodes"]["summary"]["status"] == "cached"
+    assert second["response"] == "S(F(topic))"
+    assert len(fetch.queries) == 1
+
+    third = await graph.run("topic", rerun=["fetch"])
+    assert third["nodes"]["fetch"]["status"] == "success"
+    # the refreshed fetch produced the same output, so summary is still cached
+    assert third["nodes"]["summary"]["status"] == "cached"
+    assert len(fetch.queries) == 2 and len(summarize.queries) == 1
+
+    await graph.run("other topic")
+    assert len(summarize.queries) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_node_skips_dependents_and_limits_concurrency():
+    graph = await make_graph(
+        [
+            GraphNode("ok", FakeAgent("ok", delay=0.02)),
+            GraphNode("broken", FakeAgent("broken", fail=True)),
+            GraphNode("after", FakeAgent("after"), depends_on=["broken"]),
+        ],
+        max_concurrency=1,
+        max_retries=1,
+    )
+    result = await graph.run("x")
+
+    assert result["nodes"]["broken"]["status"] == "failed"
+    assert result["nodes"]["after"]["status"] == "skipped"
+    assert result["failed_nodes"] == ["broken"]
+    assert result["response"] == "[ok]\nok(x)"
@@ -0,0 +1,118 @@
+import asyncio
+from contextlib import aclosing
+
+import pytest
+
+from omnicoreagent.core.events.base import Event, EventType, FinalAnswerPayload
+from omnicoreagent.core.events.in_memory import LATEST, InMemoryEventStore
+
+
+def make_event(text: str) -> Event:
+    return Event(
+        type=EventType.FINAL_ANSWER,
+        payload=FinalAnswerPayload(message=text),
+        agent_name="agent",
+    )
+
+
+async def collect(stream, count: int) -> list[str]:
+    messages = []
+    async with aclosing(stream):
+        async for event in stream:
+            messages.append(event.payload.message)
+            if len(messages) == count:
+                break
+    return messages
+
+
+@pytest.mark.asyncio
+async def test_every_subscriber_receives_every_event():
+    store = InMemoryEventStore(buffer_size=10)
+    first = asyncio.create_task(collect(store.stream("s"), 3))
+    second = asyncio.create_task(collect(store.stream("s"), 3))
+    await asyncio.sleep(0)
+    for text in ("a", "b", "c"):
+        await store.append("s", make_event(text))
+
+    assert await first == ["a", "b", "c"]
+    assert await second == ["a", "b", "c"]
+    assert store.get_stats("s")["subscribers"] == []
+
+
+@pytest.mark.asyncio
+async def test_buffer_is_bounded_and_replayable_from_offset():
+    store = InMemoryEventStore(buffer_size=3)
+    for index in range(5):
+        await store.append("s", make_event(str(index)))
+
+    assert [e.payload.message for e in await store.get_events("s")] == ["2", "3", "4"]
+    assert await collect(store.stream("s", from_seq=3), 2) == ["3", "4"]
+
+    subscription = store.subscribe("s", from_seq=LATEST)
+    await store.append("s", make_event("5"))
+    assert (await subscription.__anext__()).payload.message == "5"
+    assert subscription.cursor == 6
+    subscription.close()
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_and_disconnect_policies():
+    store = InMemoryEventStore(buffer_size=2)
+    dropping = store.subscribe("s", policy="drop_oldest")
+    disconnecting = store.subscribe("s", policy="disconnect")
+    for index in range(5):
+        await store.append("s", make_event(str(index)))
+
+    assert (await dropping.__anext__()).payload.message == "3"
+    assert dropping.dropped == 3
+    with pytest.raises(StopAsyncIteration):
+        await disconnecting.__anext__()
+    assert disconnecting.closed
+
+
+@pytest.mark.asyncio
+async def test_block_policy_holds_writer_until_subscriber_reads():
+    store = InMemoryEventStore(buffer_size=2, block_timeout=1.0)
+    blocking = store.subscribe("s", policy="block")
+    await store.append("s", make_event("0"))
+    await store.append("s", make_event("1"))
+
+    writer = asyncio.create_task(store.append("s", make_event("2")))
+    await asyncio.sleep(0.05)
+    assert not writer.done()
+
+    assert (await blocking.__anext__()).payload.message == "0"
+    await asyncio.wait_for(writer, 1)
+    assert blocking.dropped == 0
+
+
+@pytest.mark.asyncio
+async def test_block_subscriber_that_stops_reading_stalls_the_writer_once():
+    store = InMemoryEventStore(buffer_size=2, block_timeout=0.05)
+    gone = store.subscribe("s", policy="block")
+    await store.append("s", make_event("0"))
+    await store.append("s", make_event("1"))
+
+    started = asyncio.get_running_loop().time()
+    for i in range(2, 6):
+        await store.append("s", make_event(str(i)))
+    elapsed = asyncio.get_running_loop().time() - started
+
+    assert elapsed < 0.15
+    assert gone.policy == "drop_oldest"
+    assert (await gone.__anext__()).payload.message == "4"
+    assert gone.dropped == 4
+
+
+@pytest.mark.asyncio
+async def test_idle_sessions_are_evicted():
+    store = InMemoryEventStore(idle_ttl=0.01)
+    await store.append("old", make_event("x"))
+    await asyncio.sleep(0.02)
+    await store.append("new", make_event("y"))
+    assert await store.get_events("old") == []
+
+
+def test_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        InMemoryEventStore(default_policy="spill")
@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from omnicoreagent.core.tools.local_tools_registry import (
+    Tool,
+    ToolExecutionPool,
+    ToolRegistry,
+)
+
+
+def cpu_bound_sum(n: int):
+    return sum(range(n))
+
+
+@pytest.fixture
+def registry():
+    return ToolRegistry()
+
+
+def test_sync_tools_default_to_thread_mode(registry):
+    @registry.register_tool()
+    def add(a: int, b: int):
+        return a + b
+
+    @registry.register_tool()
+    async def async_add(a: int, b: int):
+        return a + b
+
+    assert registry.get_tool("add").execution_mode == "thread"
+    assert registry.get_tool("async_add").execution_mode == "inline"
+
+
+def test_invalid_execution_mode_raises():
+    with pytest.raises(ValueError):
+        Tool(
+            name="bad",
+            description="",
+            inputSchema={},
+            function=lambda: None,
+            execution_mode="gpu",
+        )
+
+    async def coro():
+        return None
+
+    with pytest.raises(ValueError):
+        Tool(
+            name="bad_async",
+            description="",
+            inputSchema={},
+            function=coro,
+            execution_mode="thread",
+        )
+
+
+@pytest.mark.asyncio
+async def test_thread_mode_does_not_block_event_loop(registry):
+    @registry.register_tool()
+    def blocking(delay: float):
+        time.sleep(delay)
+        return threading.current_thread().name
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *[registry.execute_tool("blocking", {"delay": 0.2}) for _ in range(3)]
+    )
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5
+    assert all(name.startswith("omnicoreagent-tool") for name in results)
+
+
+@pytest.mark.asyncio
+async def test_inline_mode_runs_on_event_loop_thread(registry):
+    @registry.register_tool(execution_mode="inline")
+    def where():
+        return threading.current_thread().name
+
+    assert await registry.execute_tool("where", {}) == threading.current_thread().name
+
+
+@pytest.mark.asyncio
+async def test_process_mode_rejects_unpicklable_arguments():
+    pool = ToolExecutionPool(thread_workers=1, process_workers=1)
+    try:
+        with pytest.raises(ValueError, match="not picklable"):
+            await pool.run(
+                "process", cpu_bound_sum, {"n": threading.Lock()}, tool_name="sum"
+            )
+        assert await pool.run("process", cpu_bound_sum, {"n": 10}) == 45
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_execution_metrics_are_reported():
+    pool = ToolExecutionPool(thread_workers=2, process_workers=1)
+    try:
+        await pool.run("thread", cpu_bound_sum, {"n": 5})
+        metrics = pool.get_metrics()
+        assert metrics["thread"]["max_workers"] == 2
+        assert metrics["thread"]["completed"] == 1
+        assert metrics["thread"]["queued"] == 0
+        assert metrics["thread"]["running"] == 0
+        assert metrics["process"]["started"] is False
+    finally:
+        pool.shutdown()
+
+
+def failing_tool():
+    raise RuntimeError("tool failed")
+
+
+@pytest.mark.asyncio
+async def test_completed_and_failed_calls_are_counted_apart():
+    pool = ToolExecutionPool(thread_workers=1, process_workers=1)
+    try:
+        await pool.run("thread", cpu_bound_sum, {"n": 5})
+        with pytest.raises(RuntimeError):
+            await pool.run("thread", failing_tool, {})
+        metrics = pool.get_metrics()["thread"]
+        assert (metrics["completed"], metrics["failed"]) == (1, 1)
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_call_cancelled_while_queued_leaves_the_queue():
+    pool = ToolExecutionPool(thread_workers=1, process_workers=1)
+    release = threading.Event()
+    try:
+        blocking = asyncio.create_task(pool.run("thread", release.wait, {"timeout": 5}))
+        queued = asyncio.create_task(pool.run("thread", cpu_bound_sum, {"n": 5}))
+        await asyncio.sleep(0.05)
+        assert pool.get_metrics()["thread"]["queued"] == 1
+
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        release.set()
+        await blocking
+        metrics = pool.get_metrics()["thread"]
+        assert metrics["queued"] == 0
+        assert metrics["running"] == 0
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_process_mode_checks_each_function_once():
+    pool = ToolExecutionPool(thread_workers=1, process_workers=1)
+    try:
+        assert await pool.run("process", cpu_bound_sum, {"n": 10}) == 45
+        assert cpu_bound_sum in pool._picklable_functions
+        assert await pool.run("process", cpu_bound_sum, {"n": 4}) == 6
+    finally:
+        pool.shutdown()
@@ -0,0 +1,51 @@
+import logging
+from logging.handlers import QueueHandler
+
+from omnicoreagent.core.agents.types import Message
+from omnicoreagent.core.utils import (
+    LazyLogPayload,
+    format_messages_for_log,
+    logger,
+    truncate_for_log,
+)
+
+
+def test_truncate_for_log_caps_payload():
+    assert truncate_for_log("short", 10) == "short"
+    assert truncate_for_log("x" * 30, 10) == "x" * 10 + "... [20 chars truncated]"
+    assert truncate_for_log("x" * 30, 0) == "x" * 30
+
+
+def test_lazy_payload_is_not_rendered_when_level_disabled():
+    rendered = []
+
+    def build():
+        rendered.append(True)
+        return "payload"
+
+    previous_level = logger.level
+    logger.setLevel(logging.INFO)
+    try:
+        logger.debug("value: %s", LazyLogPayload(build))
+    finally:
+        logger.setLevel(previous_level)
+
+    assert rendered == []
+    assert str(LazyLogPayload(build, limit=3)) == "pay... [4 chars truncated]"
+
+
+def test_format_messages_for_log_handles_models_and_dicts():
+    output = format_messages_for_log(
+        [
+            Message(role="user", content="y" * 500),
+            {"role": "assistant", "content": "ok"},
+        ],
+        limit=200,
+    )
+    assert output.startswith("user: ")
+    assert output.endswith("assistant: ok")
+    assert len(output) < 250
+
+
+def test_logger_writes_through_queue_handler():
+    assert any(isinstance(handler, QueueHandler) for handler in logger.handlers)
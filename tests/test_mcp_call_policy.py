@@ -0,0 +1,172 @@
+import asyncio
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from mcp.shared.exceptions import McpError
+from mcp.types import ErrorData
+
+from omnicoreagent.core.tools.tools_handler import MCPToolHandler
+from omnicoreagent.mcp_omni_connect.call_policy import (
+    MCPCallGate,
+    MCPCallPolicy,
+    MCPServerBusyError,
+)
+from omnicoreagent.omni_agent.config import ConfigTransformer
+
+
+def timeout_error():
+    return McpError(ErrorData(code=httpx.codes.REQUEST_TIMEOUT, message="timed out"))
+
+
+class FakeSession:
+    """Answers call_tool after `delays[i]` seconds, or raises `errors[i]`."""
+
+    def __init__(self, delays=(), errors=()):
+        self.delays = list(delays)
+        self.errors = list(errors)
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def call_tool(self, name, arguments=None, read_timeout_seconds=None):
+        attempt = len(self.calls)
+        self.calls.append((name, arguments, read_timeout_seconds))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(
+                self.delays[attempt] if attempt < len(self.delays) else 0.01
+            )
+            if attempt < len(self.errors) and self.errors[attempt]:
+                raise self.errors[attempt]
+            return f"result {attempt}"
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.mark.asyncio
+async def test_calls_beyond_max_in_flight_queue_and_time_out():
+    session = FakeSession(delays=[0.05] * 5)
+    gate = MCPCallGate("srv", MCPCallPolicy(max_in_flight=2, queue_timeout=0.08))
+
+    results = await asyncio.gather(
+        *(gate.call(session, "slow", {}) for _ in range(5)),
+        return_exceptions=True,
+    )
+
+    assert session.peak == 2
+    busy = [result for result in results if isinstance(result, MCPServerBusyError)]
+    assert len(busy) == 1
+    stats = gate.get_stats()
+    assert stats["rejected"] == 1
+    assert stats["calls"] == 4
+    assert stats["in_flight"] == stats["queued"] == 0
+    assert stats["peak_in_flight"] == 2
+    assert stats["latency"]["count"] == 4
+
+
+@pytest.mark.asyncio
+async def test_per_tool_timeouts_are_passed_to_the_session():
+    session = FakeSession()
+    gate = MCPCallGate(
+        "srv", MCPCallPolicy(call_timeout=30, tool_timeouts={"report": 120})
+    )
+
+    await gate.call(session, "report", {})
+    await gate.call(session, "search", {})
+
+    assert session.calls[0][2] == timedelta(seconds=120)
+    assert session.calls[1][2] == timedelta(seconds=30)
+
+
+@pytest.mark.asyncio
+async def test_idempotent_tools_retry_transient_failures_only():
+    session = FakeSession(errors=[timeout_error()])
+    gate = MCPCallGate("srv", MCPCallPolicy(idempotent_tools=["search"]))
+
+    assert await gate.call(session, "search", {"q": "x"}) == "result 1"
+    assert gate.get_stats()["retries"] == 1
+    assert gate.get_stats()["timeouts"] == 1
+
+    # non-idempotent tools are not retried
+    session = FakeSession(errors=[timeout_error()])
+    with pytest.raises(McpError):
+        await gate.call(session, "send_email", {})
+    assert len(session.calls) == 1
+
+    # neither are errors a repeated call would hit again
+    session = FakeSession(errors=[ValueError("bad arguments")])
+    with pytest.raises(ValueError):
+        await gate.call(session, "search", {})
+    assert len(session.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_idempotent_call_is_hedged_when_a_slot_is_free():
+    session = FakeSession(delays=[1.0, 0.01])
+    gate = MCPCallGate(
+        "srv",
+        MCPCallPolicy(max_in_flight=2, idempotent_tools=["*"], hedge_after=0.02),
+    )
+
+    result = await asyncio.wait_for(gate.call(session, "search", {}), timeout=0.5)
+
+    assert result == "result 1"
+    assert gate.get_stats()["hedges"] == 1
+    await asyncio.sleep(0)
+    assert gate.in_flight == 0
+    assert session.in_flight == 0
+
+    # with every slot taken the slow call is not hedged
+    gate = MCPCallGate(
+        "srv",
+        MCPCallPolicy(max_in_flight=1, idempotent_tools=["*"], hedge_after=0.02),
+    )
+    session = FakeSession(delays=[0.06])
+    assert await gate.call(session, "search", {}) == "result 0"
+    assert gate.get_stats()["hedges"] == 0
+
+
+@pytest.mark.asyncio
+async def test_tool_handler_routes_calls_through_the_gate():
+    session = FakeSession()
+    gate = MCPCallGate("srv")
+    handler = MCPToolHandler(
+        sessions={"srv": {"session": session, "call_gate": gate}},
+        server_name="srv",
+    )
+
+    assert await handler.call("search", {"q": "x"}) == "result 0"
+    assert gate.get_stats()["calls"] == 1
+
+    plain = MagicMock()
+    plain.call_tool = MagicMock(return_value=asyncio.sleep(0, result="direct"))
+    handler = MCPToolHandler(sessions={"srv": {"session": plain}}, server_name="srv")
+    assert await handler.call("search", {}) == "direct"
+
+
+def test_call_policy_is_validated_and_passed_to_the_server_config():
+    transformer = ConfigTransformer()
+    tool = {
+        "name": "search_server",
+        "command": "python",
+        "call_policy": {"max_in_flight": 4, "idempotent_tools": ["search"]},
+    }
+
+    servers = transformer._transform_tools_config(
+        [transformer._ensure_tool_config(tool)]
+    )
+    assert servers["search_server"]["call_policy"]["max_in_flight"] == 4
+
+    with pytest.raises(ValueError):
+        transformer._validate_tools_config(
+            [
+                transformer._ensure_tool_config(
+                    {**tool, "call_policy": {"max_in_flight": 0}}
+                )
+            ]
+        )
+    with pytest.raises(TypeError):
+        MCPCallPolicy.from_config({"max_inflight": 4})
@@ -0,0 +1,122 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from mcp.types import (
+    ServerNotification,
+    ToolListChangedNotification,
+)
+
+from omnicoreagent.mcp_omni_connect.client import MCPClient
+from omnicoreagent.mcp_omni_connect.notifications import (
+    CapabilityRefreshScheduler,
+    SessionNotifications,
+    add_notification_listener,
+    remove_notification_listener,
+)
+
+
+def tool_list_changed():
+    return ServerNotification(
+        ToolListChangedNotification(method="notifications/tools/list_changed")
+    )
+
+
+@pytest.mark.asyncio
+async def test_notification_storm_is_coalesced_into_one_refresh():
+    refresh = AsyncMock()
+    scheduler = CapabilityRefreshScheduler(refresh, debounce=0.02)
+
+    for _ in range(200):
+        scheduler.request("srv")
+    await asyncio.sleep(0.1)
+
+    refresh.assert_awaited_once_with("srv")
+    assert scheduler.requests == 200
+    assert scheduler.refreshes == 1
+
+
+@pytest.mark.asyncio
+async def test_requests_during_a_refresh_cause_exactly_one_more():
+    in_flight = 0
+    peak = 0
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def refresh(server_name):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        started.set()
+        await release.wait()
+        in_flight -= 1
+
+    scheduler = CapabilityRefreshScheduler(refresh, debounce=0)
+    scheduler.request("srv")
+    await started.wait()
+    for _ in range(50):
+        scheduler.request("srv")
+    release.set()
+    await asyncio.sleep(0.05)
+
+    assert scheduler.refreshes == 2
+    assert peak == 1
+
+
+@pytest.mark.asyncio
+async def test_servers_are_refreshed_independently_and_cancel_drops_pending():
+    refresh = AsyncMock()
+    scheduler = CapabilityRefreshScheduler(refresh, debounce=0.02)
+
+    scheduler.request("a")
+    scheduler.request("b")
+    scheduler.request("c")
+    scheduler.cancel("c")
+    await asyncio.sleep(0.08)
+
+    assert sorted(call.args[0] for call in refresh.await_args_list) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_session_handler_reaches_global_listeners_and_each_subscriber():
+    notifications = SessionNotifications()
+    first, second, global_listener = AsyncMock(), AsyncMock(), AsyncMock()
+    notifications.subscribe("client_1", first)
+    notifications.subscribe("client_2", second)
+    notifications.unsubscribe("client_2")
+    add_notification_listener(global_listener)
+    try:
+        await notifications(tool_list_changed())
+        await notifications(Exception("transport error"))
+        await asyncio.sleep(0)
+    finally:
+        remove_notification_listener(global_listener)
+
+    first.assert_awaited_once()
+    second.assert_not_awaited()
+    global_listener.assert_awaited_once()
+    assert first.await_args.args[0].method == "notifications/tools/list_changed"
+
+
+@pytest.mark.asyncio
+async def test_client_refreshes_only_the_server_that_sent_the_notification():
+    client = MCPClient.__new__(MCPClient)
+    client.debug = False
+    client.refresh_server = AsyncMock()
+    client.refresh_scheduler = CapabilityRefreshScheduler(
+        client.refresh_server, debounce=0.01
+    )
+    notifications = {name: SessionNotifications() for name in ("a", "b")}
+    for name, handler in notifications.items():
+        handler.subscribe(
+            id(client),
+            lambda notification, name=name: client._on_server_notification(
+                name, notification
+            ),
+        )
+
+    for _ in range(10):
+        await notifications["b"](tool_list_changed())
+    await asyncio.sleep(0.05)
+
+    client.refresh_server.assert_awaited_once_with("b")
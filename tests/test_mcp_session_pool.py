@@ -0,0 +1,104 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from omnicoreagent.mcp_omni_connect.session_pool import MCPSessionPool
+
+SERVER = {"command": "uvx", "args": ["mcp-server-fetch"]}
+
+
+def make_opener(opened):
+    async def open_session():
+        await asyncio.sleep(0.01)
+        stack = AsyncMock()
+        opened.append(stack)
+        return {"session": object(), "stack": stack}
+
+    return open_session
+
+
+@pytest.mark.asyncio
+async def test_concurrent_acquires_share_one_session():
+    pool = MCPSessionPool()
+    opened = []
+    leases = await asyncio.gather(
+        *(
+            pool.acquire(dict(SERVER), make_opener(opened), client_id=i)
+            for i in range(5)
+        )
+    )
+
+    assert len(opened) == 1
+    assert len({id(lease.session_info) for lease in leases}) == 1
+    assert pool.get_stats()["references"] == 5
+
+    # key order does not matter
+    reordered = {"args": ["mcp-server-fetch"], "command": "uvx"}
+    assert pool.config_key(reordered) == leases[0].key
+
+
+@pytest.mark.asyncio
+async def test_session_closed_after_last_release():
+    pool = MCPSessionPool()
+    opened = []
+    first = await pool.acquire(SERVER, make_opener(opened), client_id="a")
+    await pool.acquire(SERVER, make_opener(opened), client_id="b")
+    other = await pool.acquire({"url": "http://x/mcp"}, make_opener(opened))
+    assert len(opened) == 2
+
+    assert await pool.release(first.key, client_id="a") is False
+    opened[0].aclose.assert_not_awaited()
+    assert await pool.release(first.key, client_id="b") is True
+    opened[0].aclose.assert_awaited_once()
+    assert pool.get_stats()["sessions"] == 1
+
+    # a new acquire after the close opens a fresh session
+    await pool.acquire(SERVER, make_opener(opened))
+    assert len(opened) == 3
+    assert await pool.release(other.key) is True
+
+
+@pytest.mark.asyncio
+async def test_session_is_opened_and_closed_by_its_owner_task():
+    pool = MCPSessionPool()
+    tasks = {}
+
+    async def open_session():
+        tasks["open"] = asyncio.current_task()
+        stack = AsyncMock()
+        stack.aclose.side_effect = lambda: tasks.setdefault(
+            "close", asyncio.current_task()
+        )
+        return {"session": object(), "stack": stack}
+
+    lease = await asyncio.create_task(pool.acquire(SERVER, open_session, client_id="a"))
+    # released from another task than the one that acquired it
+    assert await asyncio.create_task(pool.release(lease.key, client_id="a"))
+
+    assert tasks["close"] is tasks["open"]
+    assert tasks["open"] is not asyncio.current_task()
+
+
+@pytest.mark.asyncio
+async def test_clients_with_different_sampling_callbacks_do_not_share():
+    pool = MCPSessionPool()
+    opened = []
+    first = await pool.acquire(SERVER, make_opener(opened), sampling_key="default")
+    same = await pool.acquire(SERVER, make_opener(opened), sampling_key="default")
+    custom = await pool.acquire(SERVER, make_opener(opened), sampling_key=1234)
+
+    assert len(opened) == 2
+    assert first.key == same.key != custom.key
+
+
+@pytest.mark.asyncio
+async def test_failed_open_is_not_pooled():
+    pool = MCPSessionPool()
+
+    async def open_session():
+        raise ConnectionError("server exited")
+
+    with pytest.raises(ConnectionError):
+        await pool.acquire(SERVER, open_session)
+    assert pool.get_stats()["sessions"] == 0
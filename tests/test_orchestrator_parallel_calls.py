@@ -0,0 +1,123 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from omnicoreagent.core.agents.orchestrator import OrchestratorAgent
+from omnicoreagent.core.agents.types import AgentConfig
+
+
+@pytest.fixture
+def orchestrator():
+    config = AgentConfig(
+        agent_name="orchestrator",
+        max_steps=5,
+        tool_call_timeout=10,
+        max_parallel_agent_calls=2,
+    )
+    return OrchestratorAgent(
+        config=config,
+        agents_registry={"Weather": "Gets forecasts", "News": "Gets headlines"},
+        current_date_time="2025-05-03",
+    )
+
+
+BATCH_RESPONSE = """<thought>Both are independent</thought>
+<agent_call><agent_name>WeatherAgent</agent_name><task>Lagos forecast</task></agent_call>
+<agent_call><agent_name>News</agent_name><task>Lagos headlines</task></agent_call>
+"""
+
+
+@pytest.mark.asyncio
+async def test_parses_batch_of_agent_calls(orchestrator):
+    parsed = await orchestrator.extract_agent_action_or_answer(BATCH_RESPONSE)
+    assert parsed.action
+    assert json.loads(parsed.data) == [
+        {"agent_name": "Weather", "task": "Lagos forecast"},
+        {"agent_name": "News", "task": "Lagos headlines"},
+    ]
+
+    single = await orchestrator.extract_agent_action_or_answer(
+        "<agent_call><agent_name>News</agent_name><task>t</task></agent_call>"
+    )
+    assert json.loads(single.data) == {"agent_name": "News", "task": "t"}
+
+    unknown = await orchestrator.extract_agent_action_or_answer(
+        BATCH_RESPONSE.replace("News", "Sports")
+    )
+    assert unknown.error == "Agent Sports not found"
+
+
+@pytest.mark.asyncio
+async def test_run_dispatches_batch_concurrently(orchestrator):
+    running = {"now": 0, "peak": 0}
+
+    async def fake_act(agent_name, task, record_observation=True, **kwargs):
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+        assert record_observation is False
+        return f"{agent_name} result"
+
+    orchestrator.act = fake_act
+    llm_connection = AsyncMock()
+    llm_connection.llm_call.side_effect = [
+        BATCH_RESPONSE,
+        "<final_answer>Sunny, calm news day</final_answer>",
+    ]
+    history = AsyncMock()
+
+    answer = await orchestrator.run(
+        sessions={},
+        query="Lagos weather and news",
+        add_message_to_history=history,
+        llm_connection=llm_connection,
+        mcp_tools={},
+        message_history=AsyncMock(return_value=[]),
+        orchestrator_system_prompt="",
+        tool_call_timeout=10,
+        max_steps=5,
+        request_limit=0,
+        total_tokens_limit=0,
+        session_id="s1",
+    )
+
+    assert answer == "Sunny, calm news day"
+    assert running["peak"] == 2
+    assert llm_connection.llm_call.await_count == 2
+    combined = orchestrator.orchestrator_messages[-2]["content"]
+    assert combined == (
+        "Weather Agent Observation:\nWeather result\n\n"
+        "News Agent Observation:\nNews result"
+    )
+
+
+@pytest.mark.asyncio
+async def test_batched_calls_to_the_same_agent_run_in_order(orchestrator):
+    running = {"Weather": 0, "News": 0}
+    started = []
+
+    async def fake_act(agent_name, task, record_observation=True, **kwargs):
+        assert running[agent_name] == 0
+        running[agent_name] += 1
+        started.append(task)
+        await asyncio.sleep(0.01)
+        running[agent_name] -= 1
+        return f"{task} result"
+
+    orchestrator.act = fake_act
+    observations = await orchestrator.act_batch(
+        [
+            {"agent_name": "Weather", "task": "Lagos"},
+            {"agent_name": "News", "task": "headlines"},
+            {"agent_name": "Weather", "task": "Abuja"},
+        ],
+        add_message_to_history=AsyncMock(),
+        session_id="s1",
+    )
+
+    assert observations == ["Lagos result", "headlines result", "Abuja result"]
+    assert started.index("Lagos") < started.index("Abuja")
+    assert started[:2] == ["Lagos", "headlines"]
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from omnicoreagent.omni_agent.workflow.parallel_agent import ParallelAgent
+
+
+class FakeAgent:
+    def __init__(self, name, delay=0.0, fail=False, tracker=None):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.tracker = tracker
+        self.cancelled = False
+
+    async def run(self, query, session_id=None):
+        if self.tracker is not None:
+            self.tracker["running"] += 1
+            self.tracker["peak"] = max(self.tracker["peak"], self.tracker["running"])
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        finally:
+            if self.tracker is not None:
+                self.tracker["running"] -= 1
+        if self.fail:
+            raise RuntimeError(f"{self.name} failed")
+        return {"response": f"{self.name}: {query}", "session_id": session_id}
+
+
+async def make_parallel(agents, **kwargs):
+    parallel = ParallelAgent(sub_agents=agents, **kwargs)
+    await parallel.initialize()
+    return parallel
+
+
+@pytest.mark.asyncio
+async def test_run_collects_results_with_timing():
+    parallel = await make_parallel(
+        [FakeAgent("a"), FakeAgent("b", fail=True)], max_retries=1
+    )
+    results = await parallel.run(agent_tasks={"a": "task a"}, session_id="s1")
+
+    assert results["a"]["status"] == "success"
+    assert results["a"]["response"] == "a: task a"
+    assert results["a"]["elapsed_seconds"] >= 0
+    assert results["b"]["status"] == "failed"
+    assert results["b"]["agent_name"] == "b"
+    assert results["b"]["error"] == "b failed"
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_limits_running_agents():
+    tracker = {"running": 0, "peak": 0}
+    agents = [FakeAgent(f"agent{i}", delay=0.01, tracker=tracker) for i in range(6)]
+    parallel = await make_parallel(agents, max_concurrency=2)
+    results = await parallel.run()
+
+    assert tracker["peak"] == 2
+    assert all(res["status"] == "success" for res in results.values())
+
+
+@pytest.mark.asyncio
+async def test_agent_timeout_and_per_agent_override():
+    parallel = await make_parallel(
+        [FakeAgent("slow", delay=1), FakeAgent("patient", delay=0.05)],
+        agent_timeout=0.02,
+    )
+    results = await parallel.run(agent_timeouts={"patient": 1})
+
+    assert results["slow"]["status"] == "timeout"
+    assert results["patient"]["status"] == "success"
+
+
+@pytest.mark.asyncio
+async def test_first_success_cancels_remaining_agents():
+    slow = FakeAgent("slow", delay=1)
+    parallel = await make_parallel(
+        [slow, FakeAgent("broken", fail=True), FakeAgent("fast", delay=0.01)],
+        max_retries=1,
+    )
+    results = await parallel.run(completion="first_success")
+
+    assert results["fast"]["status"] == "success"
+    assert results["broken"]["status"] == "failed"
+    assert results["slow"]["status"] == "cancelled"
+    assert slow.cancelled
+
+
+@pytest.mark.asyncio
+async def test_quorum_and_as_completed_order():
+    agents = [FakeAgent(f"agent{i}", delay=0.01 * i) for i in range(1, 5)]
+    parallel = await make_parallel(agents)
+    results = await parallel.run(completion="quorum", quorum=2)
+    assert sum(res["status"] == "success" for res in results.values()) == 2
+
+    order = [res["agent_name"] async for res in parallel.as_completed()]
+    assert order == ["agent1", "agent2", "agent3", "agent4"]
+
+    with pytest.raises(ValueError):
+        await parallel.run(completion="quorum")
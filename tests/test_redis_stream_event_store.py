@@ -0,0 +1,155 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from omnicoreagent.core.events.base import (
+    Event,
+    EventType,
+    FinalAnswerPayload,
+    ToolCallResultPayload,
+)
+from omnicoreagent.core.events.redis_stream import RedisStreamEventStore
+
+
+def make_event(text: str) -> Event:
+    return Event(
+        type=EventType.FINAL_ANSWER,
+        payload=FinalAnswerPayload(message=text),
+        agent_name="agent",
+    )
+
+
+def entry(entry_id: str, text: str):
+    return entry_id, {"event": make_event(text).json()}
+
+
+@pytest.fixture
+def store():
+    store = RedisStreamEventStore(maxlen=100, retention_seconds=0, read_count=10)
+    store._redis = AsyncMock()
+    store.pipe = MagicMock()
+    store.pipe.execute = AsyncMock()
+    store._redis.pipeline = MagicMock()
+    store._redis.pipeline.return_value.__aenter__.return_value = store.pipe
+    return store
+
+
+@pytest.mark.asyncio
+async def test_append_trims_with_maxlen_or_minid(store):
+    await store.append("s", make_event("a"))
+    kwargs = store.pipe.xadd.call_args.kwargs
+    assert kwargs == {"maxlen": 100, "approximate": True}
+    store.pipe.execute.assert_awaited()
+
+    store.retention_seconds = 60
+    await store.append("s", make_event("b"))
+    kwargs = store.pipe.xadd.call_args.kwargs
+    assert kwargs["minid"].endswith("-0")
+    assert "maxlen" not in kwargs
+
+
+@pytest.mark.asyncio
+async def test_get_events_is_paginated(store, monkeypatch):
+    monkeypatch.setattr(
+        "omnicoreagent.core.events.redis_stream.EVENT_STREAM_PAGE_SIZE", 2
+    )
+    store._redis.xrange.side_effect = [
+        [entry("1-0", "a"), entry("2-0", "b")],
+        [entry("3-0", "c")],
+    ]
+    events = await store.get_events("s")
+
+    assert [e.payload.message for e in events] == ["a", "b", "c"]
+    second_call = store._redis.xrange.call_args_list[1].kwargs
+    assert second_call["min"] == "(2-0"
+    assert second_call["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_replays_from_the_start_by_default(store):
+    store._redis.xread.side_effect = [
+        [("omnicoreagent_events:s", [entry("1-0", "first")])]
+    ]
+    async for event in store.stream("s"):
+        assert event.payload.message == "first"
+        break
+    assert store._redis.xread.call_args.args[0] == {"omnicoreagent_events:s": "0-0"}
+    store._redis.xrevrange.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stream_starts_from_latest_and_reads_in_batches(store):
+    store._redis.xrevrange.return_value = [entry("5-0", "old")]
+    store._redis.xread.side_effect = [
+        [("omnicoreagent_events:s", [entry("6-0", "a"), entry("7-0", "b")])],
+        [],
+        [("omnicoreagent_events:s", [entry("8-0", "c")])],
+    ]
+    received = []
+    async for event in store.stream("s", last_id="latest"):
+        received.append(event.payload.message)
+        if len(received) == 3:
+            break
+
+    assert received == ["a", "b", "c"]
+    calls = store._redis.xread.call_args_list
+    assert calls[0].args[0] == {"omnicoreagent_events:s": "5-0"}
+    assert calls[0].kwargs["count"] == 10
+    assert calls[2].args[0] == {"omnicoreagent_events:s": "7-0"}
+
+
+@pytest.mark.asyncio
+async def test_stream_resumes_from_explicit_id(store):
+    store._redis.xread.side_effect = [[("omnicoreagent_events:s", [entry("9-0", "x")])]]
+    async for event in store.stream("s", last_id="8-0"):
+        break
+    assert store._redis.xread.call_args.args[0] == {"omnicoreagent_events:s": "8-0"}
+    store._redis.xrevrange.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_consumer_group_redelivers_pending_then_acks(store):
+    store._redis.xrevrange.return_value = []
+    store._redis.xreadgroup.side_effect = [
+        [("omnicoreagent_events:s", [entry("1-0", "pending")])],
+        [("omnicoreagent_events:s", [])],
+        [("omnicoreagent_events:s", [entry("2-0", "new")])],
+    ]
+    received = []
+    async for event in store.stream("s", consumer_group="sse", consumer_name="w1"):
+        received.append(event.payload.message)
+        if len(received) == 2:
+            break
+
+    assert received == ["pending", "new"]
+    store._redis.xgroup_create.assert_awaited_once()
+    cursors = [
+        call.args[2]["omnicoreagent_events:s"]
+        for call in store._redis.xreadgroup.call_args_list
+    ]
+    assert cursors == ["0", "0", ">"]
+    store._redis.xack.assert_awaited_with("omnicoreagent_events:s", "sse", "1-0")
+
+
+@pytest.mark.asyncio
+async def test_large_payloads_are_stored_out_of_line(store, monkeypatch):
+    monkeypatch.setattr(
+        "omnicoreagent.core.events.codec.EVENT_PAYLOAD_INLINE_LIMIT", 10
+    )
+    event = Event(
+        type=EventType.TOOL_CALL_RESULT,
+        payload=ToolCallResultPayload(tool_name="t", tool_args={}, result="x" * 50),
+        agent_name="agent",
+    )
+    await store.append("s", event)
+
+    blob_key, blob = store.pipe.set.call_args.args
+    assert blob == "x" * 50
+    body = store.pipe.xadd.call_args.args[1]["event"]
+    assert len(body) < 300
+
+    store._redis.mget.return_value = [blob]
+    store._redis.xrange.return_value = [("1-0", {"event": body.decode()})]
+    (decoded,) = await store.get_events("s")
+    assert decoded.payload.result == "x" * 50
+    store._redis.mget.assert_awaited_with([blob_key])
@@ -0,0 +1,196 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from mcp.types import Prompt, Resource, Tool
+
+from omnicoreagent.mcp_omni_connect.cli import MCPClientCLI
+from omnicoreagent.mcp_omni_connect.client import MCPClient
+from omnicoreagent.mcp_omni_connect.refresh_server_capabilities import (
+    refresh_capabilities,
+    refresh_server_capabilities,
+)
+
+
+def make_tool(name, description="a tool"):
+    return Tool(name=name, description=description, inputSchema={})
+
+
+def make_session(tools=(), resources=(), prompts=(), page_size=None):
+    """A session mock whose list calls page through the given entries."""
+
+    def pages(kind, items):
+        async def list_page(cursor=None):
+            start = int(cursor or 0)
+            end = len(items) if page_size is None else start + page_size
+            return SimpleNamespace(
+                **{kind: list(items[start:end])},
+                nextCursor=str(end) if end < len(items) else None,
+            )
+
+        return AsyncMock(side_effect=list_page)
+
+    session = MagicMock()
+    session.list_tools = pages("tools", list(tools))
+    session.list_resources = pages("resources", list(resources))
+    session.list_prompts = pages("prompts", list(prompts))
+    return session
+
+
+def connected(session, capabilities=None):
+    return {"session": session, "connected": True, "capabilities": capabilities}
+
+
+@pytest.mark.asyncio
+async def test_refresh_follows_pagination_cursors():
+    tools = [make_tool(f"tool_{i}") for i in range(5)]
+    session = make_session(tools=tools, page_size=2)
+    available_tools, available_resources, available_prompts = {}, {}, {}
+
+    delta = await refresh_server_capabilities(
+        {"srv": connected(session)},
+        "srv",
+        available_tools,
+        available_resources,
+        available_prompts,
+    )
+
+    assert [tool.name for tool in available_tools["srv"]] == [
+        f"tool_{i}" for i in range(5)
+    ]
+    assert session.list_tools.await_count == 3
+    assert delta.added["tools"] == [f"tool_{i}" for i in range(5)]
+    assert available_resources == {"srv": []}
+    assert available_prompts == {"srv": []}
+
+
+@pytest.mark.asyncio
+async def test_servers_are_refreshed_concurrently():
+    in_flight = 0
+    peak = 0
+
+    async def slow_list(cursor=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return SimpleNamespace(tools=[make_tool("t")], nextCursor=None)
+
+    sessions = {}
+    for name in ("a", "b", "c"):
+        session = make_session()
+        session.list_tools = AsyncMock(side_effect=slow_list)
+        sessions[name] = connected(session)
+
+    deltas = await refresh_capabilities(
+        sessions, ["a", "b", "c"], {}, {}, {}, debug=False
+    )
+
+    assert peak == 3
+    assert set(deltas) == {"a", "b", "c"}
+    assert all(delta.added["tools"] == ["t"] for delta in deltas.values())
+
+
+@pytest.mark.asyncio
+async def test_delta_names_added_removed_and_changed_entries():
+    available_tools = {"srv": [make_tool("keep"), make_tool("edit"), make_tool("gone")]}
+    available_resources = {
+        "srv": [Resource(uri="file:///a.txt", name="a")],
+    }
+    available_prompts = {"srv": [Prompt(name="greet")]}
+    unchanged_prompts = available_prompts["srv"]
+    session = make_session(
+        tools=[make_tool("keep"), make_tool("edit", "new text"), make_tool("new")],
+        resources=[Resource(uri="file:///b.txt", name="a")],
+        prompts=[Prompt(name="greet")],
+    )
+
+    delta = await refresh_server_capabilities(
+        {"srv": connected(session)},
+        "srv",
+        available_tools,
+        available_resources,
+        available_prompts,
+    )
+
+    assert delta.added["tools"] == ["new"]
+    assert delta.removed["tools"] == ["gone"]
+    assert delta.changed["tools"] == ["edit"]
+    # resources are keyed by URI
+    assert delta.added["resources"] == ["file:///b.txt"]
+    assert delta.removed["resources"] == ["file:///a.txt"]
+    assert not delta.kind_changed("prompts")
+    # an unchanged kind keeps its cached list
+    assert available_prompts["srv"] is unchanged_prompts
+    assert {tool.name for tool in available_tools["srv"]} == {"keep", "edit", "new"}
+
+
+@pytest.mark.asyncio
+async def test_unadvertised_kinds_are_not_requested_and_failures_keep_cache():
+    cached = [make_tool("cached")]
+    available_tools = {"srv": cached}
+    session = make_session(prompts=[Prompt(name="p")])
+    session.list_tools = AsyncMock(side_effect=RuntimeError("timeout"))
+    capabilities = SimpleNamespace(tools=object(), resources=None, prompts=object())
+
+    delta = await refresh_server_capabilities(
+        {"srv": connected(session, capabilities)}, "srv", available_tools, {}, {}
+    )
+
+    session.list_resources.assert_not_awaited()
+    assert available_tools["srv"] is cached
+    assert "tools" not in delta.added
+    assert delta.added["prompts"] == ["p"]
+
+
+@pytest.mark.asyncio
+async def test_refresh_of_disconnected_server_raises():
+    with pytest.raises(ValueError):
+        await refresh_server_capabilities(
+            {"srv": {"connected": False}}, "srv", {}, {}, {}
+        )
+
+
+@pytest.mark.asyncio
+async def test_client_refresh_server_notifies_listeners_only_on_change():
+    client = MCPClient.__new__(MCPClient)
+    client.sessions = {"srv": connected(make_session(tools=[make_tool("t")]))}
+    client.available_tools, client.available_resources = {}, {}
+    client.available_prompts = {}
+    client.debug = False
+    listener = AsyncMock()
+    failing_listener = AsyncMock(side_effect=RuntimeError("boom"))
+    client.capability_listeners = [failing_listener, listener]
+
+    delta = await client.refresh_server("srv")
+    await client.refresh_server("srv")
+
+    listener.assert_awaited_once_with(delta)
+    assert delta.added["tools"] == ["t"]
+
+
+@pytest.mark.asyncio
+async def test_cli_refresh_goes_through_the_client_listeners():
+    client = MCPClient.__new__(MCPClient)
+    client.server_names = ["a", "b"]
+    client.sessions = {
+        name: connected(make_session(tools=[make_tool(f"{name}_tool")]))
+        for name in client.server_names
+    }
+    client.available_tools, client.available_resources = {}, {}
+    client.available_prompts = {}
+    client.debug = False
+    listener = AsyncMock()
+    client.capability_listeners = [listener]
+    cli = MCPClientCLI.__new__(MCPClientCLI)
+    cli.client = client
+    cli.console = MagicMock()
+
+    await cli.handle_refresh_command()
+
+    assert sorted(call.args[0].server_name for call in listener.await_args_list) == [
+        "a",
+        "b",
+    ]
@@ -0,0 +1,169 @@
+import json
+
+from omnicoreagent.core.agents.response_parser import (
+    IncrementalResponseParser,
+    parse_agent_response,
+    to_tool_parsed_response,
+)
+
+
+def test_parses_thought_and_multiple_tool_calls():
+    response = """<thought>I need the weather and the time</thought>
+<tool_calls>
+  <tool_call>
+    <tool_name>get_weather</tool_name>
+    <parameters>{"city": "Lagos"}</parameters>
+  </tool_call>
+  <tool_call>
+    <name>get_time</name>
+    <args><timezone>UTC</timezone><fields>["hour", "minute"]</fields></args>
+  </tool_call>
+</tool_calls>"""
+    parsed = parse_agent_response(response)
+
+    assert parsed.thought == "I need the weather and the time"
+    assert [call.name for call in parsed.tool_calls] == ["get_weather", "get_time"]
+    assert parsed.tool_calls[0].parameters == {"city": "Lagos"}
+    assert parsed.tool_calls[1].parameters == {
+        "timezone": "UTC",
+        "fields": ["hour", "minute"],
+    }
+
+    result = to_tool_parsed_response(parsed)
+    assert result.action is True
+    assert json.loads(result.data)[0] == {
+        "tool": "get_weather",
+        "parameters": {"city": "Lagos"},
+    }
+
+
+def test_single_tool_call_and_nested_markup_in_values():
+    response = (
+        "<thought>render</thought><tool_call><tool_name>render</tool_name>"
+        "<parameters><html><b>bold</b></html></parameters></tool_call>"
+    )
+    parsed = parse_agent_response(response)
+    assert parsed.tool_calls[0].parameters == {"html": "<b>bold</b>"}
+
+
+def test_final_answer_tolerates_unbalanced_tags():
+    response = (
+        "<thought>done</thought><final_answer>Line one<br>Line two</final_answer>"
+    )
+    result = to_tool_parsed_response(parse_agent_response(response))
+    assert result.answer == "Line one<br>Line two"
+
+
+def test_unclosed_final_answer_is_rejected():
+    result = to_tool_parsed_response(
+        parse_agent_response("<thought>x</thought><final_answer>truncated answer")
+    )
+    assert result.answer is None
+    assert result.error.startswith("Response contains XML tags")
+
+
+def test_truncated_tool_call_is_not_run():
+    truncated = to_tool_parsed_response(
+        parse_agent_response(
+            '<tool_call><tool_name>delete_file</tool_name><parameters>{"path": "/tmp/a'
+        )
+    )
+    assert not truncated.action
+    assert truncated.error.startswith("Response contains XML tags")
+
+    unclosed_parameters = to_tool_parsed_response(
+        parse_agent_response(
+            "<tool_call><tool_name>delete_file</tool_name>"
+            '<parameters>{"path": "/tmp/a</tool_call>'
+        )
+    )
+    assert not unclosed_parameters.action
+    assert (
+        unclosed_parameters.error
+        == "Invalid tool call format - missing name or parameters"
+    )
+
+
+def test_tool_call_quoted_in_thought_is_not_a_call():
+    result = to_tool_parsed_response(
+        parse_agent_response(
+            "<thought>I could reply with <tool_call> but no tool is needed</thought>"
+            "<final_answer>Done</final_answer>"
+        )
+    )
+    assert result.error is None
+    assert result.answer == "Done"
+
+
+def test_errors_match_react_contract():
+    missing = to_tool_parsed_response(
+        parse_agent_response("<tool_call><tool_name>x</tool_name></tool_call>")
+    )
+    assert missing.error == "Invalid tool call format - missing name or parameters"
+
+    bad_json = to_tool_parsed_response(
+        parse_agent_response(
+            "<tool_call><tool_name>x</tool_name><parameters>{bad}</parameters></tool_call>"
+        )
+    )
+    assert bad_json.error.startswith("Invalid JSON in args")
+
+    no_xml = to_tool_parsed_response(parse_agent_response("just text"))
+    assert no_xml.error.startswith("Response must use XML format")
+
+    wrong_xml = to_tool_parsed_response(parse_agent_response("<foo>bar</foo>"))
+    assert wrong_xml.error.startswith("Response contains XML tags")
+
+
+def test_agent_calls():
+    parsed = parse_agent_response(
+        "<thought>delegate</thought><agent_call><agent_name>filesystem</agent_name>"
+        "<task>list files</task></agent_call>"
+    )
+    assert parsed.agent_calls[0].agent_name == "filesystem"
+    assert parsed.agent_calls[0].task == "list files"
+
+    broken = parse_agent_response("<agent_call><task>list</task></agent_call>")
+    assert broken.agent_calls == []
+    assert broken.agent_call_error is not None
+
+
+def test_truncated_agent_call_is_not_dispatched():
+    truncated = parse_agent_response(
+        "<thought>clean up</thought><agent_call><agent_name>db</agent_name>"
+        "<task>delete all rec"
+    )
+    assert truncated.agent_calls == []
+
+    unclosed_task = parse_agent_response(
+        "<agent_call><agent_name>db</agent_name><task>delete all rec</agent_call>"
+    )
+    assert unclosed_task.agent_calls == []
+    assert unclosed_task.agent_call_error is not None
+
+
+def test_agent_call_quoted_in_thought_is_not_a_call():
+    parsed = parse_agent_response(
+        "<thought>No need for an <agent_call> here</thought>"
+        "<final_answer>Done</final_answer>"
+    )
+    assert parsed.agent_calls == []
+    assert parsed.agent_call_error is None
+    assert parsed.final_answer == "Done"
+
+
+def test_incremental_feed_matches_single_pass():
+    response = (
+        "<thought>stream me</thought><tool_call><tool_name>t</tool_name>"
+        '<parameters>{"a": 1}</parameters></tool_call>'
+    )
+    parser = IncrementalResponseParser()
+    completed = []
+    for i in range(0, len(response), 7):
+        completed.extend(element.name for element in parser.feed(response[i : i + 7]))
+    root = parser.close()
+
+    assert completed[0] == "thought"
+    assert "tool_call" in completed
+    assert root.find("thought").text == "stream me"
+    assert root.find("parameters").text == '{"a": 1}'
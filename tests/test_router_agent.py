@@ -0,0 +1,122 @@
+import pytest
+
+from omnicoreagent.omni_agent.workflow.router_agent import RouterAgent
+from omnicoreagent.omni_agent.workflow.routing import RouteCache
+
+VOCAB = ["code", "python", "function", "weather", "forecast", "rain", "report"]
+
+
+async def bag_of_words(texts):
+    return [[float(word in text.lower()) for word in VOCAB] for text in texts]
+
+
+class FakeAgent:
+    def __init__(self, name):
+        self.name = name
+        self.queries = []
+
+    async def run(self, query, session_id=None):
+        self.queries.append(query)
+        return {"response": f"{self.name} done", "session_id": session_id}
+
+
+async def make_router():
+    coder, weather = FakeAgent("coder"), FakeAgent("weather")
+    router = RouterAgent(sub_agents=[coder, weather], model_config={}, agent_config={})
+    router.agent_registry = {
+        "coder": "Writes python code and functions.",
+        "weather": "Gives the weather forecast and rain report.",
+    }
+    router.route_classifier.embed = bag_of_words
+    assert await router.route_classifier.fit(router.agent_registry)
+    router._initialized = True
+    llm_calls = []
+
+    async def fake_llm_route(task, session_id):
+        llm_calls.append(task)
+        return "<routing><agent>weather</agent><task>report</task></routing>"
+
+    router._route_with_llm = fake_llm_route
+    return router, coder, weather, llm_calls
+
+
+@pytest.mark.asyncio
+async def test_embedding_tier_then_cache():
+    router, coder, _, llm_calls = await make_router()
+
+    result = await router.run("Write a python function")
+    assert result["agent_name"] == "coder"
+    assert result["routing"]["routed_by"] == "embedding"
+
+    result = await router.run("  write a PYTHON function ")
+    assert result["routing"]["routed_by"] == "cache"
+    assert llm_calls == []
+    assert len(coder.queries) == 2
+    assert router.get_routing_stats()["cache_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_ambiguous_task_falls_back_to_llm():
+    router, _, weather, llm_calls = await make_router()
+
+    result = await router.run("Send me a summary")
+    assert result["routing"]["routed_by"] == "llm"
+    assert result["agent_name"] == "weather"
+    assert llm_calls == ["Send me a summary"]
+
+    # the LLM decision is cached for the next identical task
+    result = await router.run("send me a summary")
+    assert result["routing"]["routed_by"] == "cache"
+    assert len(llm_calls) == 1
+
+
+def test_route_cache_evicts_least_recently_used():
+    cache = RouteCache(max_size=2)
+    cache.put("a", "x")
+    cache.put("b", "y")
+    assert cache.get("A") == "x"
+    cache.put("c", "z")
+    assert cache.get("b") is None
+    assert cache.get("a") == "x" and cache.get("c") == "z"
+
+
+class SummarizedAgent(FakeAgent):
+    def __init__(self, name, instruction):
+        super().__init__(name)
+        self.system_instruction = instruction
+        self.summaries = 0
+        self.llm_connection = self
+
+    async def list_all_available_tools(self):
+        return [{"name": "search", "description": "Search", "inputSchema": {}}]
+
+    async def llm_call(self, messages):
+        self.summaries += 1
+        return "Writes code."
+
+
+@pytest.mark.asyncio
+async def test_capability_summaries_cached_by_fingerprint(tmp_path):
+    cache_path = str(tmp_path / "capabilities.json")
+    agent = SummarizedAgent("coder", "Write code")
+    router = RouterAgent(
+        sub_agents=[agent],
+        model_config={},
+        agent_config={},
+        capability_cache_path=cache_path,
+    )
+    assert await router.create_agent_capabilities_registry(agent) == "Writes code."
+    router.capability_cache.save()
+
+    fresh = RouterAgent(
+        sub_agents=[agent],
+        model_config={},
+        agent_config={},
+        capability_cache_path=cache_path,
+    )
+    assert await fresh.create_agent_capabilities_registry(agent) == "Writes code."
+    assert agent.summaries == 1
+
+    agent.system_instruction = "Write and review code"
+    await fresh.create_agent_capabilities_registry(agent)
+    assert agent.summaries == 2
@@ -0,0 +1,117 @@
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from omnicoreagent.core.memory_store.memory_router import MemoryRouter
+from omnicoreagent.omni_agent.background_agent import session_rotation
+from omnicoreagent.omni_agent.background_agent.background_agents import (
+    BackgroundOmniAgent,
+)
+from omnicoreagent.omni_agent.background_agent.session_rotation import (
+    DIGEST_PREFIX,
+    SessionRotationPolicy,
+)
+
+
+def make_agent(tmp_path, digest="disk usage stable at 40%", **policy):
+    """A BackgroundOmniAgent without model or MCP setup, on in-memory storage."""
+    agent = BackgroundOmniAgent.__new__(BackgroundOmniAgent)
+    agent.agent_id = agent.name = "rotating_agent"
+    agent.session_id = "background_rotating_agent"
+    agent.memory_router = MemoryRouter(memory_store_type="in_memory")
+    agent.llm_connection = MagicMock()
+    agent.llm_connection.llm_call = AsyncMock(
+        return_value=MagicMock(choices=[MagicMock(message=MagicMock(content=digest))])
+    )
+    agent.session_rotation = SessionRotationPolicy(archive_dir=str(tmp_path), **policy)
+    agent.segment = agent.segment_runs = agent.session_rotations = 0
+    agent.last_archive = None
+    agent.segment_tokens = 0
+    return agent
+
+
+async def add_run(agent, query, answer, tokens=0):
+    for role, content in (("user", query), ("assistant", answer)):
+        await agent.memory_router.store_message(
+            role=role,
+            content=content,
+            metadata={"agent_name": agent.name},
+            session_id=agent.session_id,
+        )
+    agent.segment_runs += 1
+    agent.segment_tokens += tokens
+
+
+@pytest.mark.asyncio
+async def test_rotation_archives_segment_and_seeds_digest(tmp_path):
+    agent = make_agent(tmp_path, max_runs=2)
+
+    await add_run(agent, "check disk", "40% used")
+    assert await agent._maybe_rotate_session() is False
+
+    await add_run(agent, "check disk", "41% used")
+    assert await agent._maybe_rotate_session() is True
+
+    archived = [
+        json.loads(line) for line in Path(agent.last_archive).read_text().splitlines()
+    ]
+    assert [m["content"] for m in archived] == [
+        "check disk",
+        "40% used",
+        "check disk",
+        "41% used",
+    ]
+    history = await agent.get_session_history(agent.session_id)
+    assert len(history) == 1
+    assert history[0]["content"] == f"{DIGEST_PREFIX}\ndisk usage stable at 40%"
+    assert (agent.segment, agent.segment_runs, agent.session_rotations) == (1, 0, 1)
+
+
+@pytest.mark.asyncio
+async def test_digest_falls_back_to_an_extract_without_llm(tmp_path):
+    agent = make_agent(tmp_path, max_runs=1)
+    agent.llm_connection.llm_call.return_value = None
+
+    await add_run(agent, "check disk", "40% used")
+    await agent._maybe_rotate_session()
+    await add_run(agent, "check disk", "90% used, alert sent")
+    await agent._maybe_rotate_session()
+
+    history = await agent.get_session_history(agent.session_id)
+    assert "90% used, alert sent" in history[0]["content"]
+    assert "Earlier: " in history[0]["content"]
+    assert "40% used" in history[0]["content"]
+
+
+@pytest.mark.asyncio
+async def test_token_budget_rotates_by_segment_usage(tmp_path):
+    agent = make_agent(tmp_path, max_tokens=1000)
+
+    await add_run(agent, "check disk", "40% used", tokens=600)
+    assert await agent._maybe_rotate_session() is False
+
+    await add_run(agent, "check disk", "41% used", tokens=600)
+    assert await agent._maybe_rotate_session() is True
+    assert agent.segment_tokens == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_archive_keeps_the_history(tmp_path, monkeypatch):
+    agent = make_agent(tmp_path, max_runs=1)
+    monkeypatch.setattr(
+        session_rotation, "_archive_segment", MagicMock(side_effect=OSError("full"))
+    )
+
+    await add_run(agent, "check disk", "40% used")
+    assert await agent._maybe_rotate_session() is False
+
+    assert len(await agent.get_session_history(agent.session_id)) == 2
+    assert agent.session_rotations == 0
+
+
+def test_policy_validation():
+    assert not SessionRotationPolicy().enabled
+    with pytest.raises(ValueError):
+        SessionRotationPolicy(max_runs=0)
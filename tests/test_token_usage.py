@@ -0,0 +1,111 @@
+import threading
+
+import pytest
+
+from omnicoreagent.core.agents.token_usage import (
+    Usage,
+    UsageLedger,
+    UsageLimitExceeded,
+    UsageLimits,
+    UsageScope,
+    record_request_usage,
+    session_stats,
+)
+
+
+def make_usage(tokens: int) -> Usage:
+    return Usage(requests=1, request_tokens=tokens, response_tokens=tokens)
+
+
+def test_usage_is_isolated_per_scope_and_rolled_up():
+    ledger = UsageLedger()
+    ledger.record(UsageScope("a", "s1", "r1"), make_usage(10))
+    ledger.record(UsageScope("a", "s1", "r2"), make_usage(5))
+    ledger.record(UsageScope("b", "s2", "r3"), make_usage(100))
+
+    assert ledger.usage_for(agent_name="a").total_tokens == 30
+    assert ledger.usage_for(agent_name="a").requests == 2
+    assert ledger.usage_for(run_id="r3").total_tokens == 200
+    assert ledger.usage_for().requests == 3
+
+    by_agent = ledger.rollup(by="agent")
+    assert by_agent["a"].total_tokens == 30
+    assert by_agent["b"].total_tokens == 200
+    assert set(ledger.rollup(by="run", agent_name="a")) == {"r1", "r2"}
+
+    with pytest.raises(ValueError):
+        ledger.rollup(by="model")
+
+
+def test_limits_are_enforced_per_scope():
+    ledger = UsageLedger()
+    limits = UsageLimits(request_limit=2, total_tokens_limit=50)
+    noisy = UsageScope("noisy", "s", "r")
+    quiet = UsageScope("quiet", "s", "r")
+
+    record_request_usage(ledger, noisy, limits, make_usage(20))
+    with pytest.raises(UsageLimitExceeded):
+        record_request_usage(ledger, noisy, limits, make_usage(20))
+
+    # the other agent still has its whole budget
+    stats = record_request_usage(ledger, quiet, limits, make_usage(5))
+    assert stats["used_tokens"] == 10
+    assert stats["remaining_requests"] == 1
+    assert stats["remaining_tokens"] == 40
+    assert session_stats["used_tokens"] == 10
+    limits.check_before_request(ledger.usage_for(agent_name="quiet"))
+    with pytest.raises(UsageLimitExceeded):
+        limits.check_before_request(ledger.usage_for(agent_name="noisy"))
+
+
+def test_exporters_export_and_reset():
+    ledger = UsageLedger()
+    exported = []
+    ledger.add_exporter(lambda scope, usage: exported.append((scope, usage)))
+    ledger.add_exporter(lambda scope, usage: 1 / 0)  # failures are only logged
+    ledger.record(UsageScope("a", "s", "r"), make_usage(1))
+
+    assert exported[0][0] == UsageScope("a", "s", "r")
+    snapshot = ledger.export()
+    assert snapshot[0]["agent_name"] == "a"
+    assert snapshot[0]["total_tokens"] == 2
+
+    ledger.reset(agent_name="a")
+    assert ledger.usage_for().requests == 0
+
+
+def test_concurrent_records_are_not_lost():
+    ledger = UsageLedger(max_scopes=100)
+
+    def worker(index):
+        for _ in range(500):
+            ledger.record(UsageScope("agent", f"s{index}", "r"), make_usage(1))
+            if index == 0:
+                ledger.usage_for()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert ledger.usage_for(agent_name="agent").requests == 8 * 500
+
+
+def test_session_totals_follow_eviction_and_reset():
+    ledger = UsageLedger(max_scopes=3)
+    for run_id, tokens in (("r1", 1), ("r2", 2), ("r3", 4)):
+        ledger.record(UsageScope("a", "s1", run_id), make_usage(tokens))
+    ledger.record(UsageScope("b", "s1", "r4"), make_usage(8))
+
+    # r1 was evicted; the session total matches the runs still kept
+    session = ledger.usage_for(agent_name="a", session_id="s1")
+    assert (session.requests, session.total_tokens) == (2, 12)
+    assert ledger.rollup(by="session", agent_name="a")["s1"].total_tokens == 12
+    assert ledger.usage_for(agent_name="a", session_id="s1", run_id="r3").requests == 1
+
+    ledger.reset(run_id="r2")
+    assert ledger.usage_for(agent_name="a", session_id="s1").total_tokens == 8
+    ledger.reset(agent_name="a")
+    assert ledger.usage_for(agent_name="a", session_id="s1").requests == 0
+    assert ledger.usage_for(agent_name="b", session_id="s1").total_tokens == 16
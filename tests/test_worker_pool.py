@@ -0,0 +1,117 @@
+import os
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from omnicoreagent.core.events.base import (
+    BackgroundTaskStartedPayload,
+    Event,
+    EventType,
+)
+from omnicoreagent.core.events.event_router import EventRouter
+from omnicoreagent.omni_agent.background_agent.background_agent_manager import (
+    BackgroundAgentManager,
+)
+from omnicoreagent.omni_agent.background_agent.task_registry import TaskRegistry
+from omnicoreagent.omni_agent.background_agent.worker_pool import (
+    WorkerAgentHandle,
+    WorkerPool,
+)
+
+
+class EchoAgent:
+    """Minimal stand-in for BackgroundOmniAgent, instantiated inside the workers."""
+
+    def __init__(self, config, task_registry, memory_router, event_router):
+        self.agent_id = config["agent_id"]
+        self.task_registry = task_registry
+        self.event_router = event_router
+        self.session_id = f"session_{self.agent_id}"
+        self.run_count = 0
+        self.error_count = 0
+        self.last_run = None
+
+    def get_session_id(self):
+        return self.session_id
+
+    async def run_task(self, **kwargs):
+        query = self.task_registry.get(self.agent_id)["query"]
+        if query == "fail":
+            self.error_count += 1
+            raise ValueError("task failed")
+        await self.event_router.append(
+            self.session_id,
+            Event(
+                type=EventType.BACKGROUND_TASK_STARTED,
+                payload=BackgroundTaskStartedPayload(
+                    agent_id=self.agent_id,
+                    session_id=self.session_id,
+                    timestamp=datetime.now().isoformat(),
+                    run_count=self.run_count + 1,
+                    kwargs=kwargs,
+                ),
+                agent_name=self.agent_id,
+            ),
+        )
+        self.run_count += 1
+        self.last_run = datetime.now()
+        return {"response": f"{query} from {os.getpid()}"}
+
+    async def update_config(self, new_config):
+        pass
+
+    async def cleanup(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_runs_agents_in_subprocesses_and_forwards_events():
+    event_router = EventRouter(event_store_type="in_memory", async_publish=False)
+    registry = TaskRegistry()
+    pool = WorkerPool(num_workers=2, agent_class=EchoAgent, request_timeout=60)
+    await pool.start(event_router)
+    try:
+        handles = []
+        for agent_id in ("agent_a", "agent_b"):
+            registry.register(agent_id, {"query": f"hello {agent_id}"})
+            handles.append(await pool.create_agent({"agent_id": agent_id}, registry))
+        # the second agent goes to the idle worker
+        assert {handle.worker_id for handle in handles} == {0, 1}
+
+        result = await handles[0].run_task()
+        assert result["response"].startswith("hello agent_a from ")
+        assert int(result["response"].rsplit(" ", 1)[1]) != os.getpid()
+        assert handles[0].run_count == 1
+
+        events = await event_router.get_events("session_agent_a")
+        assert [event.type for event in events] == [EventType.BACKGROUND_TASK_STARTED]
+
+        registry.update("agent_b", {"query": "fail"})
+        with pytest.raises(RuntimeError, match="task failed"):
+            await handles[1].run_task()
+        assert handles[1].error_count == 1
+        assert not handles[1].is_running
+    finally:
+        await pool.shutdown()
+
+
+def test_least_loaded_worker_uses_inflight_runs_and_duty_cycle():
+    pool = WorkerPool(num_workers=2)
+    busy, idle = MagicMock(inflight=1, agents={}), MagicMock(inflight=0, agents={})
+    busy.load, idle.load = 1.0, 0.25
+    pool._workers = [busy, idle]
+    assert pool.least_loaded_worker() is idle
+
+    handle = MagicMock(interval=60, avg_run_seconds=30)
+    assert WorkerAgentHandle.duty_cycle.fget(handle) == 0.5
+
+
+def test_worker_pool_requires_event_loop_scheduler():
+    with pytest.raises(ValueError):
+        BackgroundAgentManager(
+            memory_router=MagicMock(),
+            event_router=MagicMock(),
+            scheduler=MagicMock(runs_on_event_loop=False),
+            worker_pool=WorkerPool(num_workers=1),
+        )